@@ -240,6 +240,7 @@ class EscalationSnapshotMixin:
         :type self:AlertGroup
         """
         AlertGroup = apps.get_model("alerts", "AlertGroup")
+        ScheduledTask = apps.get_model("base", "ScheduledTask")
 
         if self.pause_escalation:
             return
@@ -255,6 +256,7 @@ class EscalationSnapshotMixin:
         )
         task_id = celery_uuid()
 
+        ScheduledTask.cancel(self.active_escalation_id)
         AlertGroup.all_objects.filter(pk=self.pk,).update(
             active_escalation_id=task_id,
             is_escalation_finished=False,
@@ -262,9 +264,12 @@ class EscalationSnapshotMixin:
         )
         if not self.pause_escalation:
             calculate_escalation_finish_time.apply_async((self.pk,), immutable=True)
-        escalate_alert_group.apply_async((self.pk,), countdown=countdown, immutable=True, eta=eta, task_id=task_id)
+        ScheduledTask.schedule(escalate_alert_group, (self.pk,), countdown=countdown, eta=eta, task_id=task_id)
 
     def stop_escalation(self):
+        ScheduledTask = apps.get_model("base", "ScheduledTask")
+
+        ScheduledTask.cancel(self.active_escalation_id)
         self.is_escalation_finished = True
         self.estimate_escalation_finish_time = None
         # change active_escalation_id to prevent alert escalation
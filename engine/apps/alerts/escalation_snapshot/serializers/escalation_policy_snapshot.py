@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
 from apps.alerts.models.custom_button import CustomButton
@@ -19,6 +20,22 @@ class PrimaryKeyRelatedFieldWithNoneValue(serializers.PrimaryKeyRelatedField):
         except (TypeError, ValueError):
             self.fail("incorrect_type", data_type=type(data).__name__)
 
+    def to_internal_values(self, data):
+        """
+        Bulk version of to_internal_value: fetches all related objects with a single query, keeps the order of data
+        and skips non-existent primary keys
+        """
+        if self.pk_field is not None:
+            data = [self.pk_field.to_internal_value(item) for item in data]
+        queryset = self.get_queryset()
+        to_python = queryset.model._meta.pk.to_python
+        try:
+            data = [to_python(item) for item in data]
+            objects_by_pk = {obj.pk: obj for obj in queryset.filter(pk__in=data)}
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        return [objects_by_pk[pk] for pk in data if pk in objects_by_pk]
+
 
 class ManyRelatedFieldWithNoneCleanup(serializers.ManyRelatedField):
     """
@@ -40,6 +57,9 @@ class ManyRelatedFieldWithNoneCleanup(serializers.ManyRelatedField):
         if not self.allow_empty and len(data) == 0:
             self.fail("empty")
 
+        if isinstance(self.child_relation, PrimaryKeyRelatedFieldWithNoneValue):
+            return self.child_relation.to_internal_values(data)
+
         internal_value = []
         for item in data:
             child_internal_value = self.child_relation.to_internal_value(item)
@@ -53,7 +73,9 @@ class EscalationPolicySnapshotSerializer(serializers.ModelSerializer):
     order = serializers.IntegerField()
     wait_delay = serializers.DurationField(allow_null=True)
     notify_to_users_queue = ManyRelatedFieldWithNoneCleanup(
-        child_relation=PrimaryKeyRelatedFieldWithNoneValue(allow_null=True, queryset=User.objects)
+        child_relation=PrimaryKeyRelatedFieldWithNoneValue(
+            allow_null=True, queryset=User.objects.select_related("slack_user_identity")
+        )
     )
     escalation_counter = serializers.IntegerField(default=0)
     passed_last_time = serializers.DateTimeField(allow_null=True, default=None)
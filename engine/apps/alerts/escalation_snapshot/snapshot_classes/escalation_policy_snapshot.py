@@ -398,10 +398,8 @@ class EscalationPolicySnapshot:
                 escalation_policy_step=self.step,
             )
 
-        last_alert = alert_group.alerts.last()
-
         time_delta = timezone.timedelta(minutes=self.escalation_policy.num_minutes_in_window)
-        num_alerts_in_window = alert_group.alerts.filter(created_at__gte=last_alert.created_at - time_delta).count()
+        num_alerts_in_window = alert_group.alerts.filter(created_at__gte=alert_group.last_alert_at - time_delta).count()
 
         # pause escalation if there are not enough alerts in time window
         if num_alerts_in_window <= self.escalation_policy.num_alerts_in_window:
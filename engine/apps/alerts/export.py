@@ -0,0 +1,168 @@
+"""
+Streaming export of alert groups history (alert groups, their log records and resolution notes) to CSV or NDJSON.
+Rows are read in keyset batches of primary keys and written to the response one by one,
+so memory used by an export doesn't depend on the size of the exported range.
+"""
+import csv
+import json
+
+from django.apps import apps
+from django.db.models import F, OuterRef, Prefetch, Subquery
+from django.http import StreamingHttpResponse
+
+from common.utils import batch_queryset, iterate_queryset
+
+EXPORT_BATCH_SIZE = 500
+
+CSV = "csv"
+NDJSON = "ndjson"
+EXPORT_FORMATS = (CSV, NDJSON)
+CONTENT_TYPES = {CSV: "text/csv", NDJSON: "application/x-ndjson"}
+
+ALERT_GROUPS = "alert_groups"
+LOG_RECORDS = "log_records"
+RESOLUTION_NOTES = "resolution_notes"
+EXPORT_TYPES = (ALERT_GROUPS, LOG_RECORDS, RESOLUTION_NOTES)
+# used in url patterns of export endpoints
+EXPORT_TYPES_PATTERN = "|".join(EXPORT_TYPES)
+
+ALERT_GROUP_FIELDS = (
+    "id",
+    "integration_id",
+    "route_id",
+    "state",
+    "alerts_count",
+    "title",
+    "created_at",
+    "acknowledged_at",
+    "resolved_at",
+)
+LOG_RECORD_FIELDS = ("id", "alert_group_id", "type", "action", "author", "created_at")
+RESOLUTION_NOTE_FIELDS = ("id", "alert_group_id", "source", "text", "author", "created_at")
+
+
+def _isoformat(dt):
+    return dt.isoformat() if dt is not None else None
+
+
+def iterate_alert_group_rows(alert_groups):
+    """Alert group rows are read with a server-side cursor, without instantiating models."""
+    Alert = apps.get_model("alerts", "Alert")
+    AlertGroup = apps.get_model("alerts", "AlertGroup")
+
+    states = {status: label.lower() for status, label in AlertGroup.STATUS_CHOICES}
+    first_alert_title = Alert.objects.filter(group_id=OuterRef("pk")).order_by("pk").values("title")[:1]
+    rows = (
+        alert_groups.select_related(None)
+        .prefetch_related(None)
+        .annotate(title=Subquery(first_alert_title))
+        .values(
+            "public_primary_key",
+            "channel__public_primary_key",
+            "channel_filter__public_primary_key",
+            "status",
+            "alerts_count",
+            "title",
+            "started_at",
+            "acknowledged_at",
+            "resolved_at",
+        )
+    )
+    for row in iterate_queryset(rows, EXPORT_BATCH_SIZE):
+        yield {
+            "id": row["public_primary_key"],
+            "integration_id": row["channel__public_primary_key"],
+            "route_id": row["channel_filter__public_primary_key"],
+            "state": states[row["status"]],
+            "alerts_count": row["alerts_count"],
+            "title": row["title"],
+            "created_at": _isoformat(row["started_at"]),
+            "acknowledged_at": _isoformat(row["acknowledged_at"]),
+            "resolved_at": _isoformat(row["resolved_at"]),
+        }
+
+
+def iterate_log_record_rows(alert_groups):
+    """
+    Log records are rendered from models, so they are loaded in batches with their alert groups prefetched once
+    per batch (escalation snapshot of an alert group is parsed once for all its records in the batch).
+    """
+    AlertGroup = apps.get_model("alerts", "AlertGroup")
+    AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
+
+    log_records = AlertGroupLogRecord.objects.filter(alert_group_id__in=alert_groups.values("pk"))
+    alert_groups_prefetch = Prefetch(
+        "alert_group",
+        queryset=AlertGroup.all_objects.defer("cached_render_for_web").select_related("channel__organization"),
+    )
+    for batch in batch_queryset(log_records, EXPORT_BATCH_SIZE):
+        batch = batch.select_related("author", "escalation_policy", "invitation__invitee").prefetch_related(
+            alert_groups_prefetch
+        )
+        for log_record in batch:
+            yield {
+                "id": log_record.pk,
+                "alert_group_id": log_record.alert_group.public_primary_key,
+                "type": log_record.get_type_display(),
+                "action": log_record.rendered_log_line_action(),
+                "author": log_record.author.username if log_record.author is not None else None,
+                "created_at": _isoformat(log_record.created_at),
+            }
+
+
+def iterate_resolution_note_rows(alert_groups):
+    ResolutionNote = apps.get_model("alerts", "ResolutionNote")
+
+    resolution_notes = ResolutionNote.objects.filter(alert_group_id__in=alert_groups.values("pk")).annotate(
+        alert_group_public_primary_key=F("alert_group__public_primary_key")
+    )
+    for batch in batch_queryset(resolution_notes, EXPORT_BATCH_SIZE):
+        for resolution_note in batch.select_related("author", "resolution_note_slack_message"):
+            yield {
+                "id": resolution_note.public_primary_key,
+                "alert_group_id": resolution_note.alert_group_public_primary_key,
+                "source": resolution_note.get_source_display(),
+                "text": resolution_note.text,
+                "author": resolution_note.author.username if resolution_note.author is not None else None,
+                "created_at": _isoformat(resolution_note.created_at),
+            }
+
+
+EXPORTS = {
+    ALERT_GROUPS: (iterate_alert_group_rows, ALERT_GROUP_FIELDS),
+    LOG_RECORDS: (iterate_log_record_rows, LOG_RECORD_FIELDS),
+    RESOLUTION_NOTES: (iterate_resolution_note_rows, RESOLUTION_NOTE_FIELDS),
+}
+
+
+class _EchoBuffer:
+    """File-like object returning written lines, so csv.writer output can be streamed line by line."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, fields):
+    writer = csv.DictWriter(_EchoBuffer(), fieldnames=fields)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def get_export_response(export_type, export_format, alert_groups):
+    """
+    Returns streaming response with rows of export_type related to alert_groups.
+    alert_groups queryset is only used as a filter, so it can have any ordering, select_related and prefetch_related.
+    """
+    iterate_rows, fields = EXPORTS[export_type]
+    rows = iterate_rows(alert_groups)
+    content = stream_csv(rows, fields) if export_format == CSV else stream_ndjson(rows)
+
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{export_type}.{export_format}"'
+    return response
@@ -27,7 +27,7 @@ class AlertGroupPhoneCallRenderer(AlertGroupBaseRenderer):
         text = self.TEMPLATE.format(
             integration_name=self.alert_group.channel.short_name,
             title=title,
-            alert_count=self.alert_group.alerts.count(),
+            alert_count=self.alert_group.alerts_count,
         )
 
         return text
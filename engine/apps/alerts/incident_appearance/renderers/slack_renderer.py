@@ -61,14 +61,13 @@ class AlertGroupSlackRenderer(AlertGroupBaseRenderer):
         super().__init__(alert_group)
 
         # render the last alert content as Slack message, so Slack message is updated when a new alert comes
-        self.alert_renderer = self.alert_renderer_class(self.alert_group.alerts.last())
+        self.alert_renderer = self.alert_renderer_class(self.alert_group.last_alert)
 
     @property
     def alert_renderer_class(self):
         return AlertSlackRenderer
 
     def render_alert_group_blocks(self):
-        non_resolve_alerts_queryset = self.alert_group.alerts.filter(is_resolve_signal=False)
         if not self.alert_group.channel.organization.slack_team_identity.installed_via_granular_permissions:
             blocks = [
                 {
@@ -99,7 +98,7 @@ class AlertGroupSlackRenderer(AlertGroupBaseRenderer):
             ]
         else:
             blocks = []
-        if non_resolve_alerts_queryset.count() <= 1:
+        if self.alert_group.non_resolve_alerts_count <= 1:
             blocks.extend(self.alert_renderer.render_alert_blocks())
         else:
             blocks.extend(self._get_alert_group_base_blocks_if_grouped())
@@ -184,7 +183,7 @@ class AlertGroupSlackRenderer(AlertGroupBaseRenderer):
         return attachments
 
     def _get_text_alert_grouped(self):
-        alert_count = self.alert_group.alerts.count()
+        alert_count = self.alert_group.alerts_count
         link = self.alert_group.web_link
 
         text = (
@@ -26,7 +26,7 @@ class AlertGroupSmsRenderer(AlertGroupBaseRenderer):
             f"You are invited to check an incident #{self.alert_group.inside_organization_number} with title "
             f'"{title}" in Grafana OnCall organization: "{self.alert_group.channel.organization.org_title}", '
             f"alert channel: {self.alert_group.channel.short_name}, "
-            f"alerts registered: {self.alert_group.alerts.count()}, "
+            f"alerts registered: {self.alert_group.alerts_count}, "
             f"{incident_link}\n"
             f"Your Grafana OnCall <3"
         )
@@ -17,7 +17,7 @@ class AlertGroupTelegramRenderer(AlertGroupBaseRenderer):
         super().__init__(alert_group)
 
         # render the last alert content as a Telegram message, so Telegram message is updated when a new alert comes
-        self.alert_renderer = self.alert_renderer_class(self.alert_group.alerts.last())
+        self.alert_renderer = self.alert_renderer_class(self.alert_group.last_alert)
 
     @property
     def alert_renderer_class(self):
@@ -29,7 +29,7 @@ class AlertGroupTelegramRenderer(AlertGroupBaseRenderer):
         message = templated_alert.message
         image_url = templated_alert.image_url
 
-        alerts_count = self.alert_group.alerts.count()
+        alerts_count = self.alert_group.alerts_count
         if alerts_count <= 10:
             alerts_count_str = str(alerts_count)
         else:
@@ -22,7 +22,7 @@ class AlertWebRenderer(AlertBaseRenderer):
 class AlertGroupWebRenderer(AlertGroupBaseRenderer):
     def __init__(self, alert_group, alert=None):
         if alert is None:
-            alert = alert_group.alerts.last()
+            alert = alert_group.last_alert
 
         super().__init__(alert_group, alert)
 
@@ -1,30 +1,82 @@
+import hashlib
 import re
+from dataclasses import asdict
 
-from apps.alerts.incident_appearance.templaters.alert_templater import AlertTemplater
+from django.core.cache import cache
+
+from apps.alerts.incident_appearance.templaters.alert_templater import AlertTemplater, TemplatedAlert
 from common.utils import convert_md_to_html, escape_html, url_re, urlize_with_respect_to_a
 
+LINK_SUBSTITUTION_PREFIX = "amixrsubstitutedlink"
+LINK_SUBSTITUTION_RE = re.compile(rf"{LINK_SUBSTITUTION_PREFIX}(\d+)")
+
+WEB_TEMPLATED_ALERT_CACHE_KEY_PREFIX = "web_templated_alert"
+WEB_TEMPLATED_ALERT_CACHE_LIFETIME = 60 * 30
+
+
+def format_web_message(message):
+    """
+    Converts escaped markdown message to html.
+    Links are hidden from markdown while it's converted, so they are not mangled, then not yet linked ones are urlized.
+    """
+    links = []
+
+    def _substitute_link(match):
+        links.append(match.group(0))
+        return f"{LINK_SUBSTITUTION_PREFIX}{len(links) - 1}"
+
+    message = url_re.sub(_substitute_link, message)
+    message = convert_md_to_html(message)
+    if links:
+        message = LINK_SUBSTITUTION_RE.sub(lambda match: links[int(match.group(1))], message)
+    return urlize_with_respect_to_a(message)
+
 
 class AlertWebTemplater(AlertTemplater):
     RENDER_FOR_WEB = "web"
 
+    def render(self):
+        """
+        Web rendering is cached per alert and version of templates used to render it,
+        since the same alert is rendered on every alert group list and details request.
+        """
+        if self.alert.pk is None:
+            return super().render()
+
+        cache_key = self._get_cache_key()
+        cached_templated_alert = cache.get(cache_key)
+        if cached_templated_alert is not None:
+            return TemplatedAlert(**cached_templated_alert)
+
+        templated_alert = super().render()
+        cache.set(cache_key, asdict(templated_alert), timeout=WEB_TEMPLATED_ALERT_CACHE_LIFETIME)
+        return templated_alert
+
+    def _get_cache_key(self):
+        alert_group = self.alert.group
+        channel = alert_group.channel
+        # wiping replaces alert contents in place, so renders of wiped alerts have their own key
+        templates_version = hashlib.md5(
+            repr(
+                [channel.verbal_name, alert_group.wiped_at]
+                + [
+                    self.template_manager.get_attr_template(attr, channel, self._render_for())
+                    for attr in ("source_link", "title", "message", "image_url")
+                ]
+            ).encode()
+        ).hexdigest()
+        return f"{WEB_TEMPLATED_ALERT_CACHE_KEY_PREFIX}_{self.alert.pk}_{templates_version}"
+
     def _render_for(self):
         return self.RENDER_FOR_WEB
 
     def _postformat(self, templated_alert):
-        link_substitution = {}
         if templated_alert.title:
             templated_alert.title = escape_html(self._slack_format_for_web(templated_alert.title))
         if templated_alert.message:
-            message = escape_html(self._slack_format_for_web(templated_alert.message))
-            link_matches = re.findall(url_re, message)
-            for idx, link in enumerate(link_matches):
-                substitution = f"amixrsubstitutedlink{idx}"
-                link_substitution[substitution] = link
-                message = message.replace(link, substitution)
-            message = convert_md_to_html(message)
-            for substitution, original_link in link_substitution.items():
-                message = message.replace(substitution, original_link)
-            templated_alert.message = urlize_with_respect_to_a(message)
+            templated_alert.message = format_web_message(
+                escape_html(self._slack_format_for_web(templated_alert.message))
+            )
         if templated_alert.image_url:
             templated_alert.image_url = escape_html(templated_alert.image_url)
 
@@ -1,14 +1,35 @@
+import hashlib
+import json
+
 from django.apps import apps
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 
 from apps.base.messaging import get_messaging_backend_from_id
-from apps.schedules.ical_utils import list_users_to_notify_from_ical
+from apps.schedules.ical_events import ical_events
+from apps.schedules.ical_utils import (
+    ICAL_DATETIME_END,
+    ICAL_DATETIME_START,
+    get_icalendar_tz_or_utc,
+    ical_date_to_datetime,
+    list_users_to_notify_from_ical,
+)
 
 
 class IncidentLogBuilder:
+    ESCALATION_PLAN_CACHE_KEY_PREFIX = "incident_escalation_plan"
+    ESCALATION_PLAN_CACHE_LIFETIME = 60 * 5
+
     def __init__(self, alert_group):
         self.alert_group = alert_group
+        # data shared by all steps of the escalation plan, loaded once per builder
+        self._last_user_notification_logs = None
+        self._schedule_calendars = {}
+        # (user pk, important) of users notified by the plan and the time on-call users of its schedule steps change,
+        # see get_incident_escalation_plan
+        self._plan_users = set()
+        self._oncall_changes_at = None
 
     def get_log_records_list(self, with_resolution_notes=False):
         """
@@ -108,12 +129,119 @@ class IncidentLogBuilder:
             "created_at"
         )
 
+    @classmethod
+    def _get_escalation_plan_cache_key(cls, alert_group_pk, for_slack):
+        return f"{cls.ESCALATION_PLAN_CACHE_KEY_PREFIX}_{alert_group_pk}_{int(for_slack)}"
+
+    @classmethod
+    def invalidate_escalation_plan_cache(cls, alert_group_pk):
+        cache.delete_many(
+            [cls._get_escalation_plan_cache_key(alert_group_pk, for_slack) for for_slack in (False, True)]
+        )
+
+    def _get_escalation_plan_version(self):
+        """
+        Escalation plan version changes with escalation snapshot and alert group state.
+        Log records and invitations invalidate the cached plan on save.
+        """
+        alert_group = self.alert_group
+        version_data = [
+            alert_group.raw_escalation_snapshot,
+            alert_group.acknowledged,
+            alert_group.resolved,
+            alert_group.silenced,
+            alert_group.silenced_until,
+        ]
+        return hashlib.md5(json.dumps(version_data, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _get_escalation_plan_dependencies_version(self, plan_users, schedule_pks):
+        """
+        Version of the data the plan was rendered from, other than the alert group: names and notification policies
+        of notified users and iCal files of schedules. Notification policies are taken from their own cache.
+        """
+        User = apps.get_model("user_management", "User")
+        UserNotificationPolicy = apps.get_model("base", "UserNotificationPolicy")
+        OnCallSchedule = apps.get_model("schedules", "OnCallSchedule")
+
+        users_data = []
+        if plan_users:
+            users = User.objects.filter(pk__in={user_pk for user_pk, _ in plan_users}).select_related(
+                "slack_user_identity"
+            )
+            users_by_pk = {user.pk: user for user in users}
+            for user_pk, important in plan_users:
+                user = users_by_pk.get(user_pk)
+                if user is None:
+                    users_data.append([user_pk, None])
+                    continue
+                notification_policies = [
+                    [policy.pk, policy.step, policy.notify_by, policy.wait_delay]
+                    for policy in UserNotificationPolicy.objects.get_cached_for_user(user, important)
+                ]
+                users_data.append([user_pk, user.get_user_verbal_for_team_for_slack(), notification_policies])
+
+        schedules_data = []
+        if schedule_pks:
+            schedules_data = list(
+                OnCallSchedule.objects.filter(pk__in=schedule_pks)
+                .order_by("pk")
+                .values_list("pk", "cached_ical_file_primary", "cached_ical_file_overrides")
+            )
+        version_data = [users_data, schedules_data]
+        return hashlib.md5(json.dumps(version_data, sort_keys=True, default=str).encode()).hexdigest()
+
     def get_incident_escalation_plan(self, for_slack=False):
         """
-        Generates dict with escalation plan with timedelta as keys and list with plan lines as values
+        Generates dict with escalation plan with timedelta as keys and list with plan lines as values.
+        Plan is memoized per alert group and escalation snapshot version, timedeltas of the memoized plan are shifted
+        by the time passed since it was rendered. Memoized plan is rendered again when notified users or schedules
+        change, or when on-call users of its schedule steps change with time.
         :param for_slack: (bool) add user slack id to plan line or not
         :return:
         """
+        now = timezone.now()
+        cache_key = self._get_escalation_plan_cache_key(self.alert_group.pk, for_slack)
+        version = self._get_escalation_plan_version()
+
+        cached_plan = cache.get(cache_key)
+        if (
+            cached_plan is not None
+            and cached_plan["version"] == version
+            and (cached_plan["oncall_changes_at"] is None or now < cached_plan["oncall_changes_at"])
+            and cached_plan["dependencies_version"]
+            == self._get_escalation_plan_dependencies_version(cached_plan["plan_users"], cached_plan["schedule_pks"])
+        ):
+            return self._shift_escalation_plan(cached_plan["plan"], now - cached_plan["rendered_at"])
+
+        self._plan_users = set()
+        self._oncall_changes_at = None
+        incident_escalation_plan = self._build_incident_escalation_plan(for_slack=for_slack)
+        plan_users = sorted(self._plan_users)
+        schedule_pks = sorted(self._schedule_calendars)
+        cache.set(
+            cache_key,
+            {
+                "version": version,
+                "dependencies_version": self._get_escalation_plan_dependencies_version(plan_users, schedule_pks),
+                "plan_users": plan_users,
+                "schedule_pks": schedule_pks,
+                "oncall_changes_at": self._oncall_changes_at,
+                "rendered_at": now,
+                "plan": incident_escalation_plan,
+            },
+            self.ESCALATION_PLAN_CACHE_LIFETIME,
+        )
+        return incident_escalation_plan
+
+    @staticmethod
+    def _shift_escalation_plan(escalation_plan, passed_timedelta):
+        shifted_escalation_plan = dict()
+        for timedelta in sorted(escalation_plan):
+            shifted_timedelta = max(timedelta - passed_timedelta, timezone.timedelta())
+            shifted_escalation_plan.setdefault(shifted_timedelta, []).extend(escalation_plan[timedelta])
+        return shifted_escalation_plan
+
+    def _build_incident_escalation_plan(self, for_slack=False):
         incident_escalation_plan = dict()
         incident_escalation_plan = self._add_invitation_plan(incident_escalation_plan, for_slack=for_slack)
         if not self.alert_group.acknowledged and not self.alert_group.is_silenced_forever:
@@ -263,7 +391,7 @@ class IncidentLogBuilder:
         """
         Invitation = apps.get_model("alerts", "Invitation")
         now = timezone.now()
-        for invitation in self.alert_group.invitations.filter(is_active=True):
+        for invitation in self.alert_group.invitations.filter(is_active=True).select_related("invitee"):
             invitation_timedelta = timezone.timedelta()
             current_attempt = invitation.attempt - 1
             # generate notification plan for each attempt
@@ -513,7 +641,7 @@ class IncidentLogBuilder:
             if future_step:
                 if schedule is not None:
                     step_datetime = timezone.now() + esc_timedelta
-                    users_oncall = list_users_to_notify_from_ical(schedule, step_datetime)
+                    users_oncall = self._get_users_oncall(schedule, step_datetime)
                     important_text = ""
                     if escalation_policy_snapshot.step == EscalationPolicy.STEP_NOTIFY_SCHEDULE_IMPORTANT:
                         important_text = " (Important)"
@@ -616,6 +744,7 @@ class IncidentLogBuilder:
         UserNotificationPolicyLogRecord = apps.get_model("base", "UserNotificationPolicyLogRecord")
         UserNotificationPolicy = apps.get_model("base", "UserNotificationPolicy")
 
+        self._plan_users.add((user_to_notify.pk, important))
         timedelta = timezone.timedelta()
         is_the_first_notification_step = future_step  # escalation starts with this step or not
 
@@ -629,39 +758,35 @@ class IncidentLogBuilder:
 
         last_user_log = None
 
+        notification_policies = UserNotificationPolicy.objects.get_cached_for_user(
+            user=user_to_notify, important=important
+        )
+        notification_policies_by_pk = {
+            notification_policy.pk: notification_policy for notification_policy in notification_policies
+        }
+
         notification_policy_order = 0
         if not future_step:  # escalation step has been passed, so escalation for user has been already triggered.
-            last_user_log = (
-                user_to_notify.personal_log_records.filter(
-                    alert_group=self.alert_group,
-                    notification_policy__isnull=False,
-                    type__in=[
-                        UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_TRIGGERED,
-                        UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FINISHED,
-                    ],
-                )
-                .order_by("created_at")
-                .last()
-            )
+            last_user_log = self._get_last_user_notification_logs().get(user_to_notify.pk)
 
         if last_user_log and last_user_log.type == UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_TRIGGERED:
-            if last_user_log.notification_policy is not None:
+            # use the cached policy if it's still in user's chain to avoid an extra query
+            last_notification_policy = notification_policies_by_pk.get(last_user_log.notification_policy_id)
+            if last_notification_policy is None:
+                last_notification_policy = last_user_log.notification_policy
+            if last_notification_policy is not None:
                 notification_step = (
                     last_user_log.notification_step
                     if last_user_log.notification_step is not None
-                    else last_user_log.notification_policy.step
+                    else last_notification_policy.step
                 )
                 # get order of the next notification step
                 if notification_step == UserNotificationPolicy.Step.WAIT:
                     # do not exclude wait step, because we need it to count timedelta
-                    notification_policy_order = last_user_log.notification_policy.order
+                    notification_policy_order = last_notification_policy.order
                 else:
                     # last passed step order + 1
-                    notification_policy_order = last_user_log.notification_policy.order + 1
-
-        notification_policies = UserNotificationPolicy.objects.get_or_create_for_user(
-            user=user_to_notify, important=important
-        )
+                    notification_policy_order = last_notification_policy.order + 1
 
         for notification_policy in notification_policies:
             future_notification = notification_policy.order >= notification_policy_order
@@ -680,3 +805,50 @@ class IncidentLogBuilder:
                 else:
                     notification_plan_dict[timedelta][0]["plan_lines"].append(plan_line)
         return notification_plan_dict
+
+    def _get_last_user_notification_logs(self):
+        """
+        Returns the last notification log record of every user notified within the alert group,
+        loaded with a single query for the whole escalation plan
+        :return: {user.pk: UserNotificationPolicyLogRecord, ...}
+        """
+        UserNotificationPolicyLogRecord = apps.get_model("base", "UserNotificationPolicyLogRecord")
+
+        if self._last_user_notification_logs is None:
+            log_records = self.alert_group.personal_log_records.filter(
+                notification_policy__isnull=False,
+                type__in=[
+                    UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_TRIGGERED,
+                    UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FINISHED,
+                ],
+            ).order_by("created_at", "pk")
+            # later log records overwrite earlier ones
+            self._last_user_notification_logs = {log_record.author_id: log_record for log_record in log_records}
+        return self._last_user_notification_logs
+
+    def _get_users_oncall(self, schedule, step_datetime):
+        """Returns on-call users for schedule step, schedule iCal files are parsed once per escalation plan"""
+        if schedule.pk not in self._schedule_calendars:
+            self._schedule_calendars[schedule.pk] = schedule.get_icalendars()
+        self._track_oncall_changes(self._schedule_calendars[schedule.pk], step_datetime)
+        return list_users_to_notify_from_ical(schedule, step_datetime, calendars=self._schedule_calendars[schedule.pk])
+
+    def _track_oncall_changes(self, calendars, step_datetime):
+        """
+        Keeps the nearest time on-call users of the step can change, that is the start or the end of a schedule event.
+        The step is notified at step_datetime or, if the escalation is late, as soon as possible,
+        so events are checked starting from the latest of them, up to the lifetime of the memoized plan.
+        """
+        start_datetime = max(step_datetime, timezone.now())
+        end_datetime = start_datetime + timezone.timedelta(seconds=self.ESCALATION_PLAN_CACHE_LIFETIME)
+        oncall_changes_at = self._oncall_changes_at or end_datetime
+        for calendar in calendars:
+            if calendar is None:
+                continue
+            calendar_tz = get_icalendar_tz_or_utc(calendar)
+            for event in ical_events.get_events_from_ical_between(calendar, start_datetime, end_datetime):
+                for field_name, is_start in ((ICAL_DATETIME_START, True), (ICAL_DATETIME_END, False)):
+                    event_datetime, _ = ical_date_to_datetime(event[field_name].dt, calendar_tz, start=is_start)
+                    if start_datetime < event_datetime < oncall_changes_at:
+                        oncall_changes_at = event_datetime
+        self._oncall_changes_at = oncall_changes_at
@@ -0,0 +1,69 @@
+# Generated by Django 3.2.15 on 2022-08-02 10:12
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 5000
+
+NEW, ACKNOWLEDGED, RESOLVED, SILENCED = range(4)
+
+
+def backfill_status_and_organization(apps, schema_editor):
+    """
+    Fills denormalized AlertGroup.status and AlertGroup.organization in batches of primary keys,
+    so every batch is a short transaction and the table is never locked as a whole.
+    """
+    AlertGroup = apps.get_model("alerts", "AlertGroup")
+    AlertReceiveChannel = apps.get_model("alerts", "AlertReceiveChannel")
+
+    last_alert_group = AlertGroup.all_objects.order_by("pk").last()
+    if last_alert_group is None:
+        return
+
+    organization_subquery = AlertReceiveChannel.objects.filter(pk=OuterRef("channel_id")).values("organization_id")[:1]
+
+    for start in range(0, last_alert_group.pk + 1, BACKFILL_BATCH_SIZE):
+        batch = AlertGroup.all_objects.filter(pk__gte=start, pk__lt=start + BACKFILL_BATCH_SIZE)
+
+        batch.filter(organization__isnull=True).update(organization_id=Subquery(organization_subquery))
+        # status=NEW is the column default, so only non-new alert groups need to be updated
+        batch.filter(resolved=True).update(status=RESOLVED)
+        batch.filter(resolved=False, acknowledged=True).update(status=ACKNOWLEDGED)
+        batch.filter(resolved=False, acknowledged=False, silenced=True).update(status=SILENCED)
+
+
+class Migration(migrations.Migration):
+    # every backfill batch is committed separately
+    atomic = False
+
+    dependencies = [
+        ('user_management', '0002_auto_20220705_1214'),
+        ('alerts', '0006_alertgroup_alerts_aler_channel_ee84a7_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertgroup',
+            name='organization',
+            field=models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='alert_groups', to='user_management.organization'),
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='status',
+            field=models.IntegerField(choices=[(0, 'New'), (1, 'Acknowledged'), (2, 'Resolved'), (3, 'Silenced')], default=0),
+        ),
+        migrations.RunPython(backfill_status_and_organization, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='alertgroup',
+            index=models.Index(fields=['organization', 'status', 'is_archived', 'started_at'], name='alerts_aler_organiz_dfdb01_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alertgroup',
+            index=models.Index(condition=models.Q(('is_archived', False), ('root_alert_group__isnull', True), ('status', 0)), fields=['organization', '-id'], name='alert_group_firing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alertgroup',
+            index=models.Index(condition=models.Q(('is_archived', False), ('root_alert_group__isnull', True), ('status', 1)), fields=['organization', '-id'], name='alert_group_acknowledged_idx'),
+        ),
+    ]
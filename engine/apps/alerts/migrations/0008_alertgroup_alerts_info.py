@@ -0,0 +1,71 @@
+# Generated by Django 3.2.15 on 2022-08-03 09:11
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def backfill_alerts_info(apps, schema_editor):
+    """
+    Fills denormalized AlertGroup alerts info in batches of primary keys,
+    so every batch is a short transaction and the table is never locked as a whole.
+    """
+    AlertGroup = apps.get_model("alerts", "AlertGroup")
+    Alert = apps.get_model("alerts", "Alert")
+
+    last_alert_group = AlertGroup.all_objects.order_by("pk").last()
+    if last_alert_group is None:
+        return
+
+    def alerts_subquery(aggregate, **filters):
+        return Subquery(
+            Alert.objects.filter(group_id=OuterRef("pk"), **filters)
+            .order_by()
+            .values("group_id")
+            .annotate(value=aggregate)
+            .values("value")[:1]
+        )
+
+    for start in range(0, last_alert_group.pk + 1, BACKFILL_BATCH_SIZE):
+        AlertGroup.all_objects.filter(pk__gte=start, pk__lt=start + BACKFILL_BATCH_SIZE).update(
+            alerts_count=Coalesce(alerts_subquery(Count("pk")), 0),
+            non_resolve_alerts_count=Coalesce(alerts_subquery(Count("pk", filter=Q(is_resolve_signal=False))), 0),
+            last_alert_id=alerts_subquery(Max("pk")),
+            last_alert_at=alerts_subquery(Max("created_at")),
+        )
+
+
+class Migration(migrations.Migration):
+    # every backfill batch is committed separately
+    atomic = False
+
+    dependencies = [
+        ('alerts', '0007_alertgroup_status_and_organization'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertgroup',
+            name='alerts_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='last_alert',
+            field=models.ForeignKey(db_constraint=False, default=None, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='alerts.alert'),
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='last_alert_at',
+            field=models.DateTimeField(default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='alertgroup',
+            name='non_resolve_alerts_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_alerts_info, migrations.RunPython.noop),
+    ]
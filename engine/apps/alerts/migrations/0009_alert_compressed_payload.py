@@ -0,0 +1,23 @@
+# Generated by Django 3.2.15 on 2022-08-04 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0008_alertgroup_alerts_info'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='compressed_payload',
+            field=models.BinaryField(default=None, null=True),
+        ),
+        migrations.AlterField(
+            model_name='alert',
+            name='raw_request_data',
+            field=models.JSONField(null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.15 on 2022-08-05 09:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0009_alert_compressed_payload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='alertgroup',
+            name='last_alert',
+            field=models.ForeignKey(db_constraint=False, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='alerts.alert'),
+        ),
+    ]
@@ -1,19 +1,25 @@
 import hashlib
+import json
 import logging
+import zlib
 from uuid import uuid4
 
 from django.apps import apps
 from django.conf import settings
 from django.core.validators import MinLengthValidator
-from django.db import models
-from django.db.models import JSONField
+from django.db import models, transaction
+from django.db.models import F, JSONField
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.query_utils import DeferredAttribute
 from django.db.models.signals import post_save
 
 from apps.alerts.constants import TASK_DELAY_SECONDS
 from apps.alerts.incident_appearance.templaters import TemplateLoader
 from apps.alerts.tasks import distribute_alert, send_alert_group_signal
+from common import metrics
 from common.jinja_templater import apply_jinja_template
 from common.public_primary_keys import generate_public_primary_key, increase_public_primary_key_length
+from common.utils import batch_queryset
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -33,6 +39,35 @@ def generate_public_primary_key_for_alert():
     return new_public_primary_key
 
 
+class AlertPayloadAttribute(DeferredAttribute):
+    """
+    Payload fields of compacted alerts are stored as NULL, their values are decompressed from
+    Alert.compressed_payload on first access, so templaters and serializers don't depend on the storage mode.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if value is None and not instance._payload_decompressed and instance.compressed_payload is not None:
+            instance.decompress_payload()
+            value = instance.__dict__[self.field.attname]
+        return value
+
+    def __set__(self, instance, value):
+        # a data descriptor is looked up before instance __dict__, so __get__ is called for loaded values as well
+        instance.__dict__[self.field.attname] = value
+
+
+class AlertPayloadField(JSONField):
+    descriptor_class = AlertPayloadAttribute
+
+    def deconstruct(self):
+        # the field is a plain JSONField for migrations, only instance attribute access is different
+        name, _, args, kwargs = super().deconstruct()
+        return name, "django.db.models.JSONField", args, kwargs
+
+
 class Alert(models.Model):
     public_primary_key = models.CharField(
         max_length=20,
@@ -50,8 +85,10 @@ class Alert(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     link_to_upstream_details = models.URLField(max_length=500, default=None, null=True)
-    integration_unique_data = JSONField(default=None, null=True)
-    raw_request_data = JSONField()
+    integration_unique_data = AlertPayloadField(default=None, null=True)
+    raw_request_data = AlertPayloadField(null=True)
+    # zlib compressed payload fields of compacted alerts, see Alert.compact_payloads
+    compressed_payload = models.BinaryField(null=True, default=None)
 
     # This hash is for integration-specific needs
     integration_optimization_hash = models.CharField(max_length=100, db_index=True, default=None, null=True)
@@ -60,6 +97,94 @@ class Alert(models.Model):
         "alerts.AlertGroup", on_delete=models.CASCADE, null=True, default=None, related_name="alerts"
     )
 
+    _payload_decompressed = False
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and self.group_id is not None:
+                self._update_alert_group_alerts_info()
+
+    def _update_alert_group_alerts_info(self):
+        """
+        Updates denormalized alerts info of the alert group with a single atomic UPDATE,
+        so concurrently created alerts don't overwrite each other's changes.
+        """
+        AlertGroup = apps.get_model("alerts", "AlertGroup")
+
+        non_resolve_alert = 0 if self.is_resolve_signal else 1
+        AlertGroup.all_objects.filter(pk=self.group_id).update(
+            alerts_count=F("alerts_count") + 1,
+            non_resolve_alerts_count=F("non_resolve_alerts_count") + non_resolve_alert,
+            last_alert_id=Greatest(Coalesce(F("last_alert_id"), 0), self.pk),
+            last_alert_at=Greatest(Coalesce(F("last_alert_at"), self.created_at), self.created_at),
+        )
+
+        # keep already loaded alert group up to date
+        if Alert.group.is_cached(self):
+            group = self.group
+            group.alerts_count += 1
+            group.non_resolve_alerts_count += non_resolve_alert
+            if group.last_alert_id is None or group.last_alert_id < self.pk:
+                group.last_alert = self
+                group.last_alert_at = self.created_at
+
+    @staticmethod
+    def compress_payload(raw_request_data, integration_unique_data):
+        payload = {"raw_request_data": raw_request_data, "integration_unique_data": integration_unique_data}
+        return zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+
+    def decompress_payload(self):
+        payload = json.loads(zlib.decompress(self.compressed_payload))
+        for field_name in ("raw_request_data", "integration_unique_data"):
+            # values assigned after the alert was compacted take precedence
+            if self.__dict__.get(field_name) is None:
+                self.__dict__[field_name] = payload[field_name]
+        self._payload_decompressed = True
+
+    @classmethod
+    def compact_payloads(cls, alerts_qs, batch_size=500):
+        """
+        Moves payloads of alerts to compressed_payload, except for the first and the last alerts of their groups,
+        which are rendered most often. Alerts skipped by previous calls for being the last alerts of their groups
+        are compacted with the next alerts of the groups. Returns pk of the last processed alert or None
+        if alerts_qs is empty.
+        """
+        AlertGroup = apps.get_model("alerts", "AlertGroup")
+
+        last_pk = None
+        fields = ("pk", "group_id", "raw_request_data", "integration_unique_data", "compressed_payload")
+        alerts_qs = alerts_qs.filter(compressed_payload__isnull=True, is_the_first_alert_in_group=False).only(*fields)
+        for alerts in batch_queryset(alerts_qs, batch_size):
+            alerts = list(alerts)
+            group_pks = {alert.group_id for alert in alerts}
+            last_alert_pks = set(
+                AlertGroup.all_objects.filter(pk__in=group_pks).values_list("last_alert_id", flat=True)
+            )
+            # former last alerts of the groups, which were skipped when they were processed
+            skipped_alerts = cls.objects.filter(
+                group_id__in=group_pks,
+                pk__lt=alerts[0].pk,
+                compressed_payload__isnull=True,
+                raw_request_data__isnull=False,
+                is_the_first_alert_in_group=False,
+            ).only(*fields)
+            alerts_to_compact = []
+            for alert in [*skipped_alerts, *alerts]:
+                if alert.pk in last_alert_pks or alert.raw_request_data is None:
+                    continue
+                alert.compressed_payload = cls.compress_payload(alert.raw_request_data, alert.integration_unique_data)
+                alert.raw_request_data = None
+                alert.integration_unique_data = None
+                alert._payload_decompressed = True  # keep NULLs for bulk_update
+                alerts_to_compact.append(alert)
+            cls.objects.bulk_update(
+                alerts_to_compact, ["compressed_payload", "raw_request_data", "integration_unique_data"]
+            )
+            last_pk = alerts[-1].pk
+        return last_pk
+
     def get_integration_optimization_hash(self):
         """
         Should be overloaded in child classes.
@@ -67,6 +192,7 @@ class Alert(models.Model):
         raise NotImplementedError
 
     @classmethod
+    @metrics.observe_stage("alert_create")
     def create(
         cls,
         title,
@@ -150,25 +276,19 @@ class Alert(models.Model):
 
         return alert
 
-    def wipe(self, wiped_by, wiped_at):
+    @staticmethod
+    def get_wiped_fields(wiped_by, wiped_at):
+        """Returns field values of a wiped alert, so alerts can be wiped in bulk with QuerySet.update()."""
         wiped_by_user_verbal = "by " + wiped_by.username
-
-        self.integration_unique_data = {}
-        self.raw_request_data = {}
-        self.title = f"Wiped {wiped_by_user_verbal} at {wiped_at.strftime('%Y-%m-%d')}"
-        self.message = ""
-        self.image_url = None
-        self.link_to_upstream_details = None
-        self.save(
-            update_fields=[
-                "integration_unique_data",
-                "raw_request_data",
-                "title",
-                "message",
-                "image_url",
-                "link_to_upstream_details",
-            ]
-        )
+        return {
+            "integration_unique_data": {},
+            "raw_request_data": {},
+            "compressed_payload": None,
+            "title": f"Wiped {wiped_by_user_verbal} at {wiped_at.strftime('%Y-%m-%d')}",
+            "message": "",
+            "image_url": None,
+            "link_to_upstream_details": None,
+        }
 
     @classmethod
     def render_group_data(cls, alert_receive_channel, raw_request_data, is_demo=False):
@@ -8,6 +8,7 @@ import pytz
 from celery import uuid as celery_uuid
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MinLengthValidator
 from django.db import IntegrityError, models
 from django.db.models import JSONField, Q, QuerySet
@@ -23,13 +24,24 @@ from apps.alerts.tasks import acknowledge_reminder_task, call_ack_url, send_aler
 from apps.slack.slack_formatter import SlackFormatter
 from apps.user_management.models import User
 from common.public_primary_keys import generate_public_primary_key, increase_public_primary_key_length
-from common.utils import clean_markup, str_or_backup
+from common.utils import batch_queryset, clean_markup, delete_queryset_in_batches, str_or_backup
 
-from .alert_group_counter import AlertGroupCounter
+from .alert_group_counter import AlertGroupCounter, ConcurrentUpdateError
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# (channel, channel_filter, distinction) -> pk of the alert group open for grouping
+GROUPING_CACHE_KEY_PREFIX = "alert_group_grouping"
+GROUPING_CACHE_LIFETIME = 60 * 60
+# only the worker which claimed creation of the group creates it, see get_or_create_grouping
+GROUPING_CLAIM_CACHE_KEY_PREFIX = "alert_group_grouping_claim"
+GROUPING_CLAIM_TIMEOUT = 10
+
+
+def get_grouping_cache_key(channel_id, channel_filter_id, distinction):
+    return f"{GROUPING_CACHE_KEY_PREFIX}_{channel_id}_{channel_filter_id}_{distinction}"
+
 
 def generate_public_primary_key_for_alert_group():
     prefix = "I"
@@ -64,13 +76,14 @@ class AlertGroupQuerySet(models.QuerySet):
             "channel_filter": channel_filter,
             "distinction": group_data.group_distinction,
         }
+        cache_key = get_grouping_cache_key(
+            channel.pk, channel_filter.pk if channel_filter is not None else None, group_data.group_distinction
+        )
 
         # Try to return the last open group
-        # Note that (channel, channel_filter, distinction, is_open_for_grouping) is in unique_together
-        try:
-            return self.get(**search_params, is_open_for_grouping=True), False
-        except self.model.DoesNotExist:
-            pass
+        alert_group = self._get_open_for_grouping(search_params, cache_key)
+        if alert_group is not None:
+            return alert_group, False
 
         # If it's an "OK" alert, try to return the latest resolved group
         if group_data.is_resolve_signal:
@@ -79,18 +92,112 @@ class AlertGroupQuerySet(models.QuerySet):
             except self.model.DoesNotExist:
                 pass
 
-        # Create a new group if we couldn't group it to any existing ones
+        # Create a new group if we couldn't group it to any existing ones.
+        # Only one worker gets to create the group. The others don't wait for it to be created, they get the group
+        # if it's already there or retry later, the same way as on concurrent updates of AlertGroupCounter.
+        claim_cache_key = f"{GROUPING_CLAIM_CACHE_KEY_PREFIX}_{cache_key}"
+        if not cache.add(claim_cache_key, True, timeout=GROUPING_CLAIM_TIMEOUT):
+            alert_group = self._get_cached_open_for_grouping(cache_key)
+            if alert_group is not None:
+                return alert_group, False
+            raise ConcurrentUpdateError()
+
         try:
-            return (
-                self.create(**search_params, is_open_for_grouping=True, verbose_name=group_data.group_verbose_name),
-                True,
-            )
-        except IntegrityError:
             try:
-                return self.get(**search_params, is_open_for_grouping=True), False
-            except self.model.DoesNotExist:
-                pass
-            raise
+                alert_group = self.create(
+                    **search_params, is_open_for_grouping=True, verbose_name=group_data.group_verbose_name
+                )
+            except IntegrityError:
+                alert_group = self._get_open_for_grouping(search_params, cache_key)
+                if alert_group is not None:
+                    return alert_group, False
+                raise
+            cache.set(cache_key, alert_group.pk, timeout=GROUPING_CACHE_LIFETIME)
+            return alert_group, True
+        finally:
+            cache.delete(claim_cache_key)
+
+    def _get_open_for_grouping(self, search_params, cache_key):
+        """
+        Returns the group open for grouping, the cached one if the cache entry is still valid.
+        Note that (channel, channel_filter, distinction, is_open_for_grouping) is in unique_together.
+        """
+        alert_group = self._get_cached_open_for_grouping(cache_key)
+        if alert_group is not None:
+            return alert_group
+
+        try:
+            alert_group = self.get(**search_params, is_open_for_grouping=True)
+        except self.model.DoesNotExist:
+            return None
+        cache.set(cache_key, alert_group.pk, timeout=GROUPING_CACHE_LIFETIME)
+        return alert_group
+
+    def _get_cached_open_for_grouping(self, cache_key):
+        """
+        Cached group is fetched by primary key without the grouping query, the group is needed to attach the alert
+        anyway. Entries are invalidated when groups are closed for grouping, so the fetched group is only checked
+        in Python, and a stale entry is dropped to fall back to the grouping query.
+        """
+        alert_group_pk = cache.get(cache_key)
+        if alert_group_pk is None:
+            return None
+
+        # cache entries are only set for groups matching the key, so the group is not filtered by search_params
+        try:
+            alert_group = self.get(pk=alert_group_pk)
+        except self.model.DoesNotExist:
+            alert_group = None
+        if alert_group is not None and alert_group.is_open_for_grouping:
+            return alert_group
+
+        cache.delete(cache_key)
+        return None
+
+    def hard_delete(self, batch_size=100):
+        """
+        Deletes alert groups with all their related objects in batches of alert groups.
+        Related objects are deleted with delete_queryset_in_batches instead of cascades of the Django collector,
+        so deleting groups with hundreds of thousands of alerts doesn't load them into memory or lock tables for minutes.
+        """
+        Alert = apps.get_model("alerts", "Alert")
+        AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
+        Invitation = apps.get_model("alerts", "Invitation")
+        ResolutionNote = apps.get_model("alerts", "ResolutionNote")
+        ResolutionNoteSlackMessage = apps.get_model("alerts", "ResolutionNoteSlackMessage")
+        SlackMessage = apps.get_model("slack", "SlackMessage")
+        UserNotificationPolicyLogRecord = apps.get_model("base", "UserNotificationPolicyLogRecord")
+
+        # models referring to other related models go first, so their references are not set to null before deletion
+        related_models = (
+            (AlertGroupLogRecord, "alert_group_id"),
+            (UserNotificationPolicyLogRecord, "alert_group_id"),
+            (Invitation, "alert_group_id"),
+            (ResolutionNote, "alert_group_id"),
+            (ResolutionNoteSlackMessage, "alert_group_id"),
+            (SlackMessage, "alert_group_id"),
+            (Alert, "group_id"),
+        )
+
+        deleted_count = 0
+        for alert_groups in batch_queryset(self.values_list("pk", flat=True), batch_size):
+            alert_group_pks = list(alert_groups)
+            cache.delete_many(
+                [
+                    get_grouping_cache_key(*grouping_key)
+                    for grouping_key in AlertGroup._base_manager.filter(
+                        pk__in=alert_group_pks, is_open_for_grouping=True
+                    ).values_list("channel_id", "channel_filter_id", "distinction")
+                ]
+            )
+            for model, field_name in related_models:
+                # base manager includes soft deleted objects (e.g. resolution notes)
+                delete_queryset_in_batches(model._base_manager.filter(**{f"{field_name}__in": alert_group_pks}))
+            delete_queryset_in_batches(AlertGroup._base_manager.filter(pk__in=alert_group_pks))
+
+            deleted_count += len(alert_group_pks)
+            logger.info(f"Hard deleted {deleted_count} alert groups, last pk {alert_group_pks[-1]}")
+        return deleted_count
 
 
 class UnarchivedAlertGroupQuerySet(models.QuerySet):
@@ -173,6 +280,15 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
         related_name="alert_groups",
     )
 
+    # Denormalized channel.organization to avoid joining alert receive channels when listing alert groups
+    organization = models.ForeignKey(
+        "user_management.Organization",
+        on_delete=models.CASCADE,
+        related_name="alert_groups",
+        null=True,
+        default=None,
+    )
+
     # Distinction is a difference between groups inside the same channel.
     # For example different types of alerts from the same channel should go to different groups.
     # Distinction is what describes their difference.
@@ -259,8 +375,11 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
     def is_silenced_for_period(self):
         return self.silenced and self.silenced_until is not None
 
-    @property
-    def status(self):
+    # status is denormalized from resolved, acknowledged and silenced fields so list views can filter by it using
+    # a single indexed column. It's kept in sync by AlertGroup.save() and by bulk actions that use QuerySet.update().
+    status = models.IntegerField(choices=STATUS_CHOICES, default=NEW)
+
+    def get_status_from_flags(self):
         if self.resolved:
             return AlertGroup.RESOLVED
         elif self.acknowledged:
@@ -332,6 +451,21 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
     raw_escalation_snapshot = JSONField(null=True, default=None)
     estimate_escalation_finish_time = models.DateTimeField(null=True, default=None)
 
+    # Denormalized alerts info, updated atomically on every alert insert (see Alert.save).
+    # These fields are not updated by AlertGroup.save (see _do_update) to not overwrite them with stale values.
+    alerts_count = models.PositiveIntegerField(default=0)
+    non_resolve_alerts_count = models.PositiveIntegerField(default=0)
+    last_alert = models.ForeignKey(
+        "alerts.Alert",
+        on_delete=models.SET_NULL,
+        db_constraint=False,
+        related_name="+",
+        null=True,
+        default=None,
+    )
+    last_alert_at = models.DateTimeField(null=True, default=None)
+    ALERTS_INFO_FIELDS = ("alerts_count", "non_resolve_alerts_count", "last_alert", "last_alert_at")
+
     # This field is used for constraints so we can use get_or_create() in concurrent calls
     # https://docs.djangoproject.com/en/3.2/ref/models/querysets/#get-or-create
     # Combined with unique_together below, it allows only one alert group with
@@ -354,11 +488,42 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             models.Index(
                 fields=["channel_id", "resolved", "acknowledged", "silenced", "root_alert_group_id", "is_archived"]
             ),
+            models.Index(fields=["organization", "status", "is_archived", "started_at"]),
+            # Partial indexes for the hot "firing" (status=NEW) and "acknowledged" (status=ACKNOWLEDGED) views of the
+            # alert group list. They are ignored on MySQL which doesn't support indexes with conditions.
+            models.Index(
+                fields=["organization", "-id"],
+                condition=Q(status=0, is_archived=False, root_alert_group__isnull=True),
+                name="alert_group_firing_idx",
+            ),
+            models.Index(
+                fields=["organization", "-id"],
+                condition=Q(status=1, is_archived=False, root_alert_group__isnull=True),
+                name="alert_group_acknowledged_idx",
+            ),
         ]
 
     def __str__(self):
         return f"{self.pk}: {self.verbose_name}"
 
+    def save(self, *args, **kwargs):
+        self.status = self.get_status_from_flags()
+        if self.organization_id is None:
+            self.organization_id = self.channel.organization_id
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"resolved", "acknowledged", "silenced"}.intersection(update_fields):
+            kwargs["update_fields"] = {*update_fields, "status"}
+
+        super().save(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # Alerts info is left out of UPDATEs of regular saves, so stale instances don't overwrite it.
+        # A save of an instance whose row is missing still inserts all fields.
+        if update_fields is None:
+            values = [value for value in values if value[0].name not in self.ALERTS_INFO_FIELDS]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
     @property
     def is_maintenance_incident(self):
         return self.maintenance_uuid is not None
@@ -668,6 +833,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
         if root_alert_group.root_alert_group is None and not root_alert_group.resolved:
             self.root_alert_group = root_alert_group
             self.save(update_fields=["root_alert_group"])
+            cache.delete(self.grouping_cache_key)
             self.stop_escalation()
             if root_alert_group.acknowledged and not self.acknowledged:
                 self.acknowledge_by_user(user, action_source=action_source)
@@ -744,6 +910,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
         root_alert_group = self.root_alert_group
         self.root_alert_group = None
         self.save(update_fields=["root_alert_group"])
+        cache.delete(self.grouping_cache_key)
 
         self.start_escalation_if_needed()
 
@@ -790,6 +957,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
 
         self.root_alert_group = None
         self.save(update_fields=["root_alert_group"])
+        cache.delete(self.grouping_cache_key)
 
         self.start_escalation_if_needed()
 
@@ -893,6 +1061,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             dependent_alert_group.un_silence_by_user(user, action_source=action_source)
 
     def wipe_by_user(self, user: User) -> None:
+        Alert = apps.get_model("alerts", "Alert")
         AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
 
         if not self.wiped_at:
@@ -902,8 +1071,9 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             self.verbose_name = "Wiped incident"
             self.wiped_at = timezone.now()
             self.wiped_by = user
-            for alert in self.alerts.all():
-                alert.wipe(wiped_by=self.wiped_by, wiped_at=self.wiped_at)
+            wiped_fields = Alert.get_wiped_fields(wiped_by=self.wiped_by, wiped_at=self.wiped_at)
+            for alerts in batch_queryset(self.alerts.all()):
+                alerts.update(**wiped_fields)
 
             self.save(update_fields=["distinction", "verbose_name", "wiped_at", "wiped_by"])
 
@@ -963,19 +1133,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             dependent_alert_group.un_attach_by_delete()
 
     def hard_delete(self):
-        ResolutionNote = apps.get_model("alerts", "ResolutionNote")
-
-        alerts = self.alerts.all()
-        alerts.delete()
-
-        self.slack_messages.all().delete()
-        self.personal_log_records.all().delete()
-        self.log_records.all().delete()
-        self.invitations.all().delete()
-        resolution_notes = ResolutionNote.objects_with_deleted.filter(alert_group=self)
-        resolution_notes.delete()
-        self.resolution_note_slack_messages.all().delete()
-        self.delete()
+        AlertGroup.all_objects.filter(pk=self.pk).hard_delete()
 
     @staticmethod
     def bulk_acknowledge(user: User, alert_groups: "QuerySet[AlertGroup]") -> None:
@@ -1016,6 +1174,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             acknowledged_by_user=user,
             acknowledged_by=AlertGroup.USER,
             is_escalation_finished=True,
+            status=AlertGroup.ACKNOWLEDGED,
         )
 
         for alert_group in alert_groups_to_unresolve_before_acknowledge_list:
@@ -1086,8 +1245,11 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             silenced_by_user=None,
             silenced_at=None,
             silenced=False,
+            status=AlertGroup.RESOLVED,
         )
 
+        cache.delete_many([alert_group.grouping_cache_key for alert_group in alert_groups_to_resolve_list])
+
         for alert_group in alert_groups_to_unsilence_before_resolve_list:
             alert_group.log_records.create(
                 type=AlertGroupLogRecord.TYPE_UN_SILENCE, author=user, reason="Bulk action resolve"
@@ -1146,6 +1308,15 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             silenced_by_user=None,
             silenced_at=None,
             silenced=False,
+            status=AlertGroup.NEW,
+        )
+        cache.delete_many(
+            [
+                alert_group.grouping_cache_key
+                for alert_group in alert_groups_to_restart_unack_list
+                + alert_groups_to_restart_unresolve_list
+                + alert_groups_to_restart_unsilence_list
+            ]
         )
 
         # unresolve alert groups
@@ -1229,6 +1400,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
                 silenced_at=now,
                 silenced_until=silenced_until,
                 silenced_by_user=user,
+                status=AlertGroup.SILENCED,
             )
         else:
             alert_groups_to_silence.update(
@@ -1245,6 +1417,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
                 silenced_until=silenced_until,
                 silenced_by_user=user,
                 is_escalation_finished=True,
+                status=AlertGroup.SILENCED,
             )
 
         for alert_group in alert_groups_to_unresolve_before_silence_list:
@@ -1282,6 +1455,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
 
     def start_ack_reminder(self, user: User):
         Organization = apps.get_model("user_management", "Organization")
+        ScheduledTask = apps.get_model("base", "ScheduledTask")
         unique_unacknowledge_process_id = uuid1()
         logger.info(
             f"AlertGroup acknowledged by user with pk "
@@ -1292,7 +1466,8 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
         seconds = Organization.ACKNOWLEDGE_REMIND_DELAY[self.channel.organization.acknowledge_remind_timeout]
         if seconds > 0:
             delay = timezone.timedelta(seconds=seconds).total_seconds()
-            acknowledge_reminder_task.apply_async(
+            ScheduledTask.schedule(
+                acknowledge_reminder_task,
                 (
                     self.pk,
                     unique_unacknowledge_process_id,
@@ -1316,6 +1491,9 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             )
 
     def start_unsilence_task(self, countdown):
+        ScheduledTask = apps.get_model("base", "ScheduledTask")
+
+        ScheduledTask.cancel(self.unsilence_task_uuid)
         task_id = celery_uuid()
         self.unsilence_task_uuid = task_id
 
@@ -1326,12 +1504,16 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
         )
 
         self.save(update_fields=["unsilence_task_uuid", "estimate_escalation_finish_time"])
-        unsilence_task.apply_async((self.pk,), task_id=task_id, countdown=countdown)
+        ScheduledTask.schedule(unsilence_task, (self.pk,), countdown=countdown, task_id=task_id)
 
     @property
     def can_call_ack_url(self):
         return type(self.alerts.first().integration_unique_data) is dict
 
+    @property
+    def grouping_cache_key(self):
+        return get_grouping_cache_key(self.channel_id, self.channel_filter_id, self.distinction)
+
     @property
     def is_root_alert_group(self):
         return self.root_alert_group is None
@@ -1365,6 +1547,7 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
                 setattr(self, k, v)
 
             self.save(update_fields=["resolved", "resolved_at", "is_open_for_grouping", *kwargs.keys()])
+            cache.delete(self.grouping_cache_key)
 
     def unresolve(self):
         self.unacknowledge()
@@ -1387,6 +1570,9 @@ class AlertGroup(AlertGroupSlackRenderingMixin, EscalationSnapshotMixin, models.
             self.save(update_fields=["silenced", *kwargs.keys()])
 
     def un_silence(self):
+        ScheduledTask = apps.get_model("base", "ScheduledTask")
+
+        ScheduledTask.cancel(self.unsilence_task_uuid)
         self.silenced_until = None
         self.silenced_by_user = None
         self.silenced_at = None
@@ -9,6 +9,7 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from rest_framework.fields import DateTimeField
 
+from apps.alerts.incident_log_builder import IncidentLogBuilder
 from apps.alerts.tasks import send_update_log_report_signal
 from apps.alerts.utils import render_relative_timeline
 from apps.slack.slack_formatter import SlackFormatter
@@ -546,6 +547,7 @@ class AlertGroupLogRecord(models.Model):
 
 @receiver(post_save, sender=AlertGroupLogRecord)
 def listen_for_alertgrouplogrecord(sender, instance, created, *args, **kwargs):
+    IncidentLogBuilder.invalidate_escalation_plan_cache(instance.alert_group_id)
     if instance.type != AlertGroupLogRecord.TYPE_DELETED:
         if not instance.alert_group.is_maintenance_incident:
             alert_group_pk = instance.alert_group.pk
@@ -79,6 +79,10 @@ class AlertReceiveChannelQueryset(models.QuerySet):
     def delete(self):
         self.update(deleted_at=timezone.now())
 
+    def hard_delete(self):
+        for alert_receive_channel in self:
+            alert_receive_channel.hard_delete()
+
 
 class AlertReceiveChannelManager(models.Manager):
     def get_queryset(self):
@@ -259,6 +263,9 @@ class AlertReceiveChannel(IntegrationOptionsMixin, MaintainableObject):
         self.save()
 
     def hard_delete(self):
+        AlertGroup = apps.get_model("alerts", "AlertGroup")
+        # alert groups are deleted in batches before cascades of the integration itself
+        AlertGroup.all_objects.filter(channel=self).hard_delete()
         super(AlertReceiveChannel, self).delete()
 
     def change_team(self, team_id, user):
@@ -484,8 +491,10 @@ class AlertReceiveChannel(IntegrationOptionsMixin, MaintainableObject):
 
     # Maintenance
     def start_disable_maintenance_task(self, countdown):
-        maintenance_uuid = disable_maintenance.apply_async(
-            args=(),
+        ScheduledTask = apps.get_model("base", "ScheduledTask")
+
+        maintenance_uuid = ScheduledTask.schedule(
+            disable_maintenance,
             kwargs={
                 "alert_receive_channel_id": self.pk,
             },
@@ -2,8 +2,11 @@ import logging
 
 from django.apps import apps
 from django.db import models, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
+from apps.alerts.incident_log_builder import IncidentLogBuilder
 from apps.alerts.tasks import invite_user_to_join_incident, send_alert_group_signal
 
 logger = logging.getLogger(__name__)
@@ -121,3 +124,8 @@ class Invitation(models.Model):
             f"log record {log_record.pk} with type '{log_record.get_type_display()}'"
         )
         send_alert_group_signal.apply_async((log_record.pk,))
+
+
+@receiver(post_save, sender=Invitation)
+def listen_for_invitation_model_save(sender, instance, created, *args, **kwargs):
+    IncidentLogBuilder.invalidate_escalation_plan_cache(instance.alert_group_id)
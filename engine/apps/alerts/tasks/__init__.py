@@ -3,6 +3,7 @@ from .cache_alert_group_for_web import cache_alert_group_for_web, schedule_cache
 from .calculcate_escalation_finish_time import calculate_escalation_finish_time  # noqa
 from .call_ack_url import call_ack_url  # noqa: F401
 from .check_escalation_finished import check_escalation_finished_task  # noqa: F401
+from .compact_alert_payloads import compact_alert_payloads  # noqa: F401
 from .create_contact_points_for_datasource import create_contact_points_for_datasource  # noqa: F401
 from .create_contact_points_for_datasource import schedule_create_contact_points_for_datasource  # noqa: F401
 from .custom_button_result import custom_button_result  # noqa: F401
@@ -16,6 +17,7 @@ from .notify_all import notify_all_task  # noqa: F401
 from .notify_group import notify_group_task  # noqa: F401
 from .notify_ical_schedule_shift import notify_ical_schedule_shift  # noqa: F401
 from .notify_user import notify_user_task  # noqa: F401
+from .purge_alert_groups import purge_resolved_alert_groups, start_purge_resolved_alert_groups  # noqa: F401
 from .resolve_alert_group_by_source_if_needed import resolve_alert_group_by_source_if_needed  # noqa: F401
 from .resolve_alert_group_if_needed import resolve_alert_group_if_needed  # noqa: F401
 from .resolve_by_last_step import resolve_by_last_step_task  # noqa: F401
@@ -15,6 +15,7 @@ def acknowledge_reminder_task(alert_group_pk, unacknowledge_process_id):
     Organization = apps.get_model("user_management", "Organization")
     AlertGroup = apps.get_model("alerts", "AlertGroup")
     AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
+    ScheduledTask = apps.get_model("base", "ScheduledTask")
 
     log_record = None
 
@@ -44,7 +45,8 @@ def acknowledge_reminder_task(alert_group_pk, unacknowledge_process_id):
                         alert_group.channel.organization.unacknowledge_timeout
                         != Organization.UNACKNOWLEDGE_TIMEOUT_NEVER
                     ):
-                        unacknowledge_timeout_task.apply_async(
+                        ScheduledTask.schedule(
+                            unacknowledge_timeout_task,
                             (alert_group.pk, unacknowledge_process_id),
                             countdown=seconds_unack,
                         )
@@ -56,7 +58,8 @@ def acknowledge_reminder_task(alert_group_pk, unacknowledge_process_id):
                             seconds_remind = Organization.ACKNOWLEDGE_REMIND_DELAY[
                                 alert_group.channel.organization.acknowledge_remind_timeout
                             ]
-                            acknowledge_reminder_task.apply_async(
+                            ScheduledTask.schedule(
+                                acknowledge_reminder_task,
                                 (
                                     alert_group.pk,
                                     unacknowledge_process_id,
@@ -81,6 +84,7 @@ def unacknowledge_timeout_task(alert_group_pk, unacknowledge_process_id):
     Organization = apps.get_model("user_management", "Organization")
     AlertGroup = apps.get_model("alerts", "AlertGroup")
     AlertGroupLogRecord = apps.get_model("alerts", "AlertGroupLogRecord")
+    ScheduledTask = apps.get_model("base", "ScheduledTask")
 
     log_record = None
 
@@ -116,7 +120,8 @@ def unacknowledge_timeout_task(alert_group_pk, unacknowledge_process_id):
                         alert_group.channel.organization.unacknowledge_timeout
                     ]
                     seconds = seconds_remind - seconds_unack
-                    acknowledge_reminder_task.apply_async(
+                    ScheduledTask.schedule(
+                        acknowledge_reminder_task,
                         (
                             alert_group_pk,
                             unacknowledge_process_id,
@@ -0,0 +1,35 @@
+from celery.utils.log import get_task_logger
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from common.custom_celery_tasks import shared_dedicated_queue_retry_task
+
+logger = get_task_logger(__name__)
+
+# pk of the last processed alert, so every run continues from where the previous one stopped
+COMPACT_ALERT_PAYLOADS_CHECKPOINT_CACHE_KEY = "compact_alert_payloads_last_pk"
+
+
+@shared_dedicated_queue_retry_task()
+def compact_alert_payloads():
+    """
+    Compresses payloads of alerts older than ALERT_PAYLOAD_COMPACTION_DAYS, see Alert.compact_payloads.
+    """
+    Alert = apps.get_model("alerts", "Alert")
+
+    if not settings.ALERT_PAYLOAD_COMPACTION_DAYS:
+        logger.debug("Alert payload compaction is not configured, skipping compact_alert_payloads")
+        return
+
+    created_before = timezone.now() - timezone.timedelta(days=settings.ALERT_PAYLOAD_COMPACTION_DAYS)
+    alerts = Alert.objects.filter(created_at__lt=created_before)
+    last_pk = cache.get(COMPACT_ALERT_PAYLOADS_CHECKPOINT_CACHE_KEY)
+    if last_pk is not None:
+        alerts = alerts.filter(pk__gt=last_pk)
+
+    last_pk = Alert.compact_payloads(alerts)
+    if last_pk is not None:
+        cache.set(COMPACT_ALERT_PAYLOADS_CHECKPOINT_CACHE_KEY, last_pk, timeout=None)
+    logger.info(f"Compacted alert payloads up to alert {last_pk}")
@@ -17,6 +17,7 @@ def escalate_alert_group(alert_group_pk):
     This task is on duty to send escalated alerts and schedule further escalation.
     """
     AlertGroup = apps.get_model("alerts", "AlertGroup")
+    ScheduledTask = apps.get_model("base", "ScheduledTask")
 
     task_logger.debug(f"Start escalate_alert_group for alert_group {alert_group_pk}")
 
@@ -92,7 +93,7 @@ def escalate_alert_group(alert_group_pk):
             task_id = celery_uuid()
             alert_group.active_escalation_id = task_id
             transaction.on_commit(
-                lambda: escalate_alert_group.apply_async((alert_group.pk,), immutable=True, eta=eta, task_id=task_id)
+                lambda: ScheduledTask.schedule(escalate_alert_group, (alert_group.pk,), eta=eta, task_id=task_id)
             )
             alert_group.save(update_fields=["active_escalation_id", "raw_escalation_snapshot"])
             log_message += "Next escalation poked, id: {} ".format(task_id)
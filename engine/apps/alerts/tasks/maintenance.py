@@ -17,6 +17,7 @@ def disable_maintenance(*args, **kwargs):
     AlertGroup = apps.get_model("alerts", "AlertGroup")
     User = apps.get_model("user_management", "User")
     Organization = apps.get_model("user_management", "Organization")
+    ScheduledTask = apps.get_model("base", "ScheduledTask")
     user = None
     object_under_maintenance = None
     user_id = kwargs.get("user_id")
@@ -69,6 +70,8 @@ def disable_maintenance(*args, **kwargs):
                     )
                 )
 
+            # maintenance can be disabled before its scheduled end
+            ScheduledTask.cancel(object_under_maintenance.maintenance_uuid)
             object_under_maintenance.maintenance_uuid = None
             object_under_maintenance.maintenance_duration = None
             object_under_maintenance.maintenance_mode = None
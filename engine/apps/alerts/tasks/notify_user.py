@@ -12,6 +12,7 @@ from apps.alerts.incident_appearance.renderers.web_renderer import AlertGroupWeb
 from apps.alerts.signals import user_notification_action_triggered_signal
 from apps.base.messaging import get_messaging_backend_from_id
 from apps.base.utils import live_settings
+from apps.twilioapp.twilio_client import twilio_client
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
 
 from .task_logger import task_logger
@@ -73,17 +74,14 @@ def notify_user_task(
         user_has_notification = UserHasNotification.objects.filter(pk=user_has_notification.pk).select_for_update()[0]
 
         if previous_notification_policy_pk is None:
-            notification_policy = UserNotificationPolicy.objects.get_or_create_for_user(
-                user=user, important=important
-            ).first()
+            notification_policies = UserNotificationPolicy.objects.get_cached_for_user(user=user, important=important)
+            notification_policy = notification_policies[0] if notification_policies else None
             # Here we collect a brief overview of notification steps configured for user to send it to thread.
             collected_steps_ids = []
-            next_notification_policy = notification_policy.next()
-            while next_notification_policy is not None:
+            for next_notification_policy in notification_policies[1:]:
                 if next_notification_policy.step == UserNotificationPolicy.Step.NOTIFY:
                     if next_notification_policy.notify_by not in collected_steps_ids:
                         collected_steps_ids.append(next_notification_policy.notify_by)
-                next_notification_policy = next_notification_policy.next()
             collected_steps = ", ".join(
                 UserNotificationPolicy.NotificationChannel(step_id).label for step_id in collected_steps_ids
             )
@@ -98,18 +96,36 @@ def notify_user_task(
                 )
                 return
 
-            try:
-                notification_policy = UserNotificationPolicy.objects.get(pk=previous_notification_policy_pk)
-                if notification_policy.user.organization != organization:
-                    notification_policy = UserNotificationPolicy.objects.get(
-                        order=notification_policy.order, user=user, important=important
-                    )
-                notification_policy = notification_policy.next()
-            except UserNotificationPolicy.DoesNotExist:
-                task_logger.info(
-                    f"notify_user_taskLNotification policy {previous_notification_policy_pk} has been deleted"
+            notification_policies = UserNotificationPolicy.objects.get_cached_for_user(user=user, important=important)
+            previous_notification_policy_index = next(
+                (
+                    index
+                    for index, notification_policy in enumerate(notification_policies)
+                    if notification_policy.pk == previous_notification_policy_pk
+                ),
+                None,
+            )
+            if previous_notification_policy_index is not None:
+                next_notification_policy_index = previous_notification_policy_index + 1
+                notification_policy = (
+                    notification_policies[next_notification_policy_index]
+                    if next_notification_policy_index < len(notification_policies)
+                    else None
                 )
-                return
+            else:
+                # previous notification policy is not in user's chain (e.g. it's deleted or belongs to another user)
+                try:
+                    notification_policy = UserNotificationPolicy.objects.get(pk=previous_notification_policy_pk)
+                    if notification_policy.user.organization != organization:
+                        notification_policy = UserNotificationPolicy.objects.get(
+                            order=notification_policy.order, user=user, important=important
+                        )
+                    notification_policy = notification_policy.next()
+                except UserNotificationPolicy.DoesNotExist:
+                    task_logger.info(
+                        f"notify_user_taskLNotification policy {previous_notification_policy_pk} has been deleted"
+                    )
+                    return
             reason = None
         if notification_policy is None:
             stop_escalation = True
@@ -208,6 +224,7 @@ def notify_user_task(
                         "notify_even_acknowledged": notify_even_acknowledged,
                         "notify_anyway": notify_anyway,
                         "prevent_posting_to_thread": prevent_posting_to_thread,
+                        "important": important,
                     },
                     countdown=delay,
                     task_id=task_id,
@@ -222,7 +239,7 @@ def notify_user_task(
 @shared_dedicated_queue_retry_task(
     autoretry_for=(Exception,), retry_backoff=True, max_retries=1 if settings.DEBUG else None
 )
-def perform_notification(log_record_pk):
+def perform_notification(log_record_pk, sending_slot_reserved=False):
     SMSMessage = apps.get_model("twilioapp", "SMSMessage")
     PhoneCall = apps.get_model("twilioapp", "PhoneCall")
     # EmailMessage = apps.get_model("sendgridapp", "EmailMessage")  TODO: restore email notifications
@@ -258,6 +275,27 @@ def perform_notification(log_record_pk):
         ).save()
         return
 
+    if (
+        notification_channel
+        in [UserNotificationPolicy.NotificationChannel.SMS, UserNotificationPolicy.NotificationChannel.PHONE_CALL]
+        and not live_settings.GRAFANA_CLOUD_NOTIFICATIONS_ENABLED
+        and not sending_slot_reserved
+    ):
+        # pace notifications sent from Twilio number, delay the notification until the reserved slot
+        if notification_channel == UserNotificationPolicy.NotificationChannel.SMS:
+            sending_slot_delay = twilio_client.reserve_sms_sending_slot()
+        else:
+            sending_slot_delay = twilio_client.reserve_call_sending_slot()
+        if sending_slot_delay > 0:
+            task_logger.debug(
+                f"perform_notification for log record {log_record_pk} is delayed for {sending_slot_delay} seconds "
+                f"because of Twilio sending rate"
+            )
+            perform_notification.apply_async(
+                (log_record_pk,), kwargs={"sending_slot_reserved": True}, countdown=sending_slot_delay
+            )
+            return
+
     if notification_channel == UserNotificationPolicy.NotificationChannel.SMS:
         SMSMessage.send_sms(
             user,
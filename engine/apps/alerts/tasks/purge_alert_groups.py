@@ -0,0 +1,44 @@
+from celery.utils.log import get_task_logger
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+
+from common.custom_celery_tasks import shared_dedicated_queue_retry_task
+from common.utils import iterate_queryset
+
+logger = get_task_logger(__name__)
+
+
+@shared_dedicated_queue_retry_task()
+def start_purge_resolved_alert_groups():
+    Organization = apps.get_model("user_management", "Organization")
+
+    if not settings.ALERT_GROUP_RETENTION_DAYS:
+        logger.debug("Alert group retention is not configured, skipping start_purge_resolved_alert_groups")
+        return
+
+    organization_pks = Organization.objects.values_list("pk", flat=True)
+    for organization_pk in iterate_queryset(organization_pks):
+        purge_resolved_alert_groups.apply_async((organization_pk,))
+
+
+@shared_dedicated_queue_retry_task(
+    autoretry_for=(Exception,), retry_backoff=True, max_retries=1 if settings.DEBUG else None
+)
+def purge_resolved_alert_groups(organization_pk):
+    """
+    Hard deletes alert groups of the organization resolved more than ALERT_GROUP_RETENTION_DAYS days ago.
+    Deleted batches are committed one by one, so a retry continues from where the previous run stopped.
+    """
+    AlertGroup = apps.get_model("alerts", "AlertGroup")
+
+    resolved_before = timezone.now() - timezone.timedelta(days=settings.ALERT_GROUP_RETENTION_DAYS)
+    alert_groups = AlertGroup.all_objects.filter(
+        organization_id=organization_pk,
+        status=AlertGroup.RESOLVED,
+        resolved_at__lt=resolved_before,
+    )
+    deleted_count = alert_groups.hard_delete()
+    logger.info(
+        f"Purged {deleted_count} alert groups resolved before {resolved_before} for organization {organization_pk}"
+    )
@@ -1,10 +1,16 @@
+import hashlib
+
 from django.apps import apps
-from django.db.models import OuterRef, Subquery
+from django.core.cache import cache
+from django.db.models import Prefetch
 from django.utils.text import slugify
 
 from apps.alerts.models import EscalationPolicy
 from apps.schedules.models import OnCallScheduleCalendar, OnCallScheduleICal
 
+INTEGRATION_BLOCK_CACHE_KEY_PREFIX = "terraform_integration_block"
+INTEGRATION_BLOCK_CACHE_LIFETIME = 60 * 60 * 24
+
 
 class TerraformFileRenderer:
 
@@ -219,45 +225,88 @@ class TerraformFileRenderer:
         self.organization = organization
         self.data = {}
         self.used_names = {}
+        # filled in by prefetch_related_objects
+        self.escalation_chains = []
+        self.integrations = []
+        self.schedules = []
+        self.on_call_shifts = []
+        self.slack_channel_names = {}
+        self.rolling_users_by_pk = {}
 
     def render_terraform_file(self):
-        result = self.render_resource_text()
-        data_result = self.render_data_text()
-        result = data_result + result
-        if len(result) == 0:
-            result += "There is nothing here yet. Check Settings to add integration and come back!"
-        return result
-
-    def render_resource_text(self):
-        result = ""
-
-        result += self.render_escalation_chains_related_resources_text()
-
-        integrations_related_resources_text = self.render_integrations_related_resources_text()
-        result += integrations_related_resources_text
-
-        shifts_related_resources_text = self.render_on_call_shift_resource_text()
-        result += shifts_related_resources_text
-
-        schedules_related_resources_text = self.render_schedules_related_resources_text()
-        result += schedules_related_resources_text
-
-        return result
-
-    def render_escalation_chains_related_resources_text(self):
-        result = ""
-        escalation_chains = self.organization.escalation_chains.all()
+        """
+        Renders the file from blocks of prefetched objects.
+        Data sources go first in the file, but they are collected while resources are rendered.
+        """
+        self.prefetch_related_objects()
+        resource_blocks = [block for block in self.iter_resource_blocks() if block]
+        data_blocks = list(self.iter_data_blocks())
+        if not resource_blocks and not data_blocks:
+            return "There is nothing here yet. Check Settings to add integration and come back!"
+        return "".join(data_blocks + resource_blocks)
+
+    def prefetch_related_objects(self):
+        """
+        Fetches rendered objects with everything they reference using a fixed number of queries,
+        instead of querying users, teams, routes and slack channels for every rendered object.
+        """
+        ChannelFilter = apps.get_model("alerts", "ChannelFilter")
+        SlackChannel = apps.get_model("slack", "SlackChannel")
+        User = apps.get_model("user_management", "User")
+
+        escalation_policies = EscalationPolicy.objects.select_related(
+            "notify_schedule", "notify_to_group"
+        ).prefetch_related("notify_to_users_queue")
+        self.escalation_chains = list(
+            self.organization.escalation_chains.select_related("team").prefetch_related(
+                Prefetch("escalation_policies", queryset=escalation_policies)
+            )
+        )
+        routes = ChannelFilter.objects.select_related("escalation_chain")
+        self.integrations = list(
+            self.organization.alert_receive_channels.select_related("team")
+            .prefetch_related(Prefetch("channel_filters", queryset=routes))
+            .order_by("created_at")
+        )
+        self.schedules = list(self.organization.oncall_schedules.select_related("team").order_by("pk"))
+        self.on_call_shifts = list(
+            self.organization.custom_on_call_shifts.select_related("team").prefetch_related("users").order_by("pk")
+        )
 
-        for escalation_chain in escalation_chains:
+        slack_channel_ids = {
+            route.slack_channel_id
+            for integration in self.integrations
+            for route in integration.channel_filters.all()
+            if route.slack_channel_id is not None
+        }
+        slack_channel_ids.update(schedule.channel for schedule in self.schedules if schedule.channel is not None)
+        if slack_channel_ids:
+            slack_channels = SlackChannel.objects.filter(
+                slack_id__in=slack_channel_ids,
+                slack_team_identity=self.organization.slack_team_identity,
+            ).values_list("slack_id", "name")
+            self.slack_channel_names = dict(slack_channels)
+
+        rolling_users_pks = {
+            pk for shift in self.on_call_shifts for users_dict in shift.rolling_users or [] for pk in users_dict.keys()
+        }
+        if rolling_users_pks:
+            users = User.objects.filter(pk__in=rolling_users_pks)
+            self.rolling_users_by_pk = {str(user.pk): user for user in users}
+
+    def iter_resource_blocks(self):
+        yield from self.iter_escalation_chains_related_resources_blocks()
+        yield from self.iter_integrations_related_resources_blocks()
+        yield from self.iter_on_call_shift_resource_blocks()
+        yield from self.iter_schedules_related_resources_blocks()
+
+    def iter_escalation_chains_related_resources_blocks(self):
+        for escalation_chain in self.escalation_chains:
             resource_name = self.escape_string_for_terraform(escalation_chain.name)
             team_name = self.render_team_name(escalation_chain.team)
             team_name_text = f"data.amixr_team.{team_name}.id" if team_name else "null"
-            result += self.ESCALATION_CHAIN_RESOURCE_TEMPLATE.format(
-                resource_name, escalation_chain.name, team_name_text
-            )
-            result += self.render_escalation_policy_resource_text(escalation_chain, resource_name)
-
-        return result
+            yield self.ESCALATION_CHAIN_RESOURCE_TEMPLATE.format(resource_name, escalation_chain.name, team_name_text)
+            yield self.render_escalation_policy_resource_text(escalation_chain, resource_name)
 
     def render_escalation_policy_resource_text(self, escalation_chain, escalation_chain_resource_name):
         result = ""
@@ -391,51 +440,67 @@ class TerraformFileRenderer:
                 )
         return result
 
-    def render_integrations_related_resources_text(self):
+    def iter_integrations_related_resources_blocks(self):
+        """
+        Integration resource blocks are cached by hash of everything they are rendered from, so templates of
+        integrations which didn't change since the previous export are not rendered again.
+        Names and data sources are resolved for every export, since they depend on the other rendered objects.
+        """
         AlertReceiveChannel = apps.get_model("alerts", "AlertReceiveChannel")
-        result = ""
-        integrations = self.organization.alert_receive_channels.all().order_by("created_at")
-        for integration in integrations:
+        integrations_blocks = []
+        for integration in self.integrations:
             integration_resource_name = self.render_name(integration, "integrations", "verbal_name")
             team_name = self.render_team_name(integration.team)
             team_name_text = f"data.amixr_team.{team_name}.id" if team_name else "null"
-            formatted_integration_name = self.escape_string_for_terraform(integration.verbal_name)
-            templates = self.render_integration_template(integration)
-            if templates is not None:
-                result += TerraformFileRenderer.INTEGRATION_RESOURCE_TEMPLATE_WITH_TEMPLATES.format(
-                    integration_resource_name,
-                    formatted_integration_name,
-                    AlertReceiveChannel.INTEGRATIONS_TO_REVERSE_URL_MAP[integration.integration],
-                    team_name_text,
-                    templates,
-                )
-            else:
-                result += TerraformFileRenderer.INTEGRATION_RESOURCE_TEMPLATE.format(
-                    integration_resource_name,
-                    formatted_integration_name,
-                    AlertReceiveChannel.INTEGRATIONS_TO_REVERSE_URL_MAP[integration.integration],
-                    team_name_text,
-                )
+            render_args = (
+                integration_resource_name,
+                self.escape_string_for_terraform(integration.verbal_name),
+                AlertReceiveChannel.INTEGRATIONS_TO_REVERSE_URL_MAP[integration.integration],
+                team_name_text,
+            )
             route_text = self.render_route_resource_text(integration, integration_resource_name)
             # render data sources for custom actions just after integration resource
             actions_data_text = self.render_action_data_text()
-            result += actions_data_text
+            integrations_blocks.append((integration, render_args, actions_data_text + route_text))
+
+        cache_keys = [
+            self.get_integration_block_cache_key(integration, render_args)
+            for integration, render_args, _ in integrations_blocks
+        ]
+        cached_blocks = cache.get_many(cache_keys)
+        blocks_to_cache = {}
+        result = []
+        for cache_key, (integration, render_args, related_text) in zip(cache_keys, integrations_blocks):
+            integration_text = cached_blocks.get(cache_key)
+            if integration_text is None:
+                integration_text = self.render_integration_resource_text(integration, render_args)
+                blocks_to_cache[cache_key] = integration_text
+            result.append(integration_text)
+            result.append(related_text)
+        if blocks_to_cache:
+            cache.set_many(blocks_to_cache, timeout=INTEGRATION_BLOCK_CACHE_LIFETIME)
+        yield from result
+
+    def get_integration_block_cache_key(self, integration, render_args):
+        templates = (
+            integration.resolve_condition_template,
+            integration.grouping_id_template,
+            integration.slack_title_template,
+            integration.slack_message_template,
+            integration.slack_image_url_template,
+        )
+        digest = hashlib.md5(repr((render_args, templates)).encode()).hexdigest()
+        return f"{INTEGRATION_BLOCK_CACHE_KEY_PREFIX}_{digest}"
 
-            result += route_text
-        return result
+    def render_integration_resource_text(self, integration, render_args):
+        templates = self.render_integration_template(integration)
+        if templates is not None:
+            return TerraformFileRenderer.INTEGRATION_RESOURCE_TEMPLATE_WITH_TEMPLATES.format(*render_args, templates)
+        return TerraformFileRenderer.INTEGRATION_RESOURCE_TEMPLATE.format(*render_args)
 
     def render_route_resource_text(self, integration, integration_resource_name):
-        SlackChannel = apps.get_model("slack", "SlackChannel")
-        slack_team_identity = self.organization.slack_team_identity
-        slack_channels_q = SlackChannel.objects.filter(
-            slack_id=OuterRef("slack_channel_id"),
-            slack_team_identity=slack_team_identity,
-        )
-        routes = integration.channel_filters.all().annotate(
-            slack_channel_name=Subquery(slack_channels_q.values("name")[:1])
-        )
         result = ""
-        for num, route in enumerate(routes, start=1):
+        for num, route in enumerate(integration.channel_filters.all(), start=1):
             if route.is_default:
                 continue
             route_name = f"route-{num}-{integration_resource_name}"
@@ -446,15 +511,16 @@ class TerraformFileRenderer:
 
             routing_regex = self.escape_string_for_terraform(route.filtering_term)
             if route.slack_channel_id is not None:
-                if route.slack_channel_name is not None:
-                    slack_channel_data_name = f"slack-channel-{route.slack_channel_name}"
+                slack_channel_name = self.slack_channel_names.get(route.slack_channel_id)
+                if slack_channel_name is not None:
+                    slack_channel_data_name = f"slack-channel-{slack_channel_name}"
                     slack_channel_id = f"data.amixr_slack_channel.{slack_channel_data_name}.slack_id"
-                    if route.slack_channel_name not in self.data.setdefault("slack_channels", {}):
+                    if slack_channel_name not in self.data.setdefault("slack_channels", {}):
                         data_result = TerraformFileRenderer.SLACK_CHANNEL_DATA_TEMPLATE.format(
                             slack_channel_data_name,
-                            route.slack_channel_name,
+                            slack_channel_name,
                         )
-                        self.data["slack_channels"][route.slack_channel_name] = data_result
+                        self.data["slack_channels"][slack_channel_name] = data_result
                 else:
                     slack_channel_id = f'"{route.slack_channel_id}"'
                 result += TerraformFileRenderer.ROUTE_RESOURCES_TEMPLATE_WITH_SLACK.format(
@@ -476,33 +542,24 @@ class TerraformFileRenderer:
 
         return result
 
-    def render_schedules_related_resources_text(self):
-        SlackChannel = apps.get_model("slack", "SlackChannel")
-        slack_team_identity = self.organization.slack_team_identity
-        slack_channels_q = SlackChannel.objects.filter(
-            slack_id=OuterRef("channel"),
-            slack_team_identity=slack_team_identity,
-        )
-        schedules = self.organization.oncall_schedules.annotate(
-            slack_channel_name=Subquery(slack_channels_q.values("name")[:1])
-        ).order_by("pk")
-        result = ""
-        for schedule in schedules:
+    def iter_schedules_related_resources_blocks(self):
+        for schedule in self.schedules:
             schedule_name = self.render_name(schedule, "schedules", "name")
             formatted_schedule_name = self.escape_string_for_terraform(schedule.name)
             team_name = self.render_team_name(schedule.team)
             team_name_text = f"data.amixr_team.{team_name}.id" if team_name else "null"
             slack_channel_text = ""
             if schedule.channel is not None:
-                if schedule.slack_channel_name is not None:
-                    slack_channel_data_name = f"slack-channel-{schedule.slack_channel_name}"
+                slack_channel_name = self.slack_channel_names.get(schedule.channel)
+                if slack_channel_name is not None:
+                    slack_channel_data_name = f"slack-channel-{slack_channel_name}"
                     slack_channel_id = f"data.amixr_slack_channel.{slack_channel_data_name}.slack_id"
-                    if schedule.slack_channel_name not in self.data.setdefault("slack_channels", {}):
+                    if slack_channel_name not in self.data.setdefault("slack_channels", {}):
                         data_result = TerraformFileRenderer.SLACK_CHANNEL_DATA_TEMPLATE.format(
                             slack_channel_data_name,
-                            schedule.slack_channel_name,
+                            slack_channel_name,
                         )
-                        self.data["slack_channels"][schedule.slack_channel_name] = data_result
+                        self.data["slack_channels"][slack_channel_name] = data_result
                 else:
                     slack_channel_id = f'"{schedule.channel}"'
 
@@ -511,7 +568,7 @@ class TerraformFileRenderer:
             if isinstance(schedule, OnCallScheduleICal):
                 ical_url_primary = f'"{schedule.ical_url_primary}"' if schedule.ical_url_primary else "null"
                 ical_url_overrides = f'"{schedule.ical_url_overrides}"' if schedule.ical_url_overrides else "null"
-                result += TerraformFileRenderer.SCHEDULE_RESOURCE_TEMPLATE_ICAL.format(
+                yield TerraformFileRenderer.SCHEDULE_RESOURCE_TEMPLATE_ICAL.format(
                     schedule_name,
                     formatted_schedule_name,
                     team_name_text,
@@ -521,17 +578,14 @@ class TerraformFileRenderer:
                 )
 
             elif isinstance(schedule, OnCallScheduleCalendar):
-                result += TerraformFileRenderer.SCHEDULE_RESOURCE_TEMPLATE_CALENDAR.format(
+                yield TerraformFileRenderer.SCHEDULE_RESOURCE_TEMPLATE_CALENDAR.format(
                     schedule_name, formatted_schedule_name, team_name_text, schedule.time_zone, slack_channel_text
                 )
-        return result
 
-    def render_on_call_shift_resource_text(self):
+    def iter_on_call_shift_resource_blocks(self):
         CustomOnCallShift = apps.get_model("schedules", "CustomOnCallShift")
-        result = ""
-        on_call_shifts = self.organization.custom_on_call_shifts.all().order_by("pk")
 
-        for shift in on_call_shifts:
+        for shift in self.on_call_shifts:
             shift_name = self.render_name(shift, "on_call_shifts", "name")
             team_name = self.render_team_name(shift.team)
             team_name_text = f"data.amixr_team.{team_name}.id" if team_name else "null"
@@ -548,9 +602,9 @@ class TerraformFileRenderer:
             by_monthday = self.replace_quotes(f"{shift.by_day}") if shift.by_monthday else "null"
 
             if shift.type == CustomOnCallShift.TYPE_ROLLING_USERS_EVENT:
-                rolling_amixr_users = shift.get_rolling_users()
+                rolling_amixr_users = shift.get_rolling_users(self.rolling_users_by_pk)
                 rendered_amixr_users = self.render_rolling_users_list_text(rolling_amixr_users)
-                result += TerraformFileRenderer.ON_CALL_SHIFT_RESOURCE_TEMPLATE_ROLLING_USERS.format(
+                yield TerraformFileRenderer.ON_CALL_SHIFT_RESOURCE_TEMPLATE_ROLLING_USERS.format(
                     shift_name,
                     formatted_integration_name,
                     shift_type,
@@ -571,7 +625,7 @@ class TerraformFileRenderer:
                 rendered_amixr_users = self.render_amixr_users_list_text(amixr_users)
 
                 if shift.type == CustomOnCallShift.TYPE_SINGLE_EVENT:
-                    result += TerraformFileRenderer.ON_CALL_SHIFT_RESOURCE_TEMPLATE_SINGLE_EVENT.format(
+                    yield TerraformFileRenderer.ON_CALL_SHIFT_RESOURCE_TEMPLATE_SINGLE_EVENT.format(
                         shift_name,
                         formatted_integration_name,
                         shift_type,
@@ -582,7 +636,7 @@ class TerraformFileRenderer:
                         rendered_amixr_users,
                     )
                 elif shift.type == CustomOnCallShift.TYPE_RECURRENT_EVENT:
-                    result += TerraformFileRenderer.ON_CALL_SHIFT_RESOURCE_TEMPLATE_RECURRENT_EVENT.format(
+                    yield TerraformFileRenderer.ON_CALL_SHIFT_RESOURCE_TEMPLATE_RECURRENT_EVENT.format(
                         shift_name,
                         formatted_integration_name,
                         shift_type,
@@ -598,14 +652,10 @@ class TerraformFileRenderer:
                         by_monthday,
                         rendered_amixr_users,
                     )
-        return result
 
-    def render_data_text(self):
-        result = ""
+    def iter_data_blocks(self):
         for data_type, data_source in sorted(self.data.items(), key=lambda x: x[0], reverse=True):
-            for data_result in data_source:
-                result += data_source[data_result]
-        return result
+            yield from data_source.values()
 
     def render_action_data_text(self):
         result = ""
@@ -1,7 +1,11 @@
 import pytest
+from django.core.cache import cache
+from django.db import connection
 
 from apps.alerts.incident_appearance.renderers.phone_call_renderer import AlertGroupPhoneCallRenderer
-from apps.alerts.models import AlertGroup
+from apps.alerts.models import Alert, AlertGroup, AlertGroupLogRecord, ResolutionNote
+from apps.alerts.models.alert_group import GROUPING_CLAIM_CACHE_KEY_PREFIX, get_grouping_cache_key
+from apps.alerts.models.alert_group_counter import ConcurrentUpdateError
 from apps.alerts.tasks.delete_alert_group import delete_alert_group
 from apps.slack.models import SlackMessage
 from common.constants.role import Role
@@ -95,3 +99,338 @@ def test_delete(
 
     with pytest.raises(AlertGroup.DoesNotExist):
         alert_group.refresh_from_db()
+
+
+@pytest.mark.django_db
+def test_status_and_organization_are_denormalized_on_save(
+    make_organization_and_user, make_alert_receive_channel, make_alert_group, make_alert
+):
+    organization, user = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+
+    alert_group = make_alert_group(alert_receive_channel)
+    make_alert(alert_group, raw_request_data={})
+    assert alert_group.organization == organization
+    assert alert_group.status == AlertGroup.NEW
+
+    alert_group.silence_by_user(user, silence_delay=None)
+    alert_group.refresh_from_db()
+    assert alert_group.status == AlertGroup.SILENCED
+
+    alert_group.acknowledge_by_user(user)
+    alert_group.refresh_from_db()
+    assert alert_group.status == AlertGroup.ACKNOWLEDGED
+
+    alert_group.resolve_by_user(user)
+    alert_group.refresh_from_db()
+    assert alert_group.status == AlertGroup.RESOLVED
+
+    alert_group.un_resolve_by_user(user)
+    alert_group.refresh_from_db()
+    assert alert_group.status == AlertGroup.NEW
+
+
+@pytest.mark.django_db
+def test_status_is_denormalized_on_bulk_actions(
+    make_organization_and_user, make_alert_receive_channel, make_alert_group, make_alert
+):
+    organization, user = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+    make_alert(alert_group, raw_request_data={})
+    alert_groups = AlertGroup.all_objects.filter(pk=alert_group.pk)
+
+    AlertGroup.bulk_acknowledge(user, alert_groups)
+    alert_group.refresh_from_db()
+    assert alert_group.status == AlertGroup.ACKNOWLEDGED
+
+    AlertGroup.bulk_restart(user, alert_groups)
+    alert_group.refresh_from_db()
+    assert alert_group.status == AlertGroup.NEW
+
+    AlertGroup.bulk_silence(user, alert_groups, silence_delay=0)
+    alert_group.refresh_from_db()
+    assert alert_group.status == AlertGroup.SILENCED
+
+    AlertGroup.bulk_resolve(user, alert_groups)
+    alert_group.refresh_from_db()
+    assert alert_group.status == AlertGroup.RESOLVED
+
+
+@pytest.mark.skipif(not connection.features.supports_partial_indexes, reason="partial indexes are not supported")
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "status,index_name",
+    [
+        (AlertGroup.NEW, "alert_group_firing_idx"),
+        (AlertGroup.ACKNOWLEDGED, "alert_group_acknowledged_idx"),
+    ],
+)
+def test_alert_group_list_uses_partial_index(
+    make_organization, make_alert_receive_channel, make_alert_group, status, index_name
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    make_alert_group(alert_receive_channel)
+    make_alert_group(alert_receive_channel, acknowledged=True)
+
+    queryset = AlertGroup.unarchived_objects.filter(
+        organization=organization, status=status, root_alert_group__isnull=True
+    ).order_by("-pk")
+
+    if connection.vendor == "postgresql":
+        # test tables are tiny, make sure the planner doesn't choose a sequential scan just because it's cheaper
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    assert index_name in queryset.explain()
+
+
+@pytest.mark.django_db
+def test_alerts_info_is_updated_on_alert_create(
+    make_organization,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_alert,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    assert alert_group.alerts_count == 0
+    assert alert_group.last_alert is None
+
+    make_alert(alert_group=alert_group, raw_request_data={})
+    make_alert(alert_group=alert_group, raw_request_data={}, is_resolve_signal=True)
+    last_alert = make_alert(alert_group=alert_group, raw_request_data={})
+
+    # alert group loaded in memory is kept up to date
+    assert alert_group.alerts_count == 3
+    assert alert_group.last_alert == last_alert
+
+    alert_group = AlertGroup.all_objects.get(pk=alert_group.pk)
+    assert alert_group.alerts_count == 3
+    assert alert_group.non_resolve_alerts_count == 2
+    assert alert_group.last_alert == last_alert
+    assert alert_group.last_alert_at == last_alert.created_at
+
+
+@pytest.mark.django_db
+def test_alert_group_save_does_not_overwrite_alerts_info(
+    make_organization,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_alert,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    stale_alert_group = AlertGroup.all_objects.get(pk=alert_group.pk)
+    alert = make_alert(alert_group=alert_group, raw_request_data={})
+
+    stale_alert_group.acknowledged = True
+    stale_alert_group.save()
+
+    alert_group.refresh_from_db()
+    assert alert_group.acknowledged is True
+    assert alert_group.alerts_count == 1
+    assert alert_group.last_alert == alert
+
+
+@pytest.mark.django_db
+def test_alert_group_save_inserts_missing_row(make_organization, make_alert_receive_channel, make_alert_group):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+    AlertGroup.all_objects.filter(pk=alert_group.pk).delete()
+
+    # like a regular save, the instance is inserted again
+    alert_group.save()
+    assert AlertGroup.all_objects.filter(pk=alert_group.pk).exists()
+
+
+@pytest.mark.django_db
+def test_last_alert_is_cleared_on_alert_delete(
+    make_organization,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_alert,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+    alert = make_alert(alert_group=alert_group, raw_request_data={})
+
+    alert.delete()
+    alert_group.refresh_from_db()
+    assert alert_group.last_alert is None
+
+
+@pytest.mark.django_db
+def test_hard_delete_alert_groups(
+    make_organization_and_user,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_alert,
+    make_alert_group_log_record,
+    make_resolution_note,
+):
+    organization, user = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+
+    alert_groups = [make_alert_group(alert_receive_channel) for _ in range(3)]
+    for alert_group in alert_groups:
+        for _ in range(3):
+            make_alert(alert_group, raw_request_data={})
+        make_alert_group_log_record(alert_group, AlertGroupLogRecord.TYPE_RESOLVED, user)
+        make_resolution_note(alert_group, author=user).delete()  # soft deleted notes are hard deleted as well
+    alert_groups[1].resolved_by_alert = alert_groups[1].alerts.first()
+    alert_groups[1].save(update_fields=["resolved_by_alert"])
+    alert_to_keep = alert_groups[2].alerts.first()
+
+    deleted_count = AlertGroup.all_objects.exclude(pk=alert_groups[2].pk).hard_delete(batch_size=1)
+
+    assert deleted_count == 2
+    assert list(AlertGroup.all_objects.all()) == [alert_groups[2]]
+    assert Alert.objects.filter(group=alert_groups[2]).count() == 3
+    assert Alert.objects.count() == 3
+    assert AlertGroupLogRecord.objects.count() == 1
+    assert ResolutionNote.objects_with_deleted.count() == 1
+    assert alert_to_keep.group_id == alert_groups[2].pk
+
+
+@pytest.mark.django_db
+def test_hard_delete_alert_receive_channel(make_organization, make_alert_receive_channel, make_alert_group, make_alert):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    other_alert_receive_channel = make_alert_receive_channel(organization)
+    make_alert(make_alert_group(alert_receive_channel), raw_request_data={})
+    other_alert_group = make_alert_group(other_alert_receive_channel)
+    make_alert(other_alert_group, raw_request_data={})
+
+    alert_receive_channel.hard_delete()
+
+    assert list(AlertGroup.all_objects.all()) == [other_alert_group]
+    assert list(Alert.objects.values_list("group_id", flat=True)) == [other_alert_group.pk]
+
+
+@pytest.mark.django_db
+def test_get_or_create_grouping_uses_cache(
+    make_organization,
+    make_alert_receive_channel,
+    make_channel_filter,
+    django_assert_num_queries,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    channel_filter = make_channel_filter(alert_receive_channel, is_default=True)
+    group_data = AlertGroup.GroupData(
+        is_resolve_signal=False, is_acknowledge_signal=False, group_distinction="abc", group_verbose_name="test"
+    )
+
+    alert_group, created = AlertGroup.all_objects.get_or_create_grouping(
+        alert_receive_channel, channel_filter, group_data
+    )
+    assert created is True
+    assert cache.get(alert_group.grouping_cache_key) == alert_group.pk
+
+    # cached group is looked up by primary key
+    with django_assert_num_queries(1) as queries:
+        assert AlertGroup.all_objects.get_or_create_grouping(alert_receive_channel, channel_filter, group_data) == (
+            alert_group,
+            False,
+        )
+    assert f'"alerts_alertgroup"."id" = {alert_group.pk}' in queries.captured_queries[0]["sql"]
+
+    # resolved group is not open for grouping anymore
+    alert_group.resolve()
+    assert cache.get(alert_group.grouping_cache_key) is None
+    new_alert_group, created = AlertGroup.all_objects.get_or_create_grouping(
+        alert_receive_channel, channel_filter, group_data
+    )
+    assert created is True
+    assert new_alert_group != alert_group
+    assert cache.get(alert_group.grouping_cache_key) == new_alert_group.pk
+
+
+@pytest.mark.django_db
+def test_get_or_create_grouping_stale_cache(
+    make_organization,
+    make_alert_receive_channel,
+    make_channel_filter,
+    make_alert_group,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    channel_filter = make_channel_filter(alert_receive_channel, is_default=True)
+    group_data = AlertGroup.GroupData(
+        is_resolve_signal=False, is_acknowledge_signal=False, group_distinction="abc", group_verbose_name="test"
+    )
+    alert_group = make_alert_group(
+        alert_receive_channel, channel_filter=channel_filter, distinction="abc", is_open_for_grouping=True
+    )
+    # e.g. group resolved with a queryset update
+    resolved_alert_group = make_alert_group(alert_receive_channel, channel_filter=channel_filter, distinction="abc")
+    cache.set(alert_group.grouping_cache_key, resolved_alert_group.pk)
+
+    assert AlertGroup.all_objects.get_or_create_grouping(alert_receive_channel, channel_filter, group_data) == (
+        alert_group,
+        False,
+    )
+    assert cache.get(alert_group.grouping_cache_key) == alert_group.pk
+
+
+@pytest.mark.django_db
+def test_get_or_create_grouping_claimed_creation(
+    make_organization,
+    make_alert_receive_channel,
+    make_channel_filter,
+    make_alert_group,
+    django_assert_num_queries,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    channel_filter = make_channel_filter(alert_receive_channel, is_default=True)
+    group_data = AlertGroup.GroupData(
+        is_resolve_signal=False, is_acknowledge_signal=False, group_distinction="abc", group_verbose_name="test"
+    )
+    cache_key = get_grouping_cache_key(alert_receive_channel.pk, channel_filter.pk, "abc")
+    # another worker is creating the group
+    cache.set(f"{GROUPING_CLAIM_CACHE_KEY_PREFIX}_{cache_key}", True)
+
+    # the worker doesn't wait for the group, the task is retried instead
+    with pytest.raises(ConcurrentUpdateError):
+        AlertGroup.all_objects.get_or_create_grouping(alert_receive_channel, channel_filter, group_data)
+    assert not AlertGroup.all_objects.exists()
+
+    # the group created by another worker is returned from the cache
+    alert_group = make_alert_group(
+        alert_receive_channel, channel_filter=channel_filter, distinction="abc", is_open_for_grouping=True
+    )
+    cache.set(cache_key, alert_group.pk)
+    with django_assert_num_queries(1):
+        assert AlertGroup.all_objects.get_or_create_grouping(alert_receive_channel, channel_filter, group_data) == (
+            alert_group,
+            False,
+        )
+
+
+@pytest.mark.django_db
+def test_grouping_cache_invalidated_on_attach_and_delete(
+    make_organization_and_user,
+    make_alert_receive_channel,
+    make_alert_group,
+):
+    organization, user = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel, distinction="abc", is_open_for_grouping=True)
+    root_alert_group = make_alert_group(alert_receive_channel)
+
+    cache.set(alert_group.grouping_cache_key, alert_group.pk)
+    alert_group.attach_by_user(user, root_alert_group)
+    assert cache.get(alert_group.grouping_cache_key) is None
+
+    cache.set(alert_group.grouping_cache_key, alert_group.pk)
+    AlertGroup.all_objects.filter(pk=alert_group.pk).hard_delete()
+    assert cache.get(alert_group.grouping_cache_key) is None
@@ -0,0 +1,76 @@
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.alerts.models import Alert
+from apps.alerts.tasks.compact_alert_payloads import COMPACT_ALERT_PAYLOADS_CHECKPOINT_CACHE_KEY, compact_alert_payloads
+
+
+@pytest.mark.django_db
+def test_compact_alert_payloads(settings, make_organization, make_alert_receive_channel, make_alert_group, make_alert):
+    settings.ALERT_PAYLOAD_COMPACTION_DAYS = 1
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    first_alert = make_alert(alert_group, raw_request_data={"n": 0}, is_the_first_alert_in_group=True)
+    middle_alerts = [
+        make_alert(alert_group, raw_request_data={"n": n}, integration_unique_data={"u": n}) for n in (1, 2)
+    ]
+    last_alert = make_alert(alert_group, raw_request_data={"n": 3})
+    Alert.objects.update(created_at=timezone.now() - timezone.timedelta(days=2))
+    recent_alert = make_alert(make_alert_group(alert_receive_channel), raw_request_data={"n": 4})
+
+    compact_alert_payloads()
+
+    compacted_pks = set(Alert.objects.filter(compressed_payload__isnull=False).values_list("pk", flat=True))
+    assert compacted_pks == {alert.pk for alert in middle_alerts}
+    assert not Alert.objects.filter(pk__in=compacted_pks, raw_request_data__isnull=False).exists()
+
+    # payloads are decompressed transparently
+    for n, alert in enumerate([first_alert, *middle_alerts, last_alert, recent_alert]):
+        alert = Alert.objects.get(pk=alert.pk)
+        assert alert.raw_request_data == {"n": n}
+        if alert in middle_alerts:
+            assert alert.integration_unique_data == {"u": n}
+
+
+@pytest.mark.django_db
+def test_compacted_alert_is_wiped(make_organization_and_user, make_alert_receive_channel, make_alert_group, make_alert):
+    organization, user = make_organization_and_user()
+    alert_group = make_alert_group(make_alert_receive_channel(organization))
+    make_alert(alert_group, raw_request_data={"n": 0})
+    alert = make_alert(alert_group, raw_request_data={"secret": "data"})
+    make_alert(alert_group, raw_request_data={"n": 2})
+
+    Alert.compact_payloads(Alert.objects.all())
+    alert_group.wipe_by_user(user)
+
+    alert = Alert.objects.get(pk=alert.pk)
+    assert alert.compressed_payload is None
+    assert alert.raw_request_data == {}
+
+
+@pytest.mark.django_db
+def test_skipped_last_alert_is_compacted_later(
+    settings, make_organization, make_alert_receive_channel, make_alert_group, make_alert
+):
+    settings.ALERT_PAYLOAD_COMPACTION_DAYS = 1
+    cache.delete(COMPACT_ALERT_PAYLOADS_CHECKPOINT_CACHE_KEY)
+    alert_group = make_alert_group(make_alert_receive_channel(make_organization()))
+    make_alert(alert_group, raw_request_data={"n": 0}, is_the_first_alert_in_group=True)
+    previous_last_alert = make_alert(alert_group, raw_request_data={"n": 1})
+    Alert.objects.update(created_at=timezone.now() - timezone.timedelta(days=2))
+
+    compact_alert_payloads()
+    assert not Alert.objects.filter(compressed_payload__isnull=False).exists()
+
+    # the checkpoint moved past the last alert, it's compacted when the next alert of the group is processed
+    make_alert(alert_group, raw_request_data={"n": 2})
+    Alert.objects.update(created_at=timezone.now() - timezone.timedelta(days=2))
+    compact_alert_payloads()
+
+    assert list(Alert.objects.filter(compressed_payload__isnull=False).values_list("pk", flat=True)) == [
+        previous_last_alert.pk
+    ]
+    assert Alert.objects.get(pk=previous_last_alert.pk).raw_request_data == {"n": 1}
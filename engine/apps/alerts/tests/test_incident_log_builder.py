@@ -1,8 +1,13 @@
+from unittest.mock import patch
+
 import pytest
+from django.core.cache import cache
+from django.utils import timezone
 
 from apps.alerts.incident_log_builder import IncidentLogBuilder
-from apps.alerts.models import EscalationPolicy
+from apps.alerts.models import AlertGroup, EscalationPolicy
 from apps.base.models import UserNotificationPolicy
+from apps.schedules.models import CustomOnCallShift, OnCallScheduleCalendar
 
 
 @pytest.mark.django_db
@@ -37,3 +42,160 @@ def test_escalation_plan_messaging_backends(
     log_builder = IncidentLogBuilder(alert_group=alert_group)
     plan = log_builder.get_incident_escalation_plan()
     assert list(plan.values()) == [["send test only backend message to {}".format(user.username)]]
+
+
+@pytest.mark.django_db
+def test_escalation_plan_is_memoized(
+    make_organization_and_user,
+    make_user_notification_policy,
+    make_escalation_chain,
+    make_escalation_policy,
+    make_channel_filter,
+    make_alert_receive_channel,
+    make_alert_group,
+    django_assert_num_queries,
+):
+    organization, user = make_organization_and_user()
+    make_user_notification_policy(
+        user,
+        UserNotificationPolicy.Step.NOTIFY,
+        notify_by=UserNotificationPolicy.NotificationChannel.TESTONLY,
+    )
+    escalation_chain = make_escalation_chain(organization=organization)
+    escalation_policy = make_escalation_policy(
+        escalation_chain=escalation_chain,
+        escalation_policy_step=EscalationPolicy.STEP_NOTIFY_MULTIPLE_USERS,
+    )
+    escalation_policy.notify_to_users_queue.set([user])
+    alert_receive_channel = make_alert_receive_channel(organization=organization)
+    channel_filter = make_channel_filter(alert_receive_channel, escalation_chain=escalation_chain)
+    alert_group = make_alert_group(alert_receive_channel, channel_filter=channel_filter)
+    alert_group.raw_escalation_snapshot = alert_group.build_raw_escalation_snapshot()
+    alert_group.save()
+
+    plan = IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan()
+    assert list(plan.values()) == [["send test only backend message to {}".format(user.username)]]
+
+    # plan is reused by another builder for the same escalation snapshot, notified users are checked for changes
+    with django_assert_num_queries(1):
+        assert IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan() == plan
+
+    # notified user changed, plan is rendered again
+    user.username = "renamed"
+    user.save(update_fields=["username"])
+    alert_group = AlertGroup.all_objects.get(pk=alert_group.pk)
+    plan = IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan()
+    assert list(plan.values()) == [["send test only backend message to renamed"]]
+
+    # escalation snapshot changed, plan is rendered again
+    alert_group.raw_escalation_snapshot["escalation_policies_snapshots"][0]["notify_to_users_queue"] = []
+    alert_group.save(update_fields=["raw_escalation_snapshot"])
+    alert_group = AlertGroup.all_objects.get(pk=alert_group.pk)
+    assert IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan() == {}
+
+
+@pytest.mark.django_db
+def test_escalation_plan_cache_invalidated_by_invitation(
+    make_organization_and_user,
+    make_user_notification_policy,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_invitation,
+):
+    organization, user = make_organization_and_user()
+    make_user_notification_policy(
+        user,
+        UserNotificationPolicy.Step.NOTIFY,
+        notify_by=UserNotificationPolicy.NotificationChannel.TESTONLY,
+    )
+    alert_receive_channel = make_alert_receive_channel(organization=organization)
+    alert_group = make_alert_group(alert_receive_channel)
+
+    assert IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan() == {}
+    cache_key = IncidentLogBuilder._get_escalation_plan_cache_key(alert_group.pk, for_slack=False)
+    assert cache.get(cache_key) is not None
+
+    make_invitation(alert_group, user, user)
+    assert cache.get(cache_key) is None
+    plan = IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan()
+    assert "send test only backend message to {}".format(user.username) in plan[timezone.timedelta()]
+
+
+def test_shift_escalation_plan():
+    plan = {
+        timezone.timedelta(): ["step 1"],
+        timezone.timedelta(minutes=1): ["step 2"],
+        timezone.timedelta(minutes=10): ["step 3"],
+    }
+    shifted_plan = IncidentLogBuilder._shift_escalation_plan(plan, timezone.timedelta(minutes=2))
+    assert shifted_plan == {
+        timezone.timedelta(): ["step 1", "step 2"],
+        timezone.timedelta(minutes=8): ["step 3"],
+    }
+
+
+@pytest.mark.django_db
+def test_escalation_plan_rendered_again_when_oncall_users_change(
+    make_organization_and_user,
+    make_user_notification_policy,
+    make_escalation_chain,
+    make_escalation_policy,
+    make_channel_filter,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_schedule,
+    make_on_call_shift,
+):
+    organization, user = make_organization_and_user()
+    make_user_notification_policy(
+        user,
+        UserNotificationPolicy.Step.NOTIFY,
+        notify_by=UserNotificationPolicy.NotificationChannel.TESTONLY,
+    )
+    schedule = make_schedule(organization, schedule_class=OnCallScheduleCalendar)
+    start_date = timezone.now().replace(microsecond=0) - timezone.timedelta(hours=1)
+    on_call_shift = make_on_call_shift(
+        organization=organization,
+        shift_type=CustomOnCallShift.TYPE_SINGLE_EVENT,
+        priority_level=1,
+        start=start_date,
+        rotation_start=start_date,
+        duration=timezone.timedelta(hours=1, minutes=2),
+    )
+    on_call_shift.users.add(user)
+    schedule.custom_on_call_shifts.add(on_call_shift)
+
+    escalation_chain = make_escalation_chain(organization=organization)
+    make_escalation_policy(
+        escalation_chain=escalation_chain,
+        escalation_policy_step=EscalationPolicy.STEP_WAIT,
+        wait_delay=EscalationPolicy.ONE_MINUTE,
+    )
+    make_escalation_policy(
+        escalation_chain=escalation_chain,
+        escalation_policy_step=EscalationPolicy.STEP_NOTIFY_SCHEDULE,
+        notify_schedule=schedule,
+    )
+    alert_receive_channel = make_alert_receive_channel(organization=organization)
+    channel_filter = make_channel_filter(alert_receive_channel, escalation_chain=escalation_chain)
+    alert_group = make_alert_group(alert_receive_channel, channel_filter=channel_filter)
+    alert_group.raw_escalation_snapshot = alert_group.build_raw_escalation_snapshot()
+    alert_group.save()
+
+    plan = IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan()
+    assert "send test only backend message to {}".format(user.username) in plan[EscalationPolicy.ONE_MINUTE]
+
+    # memoized plan is valid until the shift ends
+    cache_key = IncidentLogBuilder._get_escalation_plan_cache_key(alert_group.pk, for_slack=False)
+    cached_plan = cache.get(cache_key)
+    assert cached_plan["oncall_changes_at"] == on_call_shift.start + on_call_shift.duration
+    memoized_plan = IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan()
+    assert list(memoized_plan.values()) == list(plan.values())
+    assert cache.get(cache_key)["rendered_at"] == cached_plan["rendered_at"]
+
+    # on-call users changed, plan is rendered again
+    shift_end = on_call_shift.start + on_call_shift.duration
+    with patch("apps.alerts.incident_log_builder.incident_log_builder.timezone.now", return_value=shift_end):
+        plan = IncidentLogBuilder(alert_group=alert_group).get_incident_escalation_plan()
+    assert cache.get(cache_key)["rendered_at"] == shift_end
+    assert "send test only backend message to {}".format(user.username) not in sum(plan.values(), [])
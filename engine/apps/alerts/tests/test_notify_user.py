@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
+from apps.alerts.models import UserHasNotification
 from apps.alerts.tasks.notify_user import notify_user_task, perform_notification
 from apps.base.models.user_notification_policy import UserNotificationPolicy
 from apps.base.models.user_notification_policy_log_record import UserNotificationPolicyLogRecord
@@ -178,3 +179,82 @@ def test_notify_user_error_if_viewer(
         error_log_record.notification_error_code
         == UserNotificationPolicyLogRecord.ERROR_NOTIFICATION_NOT_ALLOWED_USER_ROLE
     )
+
+
+@pytest.mark.django_db
+def test_notify_user_task_takes_next_policy_from_cached_chain(
+    make_organization,
+    make_user,
+    make_user_notification_policy,
+    make_alert_receive_channel,
+    make_alert_group,
+):
+    organization = make_organization()
+    user = make_user(organization=organization)
+    first_policy = make_user_notification_policy(
+        user=user,
+        step=UserNotificationPolicy.Step.NOTIFY,
+        notify_by=UserNotificationPolicy.NotificationChannel.SLACK,
+    )
+    wait_policy = make_user_notification_policy(user=user, step=UserNotificationPolicy.Step.WAIT)
+    alert_receive_channel = make_alert_receive_channel(organization=organization)
+    alert_group = make_alert_group(alert_receive_channel=alert_receive_channel)
+
+    # warm up the cache
+    UserNotificationPolicy.objects.get_cached_for_user(user, important=False)
+
+    with patch("apps.alerts.tasks.notify_user.notify_user_task.apply_async"):
+        notify_user_task(user.pk, alert_group.pk, previous_notification_policy_pk=first_policy.pk)
+
+    log_record = UserNotificationPolicyLogRecord.objects.last()
+    assert log_record.type == UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_TRIGGERED
+    assert log_record.notification_policy == wait_policy
+
+    # the last policy in the chain finishes personal notification
+    UserHasNotification.objects.filter(user=user, alert_group=alert_group).update(active_notification_policy_id=None)
+    with patch("apps.alerts.tasks.notify_user.notify_user_task.apply_async"):
+        notify_user_task(user.pk, alert_group.pk, previous_notification_policy_pk=wait_policy.pk)
+
+    log_record = UserNotificationPolicyLogRecord.objects.last()
+    assert log_record.type == UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FINISHED
+
+
+@pytest.mark.django_db
+def test_perform_notification_paces_sms(
+    make_organization,
+    make_user,
+    make_user_notification_policy,
+    make_alert_receive_channel,
+    make_alert_group,
+    make_user_notification_policy_log_record,
+    settings,
+):
+    settings.GRAFANA_CLOUD_NOTIFICATIONS_ENABLED = False
+    organization = make_organization()
+    user = make_user(organization=organization)
+    user_notification_policy = make_user_notification_policy(
+        user=user,
+        step=UserNotificationPolicy.Step.NOTIFY,
+        notify_by=UserNotificationPolicy.NotificationChannel.SMS,
+    )
+    alert_receive_channel = make_alert_receive_channel(organization=organization)
+    alert_group = make_alert_group(alert_receive_channel=alert_receive_channel)
+    log_record = make_user_notification_policy_log_record(
+        author=user,
+        alert_group=alert_group,
+        notification_policy=user_notification_policy,
+        type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_TRIGGERED,
+    )
+
+    with patch("apps.alerts.tasks.notify_user.twilio_client.reserve_sms_sending_slot", return_value=3):
+        with patch("apps.alerts.tasks.notify_user.perform_notification.apply_async") as mock_apply_async:
+            with patch("apps.twilioapp.models.SMSMessage.send_sms") as mock_send_sms:
+                perform_notification(log_record.pk)
+
+    mock_send_sms.assert_not_called()
+    mock_apply_async.assert_called_once_with((log_record.pk,), kwargs={"sending_slot_reserved": True}, countdown=3)
+
+    with patch("apps.twilioapp.models.SMSMessage.send_sms") as mock_send_sms:
+        perform_notification(log_record.pk, sending_slot_reserved=True)
+
+    mock_send_sms.assert_called_once_with(user, alert_group, user_notification_policy, is_cloud_notification=False)
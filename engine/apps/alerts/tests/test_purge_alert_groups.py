@@ -0,0 +1,29 @@
+import pytest
+from django.utils import timezone
+
+from apps.alerts.models import Alert, AlertGroup
+from apps.alerts.tasks.purge_alert_groups import purge_resolved_alert_groups
+
+
+@pytest.mark.django_db
+def test_purge_resolved_alert_groups(
+    settings, make_organization, make_alert_receive_channel, make_alert_group, make_alert
+):
+    settings.ALERT_GROUP_RETENTION_DAYS = 30
+    organization = make_organization()
+    other_organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    other_alert_receive_channel = make_alert_receive_channel(other_organization)
+    old = timezone.now() - timezone.timedelta(days=31)
+    recent = timezone.now() - timezone.timedelta(days=1)
+
+    old_resolved = make_alert_group(alert_receive_channel, resolved=True, resolved_at=old)
+    make_alert(old_resolved, raw_request_data={})
+    recent_resolved = make_alert_group(alert_receive_channel, resolved=True, resolved_at=recent)
+    old_unresolved = make_alert_group(alert_receive_channel)
+    other_organization_old_resolved = make_alert_group(other_alert_receive_channel, resolved=True, resolved_at=old)
+
+    purge_resolved_alert_groups(organization.pk)
+
+    assert set(AlertGroup.all_objects.all()) == {recent_resolved, old_unresolved, other_organization_old_resolved}
+    assert not Alert.objects.exists()
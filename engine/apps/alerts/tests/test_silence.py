@@ -2,6 +2,7 @@ import pytest
 from django.utils import timezone
 
 from apps.alerts.models import AlertReceiveChannel
+from apps.base.models import ScheduledTask
 
 
 @pytest.mark.django_db
@@ -69,3 +70,28 @@ def test_unsilence_alert_group(
     assert alert_group.silenced_at is None
     assert alert_group.silenced_until is None
     assert alert_group.silenced_by_user is None
+
+
+@pytest.mark.django_db
+def test_silence_for_period_is_scheduled_in_database(
+    make_organization_and_user,
+    make_alert_receive_channel,
+    make_alert_group,
+):
+    organization, user = make_organization_and_user()
+    alert_receive_channel = make_alert_receive_channel(
+        organization, integration=AlertReceiveChannel.INTEGRATION_GRAFANA
+    )
+    alert_group = make_alert_group(alert_receive_channel)
+
+    alert_group.start_unsilence_task(countdown=3600)
+    first_unsilence_task_uuid = alert_group.unsilence_task_uuid
+    assert ScheduledTask.objects.filter(task_id=first_unsilence_task_uuid).exists()
+
+    # silencing again reschedules unsilence
+    alert_group.start_unsilence_task(countdown=7200)
+    assert list(ScheduledTask.objects.values_list("task_id", flat=True)) == [alert_group.unsilence_task_uuid]
+    assert alert_group.unsilence_task_uuid != first_unsilence_task_uuid
+
+    alert_group.un_silence()
+    assert not ScheduledTask.objects.exists()
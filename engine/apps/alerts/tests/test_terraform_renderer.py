@@ -1,4 +1,8 @@
+from unittest.mock import patch
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import dateparse, timezone
 from django.utils.text import slugify
 
@@ -146,3 +150,80 @@ def test_render_terraform_imports(
     )
 
     assert result == expected_result
+
+
+@pytest.mark.django_db
+def test_render_terraform_file_queries_count_does_not_depend_on_objects_count(
+    make_organization_and_user_with_slack_identities,
+    make_user_for_organization,
+    make_alert_receive_channel,
+    make_escalation_chain,
+    make_escalation_policy,
+    make_channel_filter,
+    make_slack_channel,
+    make_on_call_shift,
+    make_schedule,
+    django_assert_num_queries,
+):
+    organization, user, slack_team_identity, _ = make_organization_and_user_with_slack_identities()
+
+    def make_objects():
+        other_user = make_user_for_organization(organization)
+        slack_channel = make_slack_channel(slack_team_identity)
+        integration = make_alert_receive_channel(organization)
+        escalation_chain = make_escalation_chain(organization)
+        escalation_policy = make_escalation_policy(escalation_chain, EscalationPolicy.STEP_NOTIFY_MULTIPLE_USERS)
+        escalation_policy.notify_to_users_queue.add(user, other_user)
+        make_channel_filter(
+            integration,
+            escalation_chain=escalation_chain,
+            filtering_term="test",
+            slack_channel_id=slack_channel.slack_id,
+        )
+        make_schedule(organization, schedule_class=OnCallScheduleCalendar, channel=slack_channel.slack_id)
+        make_on_call_shift(
+            organization=organization,
+            shift_type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT,
+            frequency=CustomOnCallShift.FREQUENCY_WEEKLY,
+            start=timezone.now(),
+            rotation_start=timezone.now(),
+            duration=timezone.timedelta(seconds=3600),
+            rolling_users=[{user.pk: user.public_primary_key}, {other_user.pk: other_user.public_primary_key}],
+        )
+
+    make_objects()
+    renderer = TerraformFileRenderer(organization)
+    with CaptureQueriesContext(connection) as queries:
+        renderer.render_terraform_file()
+    queries_count = len(queries)
+
+    for _ in range(3):
+        make_objects()
+    renderer = TerraformFileRenderer(organization)
+    with django_assert_num_queries(queries_count):
+        result = renderer.render_terraform_file()
+
+    assert result.count('resource "amixr_route"') == 4
+    assert result.count('data "amixr_slack_channel"') == 4
+    assert result.count('resource "amixr_on_call_shift"') == 4
+
+
+@pytest.mark.django_db
+def test_render_terraform_file_integration_blocks_cache(
+    make_organization,
+    make_alert_receive_channel,
+):
+    organization = make_organization()
+    integration = make_alert_receive_channel(organization, grouping_id_template="{{ payload.id }}")
+
+    result = TerraformFileRenderer(organization).render_terraform_file()
+    assert 'grouping_key = "{{ payload.id }}"' in result
+
+    with patch.object(TerraformFileRenderer, "render_integration_template") as mock_render_integration_template:
+        assert TerraformFileRenderer(organization).render_terraform_file() == result
+    mock_render_integration_template.assert_not_called()
+
+    integration.grouping_id_template = "{{ payload.group }}"
+    integration.save()
+    result = TerraformFileRenderer(organization).render_terraform_file()
+    assert 'grouping_key = "{{ payload.group }}"' in result
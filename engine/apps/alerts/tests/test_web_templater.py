@@ -0,0 +1,45 @@
+import pytest
+
+from apps.alerts.incident_appearance.templaters import AlertWebTemplater
+from apps.alerts.incident_appearance.templaters.web_templater import format_web_message
+
+
+def test_format_web_message_links():
+    message = "**Runbook**: https://grafana.com/docs/a_b_c_d\n[dashboard](https://grafana.com/d/1) www.example.com"
+
+    assert format_web_message(message) == (
+        '<p><strong>Runbook</strong>: <a href="https://grafana.com/docs/a_b_c_d">https://grafana.com/docs/a_b_c_d</a><br/>'
+        '<a href="https://grafana.com/d/1">dashboard</a> <a href="http://www.example.com">www.example.com</a></p>'
+    )
+
+
+def test_format_web_message_many_links():
+    links = [f"https://grafana.com/d/{i}" for i in range(12)]
+
+    formatted = format_web_message(" ".join(links))
+
+    for link in links:
+        assert f'<a href="{link}">{link}</a>' in formatted
+    assert "amixrsubstitutedlink" not in formatted
+
+
+@pytest.mark.django_db
+def test_web_templater_render_is_cached(
+    make_organization, make_alert_receive_channel, make_alert_group, make_alert, django_assert_num_queries
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(
+        organization, web_title_template="{{ payload.title }}", web_message_template="{{ payload.message }}"
+    )
+    alert_group = make_alert_group(alert_receive_channel)
+    alert = make_alert(alert_group=alert_group, raw_request_data={"title": "title", "message": "message"})
+
+    templated_alert = AlertWebTemplater(alert).render()
+    assert templated_alert.title == "title"
+
+    with django_assert_num_queries(0):
+        assert AlertWebTemplater(alert).render() == templated_alert
+
+    # changing the template renders the alert again
+    alert_receive_channel.web_title_template = "new {{ payload.title }}"
+    assert AlertWebTemplater(alert).render().title == "new title"
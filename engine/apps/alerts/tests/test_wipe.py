@@ -8,13 +8,19 @@ def test_wipe_alert_group(
     make_organization_and_user,
     make_alert_receive_channel,
     make_alert_group,
+    make_alert,
 ):
     organization, user = make_organization_and_user()
     alert_receive_channel = make_alert_receive_channel(organization)
     alert_group = make_alert_group(alert_receive_channel)
+    alert = make_alert(alert_group, raw_request_data={"title": "secret"}, title="secret")
 
     wipe(alert_group.pk, user.pk)
 
     alert_group.refresh_from_db()
     assert alert_group.wiped_at is not None
     assert alert_group.wiped_by == user
+
+    alert.refresh_from_db()
+    assert alert.raw_request_data == {}
+    assert alert.title.startswith(f"Wiped by {user.username}")
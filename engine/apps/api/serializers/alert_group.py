@@ -137,21 +137,12 @@ class AlertGroupSerializer(AlertGroupListSerializer):
             "last_alert_at",
         ]
 
-    def get_render_for_web(self, obj):
-        # alert group has no alerts
-        alert = obj.alerts.last()
-        if not alert:
-            return {}
-
-        return AlertGroupWebRenderer(obj).render()
-
     def get_last_alert_at(self, obj):
-        last_alert = obj.alerts.last()
-
-        if not last_alert:
+        # alert group has no alerts
+        if not obj.last_alert_at:
             return obj.started_at
 
-        return last_alert.created_at
+        return obj.last_alert_at
 
     def get_limited_alerts(self, obj):
         """
@@ -1,4 +1,5 @@
 import datetime
+import json
 from unittest.mock import patch
 
 import pytest
@@ -1469,3 +1470,50 @@ def test_alert_group_preview_body_invalid_template_syntax(
     response = client.post(url, data, format="json", **make_user_auth_headers(user, token))
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_export_alert_groups_csv(alert_group_internal_api_setup, make_user_auth_headers):
+    user, token, alert_groups = alert_group_internal_api_setup
+    client = APIClient()
+
+    url = reverse("api-internal:alertgroup-export", kwargs={"export_type": "alert_groups"})
+    response = client.get(url + "?status=2", **make_user_auth_headers(user, token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    resolved_alert_group = AlertGroup.all_objects.get(status=AlertGroup.RESOLVED)
+    assert lines[0] == "id,integration_id,route_id,state,alerts_count,title,created_at,acknowledged_at,resolved_at"
+    assert len(lines) == 2
+    assert lines[1].startswith(f"{resolved_alert_group.public_primary_key},")
+    assert ",resolved,1," in lines[1]
+
+
+@pytest.mark.django_db
+def test_export_log_records_ndjson(alert_group_internal_api_setup, make_user_auth_headers):
+    user, token, alert_groups = alert_group_internal_api_setup
+    for alert_group in alert_groups:
+        alert_group.log_records.create(type=AlertGroupLogRecord.TYPE_REGISTERED)
+    client = APIClient()
+
+    url = reverse("api-internal:alertgroup-export", kwargs={"export_type": "log_records"})
+    response = client.get(url + "?export_format=ndjson", **make_user_auth_headers(user, token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+    assert len(rows) == len(alert_groups)
+    assert {row["alert_group_id"] for row in rows} == {alert_group.public_primary_key for alert_group in alert_groups}
+    assert rows[0]["action"] == "alert group registered"
+
+
+@pytest.mark.django_db
+def test_export_invalid_format(alert_group_internal_api_setup, make_user_auth_headers):
+    user, token, _ = alert_group_internal_api_setup
+    client = APIClient()
+
+    url = reverse("api-internal:alertgroup-export", kwargs={"export_type": "resolution_notes"})
+    response = client.get(url + "?export_format=xml", **make_user_auth_headers(user, token))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -3,6 +3,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from apps.alerts.terraform_renderer import TerraformFileRenderer
 from common.constants.role import Role
 
 
@@ -34,6 +35,27 @@ def test_terraform_gitops_permissions(
     assert response.status_code == expected_status
 
 
+@pytest.mark.django_db
+def test_terraform_gitops_file(
+    make_organization_and_user_with_plugin_token,
+    make_escalation_chain,
+    make_user_auth_headers,
+):
+    organization, user, token = make_organization_and_user_with_plugin_token()
+    escalation_chain = make_escalation_chain(organization)
+
+    client = APIClient()
+
+    url = reverse("api-internal:terraform_file")
+
+    response = client.get(url, format="json", **make_user_auth_headers(user, token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/plain; charset=utf-8"
+    assert response.content.decode() == TerraformFileRenderer(organization).render_terraform_file()
+    assert f'name = "{escalation_chain.name}"' in response.content.decode()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "role,expected_status",
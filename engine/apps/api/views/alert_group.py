@@ -1,6 +1,6 @@
 from datetime import timedelta
 
-from django.db.models import Count, Max, Q
+from django.db.models import Q
 from django.utils import timezone
 from django_filters import rest_framework as filters
 from django_filters.widgets import RangeWidget
@@ -11,14 +11,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.alerts.constants import ActionSource
-from apps.alerts.models import Alert, AlertGroup, AlertReceiveChannel
+from apps.alerts.export import EXPORT_FORMATS, EXPORT_TYPES_PATTERN, get_export_response
+from apps.alerts.models import AlertGroup, AlertReceiveChannel
 from apps.api.permissions import MODIFY_ACTIONS, READ_ACTIONS, ActionPermission, AnyRole, IsAdminOrEditor
 from apps.api.serializers.alert_group import AlertGroupListSerializer, AlertGroupSerializer
 from apps.auth_token.auth import MobileAppAuthTokenAuthentication, PluginAuthentication
 from apps.user_management.models import User
 from common.api_helpers.exceptions import BadRequest
 from common.api_helpers.filters import DateRangeFilterMixin, ModelFieldFilterMixin
-from common.api_helpers.mixins import PreviewTemplateMixin, PublicPrimaryKeyMixin, TeamFilteringMixin
+from common.api_helpers.mixins import PreviewTemplateMixin, PublicPrimaryKeyMixin, ReadReplicaMixin, TeamFilteringMixin
 from common.api_helpers.paginators import TwentyFiveCursorPaginator
 
 
@@ -57,7 +58,7 @@ class AlertGroupFilter(DateRangeFilterMixin, ModelFieldFilterMixin, filters.Filt
         method=ModelFieldFilterMixin.filter_model_field.__name__,
     )
     integration = filters.ModelMultipleChoiceFilter(
-        field_name="channel_filter__alert_receive_channel",
+        field_name="channel",
         queryset=get_integration_queryset,
         to_field_name="public_primary_key",
         method=ModelFieldFilterMixin.filter_model_field.__name__,
@@ -104,22 +105,7 @@ class AlertGroupFilter(DateRangeFilterMixin, ModelFieldFilterMixin, filters.Filt
         except ValueError:
             raise BadRequest(detail="Invalid status value")
 
-        filters = {}
-        q_objects = Q()
-
-        if AlertGroup.NEW in statuses:
-            filters["new"] = Q(silenced=False) & Q(acknowledged=False) & Q(resolved=False)
-        if AlertGroup.SILENCED in statuses:
-            filters["silenced"] = Q(silenced=True) & Q(acknowledged=False) & Q(resolved=False)
-        if AlertGroup.ACKNOWLEDGED in statuses:
-            filters["acknowledged"] = Q(acknowledged=True) & Q(resolved=False)
-        if AlertGroup.RESOLVED in statuses:
-            filters["resolved"] = Q(resolved=True)
-
-        for item in filters:
-            q_objects |= filters[item]
-
-        queryset = queryset.filter(q_objects)
+        queryset = queryset.filter(status__in=statuses)
 
         return queryset
 
@@ -148,6 +134,7 @@ class AlertGroupTeamFilteringMixin(TeamFilteringMixin):
 
 
 class AlertGroupView(
+    ReadReplicaMixin,
     PreviewTemplateMixin,
     AlertGroupTeamFilteringMixin,
     PublicPrimaryKeyMixin,
@@ -181,6 +168,7 @@ class AlertGroupView(
             "filters",
             "silence_options",
             "bulk_action_options",
+            "export",
         ),
     }
 
@@ -205,7 +193,7 @@ class AlertGroupView(
     def get_queryset(self):
         # no select_related or prefetch_related is used at this point, it will be done on paginate_queryset.
         queryset = AlertGroup.unarchived_objects.filter(
-            channel__organization=self.request.auth.organization, channel__team=self.request.user.current_team
+            organization=self.request.auth.organization, channel__team=self.request.user.current_team
         ).only("id")
 
         return queryset
@@ -227,7 +215,7 @@ class AlertGroupView(
     def enrich(self, alert_groups):
         """
         This method performs select_related and prefetch_related (using setup_eager_loading) as well as in-memory joins
-        to add additional info like alert_count and last_alert for every alert group efficiently.
+        to link the last alert back to every alert group efficiently.
         We need the last_alert because it's used by AlertGroupWebRenderer.
         """
 
@@ -239,33 +227,14 @@ class AlertGroupView(
         queryset = queryset.defer("cached_render_for_web")
 
         queryset = self.get_serializer_class().setup_eager_loading(queryset)
+        # alerts count and last alert are denormalized on alert group, so no aggregation over alerts is needed
+        queryset = queryset.select_related("last_alert")
         alert_groups = list(queryset)
 
-        # get info on alerts count and last alert ID for every alert group
-        alerts_info = (
-            Alert.objects.values("group_id")
-            .filter(group_id__in=alert_group_pks)
-            .annotate(alerts_count=Count("group_id"), last_alert_id=Max("id"))
-        )
-        alerts_info_map = {info["group_id"]: info for info in alerts_info}
-
-        # fetch last alerts for every alert group
-        last_alert_ids = [info["last_alert_id"] for info in alerts_info_map.values()]
-        last_alerts = Alert.objects.filter(pk__in=last_alert_ids)
-        for alert in last_alerts:
-            # link group back to alert
-            alert.group = [alert_group for alert_group in alert_groups if alert_group.pk == alert.group_id][0]
-            alerts_info_map[alert.group_id].update({"last_alert": alert})
-
-        # add additional "alerts_count" and "last_alert" fields to every alert group
         for alert_group in alert_groups:
-            try:
-                alert_group.last_alert = alerts_info_map[alert_group.pk]["last_alert"]
-                alert_group.alerts_count = alerts_info_map[alert_group.pk]["alerts_count"]
-            except KeyError:
-                # alert group has no alerts
-                alert_group.last_alert = None
-                alert_group.alerts_count = 0
+            # link group back to alert
+            if alert_group.last_alert is not None:
+                alert_group.last_alert.group = alert_group
 
         return alert_groups
 
@@ -288,6 +257,18 @@ class AlertGroupView(
             }
         )
 
+    @action(methods=["get"], detail=False, url_path=rf"export/(?P<export_type>{EXPORT_TYPES_PATTERN})")
+    def export(self, request, export_type):
+        """
+        Streams filtered alert groups, their log records or resolution notes as CSV (default) or NDJSON.
+        """
+        export_format = request.query_params.get("export_format", EXPORT_FORMATS[0])
+        if export_format not in EXPORT_FORMATS:
+            raise BadRequest(detail=f"export_format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+        alert_groups = self.filter_queryset(self.get_queryset())
+        return get_export_response(export_type, export_format, alert_groups)
+
     @action(methods=["post"], detail=True)
     def acknowledge(self, request, pk):
         alert_group = self.get_object()
@@ -5,9 +5,10 @@ from rest_framework.views import APIView
 from apps.alerts.terraform_renderer import TerraformFileRenderer, TerraformStateRenderer
 from apps.api.response_renderers import PlainTextRenderer
 from apps.auth_token.auth import PluginAuthentication
+from common.api_helpers.mixins import ReadReplicaMixin
 
 
-class TerraformGitOpsView(APIView):
+class TerraformGitOpsView(ReadReplicaMixin, APIView):
     authentication_classes = (PluginAuthentication,)
     permission_classes = (IsAuthenticated,)
 
@@ -20,7 +21,7 @@ class TerraformGitOpsView(APIView):
         return Response(terraform_file)
 
 
-class TerraformStateView(APIView):
+class TerraformStateView(ReadReplicaMixin, APIView):
     authentication_classes = (PluginAuthentication,)
     permission_classes = (IsAuthenticated,)
 
@@ -29,6 +29,7 @@ from common.api_helpers.exceptions import BadRequest, Conflict
 from common.api_helpers.mixins import (
     CreateSerializerMixin,
     PublicPrimaryKeyMixin,
+    ReadReplicaMixin,
     ShortSerializerMixin,
     UpdateSerializerMixin,
 )
@@ -41,7 +42,12 @@ EVENTS_FILTER_BY_FINAL = "final"
 
 
 class ScheduleView(
-    PublicPrimaryKeyMixin, ShortSerializerMixin, CreateSerializerMixin, UpdateSerializerMixin, ModelViewSet
+    ReadReplicaMixin,
+    PublicPrimaryKeyMixin,
+    ShortSerializerMixin,
+    CreateSerializerMixin,
+    UpdateSerializerMixin,
+    ModelViewSet,
 ):
     authentication_classes = (PluginAuthentication,)
     permission_classes = (IsAuthenticated, ActionPermission)
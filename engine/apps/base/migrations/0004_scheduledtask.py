@@ -0,0 +1,27 @@
+# Generated by Django 3.2.15 on 2022-08-24 10:41
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0003_delete_organizationlogrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=500)),
+                ('args', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('kwargs', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('task_id', models.CharField(max_length=100, unique=True)),
+                ('eta', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('dispatched_at', models.DateTimeField(default=None, null=True)),
+            ],
+        ),
+    ]
@@ -1,5 +1,12 @@
 from django.db import IntegrityError, models
 from django.db.models import JSONField
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from common.insight_log.insight_logs_enabled_check import (
+    INSIGHT_LOGS_DYNAMIC_SETTING_NAME,
+    invalidate_insight_logs_enabled_cache,
+)
 
 
 class DynamicSettingsManager(models.Manager):
@@ -37,3 +44,9 @@ class DynamicSetting(models.Model):
 
     def __str__(self):
         return self.name
+
+
+@receiver(post_save, sender=DynamicSetting)
+def listen_for_dynamicsetting_model_save(sender, instance, *args, **kwargs):
+    if instance.name == INSIGHT_LOGS_DYNAMIC_SETTING_NAME:
+        invalidate_insight_logs_enabled_cache()
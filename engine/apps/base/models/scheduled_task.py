@@ -0,0 +1,104 @@
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from kombu import uuid as celery_uuid
+
+from engine.celery import app
+
+# Tasks due sooner than the interval are sent to the broker right away, the rest are kept in the database
+# until dispatch_scheduled_tasks, which runs with the same interval, sends them to the broker with their eta.
+SCHEDULED_TASKS_DISPATCH_INTERVAL = 60
+SCHEDULED_TASKS_DISPATCH_BATCH_SIZE = 500
+# Tasks claimed by a dispatch which didn't finish sending them (e.g. its worker was killed) are claimed again after it
+SCHEDULED_TASKS_DISPATCH_CLAIM_TIMEOUT = 60 * 5
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledTask(models.Model):
+    """
+    Celery task scheduled far in the future.
+    Workers don't hold such tasks in memory as unacked ETA messages, and they can be cancelled by deleting the row.
+    """
+
+    name = models.CharField(max_length=500)
+    args = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    task_id = models.CharField(max_length=100, unique=True)
+    eta = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # set when the task is claimed by a dispatch to be sent to the broker
+    dispatched_at = models.DateTimeField(null=True, default=None)
+
+    @classmethod
+    def schedule(cls, task, args=None, kwargs=None, countdown=None, eta=None, task_id=None):
+        """
+        Schedules task like task.apply_async(args, kwargs, countdown=countdown, eta=eta, task_id=task_id).
+        Returns task id, so the task can be checked for being actual when it's executed or cancelled.
+        """
+        task_id = task_id or celery_uuid()
+        now = timezone.now()
+        if eta is None:
+            eta = now + timezone.timedelta(seconds=countdown or 0)
+
+        if eta <= now + timezone.timedelta(seconds=SCHEDULED_TASKS_DISPATCH_INTERVAL):
+            task.apply_async(args, kwargs, eta=eta, task_id=task_id)
+        else:
+            cls.objects.create(name=task.name, args=list(args or []), kwargs=kwargs or {}, task_id=task_id, eta=eta)
+        return task_id
+
+    @classmethod
+    def cancel(cls, task_id):
+        """Cancels task which is not sent to the broker yet, tasks which are already sent are discarded as stale."""
+        if task_id is not None:
+            cls.objects.filter(task_id=task_id).delete()
+
+    @classmethod
+    def dispatch_due_tasks(cls, batch_size=SCHEDULED_TASKS_DISPATCH_BATCH_SIZE):
+        """
+        Sends tasks due before the next dispatch to the broker with their eta, so they are still executed on time.
+        Tasks are claimed in a short transaction and sent after it's committed, so row locks aren't held while
+        waiting for the broker. Rows locked by a concurrent dispatch are skipped where the database supports it.
+        Tasks which failed to be sent are released for the next dispatch.
+        Returns numbers of sent and failed tasks.
+        """
+        now = timezone.now()
+        due_before = now + timezone.timedelta(seconds=SCHEDULED_TASKS_DISPATCH_INTERVAL)
+        claim_expired_before = now - timezone.timedelta(seconds=SCHEDULED_TASKS_DISPATCH_CLAIM_TIMEOUT)
+        sent_count = 0
+        failed_task_pks = []
+        while True:
+            with transaction.atomic():
+                scheduled_tasks = list(
+                    cls.objects.filter(eta__lte=due_before)
+                    .filter(Q(dispatched_at__isnull=True) | Q(dispatched_at__lt=claim_expired_before))
+                    .exclude(pk__in=failed_task_pks)
+                    .select_for_update(skip_locked=connection.features.has_select_for_update_skip_locked)
+                    .order_by("eta")[:batch_size]
+                )
+                cls.objects.filter(pk__in=[task.pk for task in scheduled_tasks]).update(dispatched_at=timezone.now())
+
+            sent_task_pks = []
+            batch_failed_task_pks = []
+            for scheduled_task in scheduled_tasks:
+                try:
+                    scheduled_task.send()
+                except Exception:
+                    logger.exception(f"Failed to send scheduled task {scheduled_task.task_id} to the broker")
+                    batch_failed_task_pks.append(scheduled_task.pk)
+                    continue
+                sent_task_pks.append(scheduled_task.pk)
+
+            cls.objects.filter(pk__in=sent_task_pks).delete()
+            cls.objects.filter(pk__in=batch_failed_task_pks).update(dispatched_at=None)
+            sent_count += len(sent_task_pks)
+            failed_task_pks += batch_failed_task_pks
+            # stop if the batch isn't full or nothing could be sent, not to retry failed tasks in a loop
+            if len(scheduled_tasks) < batch_size or not sent_task_pks:
+                return sent_count, len(failed_task_pks)
+
+    def send(self):
+        app.send_task(name=self.name, args=self.args, kwargs=self.kwargs, task_id=self.task_id, eta=self.eta)
@@ -1,11 +1,14 @@
 from enum import unique
-from typing import Tuple
+from typing import List, Tuple
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator
 from django.db import models, transaction
 from django.db.models import Q, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from ordered_model.models import OrderedModel
 
@@ -69,6 +72,30 @@ def validate_channel_choice(value):
 
 
 class UserNotificationPolicyQuerySet(models.QuerySet):
+    CACHE_KEY_PREFIX = "user_notification_policies"
+    CACHE_LIFETIME = 60 * 60 * 24
+
+    @classmethod
+    def _get_cache_key(cls, user_pk: int, important: bool) -> str:
+        return f"{cls.CACHE_KEY_PREFIX}_{user_pk}_{important}"
+
+    @classmethod
+    def invalidate_cache_for_user(cls, user_pk: int) -> None:
+        cache.delete_many([cls._get_cache_key(user_pk, important) for important in (False, True)])
+
+    def get_cached_for_user(self, user: User, important: bool) -> List["UserNotificationPolicy"]:
+        """
+        Returns the whole ordered notification chain of a user as a list, so it can be walked by index
+        instead of calling OrderedModel.next() (one query per step).
+        The cache is invalidated on every change of user's notification policies.
+        """
+        cache_key = self._get_cache_key(user.pk, important)
+        notification_policies = cache.get(cache_key)
+        if notification_policies is None:
+            notification_policies = list(self.get_or_create_for_user(user, important))
+            cache.set(cache_key, notification_policies, timeout=self.CACHE_LIFETIME)
+        return notification_policies
+
     def get_or_create_for_user(self, user: User, important: bool) -> "QuerySet[UserNotificationPolicy]":
         with transaction.atomic():
             User.objects.select_for_update().get(pk=user.pk)
@@ -102,6 +129,7 @@ class UserNotificationPolicyQuerySet(models.QuerySet):
         )
 
         super().bulk_create(policies_to_create)
+        self.invalidate_cache_for_user(user.pk)
         return user.notification_policies.filter(important=False)
 
     def create_important_policies_for_user(self, user: User) -> "QuerySet[UserNotificationPolicy]":
@@ -118,6 +146,7 @@ class UserNotificationPolicyQuerySet(models.QuerySet):
         )
 
         super().bulk_create(policies_to_create)
+        self.invalidate_cache_for_user(user.pk)
         return user.notification_policies.filter(important=True)
 
 
@@ -198,6 +227,18 @@ class UserNotificationPolicy(OrderedModel):
             return "Not set"
 
 
+@receiver(post_save, sender=UserNotificationPolicy)
+@receiver(post_delete, sender=UserNotificationPolicy)
+def listen_for_usernotificationpolicy_model_change(sender, instance, *args, **kwargs):
+    # OrderedModel shifts orders of the sibling policies with QuerySet.update(),
+    # but it always saves or deletes the policy being changed, so it's enough to drop the user's cache here
+    user_pk = instance.user_id
+    if user_pk is not None:
+        UserNotificationPolicyQuerySet.invalidate_cache_for_user(user_pk)
+        # drop it once again after commit in case a concurrent task has cached the chain before the commit
+        transaction.on_commit(lambda: UserNotificationPolicyQuerySet.invalidate_cache_for_user(user_pk))
+
+
 class NotificationChannelOptions:
     """
     NotificationChannelOptions encapsulates logic of notification channel representation for API and public API,
@@ -7,6 +7,7 @@ from django.dispatch import receiver
 from django.utils.functional import cached_property
 from rest_framework.fields import DateTimeField
 
+from apps.alerts.incident_log_builder import IncidentLogBuilder
 from apps.alerts.tasks import send_update_log_report_signal
 from apps.alerts.utils import render_relative_timeline
 from apps.base.messaging import get_messaging_backend_from_id
@@ -316,6 +317,7 @@ class UserNotificationPolicyLogRecord(models.Model):
 @receiver(post_save, sender=UserNotificationPolicyLogRecord)
 def listen_for_usernotificationpolicylogrecord_model_save(sender, instance, created, *args, **kwargs):
     alert_group_pk = instance.alert_group.pk
+    IncidentLogBuilder.invalidate_escalation_plan_cache(alert_group_pk)
     if instance.type != UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FINISHED:
         logger.debug(
             f"send_update_log_report_signal for alert_group {alert_group_pk}, "
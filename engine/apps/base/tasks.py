@@ -1,9 +1,12 @@
+from celery.utils.log import get_task_logger
 from django.db import transaction
 
-from apps.base.models import FailedToInvokeCeleryTask
+from apps.base.models import FailedToInvokeCeleryTask, ScheduledTask
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
 from common.utils import batch_queryset
 
+logger = get_task_logger(__name__)
+
 
 @shared_dedicated_queue_retry_task
 def process_failed_to_invoke_celery_tasks():
@@ -28,3 +31,9 @@ def process_failed_to_invoke_celery_tasks_batch(task_pks):
             sent_task_pks.append(task.pk)
 
         FailedToInvokeCeleryTask.objects.filter(pk__in=sent_task_pks).update(is_sent=True)
+
+
+@shared_dedicated_queue_retry_task
+def dispatch_scheduled_tasks():
+    sent_count, failed_count = ScheduledTask.dispatch_due_tasks()
+    logger.info(f"{sent_count} scheduled tasks sent, {failed_count} failed to be sent")
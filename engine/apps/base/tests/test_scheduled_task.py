@@ -0,0 +1,97 @@
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+
+from apps.alerts.tasks import unsilence_task
+from apps.base.models import ScheduledTask
+from apps.base.models.scheduled_task import SCHEDULED_TASKS_DISPATCH_CLAIM_TIMEOUT, SCHEDULED_TASKS_DISPATCH_INTERVAL
+from apps.base.tasks import dispatch_scheduled_tasks
+
+
+@pytest.mark.django_db
+def test_schedule_task_due_soon_is_sent_to_broker():
+    with patch.object(unsilence_task, "apply_async") as mock_apply_async:
+        task_id = ScheduledTask.schedule(unsilence_task, (1,), countdown=SCHEDULED_TASKS_DISPATCH_INTERVAL - 10)
+
+    assert mock_apply_async.call_count == 1
+    assert mock_apply_async.call_args.kwargs["task_id"] == task_id
+    assert not ScheduledTask.objects.exists()
+
+
+@pytest.mark.django_db
+def test_schedule_task_due_later_is_stored():
+    eta = timezone.now() + timezone.timedelta(hours=1)
+    with patch.object(unsilence_task, "apply_async") as mock_apply_async:
+        task_id = ScheduledTask.schedule(unsilence_task, (1,), eta=eta)
+
+    assert mock_apply_async.called is False
+    scheduled_task = ScheduledTask.objects.get()
+    assert scheduled_task.task_id == task_id
+    assert scheduled_task.name == unsilence_task.name
+    assert scheduled_task.args == [1]
+    assert scheduled_task.eta == eta
+
+    ScheduledTask.cancel(task_id)
+    assert not ScheduledTask.objects.exists()
+
+
+@pytest.mark.django_db
+def test_dispatch_scheduled_tasks():
+    now = timezone.now()
+    due_tasks = [
+        ScheduledTask.objects.create(name="task", args=[i], task_id=f"due-{i}", eta=now - timezone.timedelta(minutes=i))
+        for i in range(3)
+    ]
+    # sent in advance with its eta, so it's executed on time
+    soon_task = ScheduledTask.objects.create(name="task", task_id="soon", eta=now + timezone.timedelta(seconds=30))
+    later_task = ScheduledTask.objects.create(name="task", task_id="later", eta=now + timezone.timedelta(hours=1))
+
+    with patch("apps.base.models.scheduled_task.app.send_task") as mock_send_task:
+        assert ScheduledTask.dispatch_due_tasks(batch_size=2) == (4, 0)
+
+    sent_task_ids = [call.kwargs["task_id"] for call in mock_send_task.call_args_list]
+    assert sorted(sent_task_ids) == sorted([task.task_id for task in due_tasks] + [soon_task.task_id])
+    assert mock_send_task.call_args_list[-1].kwargs["eta"] == soon_task.eta
+    assert list(ScheduledTask.objects.all()) == [later_task]
+
+
+@pytest.mark.django_db
+def test_dispatch_scheduled_tasks_keeps_not_sent_tasks():
+    now = timezone.now()
+    ScheduledTask.objects.create(name="task", task_id="failed", eta=now)
+    sent_task = ScheduledTask.objects.create(name="task", task_id="sent", eta=now)
+
+    def send_task(name, task_id, **kwargs):
+        # tasks are claimed before they are sent
+        assert ScheduledTask.objects.get(task_id=task_id).dispatched_at is not None
+        if task_id == "failed":
+            raise Exception("broker is not available")
+
+    with patch("apps.base.models.scheduled_task.app.send_task", side_effect=send_task), patch(
+        "apps.base.models.scheduled_task.logger"
+    ) as mock_logger:
+        dispatch_scheduled_tasks()
+
+    mock_logger.exception.assert_called_once()
+    # failed task is released for the next dispatch
+    assert list(ScheduledTask.objects.values_list("task_id", "dispatched_at")) == [("failed", None)]
+    assert not ScheduledTask.objects.filter(pk=sent_task.pk).exists()
+
+
+@pytest.mark.django_db
+def test_dispatch_scheduled_tasks_skips_claimed_tasks():
+    now = timezone.now()
+    ScheduledTask.objects.create(name="task", task_id="claimed", eta=now, dispatched_at=now)
+    ScheduledTask.objects.create(
+        name="task",
+        task_id="claim_expired",
+        eta=now,
+        dispatched_at=now - timezone.timedelta(seconds=SCHEDULED_TASKS_DISPATCH_CLAIM_TIMEOUT + 1),
+    )
+
+    with patch("apps.base.models.scheduled_task.app.send_task") as mock_send_task:
+        assert ScheduledTask.dispatch_due_tasks() == (1, 0)
+
+    assert mock_send_task.call_args.kwargs["task_id"] == "claim_expired"
+    assert list(ScheduledTask.objects.values_list("task_id", flat=True)) == ["claimed"]
@@ -80,3 +80,38 @@ def test_extra_messaging_backends_details():
     )
 
     assert validate_channel_choice(channel_choice) is None
+
+
+@pytest.mark.django_db
+def test_get_cached_for_user(
+    make_organization,
+    make_user_for_organization,
+    make_user_notification_policy,
+    django_assert_num_queries,
+):
+    organization = make_organization()
+    user = make_user_for_organization(organization)
+
+    first_policy = make_user_notification_policy(
+        user, UserNotificationPolicy.Step.NOTIFY, notify_by=UserNotificationPolicy.NotificationChannel.SLACK
+    )
+    second_policy = make_user_notification_policy(
+        user, UserNotificationPolicy.Step.WAIT, wait_delay=timedelta(minutes=5)
+    )
+
+    notification_policies = UserNotificationPolicy.objects.get_cached_for_user(user, important=False)
+    assert notification_policies == [first_policy, second_policy]
+
+    # the chain is taken from cache
+    with django_assert_num_queries(0):
+        assert UserNotificationPolicy.objects.get_cached_for_user(user, important=False) == notification_policies
+
+    # cache is invalidated on reordering
+    second_policy.to(0)
+    notification_policies = UserNotificationPolicy.objects.get_cached_for_user(user, important=False)
+    assert [policy.pk for policy in notification_policies] == [second_policy.pk, first_policy.pk]
+
+    # cache is invalidated on deletion
+    first_policy.delete()
+    notification_policies = UserNotificationPolicy.objects.get_cached_for_user(user, important=False)
+    assert [policy.pk for policy in notification_policies] == [second_policy.pk]
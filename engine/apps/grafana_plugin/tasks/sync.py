@@ -9,6 +9,7 @@ from apps.grafana_plugin.helpers.gcom import get_active_instance_ids
 from apps.user_management.models import Organization
 from apps.user_management.sync import sync_organization
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
+from common.utils import iterate_queryset
 
 logger = get_task_logger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -36,7 +37,7 @@ def start_sync_organizations():
     organization_pks = organization_qs.values_list("pk", flat=True)
 
     max_countdown = 25 * 60  # SYNC_PERIOD minutes -> Seconds
-    for idx, organization_pk in enumerate(organization_pks):
+    for idx, organization_pk in enumerate(iterate_queryset(organization_pks)):
         countdown = idx % max_countdown  # Spread orgs evenly along SYNC_PERIOD
         sync_organization_async.apply_async((organization_pk,), countdown=countdown)
 
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.15 on 2022-08-05 11:24
+
+from django.db import migrations, models
+from django.utils import timezone
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_expires_at(apps, schema_editor):
+    """
+    Fills expires_at of heartbeats which got at least one signal, so they are checked by the expiration sweeper
+    without waiting for the next signal.
+    """
+    for model_name in ("HeartBeat", "IntegrationHeartBeat"):
+        model = apps.get_model("heartbeat", model_name)
+        heartbeats = model.objects.filter(last_heartbeat_time__isnull=False).only("last_heartbeat_time", "timeout_seconds")
+        batch = []
+        for heartbeat in heartbeats.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+            heartbeat.expires_at = heartbeat.last_heartbeat_time + timezone.timedelta(seconds=heartbeat.timeout_seconds)
+            batch.append(heartbeat)
+            if len(batch) == BACKFILL_BATCH_SIZE:
+                model.objects.bulk_update(batch, ["expires_at"])
+                batch = []
+        model.objects.bulk_update(batch, ["expires_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('heartbeat', '0001_squashed_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='heartbeat',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='integrationheartbeat',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=None, null=True),
+        ),
+        migrations.RunPython(backfill_expires_at, migrations.RunPython.noop),
+    ]
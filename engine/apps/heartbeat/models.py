@@ -3,7 +3,7 @@ from urllib.parse import urljoin
 
 from django.conf import settings
 from django.core.validators import MinLengthValidator
-from django.db import models, transaction
+from django.db import connection, models, transaction
 from django.utils import timezone
 
 from apps.integrations.tasks import create_alert
@@ -11,6 +11,8 @@ from common.public_primary_keys import generate_public_primary_key, increase_pub
 
 logger = logging.getLogger(__name__)
 
+HEARTBEATS_EXPIRATION_BATCH_SIZE = 500
+
 
 def generate_public_primary_key_for_integration_heart_beat():
     prefix = "B"
@@ -40,19 +42,74 @@ class BaseHeartBeat(models.Model):
     last_checkup_task_time = models.DateTimeField(default=None, null=True)
     actual_check_up_task_id = models.CharField(max_length=100)
     previous_alerted_state_was_life = models.BooleanField(default=True)
+    # last_heartbeat_time + timeout_seconds, indexed so overdue heartbeats are found without scanning all of them
+    expires_at = models.DateTimeField(default=None, null=True, db_index=True)
+
+    def save(self, *args, **kwargs):
+        self.expires_at = self.expiration_time if self.last_heartbeat_time is not None else None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"last_heartbeat_time", "timeout_seconds"} & set(update_fields):
+            kwargs["update_fields"] = list(update_fields) + ["expires_at"]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def process_heartbeat_signal(cls, **lookup):
+        """
+        Moves expiration of the heartbeat found by lookup without locking its row: the row is read and then updated
+        only if it wasn't changed in between, so concurrent signals don't wait for each other.
+        Returns False if heartbeat is not found.
+        """
+        heartbeats = cls.objects.filter(**lookup)
+        while True:
+            heartbeat_state = heartbeats.values_list("timeout_seconds", "previous_alerted_state_was_life").first()
+            if heartbeat_state is None:
+                return False
+            timeout_seconds, was_alive = heartbeat_state
+            now = timezone.now()
+            updated = heartbeats.filter(
+                timeout_seconds=timeout_seconds, previous_alerted_state_was_life=was_alive
+            ).update(
+                previous_alerted_state_was_life=True,
+                last_heartbeat_time=now,
+                expires_at=now + timezone.timedelta(seconds=timeout_seconds),
+            )
+            if updated:
+                break
+
+        # only one of concurrent signals gets to restore expired heartbeat
+        if not was_alive:
+            heartbeat = heartbeats.select_related("alert_receive_channel").get()
+            heartbeat.on_heartbeat_restored()
+        return True
 
     @classmethod
-    def perform_heartbeat_check(cls, heartbeat_id, task_request_id):
-        with transaction.atomic():
-            heartbeats = cls.objects.filter(pk=heartbeat_id).select_for_update()
-            if len(heartbeats) == 0:
-                logger.info(f"Heartbeat {heartbeat_id} not found {task_request_id}")
-                return
-            heartbeat = heartbeats[0]
-            if task_request_id == heartbeat.actual_check_up_task_id:
-                heartbeat.check_heartbeat_state_and_save()
-            else:
-                logger.info(f"Heartbeat {heartbeat_id} is not actual {task_request_id}")
+    def expire_overdue_heartbeats(cls, batch_size=HEARTBEATS_EXPIRATION_BATCH_SIZE):
+        """
+        Expires alive heartbeats with expires_at in the past in batches. Returns number of expired heartbeats.
+        Rows locked by another sweeper are skipped where the database supports it.
+        Signals for selected heartbeats wait until the batch is committed and then restore them.
+        """
+        now = timezone.now()
+        expired_count = 0
+        while True:
+            with transaction.atomic():
+                heartbeats = list(
+                    cls.objects.filter(previous_alerted_state_was_life=True, expires_at__lt=now)
+                    .select_related("alert_receive_channel")
+                    .select_for_update(
+                        skip_locked=connection.features.has_select_for_update_skip_locked,
+                        of=("self",) if connection.features.has_select_for_update_of else (),
+                    )
+                    .order_by("expires_at")[:batch_size]
+                )
+                cls.objects.filter(pk__in=[heartbeat.pk for heartbeat in heartbeats]).update(
+                    previous_alerted_state_was_life=False
+                )
+            for heartbeat in heartbeats:
+                heartbeat.on_heartbeat_expired()
+            expired_count += len(heartbeats)
+            if len(heartbeats) < batch_size:
+                return expired_count
 
     def check_heartbeat_state_and_save(self):
         """
@@ -4,6 +4,8 @@ import pytest
 from django.utils import timezone
 
 from apps.alerts.models import AlertReceiveChannel
+from apps.heartbeat.models import IntegrationHeartBeat
+from apps.heartbeat.tasks import check_heartbeats_expiration, process_heartbeat_task
 
 
 @pytest.mark.django_db
@@ -84,3 +86,118 @@ def test_integration_heartbeat_restored_and_alert_was_not_sent(
     )
     integration_heartbeat.check_heartbeat_state_and_save()
     assert mocked_handler.called is False
+
+
+@pytest.mark.django_db
+def test_integration_heartbeat_expires_at(make_organization, make_alert_receive_channel, make_integration_heartbeat):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    integration_heartbeat = make_integration_heartbeat(alert_receive_channel, 60)
+    assert integration_heartbeat.expires_at is None
+
+    integration_heartbeat.last_heartbeat_time = timezone.now()
+    integration_heartbeat.save(update_fields=["last_heartbeat_time"])
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.expires_at == integration_heartbeat.expiration_time
+
+    integration_heartbeat.timeout_seconds = 600
+    integration_heartbeat.save(update_fields=["timeout_seconds"])
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.expires_at == integration_heartbeat.last_heartbeat_time + timezone.timedelta(
+        seconds=600
+    )
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_restored", return_value=None)
+def test_process_heartbeat_task(
+    mocked_handler,
+    make_organization,
+    make_alert_receive_channel,
+    make_integration_heartbeat,
+    django_assert_num_queries,
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    integration_heartbeat = make_integration_heartbeat(alert_receive_channel, 60)
+
+    now = timezone.now()
+    # heartbeat is read and updated without locking
+    with django_assert_num_queries(2):
+        process_heartbeat_task(alert_receive_channel.pk)
+
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.last_heartbeat_time >= now
+    assert integration_heartbeat.expires_at == integration_heartbeat.last_heartbeat_time + timezone.timedelta(
+        seconds=60
+    )
+    assert integration_heartbeat.previous_alerted_state_was_life is True
+    assert mocked_handler.called is False
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_restored", return_value=None)
+def test_process_heartbeat_task_restores_expired_heartbeat(
+    mocked_handler, make_organization, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    integration_heartbeat = make_integration_heartbeat(
+        alert_receive_channel,
+        60,
+        last_heartbeat_time=timezone.now() - timezone.timedelta(minutes=10),
+        previous_alerted_state_was_life=False,
+    )
+
+    process_heartbeat_task(alert_receive_channel.pk)
+
+    integration_heartbeat.refresh_from_db()
+    assert integration_heartbeat.previous_alerted_state_was_life is True
+    assert integration_heartbeat.expires_at > timezone.now()
+    assert mocked_handler.call_count == 1
+
+
+@pytest.mark.django_db
+def test_process_heartbeat_signal_not_found(make_organization, make_alert_receive_channel):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    assert IntegrationHeartBeat.process_heartbeat_signal(alert_receive_channel_id=alert_receive_channel.pk) is False
+
+
+@pytest.mark.django_db
+@patch("apps.heartbeat.models.IntegrationHeartBeat.on_heartbeat_expired", return_value=None)
+def test_check_heartbeats_expiration(
+    mocked_handler, make_organization, make_alert_receive_channel, make_integration_heartbeat
+):
+    organization = make_organization()
+    now = timezone.now()
+    overdue_heartbeats = [
+        make_integration_heartbeat(
+            make_alert_receive_channel(organization), 60, last_heartbeat_time=now - timezone.timedelta(minutes=5)
+        )
+        for _ in range(3)
+    ]
+    alive_heartbeat = make_integration_heartbeat(make_alert_receive_channel(organization), 60, last_heartbeat_time=now)
+    already_expired_heartbeat = make_integration_heartbeat(
+        make_alert_receive_channel(organization),
+        60,
+        last_heartbeat_time=now - timezone.timedelta(minutes=5),
+        previous_alerted_state_was_life=False,
+    )
+    not_started_heartbeat = make_integration_heartbeat(make_alert_receive_channel(organization), 60)
+
+    assert IntegrationHeartBeat.expire_overdue_heartbeats(batch_size=2) == 3
+    assert mocked_handler.call_count == 3
+
+    for heartbeat in overdue_heartbeats:
+        heartbeat.refresh_from_db()
+        assert heartbeat.previous_alerted_state_was_life is False
+    for heartbeat in (alive_heartbeat, not_started_heartbeat):
+        heartbeat.refresh_from_db()
+        assert heartbeat.previous_alerted_state_was_life is True
+    already_expired_heartbeat.refresh_from_db()
+    assert already_expired_heartbeat.previous_alerted_state_was_life is False
+
+    # nothing left to expire
+    check_heartbeats_expiration()
+    assert mocked_handler.call_count == 3
@@ -1,9 +1,13 @@
+from unittest.mock import patch
+
 import pytest
 from django.urls import reverse
+from prometheus_client import REGISTRY
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.alerts.models import AlertReceiveChannel
+from common import tracing
 
 
 @pytest.mark.django_db
@@ -44,3 +48,32 @@ def test_integration_form_data_too_big(settings, make_organization, make_user, m
     data = {"value": "a" * settings.DATA_UPLOAD_MAX_MEMORY_SIZE}
     response = client.post(url, data, content_type="application/x-www-form-urlencoded")
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_integration_request_metrics_and_trace(make_organization, make_alert_receive_channel):
+    organization = make_organization()
+    alert_receive_channel = make_alert_receive_channel(
+        organization, integration=AlertReceiveChannel.INTEGRATION_WEBHOOK
+    )
+    url = reverse(
+        "integrations:universal",
+        kwargs={
+            "integration_type": AlertReceiveChannel.INTEGRATION_WEBHOOK,
+            "alert_channel_key": alert_receive_channel.token,
+        },
+    )
+    labels = {"integration": AlertReceiveChannel.INTEGRATION_WEBHOOK, "status": "200"}
+    count_before = REGISTRY.get_sample_value("oncall_integration_request_duration_seconds_count", labels) or 0
+
+    traces = []
+    with patch(
+        "apps.integrations.views.create_alert.apply_async",
+        side_effect=lambda *args, **kwargs: traces.append(tracing.get_current_trace()),
+    ):
+        response = APIClient().post(url, {"message": "test"}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(traces) == 1 and traces[0] is not None
+    assert tracing.get_current_trace() is None
+    assert REGISTRY.get_sample_value("oncall_integration_request_duration_seconds_count", labels) == count_before + 1
@@ -4,7 +4,6 @@ import logging
 from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
-from django.db import transaction
 from django.db.utils import IntegrityError
 from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.template import loader
@@ -16,7 +15,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.alerts.models import AlertReceiveChannel
-from apps.heartbeat.tasks import heartbeat_checkup, process_heartbeat_task
+from apps.heartbeat.tasks import process_heartbeat_task
 from apps.integrations.mixins import (
     AlertChannelDefiningMixin,
     BrowsableInstructionMixin,
@@ -316,14 +315,6 @@ class HeartBeatAPIView(AlertChannelDefiningMixin, APIView):
             )
             try:
                 heartbeat.save()
-                with transaction.atomic():
-                    heartbeat = HeartBeat.objects.filter(pk=heartbeat.pk).select_for_update()[0]
-                    task = heartbeat_checkup.apply_async(
-                        (heartbeat.pk,),
-                        countdown=heartbeat.timeout_seconds,
-                    )
-                    heartbeat.actual_check_up_task_id = task.id
-                    heartbeat.save()
             except IntegrityError:
                 return Response(status=400, data="id should be unique")
 
@@ -361,25 +352,8 @@ class HeartBeatAPIView(AlertChannelDefiningMixin, APIView):
 
         elif request.data.get("action") == "heartbeat":
             _id = request.data.get("id", "default")
-            with transaction.atomic():
-                try:
-                    heartbeat = HeartBeat.objects.filter(
-                        alert_receive_channel=alert_receive_channel,
-                        user_defined_id=_id,
-                    ).select_for_update()[0]
-                    task = heartbeat_checkup.apply_async(
-                        (heartbeat.pk,),
-                        countdown=heartbeat.timeout_seconds,
-                    )
-                    heartbeat.actual_check_up_task_id = task.id
-                    heartbeat.last_heartbeat_time = timezone.now()
-                    update_fields = ["actual_check_up_task_id", "last_heartbeat_time"]
-                    state_changed = heartbeat.check_heartbeat_state()
-                    if state_changed:
-                        update_fields.append("previous_alerted_state_was_life")
-                    heartbeat.save(update_fields=update_fields)
-                except IndexError:
-                    return Response(status=400, data="heartbeat not found")
+            if not HeartBeat.process_heartbeat_signal(alert_receive_channel=alert_receive_channel, user_defined_id=_id):
+                return Response(status=400, data="heartbeat not found")
         return Response("Ok.")
 
 
@@ -9,6 +9,7 @@ from django.db.models import Sum
 
 from apps.alerts.models import AlertGroupCounter
 from apps.oss_installation.utils import active_oss_users_count
+from common.database import use_read_replica
 
 USAGE_STATS_URL = "https://stats.grafana.org/oncall-usage-report"
 USAGE_STATS_HTTP_TIMEOUT = 500
@@ -26,6 +27,7 @@ class UsageStatsReport:
 
 
 class UsageStatsService:
+    @use_read_replica()
     def get_usage_stats_report(self):
         OssInstallation = apps.get_model("oss_installation", "OssInstallation")
         metrics = {}
@@ -32,7 +32,7 @@ class IncidentSerializer(EagerLoadingMixin, serializers.ModelSerializer):
         ]
 
     def get_alerts_count(self, obj):
-        return len(obj.alerts.all())
+        return obj.alerts_count
 
     def get_title(self, obj):
         return obj.alerts.all()[0].title
@@ -1,7 +1,9 @@
+import json
 from unittest import mock
 
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -194,3 +196,50 @@ def test_delete_incident_invalid_request(incident_public_api_setup):
 #     data = {"mode": "delete"}
 #     response = self.client.delete(url, data=data, format="json", HTTP_AUTHORIZATION=f"{self.token}")
 #     self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@pytest.mark.django_db
+def test_export_resolution_notes(incident_public_api_setup, make_resolution_note):
+    token, incidents, integrations, _ = incident_public_api_setup
+    formatted_webhook = integrations[1]
+    resolution_note = make_resolution_note(incidents[2], message_text="root cause")
+    make_resolution_note(incidents[0], message_text="other integration")
+    client = APIClient()
+
+    url = reverse("api-public:alert_groups-export", kwargs={"export_type": "resolution_notes"})
+    response = client.get(
+        url + f"?integration_id={formatted_webhook.public_primary_key}&export_format=ndjson",
+        HTTP_AUTHORIZATION=f"{token}",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+    assert rows == [
+        {
+            "id": resolution_note.public_primary_key,
+            "alert_group_id": incidents[2].public_primary_key,
+            "source": "web",
+            "text": "root cause",
+            "author": None,
+            "created_at": resolution_note.created_at.isoformat(),
+        }
+    ]
+
+
+@pytest.mark.django_db
+def test_export_incidents_started_range(incident_public_api_setup):
+    token, incidents, _, _ = incident_public_api_setup
+    AlertGroup.all_objects.filter(pk=incidents[0].pk).update(started_at=timezone.now() - timezone.timedelta(days=2))
+    client = APIClient()
+
+    url = reverse("api-public:alert_groups-export", kwargs={"export_type": "alert_groups"})
+    started_before = (timezone.now() - timezone.timedelta(days=1)).isoformat()
+    response = client.get(url, {"started_before": started_before}, HTTP_AUTHORIZATION=f"{token}")
+
+    assert response.status_code == status.HTTP_200_OK
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert len(lines) == 2
+    assert lines[1].startswith(f"{incidents[0].public_primary_key},")
+
+    response = client.get(url, {"started_before": "yesterday"}, HTTP_AUTHORIZATION=f"{token}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
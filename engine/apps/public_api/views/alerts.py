@@ -8,11 +8,11 @@ from apps.alerts.models import Alert
 from apps.auth_token.auth import ApiTokenAuthentication
 from apps.public_api.serializers.alerts import AlertSerializer
 from apps.public_api.throttlers.user_throttle import UserThrottle
-from common.api_helpers.mixins import RateLimitHeadersMixin
+from common.api_helpers.mixins import RateLimitHeadersMixin, ReadReplicaMixin
 from common.api_helpers.paginators import FiftyPageSizePaginator
 
 
-class AlertView(RateLimitHeadersMixin, mixins.ListModelMixin, GenericViewSet):
+class AlertView(RateLimitHeadersMixin, ReadReplicaMixin, mixins.ListModelMixin, GenericViewSet):
     authentication_classes = (ApiTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
@@ -1,10 +1,13 @@
+from django.core.exceptions import ValidationError
 from django_filters import rest_framework as filters
 from rest_framework import mixins, status
+from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from apps.alerts.export import EXPORT_FORMATS, EXPORT_TYPES_PATTERN, get_export_response
 from apps.alerts.models import AlertGroup
 from apps.alerts.tasks import delete_alert_group, wipe
 from apps.auth_token.auth import ApiTokenAuthentication
@@ -14,7 +17,7 @@ from apps.public_api.serializers import IncidentSerializer
 from apps.public_api.throttlers.user_throttle import UserThrottle
 from common.api_helpers.exceptions import BadRequest
 from common.api_helpers.filters import ByTeamModelFieldFilterMixin, get_team_queryset
-from common.api_helpers.mixins import RateLimitHeadersMixin
+from common.api_helpers.mixins import RateLimitHeadersMixin, ReadReplicaMixin
 from common.api_helpers.paginators import FiftyPageSizePaginator
 
 
@@ -29,7 +32,9 @@ class IncidentByTeamFilter(ByTeamModelFieldFilterMixin, filters.FilterSet):
     )
 
 
-class IncidentView(RateLimitHeadersMixin, mixins.ListModelMixin, mixins.DestroyModelMixin, GenericViewSet):
+class IncidentView(
+    RateLimitHeadersMixin, ReadReplicaMixin, mixins.ListModelMixin, mixins.DestroyModelMixin, GenericViewSet
+):
     authentication_classes = (ApiTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
@@ -47,7 +52,7 @@ class IncidentView(RateLimitHeadersMixin, mixins.ListModelMixin, mixins.DestroyM
         integration_id = self.request.query_params.get("integration_id", None)
 
         queryset = AlertGroup.unarchived_objects.filter(
-            channel__organization=self.request.auth.organization,
+            organization=self.request.auth.organization,
         ).order_by("-started_at")
 
         if route_id:
@@ -59,6 +64,26 @@ class IncidentView(RateLimitHeadersMixin, mixins.ListModelMixin, mixins.DestroyM
 
         return queryset
 
+    @action(methods=["get"], detail=False, url_path=rf"export/(?P<export_type>{EXPORT_TYPES_PATTERN})")
+    def export(self, request, export_type):
+        export_format = request.query_params.get("export_format", EXPORT_FORMATS[0])
+        if export_format not in EXPORT_FORMATS:
+            raise BadRequest(detail=f"export_format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+        alert_groups = self.filter_queryset(self.get_queryset())
+
+        started_after = self.request.query_params.get("started_after", None)
+        started_before = self.request.query_params.get("started_before", None)
+        try:
+            if started_after:
+                alert_groups = alert_groups.filter(started_at__gte=started_after)
+            if started_before:
+                alert_groups = alert_groups.filter(started_at__lt=started_before)
+        except ValidationError:
+            raise BadRequest(detail="started_after and started_before must be ISO 8601 datetimes")
+
+        return get_export_response(export_type, export_format, alert_groups)
+
     def get_object(self):
         public_primary_key = self.kwargs["pk"]
 
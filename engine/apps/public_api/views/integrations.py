@@ -9,7 +9,12 @@ from apps.auth_token.auth import ApiTokenAuthentication
 from apps.public_api.serializers import IntegrationSerializer, IntegrationUpdateSerializer
 from apps.public_api.throttlers.user_throttle import UserThrottle
 from common.api_helpers.filters import ByTeamFilter
-from common.api_helpers.mixins import FilterSerializerMixin, RateLimitHeadersMixin, UpdateSerializerMixin
+from common.api_helpers.mixins import (
+    FilterSerializerMixin,
+    RateLimitHeadersMixin,
+    ReadReplicaMixin,
+    UpdateSerializerMixin,
+)
 from common.api_helpers.paginators import FiftyPageSizePaginator
 from common.insight_log import EntityEvent, write_resource_insight_log
 
@@ -18,6 +23,7 @@ from .maintaiable_object_mixin import MaintainableObjectMixin
 
 class IntegrationView(
     RateLimitHeadersMixin,
+    ReadReplicaMixin,
     FilterSerializerMixin,
     UpdateSerializerMixin,
     MaintainableObjectMixin,
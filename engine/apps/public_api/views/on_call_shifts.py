@@ -8,12 +8,12 @@ from apps.public_api.serializers import CustomOnCallShiftSerializer, CustomOnCal
 from apps.public_api.throttlers.user_throttle import UserThrottle
 from apps.schedules.models import CustomOnCallShift
 from common.api_helpers.filters import ByTeamFilter
-from common.api_helpers.mixins import RateLimitHeadersMixin, UpdateSerializerMixin
+from common.api_helpers.mixins import RateLimitHeadersMixin, ReadReplicaMixin, UpdateSerializerMixin
 from common.api_helpers.paginators import FiftyPageSizePaginator
 from common.insight_log import EntityEvent, write_resource_insight_log
 
 
-class CustomOnCallShiftView(RateLimitHeadersMixin, UpdateSerializerMixin, ModelViewSet):
+class CustomOnCallShiftView(RateLimitHeadersMixin, ReadReplicaMixin, UpdateSerializerMixin, ModelViewSet):
     authentication_classes = (ApiTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
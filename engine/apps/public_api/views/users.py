@@ -12,7 +12,7 @@ from apps.public_api.throttlers.user_throttle import UserThrottle
 from apps.schedules.ical_utils import user_ical_export
 from apps.schedules.models import OnCallSchedule
 from apps.user_management.models import User
-from common.api_helpers.mixins import RateLimitHeadersMixin, ShortSerializerMixin
+from common.api_helpers.mixins import RateLimitHeadersMixin, ReadReplicaMixin, ShortSerializerMixin
 from common.api_helpers.paginators import HundredPageSizePaginator
 from common.constants.role import Role
 
@@ -31,7 +31,7 @@ class UserFilter(filters.FilterSet):
         fields = ["email", "roles", "username"]
 
 
-class UserView(RateLimitHeadersMixin, ShortSerializerMixin, ReadOnlyModelViewSet):
+class UserView(RateLimitHeadersMixin, ReadReplicaMixin, ShortSerializerMixin, ReadOnlyModelViewSet):
     authentication_classes = (ApiTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
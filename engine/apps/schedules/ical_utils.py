@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import logging
 import re
 from collections import namedtuple
@@ -9,6 +10,7 @@ from typing import TYPE_CHECKING
 import pytz
 import requests
 from django.apps import apps
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 from icalendar import Calendar
@@ -287,20 +289,24 @@ def list_of_empty_shifts_in_schedule(schedule, start_date, end_date):
     return sorted(empty_shifts, key=lambda dt: dt.start)
 
 
-def list_users_to_notify_from_ical(schedule, events_datetime=None, include_viewers=False):
+def list_users_to_notify_from_ical(schedule, events_datetime=None, include_viewers=False, calendars=None):
     """
-    Retrieve on-call users for the current time
+    Retrieve on-call users for the current time.
+    Pass already parsed schedule calendars to avoid parsing iCal files on every call.
     """
     events_datetime = events_datetime if events_datetime else timezone.datetime.now(timezone.utc)
     return list_users_to_notify_from_ical_for_period(
-        schedule, events_datetime, events_datetime, include_viewers=include_viewers
+        schedule, events_datetime, events_datetime, include_viewers=include_viewers, calendars=calendars
     )
 
 
-def list_users_to_notify_from_ical_for_period(schedule, start_datetime, end_datetime, include_viewers=False):
+def list_users_to_notify_from_ical_for_period(
+    schedule, start_datetime, end_datetime, include_viewers=False, calendars=None
+):
     # get list of iCalendars from current iCal files. If there is more than one calendar, primary calendar will always
     # be the first
-    calendars = schedule.get_icalendars()
+    if calendars is None:
+        calendars = schedule.get_icalendars()
     # reverse calendars to make overrides calendar the first, if schedule is iCal
     calendars = calendars[::-1]
     users_found_in_ical = []
@@ -471,19 +477,62 @@ def get_icalendar_tz_or_utc(icalendar):
         return pytz.timezone(converted_timezone)
 
 
-def fetch_ical_file_or_get_error(ical_url):
-    cached_ical_file = None
+ICAL_FILE_VALIDATORS_CACHE_KEY_PREFIX = "ical_file_validators"
+ICAL_FILE_VALIDATORS_CACHE_LIFETIME = 60 * 60 * 24
+
+# iCal files are re-downloaded from the same few hosts on every refresh, so connections are reused
+ical_file_session = requests.Session()
+
+
+def _get_ical_file_validators_cache_key(ical_url, ical_file):
+    """
+    Validators (ETag and Last-Modified) are valid only for the exact file they were sent with,
+    so they are cached per iCal url and content hash.
+    """
+    key = hashlib.sha1(ical_url.encode() + b"\n" + ical_file.encode()).hexdigest()
+    return f"{ICAL_FILE_VALIDATORS_CACHE_KEY_PREFIX}_{key}"
+
+
+def fetch_ical_file_or_get_error(ical_url, cached_ical_file=None):
+    """
+    Downloads and validates iCal file.
+    If the currently cached file is passed, the request is conditional and the cached file is returned
+    without parsing if the server responds with 304 Not Modified or with exactly the same file.
+    """
+    ical_file = None
     ical_file_error = None
+
+    headers = {}
+    if cached_ical_file is not None:
+        headers = cache.get(_get_ical_file_validators_cache_key(ical_url, cached_ical_file), {})
+
     try:
-        new_ical_file = requests.get(ical_url, timeout=10).text
-        Calendar.from_ical(new_ical_file)
-        cached_ical_file = new_ical_file
+        response = ical_file_session.get(ical_url, headers=headers, timeout=10)
+        if response.status_code == 304 and headers:
+            return cached_ical_file, None
+        new_ical_file = response.text
+        if new_ical_file != cached_ical_file:
+            Calendar.from_ical(new_ical_file)
+        ical_file = new_ical_file
     except requests.exceptions.RequestException:
         ical_file_error = "iCal download failed"
     except ValueError:
         ical_file_error = "wrong iCal"
     # TODO: catch icalendar exceptions
-    return cached_ical_file, ical_file_error
+
+    if ical_file is not None:
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        if validators:
+            cache.set(
+                _get_ical_file_validators_cache_key(ical_url, ical_file),
+                validators,
+                timeout=ICAL_FILE_VALIDATORS_CACHE_LIFETIME,
+            )
+    return ical_file, ical_file_error
 
 
 def create_base_icalendar(name: str) -> Calendar:
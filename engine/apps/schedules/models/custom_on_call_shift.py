@@ -5,6 +5,7 @@ from calendar import monthrange
 from uuid import uuid4
 
 import pytz
+from dateutil.rrule import rrulestr
 from django.apps import apps
 from django.conf import settings
 from django.core.validators import MinLengthValidator
@@ -14,7 +15,7 @@ from django.forms.models import model_to_dict
 from django.utils import timezone
 from django.utils.functional import cached_property
 from icalendar.cal import Event
-from recurring_ical_events import UnfoldableCalendar
+from icalendar.prop import vRecur
 
 from apps.schedules.tasks import (
     drop_cached_ical_task,
@@ -274,52 +275,66 @@ class CustomOnCallShift(models.Model):
         return is_finished
 
     def convert_to_ical(self, time_zone="UTC"):
-        result = ""
+        return "".join(event.to_ical().decode("utf-8") for event in self.get_ical_events(time_zone))
+
+    def get_ical_events(self, time_zone="UTC"):
+        """
+        Returns iCal events for the shift, so they can be added to a calendar and serialized at once.
+        """
+        events = []
         # use shift time_zone if it exists, otherwise use schedule or default time_zone
         time_zone = self.time_zone if self.time_zone is not None else time_zone
+
+        if self.event_ical_rules:
+            try:
+                vRecur(self.event_ical_rules).to_ical()
+            except ValueError as e:
+                logger.warning(f"Cannot convert event with pk {self.pk} to ical: {str(e)}")
+                return events
+
         # rolling_users shift converts to several ical events
         if self.type in (CustomOnCallShift.TYPE_ROLLING_USERS_EVENT, CustomOnCallShift.TYPE_OVERRIDE):
-            # generate initial iCal for counting rotation start date
-            event_ical = self.generate_ical(self.start, user_counter=0)
             rotations_created = 0
             all_rotation_checked = False
 
             users_queue = self.get_rolling_users()
             if not users_queue:
-                return result
+                return events
             if self.frequency is None:
                 users_queue = users_queue[:1]
 
+            rotation_rule = self.get_rotation_rule()
             # Get the date of the current rotation
             if self.start == self.rotation_start or self.frequency is None:
                 start = self.start
             else:
-                start = self.get_rotation_date(event_ical)
+                start = self.get_rotation_date(self.start, rotation_rule)
 
             while not all_rotation_checked:
                 for counter, users in enumerate(users_queue, start=1):
+                    # next rotation date is counted from the start of the last generated event
+                    event_time_zone = "UTC"
                     if not start:  # means that rotation ends before next event starts
                         all_rotation_checked = True
                         break
                     elif start >= self.rotation_start:  # event has already started, generate iCal for each user
                         for user_counter, user in enumerate(users, start=1):
-                            event_ical = self.generate_ical(start, user_counter, user, counter, time_zone)
-                            result += event_ical
+                            events.append(self.generate_ical_event(start, user_counter, user, counter, time_zone))
+                            event_time_zone = time_zone
                         rotations_created += 1
-                    else:  # generate default iCal to calculate the date for the next rotation
-                        event_ical = self.generate_ical(start, user_counter=0)
 
                     if rotations_created == len(users_queue):  # means that we generated iCal for every user group
                         all_rotation_checked = True
                         break
                     # Use the flag 'get_next_date' to get the date of the next rotation
-                    start = self.get_rotation_date(event_ical, get_next_date=True)
+                    event_start = self.convert_dt_to_schedule_timezone(start, event_time_zone)
+                    start = self.get_rotation_date(event_start, rotation_rule, get_next_date=True)
         else:
             for user_counter, user in enumerate(self.users.all(), start=1):
-                result += self.generate_ical(self.start, user_counter, user, time_zone=time_zone)
-        return result
+                events.append(self.generate_ical_event(self.start, user_counter, user, time_zone=time_zone))
+        return events
 
-    def generate_ical(self, start, user_counter, user=None, counter=1, time_zone="UTC"):
+    def generate_ical_event(self, start, user_counter, user=None, counter=1, time_zone="UTC"):
         event = Event()
         event["uid"] = f"oncall-{self.uuid}-PK{self.public_primary_key}-U{user_counter}-E{counter}-S{self.source}"
         if user:
@@ -329,12 +344,7 @@ class CustomOnCallShift(models.Model):
         event.add("dtstamp", timezone.now())
         if self.event_ical_rules:
             event.add("rrule", self.event_ical_rules)
-        try:
-            event_in_ical = event.to_ical().decode("utf-8")
-        except ValueError as e:
-            logger.warning(f"Cannot convert event with pk {self.pk} to ical: {str(e)}")
-            event_in_ical = ""
-        return event_in_ical
+        return event
 
     def get_summary_with_user_for_ical(self, user: User) -> str:
         summary = ""
@@ -343,16 +353,31 @@ class CustomOnCallShift(models.Model):
         summary += f"{user.username} "
         return summary
 
-    def get_rotation_date(self, event_ical, get_next_date=False):
+    def get_rotation_rule(self):
+        """
+        Returns dateutil rrule used to count rotation dates (for rolling_users shifts).
+        It's built once per shift and its dtstart is replaced for every rotation.
+        """
+        if not self.event_ical_rules:
+            return None
+
+        rules = dict(self.event_ical_rules)
+        # take shift interval, not event interval. For rolling_users shift it is not the same.
+        rules["interval"] = [self.interval or 1]
+        if self.until is not None:
+            # UNTIL must be in UTC when DTSTART is timezone-aware
+            rules["until"] = rules["until"].astimezone(pytz.UTC)
+        dtstart = self.convert_dt_to_schedule_timezone(self.start, "UTC")
+        return rrulestr(vRecur(rules).to_ical().decode(), dtstart=dtstart)
+
+    def get_rotation_date(self, current_event_start, rotation_rule, get_next_date=False):
         """Get date of the next event (for rolling_users shifts)"""
         ONE_DAY = 1
         ONE_HOUR = 1
 
-        current_event = Event.from_ical(event_ical)
-        # take shift interval, not event interval. For rolling_users shift it is not the same.
+        # event start is counted with seconds precision, as it is in iCal
+        current_event_start = current_event_start.replace(microsecond=0)
         interval = self.interval or 1
-        current_event["rrule"]["INTERVAL"] = interval
-        current_event_start = current_event["DTSTART"].dt
         next_event_start = current_event_start
         # Calculate the minimum start date for the next event based on rotation frequency. We don't need to do this
         # for the first rotation, because in this case the min start date will be the same as the current event date.
@@ -377,21 +402,23 @@ class CustomOnCallShift(models.Model):
                 days_for_next_event = DAYS_IN_A_MONTH - current_event_start.day + ONE_DAY
                 # count next event start date with respect to event interval
                 for i in range(1, interval):
-                    next_month_days = monthrange(current_event_start.year, current_event_start.month + i)[1]
+                    year, month = divmod(current_event_start.month - 1 + i, 12)
+                    next_month_days = monthrange(current_event_start.year + year, month + 1)[1]
                     days_for_next_event += next_month_days
                 next_event_start = current_event_start + timezone.timedelta(days=days_for_next_event)
 
-        next_event = None
-        # repetitions generate the next event shift according with the recurrence rules
-        repetitions = UnfoldableCalendar(current_event).RepeatedEvent(
-            current_event, next_event_start.replace(microsecond=0)
-        )
-        ical_iter = repetitions.__iter__()
-        for event in ical_iter:
-            if event.start >= next_event_start:
-                next_event = event
-                break
-        next_event_dt = next_event.start if next_event is not None else None
+        next_event_dt = None
+        if not get_next_date:
+            # the current event is the first repetition
+            next_event_dt = current_event_start
+        elif rotation_rule is not None:
+            # repetitions of the current event according with the recurrence rules
+            for event_start in rotation_rule.replace(dtstart=current_event_start):
+                # keep local time of repetitions across DST changes
+                event_start = event_start.tzinfo.localize(event_start.replace(tzinfo=None))
+                if event_start >= next_event_start:
+                    next_event_dt = event_start
+                    break
 
         if self.until and next_event_dt and next_event_dt > self.until:
             return
@@ -432,15 +459,21 @@ class CustomOnCallShift(models.Model):
         start_naive = dt.replace(tzinfo=None)
         return pytz.timezone(time_zone).localize(start_naive, is_dst=None)
 
-    def get_rolling_users(self):
+    def get_rolling_users(self, users_by_pk=None):
+        """
+        users_by_pk is a dict of users by string primary keys,
+        it allows to build users queues for a number of shifts from users fetched at once.
+        """
         User = apps.get_model("user_management", "User")
         all_users_pks = set()
         users_queue = []
         if self.rolling_users is not None:
-            # get all users pks from rolling_users field
-            for users_dict in self.rolling_users:
-                all_users_pks.update(users_dict.keys())
-            users = User.objects.filter(pk__in=all_users_pks)
+            if users_by_pk is None:
+                # get all users pks from rolling_users field
+                for users_dict in self.rolling_users:
+                    all_users_pks.update(users_dict.keys())
+                users = User.objects.filter(pk__in=all_users_pks)
+                users_by_pk = {str(user.pk): user for user in users}
             # generate users_queue list with user objects
             if self.start_rotation_from_user_index is not None:
                 rolling_users = (
@@ -450,7 +483,9 @@ class CustomOnCallShift(models.Model):
             else:
                 rolling_users = self.rolling_users
             for users_dict in rolling_users:
-                users_list = list(users.filter(pk__in=users_dict.keys()))
+                users_list = sorted(
+                    (users_by_pk[str(pk)] for pk in users_dict.keys() if str(pk) in users_by_pk), key=lambda u: u.pk
+                )
                 users_queue.append(users_list)
         return users_queue
 
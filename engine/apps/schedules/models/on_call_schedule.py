@@ -420,7 +420,7 @@ class OnCallScheduleICal(OnCallSchedule):
         self.prev_ical_file_primary = self.cached_ical_file_primary
         if self.ical_url_primary is not None:
             self.cached_ical_file_primary, self.ical_file_error_primary = fetch_ical_file_or_get_error(
-                self.ical_url_primary,
+                self.ical_url_primary, self.prev_ical_file_primary
             )
         self.save(update_fields=["cached_ical_file_primary", "prev_ical_file_primary", "ical_file_error_primary"])
 
@@ -428,7 +428,7 @@ class OnCallScheduleICal(OnCallSchedule):
         self.prev_ical_file_overrides = self.cached_ical_file_overrides
         if self.ical_url_overrides is not None:
             self.cached_ical_file_overrides, self.ical_file_error_overrides = fetch_ical_file_or_get_error(
-                self.ical_url_overrides,
+                self.ical_url_overrides, self.prev_ical_file_overrides
             )
         self.save(update_fields=["cached_ical_file_overrides", "prev_ical_file_overrides", "ical_file_error_overrides"])
 
@@ -492,7 +492,7 @@ class OnCallScheduleCalendar(OnCallSchedule):
         self.prev_ical_file_overrides = self.cached_ical_file_overrides
         if self.ical_url_overrides is not None:
             self.cached_ical_file_overrides, self.ical_file_error_overrides = fetch_ical_file_or_get_error(
-                self.ical_url_overrides,
+                self.ical_url_overrides, self.prev_ical_file_overrides
             )
         self.save(update_fields=["cached_ical_file_overrides", "prev_ical_file_overrides", "ical_file_error_overrides"])
 
@@ -502,17 +502,14 @@ class OnCallScheduleCalendar(OnCallSchedule):
         """
         ical = None
         if self.custom_on_call_shifts.exists():
-            end_line = "END:VCALENDAR"
             calendar = Calendar()
             calendar.add("prodid", "-//My calendar product//amixr//")
             calendar.add("version", "2.0")
             calendar.add("method", "PUBLISH")
-            ical_file = calendar.to_ical().decode()
-            ical = ical_file.replace(end_line, "").strip()
-            ical = f"{ical}\r\n"
-            for event in self.custom_on_call_shifts.all():
-                ical += event.convert_to_ical(self.time_zone)
-            ical += f"{end_line}\r\n"
+            for shift in self.custom_on_call_shifts.all():
+                for event in shift.get_ical_events(self.time_zone):
+                    calendar.add_component(event)
+            ical = calendar.to_ical().decode()
         return ical
 
     @property
@@ -535,17 +532,14 @@ class OnCallScheduleWeb(OnCallSchedule):
         if qs.exists() or extra_shifts is not None:
             if extra_shifts is None:
                 extra_shifts = []
-            end_line = "END:VCALENDAR"
             calendar = Calendar()
             calendar.add("prodid", "-//web schedule//oncall//")
             calendar.add("version", "2.0")
             calendar.add("method", "PUBLISH")
-            ical_file = calendar.to_ical().decode()
-            ical = ical_file.replace(end_line, "").strip()
-            ical = f"{ical}\r\n"
-            for event in itertools.chain(qs.all(), extra_shifts):
-                ical += event.convert_to_ical(self.time_zone)
-            ical += f"{end_line}\r\n"
+            for shift in itertools.chain(qs.all(), extra_shifts):
+                for event in shift.get_ical_events(self.time_zone):
+                    calendar.add_component(event)
+            ical = calendar.to_ical().decode()
         return ical
 
     def _generate_ical_file_primary(self):
@@ -565,9 +559,17 @@ class OnCallScheduleWeb(OnCallSchedule):
         return self.cached_ical_file_primary
 
     def _refresh_primary_ical_file(self):
-        self.prev_ical_file_primary = self.cached_ical_file_primary
-        self.cached_ical_file_primary = self._generate_ical_file_primary()
-        self.save(update_fields=["cached_ical_file_primary", "prev_ical_file_primary"])
+        """
+        Regenerate iCal file only if it was dropped, which happens on every change of the schedule shifts or users.
+        Rotations are encoded in the events recurrence rules, so the file doesn't change when a rotation boundary passes.
+        """
+        if self.cached_ical_file_primary is None:
+            self.prev_ical_file_primary = self.cached_ical_file_primary
+            self.cached_ical_file_primary = self._generate_ical_file_primary()
+            self.save(update_fields=["cached_ical_file_primary", "prev_ical_file_primary"])
+        elif self.prev_ical_file_primary != self.cached_ical_file_primary:
+            self.prev_ical_file_primary = self.cached_ical_file_primary
+            self.save(update_fields=["prev_ical_file_primary"])
 
     @cached_property
     def _ical_file_overrides(self):
@@ -578,9 +580,14 @@ class OnCallScheduleWeb(OnCallSchedule):
         return self.cached_ical_file_overrides
 
     def _refresh_overrides_ical_file(self):
-        self.prev_ical_file_overrides = self.cached_ical_file_overrides
-        self.cached_ical_file_overrides = self._generate_ical_file_overrides()
-        self.save(update_fields=["cached_ical_file_overrides", "prev_ical_file_overrides"])
+        """Regenerate iCal file only if it was dropped (see _refresh_primary_ical_file)."""
+        if self.cached_ical_file_overrides is None:
+            self.prev_ical_file_overrides = self.cached_ical_file_overrides
+            self.cached_ical_file_overrides = self._generate_ical_file_overrides()
+            self.save(update_fields=["cached_ical_file_overrides", "prev_ical_file_overrides"])
+        elif self.prev_ical_file_overrides != self.cached_ical_file_overrides:
+            self.prev_ical_file_overrides = self.cached_ical_file_overrides
+            self.save(update_fields=["prev_ical_file_overrides"])
 
     def preview_shift(self, custom_shift, user_tz, starting_date, days):
         """Return unsaved rotation and final schedule preview events."""
@@ -21,9 +21,15 @@ def drop_cached_ical_task(schedule_pk):
 
 @shared_dedicated_queue_retry_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=1)
 def drop_cached_ical_for_custom_events_for_organization(organization_id):
+    OnCallSchedule = apps.get_model("schedules", "OnCallSchedule")
     OnCallScheduleCalendar = apps.get_model("schedules", "OnCallScheduleCalendar")
+    OnCallScheduleWeb = apps.get_model("schedules", "OnCallScheduleWeb")
 
-    for schedule in OnCallScheduleCalendar.objects.filter(organization_id=organization_id):
+    # schedules with iCal generated from custom shifts, which include names of the shifts users
+    schedules = OnCallSchedule.objects.filter(organization_id=organization_id).instance_of(
+        OnCallScheduleCalendar, OnCallScheduleWeb
+    )
+    for schedule in schedules:
         drop_cached_ical_task.apply_async(
             (schedule.pk,),
         )
@@ -1,3 +1,5 @@
+import random
+
 from celery.utils.log import get_task_logger
 from django.apps import apps
 
@@ -6,9 +8,13 @@ from apps.schedules.ical_utils import is_icals_equal
 from apps.schedules.tasks import notify_about_empty_shifts_in_schedule, notify_about_gaps_in_schedule
 from apps.slack.tasks import start_update_slack_user_group_for_schedules
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
+from common.utils import iterate_queryset
 
 task_logger = get_task_logger(__name__)
 
+# refresh tasks are spread over half of the refresh period, so iCal hosts and workers don't get a burst of requests
+REFRESH_ICAL_FILES_MAX_COUNTDOWN = 5 * 60
+
 
 @shared_dedicated_queue_retry_task()
 def start_refresh_ical_files():
@@ -16,12 +22,12 @@ def start_refresh_ical_files():
 
     task_logger.info("Start refresh ical files")
 
-    schedules = OnCallSchedule.objects.all()
-    for schedule in schedules:
-        refresh_ical_file.apply_async((schedule.pk,))
+    schedule_pks = OnCallSchedule.objects.values_list("pk", flat=True)
+    for schedule_pk in iterate_queryset(schedule_pks):
+        refresh_ical_file.apply_async((schedule_pk,), countdown=random.randint(0, REFRESH_ICAL_FILES_MAX_COUNTDOWN))
 
     # Update Slack user groups with a delay to make sure all the schedules are refreshed
-    start_update_slack_user_group_for_schedules.apply_async(countdown=30)
+    start_update_slack_user_group_for_schedules.apply_async(countdown=REFRESH_ICAL_FILES_MAX_COUNTDOWN + 30)
 
 
 @shared_dedicated_queue_retry_task()
@@ -908,3 +908,38 @@ def test_rolling_users_shift_convert_to_ical(
 
     assert on_call_shift.event_interval == len(rolling_users) * data["interval"]
     assert expected_rrule in ical_data
+
+
+@pytest.mark.django_db
+def test_rolling_users_shift_convert_to_ical_rotations(
+    make_organization_and_user,
+    make_user_for_organization,
+    make_on_call_shift,
+):
+    organization, user_1 = make_organization_and_user()
+    user_2 = make_user_for_organization(organization)
+    user_3 = make_user_for_organization(organization)
+
+    start = timezone.datetime(2022, 11, 15, 10, 0, 0, tzinfo=timezone.utc)
+    data = {
+        "start": start,
+        "rotation_start": start + timezone.timedelta(days=50),
+        "duration": timezone.timedelta(hours=12),
+        "frequency": CustomOnCallShift.FREQUENCY_MONTHLY,
+        "interval": 2,
+        "time_zone": "Europe/Berlin",
+        "until": start + timezone.timedelta(days=365),
+    }
+    on_call_shift = make_on_call_shift(
+        organization=organization, shift_type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT, **data
+    )
+    on_call_shift.add_rolling_users([[user_1], [user_2], [user_3]])
+
+    ical_data = on_call_shift.convert_to_ical()
+
+    # rotations switch every 2 months on the 15th, the day of month of the shift start,
+    # the first rotation after rotation start is user_2
+    assert ical_data.count("BEGIN:VEVENT") == 3
+    assert f"SUMMARY:{user_2.username} \r\nDTSTART;TZID=Europe/Berlin;VALUE=DATE-TIME:20230115T100000" in ical_data
+    assert f"SUMMARY:{user_3.username} \r\nDTSTART;TZID=Europe/Berlin;VALUE=DATE-TIME:20230315T100000" in ical_data
+    assert f"SUMMARY:{user_1.username} \r\nDTSTART;TZID=Europe/Berlin;VALUE=DATE-TIME:20230515T100000" in ical_data
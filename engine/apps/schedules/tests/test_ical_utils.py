@@ -1,9 +1,15 @@
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 from django.utils import timezone
 
-from apps.schedules.ical_utils import list_users_to_notify_from_ical, parse_event_uid, users_in_ical
+from apps.schedules.ical_utils import (
+    fetch_ical_file_or_get_error,
+    list_users_to_notify_from_ical,
+    parse_event_uid,
+    users_in_ical,
+)
 from apps.schedules.models import CustomOnCallShift, OnCallScheduleCalendar
 from common.constants.role import Role
 
@@ -78,3 +84,53 @@ def test_parse_event_uid_v2():
     pk, source = parse_event_uid(event_uid)
     assert pk == pk_value
     assert source == "slack"
+
+
+ICAL_URL = "https://example.com/calendar.ics"
+ICAL_FILE = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nEND:VCALENDAR\r\n"
+
+
+class MockResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+@patch("apps.schedules.ical_utils.Calendar.from_ical")
+@patch("apps.schedules.ical_utils.ical_file_session.get")
+def test_fetch_ical_file_not_modified(mock_get, mock_from_ical):
+    mock_get.return_value = MockResponse(text=ICAL_FILE, headers={"ETag": '"v1"', "Last-Modified": "yesterday"})
+    assert fetch_ical_file_or_get_error(ICAL_URL) == (ICAL_FILE, None)
+    assert mock_get.call_args.kwargs["headers"] == {}
+    assert mock_from_ical.call_count == 1
+
+    mock_get.return_value = MockResponse(status_code=304)
+    assert fetch_ical_file_or_get_error(ICAL_URL, ICAL_FILE) == (ICAL_FILE, None)
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"', "If-Modified-Since": "yesterday"}
+    assert mock_from_ical.call_count == 1
+
+
+@patch("apps.schedules.ical_utils.Calendar.from_ical")
+@patch("apps.schedules.ical_utils.ical_file_session.get")
+def test_fetch_ical_file_same_content_is_not_parsed(mock_get, mock_from_ical):
+    mock_get.return_value = MockResponse(text=ICAL_FILE)
+    assert fetch_ical_file_or_get_error(ICAL_URL, ICAL_FILE) == (ICAL_FILE, None)
+    # no validators are known for the file, so the request is not conditional
+    assert mock_get.call_args.kwargs["headers"] == {}
+    mock_from_ical.assert_not_called()
+
+
+@patch("apps.schedules.ical_utils.ical_file_session.get")
+def test_fetch_ical_file_changed(mock_get):
+    mock_get.return_value = MockResponse(text=ICAL_FILE, headers={"ETag": '"v1"'})
+    fetch_ical_file_or_get_error(ICAL_URL)
+
+    new_ical_file = ICAL_FILE.replace("2.0", "2.1")
+    mock_get.return_value = MockResponse(text=new_ical_file, headers={"ETag": '"v2"'})
+    assert fetch_ical_file_or_get_error(ICAL_URL, ICAL_FILE) == (new_ical_file, None)
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    mock_get.return_value = MockResponse(text="not an ical")
+    assert fetch_ical_file_or_get_error(ICAL_URL, new_ical_file) == (None, "wrong iCal")
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v2"'}
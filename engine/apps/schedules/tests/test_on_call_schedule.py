@@ -1,7 +1,10 @@
+from unittest.mock import patch
+
 import pytest
 from django.utils import timezone
 
 from apps.schedules.models import CustomOnCallShift, OnCallSchedule, OnCallScheduleWeb
+from apps.schedules.tasks import drop_cached_ical_for_custom_events_for_organization, drop_cached_ical_task
 from common.constants.role import Role
 
 
@@ -510,3 +513,74 @@ def test_preview_override_shift(make_organization, make_user_for_organization, m
 
     # final ical schedule didn't change
     assert schedule._ical_file_overrides == schedule_overrides_ical
+
+
+@pytest.mark.django_db
+def test_refresh_web_schedule_only_if_dropped(
+    make_organization, make_user_for_organization, make_schedule, make_on_call_shift
+):
+    organization = make_organization()
+    schedule = make_schedule(organization, schedule_class=OnCallScheduleWeb)
+    user = make_user_for_organization(organization)
+    on_call_shift = make_on_call_shift(
+        organization=organization,
+        shift_type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT,
+        start=timezone.now().replace(microsecond=0),
+        rotation_start=timezone.now().replace(microsecond=0),
+        duration=timezone.timedelta(hours=12),
+        frequency=CustomOnCallShift.FREQUENCY_DAILY,
+        schedule=schedule,
+    )
+    on_call_shift.add_rolling_users([[user]])
+
+    schedule.refresh_ical_file()
+    ical_file = schedule.cached_ical_file_primary
+    assert ical_file is not None
+    assert schedule.prev_ical_file_primary is None
+
+    with patch.object(OnCallScheduleWeb, "_generate_ical_file_primary") as mock_generate:
+        schedule.refresh_ical_file()
+        mock_generate.assert_not_called()
+    assert schedule.cached_ical_file_primary == schedule.prev_ical_file_primary == ical_file
+
+    schedule.drop_cached_ical()
+    with patch.object(OnCallScheduleWeb, "_generate_ical_file_primary", return_value="new") as mock_generate:
+        schedule.refresh_ical_file()
+        mock_generate.assert_called_once()
+    assert schedule.cached_ical_file_primary == "new"
+
+
+@pytest.mark.django_db
+def test_web_schedule_ical_dropped_on_user_delete(
+    make_organization, make_user_for_organization, make_schedule, make_on_call_shift
+):
+    organization = make_organization()
+    schedule = make_schedule(organization, schedule_class=OnCallScheduleWeb)
+    user_1 = make_user_for_organization(organization)
+    user_2 = make_user_for_organization(organization)
+    start = timezone.now().replace(microsecond=0)
+    on_call_shift = make_on_call_shift(
+        organization=organization,
+        shift_type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT,
+        start=start,
+        rotation_start=start,
+        duration=timezone.timedelta(hours=12),
+        frequency=CustomOnCallShift.FREQUENCY_DAILY,
+        schedule=schedule,
+    )
+    on_call_shift.add_rolling_users([[user_1], [user_2]])
+    schedule.refresh_ical_file()
+    assert user_1.username in schedule.cached_ical_file_primary
+
+    # users removed by Grafana sync are deactivated with a queryset update
+    with patch.object(
+        drop_cached_ical_for_custom_events_for_organization,
+        "apply_async",
+        side_effect=lambda args: drop_cached_ical_for_custom_events_for_organization(*args),
+    ), patch.object(drop_cached_ical_task, "apply_async", side_effect=lambda args: drop_cached_ical_task(*args)):
+        organization.users.filter(pk=user_1.pk).delete()
+
+    schedule.refresh_from_db()
+    schedule.refresh_ical_file()
+    assert user_1.username not in schedule.cached_ical_file_primary
+    assert user_2.username in schedule.cached_ical_file_primary
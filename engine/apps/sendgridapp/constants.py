@@ -20,6 +20,12 @@ class SendgridEmailMessageStatuses(object):
     # Group Unsubscribe - ?
     # Group Resubscribe - ?
 
+    # statuses after which no more delivery events are expected
+    TERMINAL_STATUSES = (DELIVERED, DROPPED, BOUNCE, BLOCKED)
+    # engagement events are received only for delivered messages
+    DELIVERY_FINISHED_STATUSES = TERMINAL_STATUSES + (OPEN, CLICK, UNSUBSCRIBE, SPAMREPORT)
+    PENDING_DELIVERY_STATUSES = (ACCEPTED, PROCESSED, DEFERRED)
+
     CHOICES = (
         (ACCEPTED, "accepted"),
         (PROCESSED, "processed"),
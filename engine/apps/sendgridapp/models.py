@@ -11,37 +11,50 @@ from apps.alerts.incident_appearance.renderers.email_renderer import AlertGroupE
 from apps.alerts.signals import user_notification_action_triggered_signal
 from apps.base.utils import live_settings
 from apps.sendgridapp.constants import SendgridEmailMessageStatuses
+from apps.sendgridapp.utils import get_latest_statuses, is_status_update_allowed
 
 logger = logging.getLogger(__name__)
 
 
 class EmailMessageManager(models.Manager):
-    def update_status(self, message_uuid, message_status):
-        """The function checks existence of EmailMessage
-        instance according to message_uuid and updates status on
-        message_status
+    def update_statuses(self, events):
+        """Applies a batch of SendGrid delivery events to email messages.
+        Events are grouped by message, so every message is updated once with its terminal status
+        (or the latest status if the message is not delivered yet) in a single bulk update.
+        Log records are created only when a message reaches a terminal delivery status for the first time,
+        so events repeated by SendGrid don't produce duplicated log records.
 
         Args:
-            message_uuid (str): uuid of Email message
-            message_status (str): new status
+            events (list): (message_uuid, message_status, timestamp) tuples, as received from SendGrid
 
         Returns:
 
         """
         UserNotificationPolicyLogRecord = apps.get_model("base", "UserNotificationPolicyLogRecord")
 
-        if message_uuid and message_status:
-            email_message_qs = self.filter(message_uuid=message_uuid)
-            status = SendgridEmailMessageStatuses.DETERMINANT.get(message_status)
+        new_statuses = get_latest_statuses(events)
 
-            if email_message_qs.exists() and status:
-                email_message_qs.update(status=status)
+        email_messages = self.filter(message_uuid__in=new_statuses.keys()).select_related(
+            "receiver", "notification_policy", "represents_alert_group"
+        )
+
+        updated_email_messages = []
+        log_records = []
+        for email_message in email_messages:
+            status = new_statuses[str(email_message.message_uuid)]
+            previous_status = email_message.status
+            if not is_status_update_allowed(previous_status, status):
+                continue
+
+            email_message.status = status
+            updated_email_messages.append(email_message)
 
-                email_message = email_message_qs.first()
-                log_record = None
+            if previous_status in SendgridEmailMessageStatuses.DELIVERY_FINISHED_STATUSES:
+                continue
 
-                if status == SendgridEmailMessageStatuses.DELIVERED:
-                    log_record = UserNotificationPolicyLogRecord(
+            if status == SendgridEmailMessageStatuses.DELIVERED:
+                log_records.append(
+                    UserNotificationPolicyLogRecord(
                         author=email_message.receiver,
                         type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_SUCCESS,
                         notification_policy=email_message.notification_policy,
@@ -53,12 +66,14 @@ class EmailMessageManager(models.Manager):
                         if email_message.notification_policy
                         else None,
                     )
-                elif status in [
-                    SendgridEmailMessageStatuses.BOUNCE,
-                    SendgridEmailMessageStatuses.BLOCKED,
-                    SendgridEmailMessageStatuses.DROPPED,
-                ]:
-                    log_record = UserNotificationPolicyLogRecord(
+                )
+            elif status in [
+                SendgridEmailMessageStatuses.BOUNCE,
+                SendgridEmailMessageStatuses.BLOCKED,
+                SendgridEmailMessageStatuses.DROPPED,
+            ]:
+                log_records.append(
+                    UserNotificationPolicyLogRecord(
                         author=email_message.receiver,
                         type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FAILED,
                         notification_policy=email_message.notification_policy,
@@ -71,11 +86,15 @@ class EmailMessageManager(models.Manager):
                         if email_message.notification_policy
                         else None,
                     )
-                if log_record is not None:
-                    log_record.save()
-                    user_notification_action_triggered_signal.send(
-                        sender=EmailMessage.objects.update_status, log_record=log_record
-                    )
+                )
+
+        self.bulk_update(updated_email_messages, ["status"])
+
+        for log_record in log_records:
+            log_record.save()
+            user_notification_action_triggered_signal.send(
+                sender=EmailMessage.objects.update_statuses, log_record=log_record
+            )
 
 
 class EmailMessage(models.Model):
@@ -0,0 +1,20 @@
+from celery.utils.log import get_task_logger
+from django.apps import apps
+from django.conf import settings
+
+from common.custom_celery_tasks import shared_dedicated_queue_retry_task
+
+logger = get_task_logger(__name__)
+
+
+@shared_dedicated_queue_retry_task(
+    autoretry_for=(Exception,), retry_backoff=True, max_retries=1 if settings.DEBUG else None
+)
+def process_email_status_events(events):
+    """
+    Applies a batch of SendGrid delivery events received by EmailStatusCallback
+    """
+    EmailMessage = apps.get_model("sendgridapp", "EmailMessage")
+
+    logger.info(f"process_email_status_events: processing {len(events)} events")
+    EmailMessage.objects.update_statuses(events)
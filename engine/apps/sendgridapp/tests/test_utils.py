@@ -0,0 +1,74 @@
+import pytest
+
+from apps.sendgridapp.constants import SendgridEmailMessageStatuses
+from apps.sendgridapp.utils import get_latest_statuses, is_status_update_allowed
+
+
+def test_get_latest_statuses_groups_events_by_message():
+    events = [
+        ("message-1", "processed", 1),
+        ("message-2", "processed", 1),
+        ("message-1", "deferred", 2),
+        ("message-2", "delivered", 3),
+    ]
+
+    assert get_latest_statuses(events) == {
+        "message-1": SendgridEmailMessageStatuses.DEFERRED,
+        "message-2": SendgridEmailMessageStatuses.DELIVERED,
+    }
+
+
+def test_get_latest_statuses_orders_events_by_timestamp():
+    events = [
+        ("message-1", "deferred", 2),
+        ("message-1", "processed", 1),
+    ]
+
+    assert get_latest_statuses(events) == {"message-1": SendgridEmailMessageStatuses.DEFERRED}
+
+
+def test_get_latest_statuses_keeps_terminal_status():
+    events = [
+        ("message-1", "processed", 1),
+        ("message-1", "delivered", 2),
+        ("message-1", "deferred", 3),
+        ("message-1", "open", 4),
+    ]
+
+    assert get_latest_statuses(events) == {"message-1": SendgridEmailMessageStatuses.DELIVERED}
+
+
+def test_get_latest_statuses_terminal_status_replaced_by_terminal_status():
+    events = [
+        ("message-1", "delivered", 1),
+        ("message-1", "bounce", 2),
+    ]
+
+    assert get_latest_statuses(events) == {"message-1": SendgridEmailMessageStatuses.BOUNCE}
+
+
+def test_get_latest_statuses_skips_invalid_events():
+    events = [
+        (None, "delivered", 1),
+        ("message-1", "unknown", 2),
+        ("message-2", "processed", None),
+    ]
+
+    assert get_latest_statuses(events) == {"message-2": SendgridEmailMessageStatuses.PROCESSED}
+
+
+@pytest.mark.parametrize(
+    "previous_status,status,expected",
+    [
+        (None, SendgridEmailMessageStatuses.ACCEPTED, True),
+        (SendgridEmailMessageStatuses.ACCEPTED, SendgridEmailMessageStatuses.PROCESSED, True),
+        (SendgridEmailMessageStatuses.PROCESSED, SendgridEmailMessageStatuses.DELIVERED, True),
+        (SendgridEmailMessageStatuses.DELIVERED, SendgridEmailMessageStatuses.OPEN, True),
+        (SendgridEmailMessageStatuses.DELIVERED, SendgridEmailMessageStatuses.DELIVERED, False),
+        (SendgridEmailMessageStatuses.DELIVERED, SendgridEmailMessageStatuses.DEFERRED, False),
+        (SendgridEmailMessageStatuses.OPEN, SendgridEmailMessageStatuses.PROCESSED, False),
+        (SendgridEmailMessageStatuses.BOUNCE, SendgridEmailMessageStatuses.ACCEPTED, False),
+    ],
+)
+def test_is_status_update_allowed(previous_status, status, expected):
+    assert is_status_update_allowed(previous_status, status) is expected
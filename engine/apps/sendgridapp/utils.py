@@ -0,0 +1,44 @@
+from apps.sendgridapp.constants import SendgridEmailMessageStatuses
+
+
+def get_latest_statuses(events):
+    """Groups SendGrid delivery events by message and picks a single status per message.
+    The latest event wins unless it would replace the terminal status of the message.
+
+    Args:
+        events (list): (message_uuid, message_status, timestamp) tuples, as received from SendGrid
+
+    Returns:
+        dict: message_uuid -> status
+    """
+    new_statuses = {}
+    for message_uuid, message_status, timestamp in sorted(events, key=lambda event: event[2] or 0):
+        status = SendgridEmailMessageStatuses.DETERMINANT.get(message_status)
+        if not message_uuid or status is None:
+            continue
+        previous_status = new_statuses.get(message_uuid)
+        if (
+            previous_status in SendgridEmailMessageStatuses.TERMINAL_STATUSES
+            and status not in SendgridEmailMessageStatuses.TERMINAL_STATUSES
+        ):
+            continue
+        new_statuses[message_uuid] = status
+    return new_statuses
+
+
+def is_status_update_allowed(previous_status, status):
+    """Events are delivered out of order, delivered messages can't go back to pending delivery statuses
+
+    Args:
+        previous_status (int): current status of the message
+        status (int): new status of the message
+
+    Returns:
+        bool
+    """
+    if status == previous_status:
+        return False
+    return not (
+        previous_status in SendgridEmailMessageStatuses.DELIVERY_FINISHED_STATUSES
+        and status in SendgridEmailMessageStatuses.PENDING_DELIVERY_STATUSES
+    )
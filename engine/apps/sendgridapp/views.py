@@ -1,11 +1,13 @@
 import logging
+import uuid
 
-from django.apps import apps
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.sendgridapp.constants import SendgridEmailMessageStatuses
 from apps.sendgridapp.permissions import AllowOnlySendgrid
+from apps.sendgridapp.tasks import process_email_status_events
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,8 @@ class EmailStatusCallback(APIView):
     permission_classes = [AllowOnlySendgrid]
 
     def post(self, request):
+        # SendGrid posts events in batches, they are validated here and applied in bulk by a single task
+        events = []
         for data in request.data:
             message_uuid = data.get("message_uuid")
             message_status = data.get("event")
@@ -23,7 +27,15 @@ class EmailStatusCallback(APIView):
                 message_status = message_status["type"]
             logger.info(f"UUID: {message_uuid}, Status: {message_status}")
 
-            EmailMessage = apps.get_model("sendgridapp", "EmailMessage")
-            EmailMessage.objects.update_status(message_uuid=message_uuid, message_status=message_status)
+            try:
+                message_uuid = str(uuid.UUID(message_uuid))
+            except (TypeError, ValueError):
+                continue
+            if message_status not in SendgridEmailMessageStatuses.DETERMINANT:
+                continue
+            events.append((message_uuid, message_status, data.get("timestamp")))
+
+        if events:
+            process_email_status_events.delay(events)
 
         return Response(data="", status=status.HTTP_204_NO_CONTENT)
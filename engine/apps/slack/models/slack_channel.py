@@ -1,7 +1,10 @@
 from django.conf import settings
 from django.core.validators import MinLengthValidator
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 
+from apps.slack.slack_formatter import invalidate_workspace_names
 from common.public_primary_keys import generate_public_primary_key, increase_public_primary_key_length
 
 
@@ -43,3 +46,10 @@ class SlackChannel(models.Model):
 
     class Meta:
         unique_together = ("slack_id", "slack_team_identity")
+
+
+@receiver(post_save, sender=SlackChannel)
+def listen_for_slack_channel_model_save(sender, instance, update_fields=None, *args, **kwargs):
+    # new and renamed channels are rendered by SlackFormatter
+    if instance.slack_team_identity_id is not None and (update_fields is None or "name" in update_fields):
+        invalidate_workspace_names(instance.slack_team_identity_id)
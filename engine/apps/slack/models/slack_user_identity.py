@@ -2,10 +2,13 @@ import logging
 
 import requests
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 
 from apps.slack.constants import SLACK_BOT_ID
 from apps.slack.slack_client import SlackClientWithErrorHandling
 from apps.slack.slack_client.exceptions import SlackAPIException, SlackAPITokenException
+from apps.slack.slack_formatter import WORKSPACE_USER_NAME_FIELDS, invalidate_workspace_names
 from apps.user_management.models import User
 
 logger = logging.getLogger(__name__)
@@ -225,3 +228,12 @@ class SlackUserIdentity(models.Model):
         except User.DoesNotExist:
             user = None
         return user
+
+
+@receiver(post_save, sender=SlackUserIdentity)
+def listen_for_slack_user_identity_model_save(sender, instance, update_fields=None, *args, **kwargs):
+    # new users and changed names are rendered by SlackFormatter
+    if instance.slack_team_identity_id is not None and (
+        update_fields is None or set(WORKSPACE_USER_NAME_FIELDS).intersection(update_fields)
+    ):
+        invalidate_workspace_names(instance.slack_team_identity_id)
@@ -6,6 +6,7 @@ from slackclient import SlackClient
 from slackclient.exceptions import TokenRefreshError
 
 from apps.slack.constants import SLACK_RATE_LIMIT_DELAY
+from common import metrics
 
 from .exceptions import (
     SlackAPIChannelArchivedException,
@@ -66,7 +67,10 @@ class SlackClientWithErrorHandling(SlackClient):
             # We handle it in SlackClientServer and raise SlackClientException instead
             raise SlackClientException("Slack Downtime Simulation")
 
-        response = super(SlackClientWithErrorHandling, self).api_call(*args, **kwargs)
+        with metrics.observe_messenger_request("slack", args[0] if args else kwargs.get("method")) as request:
+            response = super(SlackClientWithErrorHandling, self).api_call(*args, **kwargs)
+            if not response["ok"]:
+                request.status = response["error"]
 
         if not response["ok"]:
 
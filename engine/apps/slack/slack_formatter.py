@@ -1,9 +1,106 @@
 import re
+import time
+from collections import OrderedDict
+from uuid import uuid4
 
-import emoji
 from django.apps import apps
+from django.core.cache import cache
+from emoji.unicode_codes import EMOJI_ALIAS_UNICODE_ENGLISH
 from slackviewer.formatter import SlackFormatter
 
+# same pattern emoji.emojize uses for ":alias:" lookups, compiled once
+EMOJI_ALIAS_PATTERN = re.compile(r"(:[\w\-&.’”“()!#*+?–,/]+:)", flags=re.UNICODE)
+# https://github.com/Ranks/emojione/issues/114
+EMOJI_ALIASES = {
+    **EMOJI_ALIAS_UNICODE_ENGLISH,
+    ":simple_smile:": EMOJI_ALIAS_UNICODE_ENGLISH[":slightly_smiling_face:"],
+}
+
+# Slack user and channel names are kept in process memory per workspace and shared by all formatters.
+# A version stored in the shared cache is checked at most every WORKSPACE_NAMES_CHECK_INTERVAL seconds,
+# so names are reloaded in all processes after invalidate_workspace_names is called.
+# Only names of the most recently used WORKSPACE_NAMES_MAX_WORKSPACES workspaces are kept.
+WORKSPACE_NAMES_CHECK_INTERVAL = 60
+WORKSPACE_NAMES_VERSION_CACHE_LIFETIME = 60 * 60 * 24
+WORKSPACE_NAMES_MAX_WORKSPACES = 100
+_workspace_names = OrderedDict()
+
+# SlackUserIdentity fields a user name is taken from, in order of preference
+WORKSPACE_USER_NAME_FIELDS = (
+    "profile_display_name",
+    # the rest of fields are used by SlackUserIdentity.slack_verbal
+    "profile_real_name_normalized",
+    "profile_real_name",
+    "profile_display_name_normalized",
+    "cached_name",
+    "cached_slack_login",
+)
+
+
+def _get_workspace_names_version_cache_key(slack_team_identity_pk):
+    return f"slack_workspace_names_version_{slack_team_identity_pk}"
+
+
+def _get_workspace_names_version(slack_team_identity_pk):
+    cache_key = _get_workspace_names_version_cache_key(slack_team_identity_pk)
+    cache.add(cache_key, uuid4().hex, timeout=WORKSPACE_NAMES_VERSION_CACHE_LIFETIME)
+    return cache.get(cache_key)
+
+
+def _load_workspace_names(slack_team_identity_pk):
+    SlackUserIdentity = apps.get_model("slack", "SlackUserIdentity")
+    SlackChannel = apps.get_model("slack", "SlackChannel")
+
+    users = {}
+    slack_user_identities = SlackUserIdentity.objects.filter(slack_team_identity_id=slack_team_identity_pk).values_list(
+        "slack_id", *WORKSPACE_USER_NAME_FIELDS
+    )
+    for slack_id, *names in slack_user_identities:
+        name = next((name for name in names if name), None)
+        if name:
+            users.setdefault(slack_id, name)
+
+    channels = dict(
+        SlackChannel.objects.filter(slack_team_identity_id=slack_team_identity_pk).values_list("slack_id", "name")
+    )
+    return users, channels
+
+
+def get_workspace_names(slack_team_identity_pk):
+    """
+    Returns (users, channels) maps of Slack id to display name for the workspace.
+    """
+    now = time.monotonic()
+    entry = _workspace_names.get(slack_team_identity_pk)
+    if entry is not None:
+        _workspace_names.move_to_end(slack_team_identity_pk)
+        if now - entry["checked_at"] < WORKSPACE_NAMES_CHECK_INTERVAL:
+            return entry["users"], entry["channels"]
+
+    version = _get_workspace_names_version(slack_team_identity_pk)
+    if entry is None or entry["version"] != version:
+        users, channels = _load_workspace_names(slack_team_identity_pk)
+        entry = {"version": version, "users": users, "channels": channels}
+        _workspace_names[slack_team_identity_pk] = entry
+        if len(_workspace_names) > WORKSPACE_NAMES_MAX_WORKSPACES:
+            # drop the least recently used workspace
+            _workspace_names.popitem(last=False)
+
+    entry["checked_at"] = now
+    return entry["users"], entry["channels"]
+
+
+def invalidate_workspace_names(slack_team_identity_pk):
+    """
+    Makes all processes reload Slack user and channel names for the workspace on next use.
+    """
+    cache.set(
+        _get_workspace_names_version_cache_key(slack_team_identity_pk),
+        uuid4().hex,
+        timeout=WORKSPACE_NAMES_VERSION_CACHE_LIFETIME,
+    )
+    _workspace_names.pop(slack_team_identity_pk, None)
+
 
 class SlackFormatter(SlackFormatter):
     _LINK_PAT = re.compile(r"<(https|http|mailto):[A-Za-z0-9_\.\-\/\?\,\=\#\:\@\& ]+\|[^>]+>")
@@ -30,17 +127,22 @@ class SlackFormatter(SlackFormatter):
         message = message.replace("<!here|@here>", "@here")
         message = message.replace("<!everyone>", "@everyone")
         message = message.replace("<!everyone|@everyone>", "@everyone")
-        message = self._slack_to_accepted_emoji(message)
 
         # Handle mentions of users, channels and bots (e.g "<@U0BM1CGQY|calvinchanubc> has joined the channel")
         message = self._MENTION_PAT.sub(self._sub_annotated_mention, message)
         # Handle links
         message = self._LINK_PAT.sub(self._sub_hyperlink, message)
         # Introduce unicode emoji
-        message = emoji.emojize(message, use_aliases=True)
+        if ":" in message:
+            message = EMOJI_ALIAS_PATTERN.sub(self._sub_emoji, message)
 
         return message
 
+    @staticmethod
+    def _sub_emoji(matchobj):
+        alias = matchobj.group(1)
+        return EMOJI_ALIASES.get(alias, alias)
+
     def _sub_hyperlink(self, matchobj):
         compound = matchobj.group(0)[1:-1]
         if len(compound.split("|")) == 2:
@@ -71,29 +173,16 @@ class SlackFormatter(SlackFormatter):
                 annotation = self._sub_annotated_mention_slack_user(ref_id)
         return mention_format.format(annotation)
 
+    def _get_workspace_names(self):
+        slack_team_identity_pk = self.__ORGANIZATION.slack_team_identity_id
+        if slack_team_identity_pk is None:
+            return {}, {}
+        return get_workspace_names(slack_team_identity_pk)
+
     def _sub_annotated_mention_slack_channel(self, ref_id):
-        channel = None
-        slack_team_identity = self.__ORGANIZATION.slack_team_identity
-        if slack_team_identity is not None:
-            cached_channels = slack_team_identity.get_cached_channels(slack_id=ref_id)
-            if len(cached_channels) > 0:
-                channel = cached_channels[0].name
-            annotation = channel if channel else ref_id
-        else:
-            annotation = ref_id
-        return annotation
+        _, channels = self._get_workspace_names()
+        return channels.get(ref_id) or ref_id
 
     def _sub_annotated_mention_slack_user(self, ref_id):
-        SlackUserIdentity = apps.get_model("slack", "SlackUserIdentity")
-
-        slack_user_identity = SlackUserIdentity.objects.filter(
-            slack_team_identity=self.__ORGANIZATION.slack_team_identity, slack_id=ref_id
-        ).first()
-
-        annotation = ref_id
-        if slack_user_identity is not None:
-            if slack_user_identity.profile_display_name:
-                annotation = slack_user_identity.profile_display_name
-            elif slack_user_identity.slack_verbal:
-                annotation = slack_user_identity.slack_verbal
-        return annotation
+        users, _ = self._get_workspace_names()
+        return users.get(ref_id, ref_id)
@@ -14,9 +14,10 @@ from apps.slack.scenarios.escalation_delivery import EscalationDeliveryStep
 from apps.slack.scenarios.scenario_step import ScenarioStep
 from apps.slack.slack_client import SlackClientWithErrorHandling
 from apps.slack.slack_client.exceptions import SlackAPIException, SlackAPITokenException
+from apps.slack.slack_formatter import invalidate_workspace_names
 from apps.slack.utils import get_cache_key_update_incident_slack_message, post_message_to_channel
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
-from common.utils import batch_queryset
+from common.utils import iterate_queryset
 
 logger = get_task_logger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -383,6 +384,7 @@ def populate_slack_user_identities(organization_pk):
         "is_app_user",
     ]
     SlackUserIdentity.objects.bulk_update(slack_user_identities_to_update, fields_to_update, batch_size=5000)
+    invalidate_workspace_names(slack_team_identity.pk)
 
 
 @shared_dedicated_queue_retry_task()
@@ -499,13 +501,12 @@ def populate_slack_usergroups():
     delay = 0
     counter = 0
 
-    for qs in batch_queryset(slack_team_identities, 5000):
-        for slack_team_identity in qs:
-            counter += 1
-            # increase delay to prevent slack ratelimit
-            if counter % 8 == 0:
-                delay += 60
-            populate_slack_usergroups_for_team.apply_async((slack_team_identity.pk,), countdown=delay)
+    for slack_team_identity_pk in iterate_queryset(slack_team_identities.values_list("pk", flat=True), 5000):
+        counter += 1
+        # increase delay to prevent slack ratelimit
+        if counter % 8 == 0:
+            delay += 60
+        populate_slack_usergroups_for_team.apply_async((slack_team_identity_pk,), countdown=delay)
 
 
 @shared_dedicated_queue_retry_task(
@@ -670,13 +671,12 @@ def populate_slack_channels():
     delay = 0
     counter = 0
 
-    for qs in batch_queryset(slack_team_identities, 5000):
-        for slack_team_identity in qs:
-            counter += 1
-            # increase delay to prevent slack ratelimit
-            if counter % 8 == 0:
-                delay += 60
-            populate_slack_channels_for_team.apply_async((slack_team_identity.pk,), countdown=delay)
+    for slack_team_identity_pk in iterate_queryset(slack_team_identities.values_list("pk", flat=True), 5000):
+        counter += 1
+        # increase delay to prevent slack ratelimit
+        if counter % 8 == 0:
+            delay += 60
+        populate_slack_channels_for_team.apply_async((slack_team_identity_pk,), countdown=delay)
 
 
 @shared_dedicated_queue_retry_task(
@@ -755,6 +755,7 @@ def populate_slack_channels_for_team(slack_team_identity_id):
         SlackChannel.objects.bulk_update(
             channels_to_update, fields=("name", "is_archived", "is_shared", "last_populated"), batch_size=5000
         )
+        invalidate_workspace_names(slack_team_identity.pk)
 
 
 @shared_dedicated_queue_retry_task(autoretry_for=(Exception,), retry_backoff=True, max_retries=0)
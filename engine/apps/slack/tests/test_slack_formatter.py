@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+import pytest
+
+from apps.slack import slack_formatter
+from apps.slack.models import SlackChannel
+from apps.slack.slack_formatter import SlackFormatter, invalidate_workspace_names
+
+
+@pytest.mark.django_db
+def test_format_mentions(
+    make_organization_with_slack_team_identity, make_slack_user_identity, make_slack_channel, django_assert_num_queries
+):
+    organization, slack_team_identity = make_organization_with_slack_team_identity()
+    make_slack_user_identity(
+        slack_team_identity=slack_team_identity, slack_id="U111111111", profile_display_name="alice"
+    )
+    make_slack_channel(slack_team_identity=slack_team_identity, slack_id="C111111111", name="general")
+
+    sf = SlackFormatter(organization)
+    message = "<@U111111111> <@U222222222|bob> <#C111111111> <#C222222222> <@U333333333>"
+    expected = "@alice @bob #general #C222222222 @U333333333"
+
+    assert sf.format(message) == expected
+    # names are shared by all formatters of the workspace
+    with django_assert_num_queries(0):
+        assert SlackFormatter(organization).format(message) == expected
+
+
+@pytest.mark.django_db
+def test_format_mentions_invalidate(
+    make_organization_with_slack_team_identity, make_slack_user_identity, make_slack_channel
+):
+    organization, slack_team_identity = make_organization_with_slack_team_identity()
+    slack_channel = make_slack_channel(slack_team_identity=slack_team_identity, slack_id="C111111111", name="general")
+
+    sf = SlackFormatter(organization)
+    assert sf.format("<#C111111111>") == "#general"
+
+    # names are invalidated when a channel is renamed
+    slack_channel.name = "renamed"
+    slack_channel.save(update_fields=["name"])
+    assert sf.format("<#C111111111>") == "#renamed"
+
+    # and when a user joins the workspace
+    make_slack_user_identity(
+        slack_team_identity=slack_team_identity, slack_id="U111111111", profile_display_name="alice"
+    )
+    assert sf.format("<@U111111111>") == "@alice"
+
+    # changes not affecting names don't invalidate them
+    SlackChannel.objects.filter(pk=slack_channel.pk).update(name="renamed again")
+    slack_channel.save(update_fields=["is_archived"])
+    assert sf.format("<#C111111111>") == "#renamed"
+
+    invalidate_workspace_names(slack_team_identity.pk)
+    assert sf.format("<#C111111111>") == "#renamed again"
+
+
+@pytest.mark.django_db
+def test_workspace_names_cache_is_bounded(make_slack_team_identity, monkeypatch):
+    monkeypatch.setattr(slack_formatter, "WORKSPACE_NAMES_MAX_WORKSPACES", 2)
+    monkeypatch.setattr(slack_formatter, "_workspace_names", OrderedDict())
+    first, second, third = [make_slack_team_identity() for _ in range(3)]
+
+    slack_formatter.get_workspace_names(first.pk)
+    slack_formatter.get_workspace_names(second.pk)
+    # recently used workspace is kept
+    slack_formatter.get_workspace_names(first.pk)
+    slack_formatter.get_workspace_names(third.pk)
+    assert list(slack_formatter._workspace_names) == [first.pk, third.pk]
+
+
+@pytest.mark.django_db
+def test_format_emoji(make_organization):
+    organization = make_organization()
+    sf = SlackFormatter(organization)
+
+    assert sf.format(":fire: :simple_smile: :not_an_emoji: 10:30:00") == "🔥 🙂 :not_an_emoji: 10:30:00"
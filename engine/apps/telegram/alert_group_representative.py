@@ -5,7 +5,7 @@ from django.apps import apps
 from apps.alerts.models import AlertGroup
 from apps.alerts.representative import AlertGroupAbstractRepresentative
 from apps.telegram.models import TelegramMessage
-from apps.telegram.tasks import edit_message, on_create_alert_telegram_representative_async
+from apps.telegram.tasks import on_create_alert_telegram_representative_async, schedule_edit_message
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -57,7 +57,7 @@ class AlertGroupTelegramRepresentative(AlertGroupAbstractRepresentative):
             )
         )
         for message in messages_to_edit:
-            edit_message.delay(message_pk=message.pk)
+            schedule_edit_message(message)
 
     @classmethod
     def on_alert_group_update_log_report(cls, **kwargs):
@@ -74,7 +74,7 @@ class AlertGroupTelegramRepresentative(AlertGroupAbstractRepresentative):
         )
 
         for message in messages_to_edit:
-            edit_message.delay(message_pk=message.pk)
+            schedule_edit_message(message)
 
     @classmethod
     def on_alert_group_action_triggered(cls, **kwargs):
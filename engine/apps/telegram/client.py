@@ -1,6 +1,10 @@
 import logging
+import math
+import time
 from typing import Optional, Tuple, Union
 
+from django.conf import settings
+from django.core.cache import cache
 from telegram import Bot, InlineKeyboardMarkup, Message, ParseMode
 from telegram.error import BadRequest, InvalidToken, Unauthorized
 from telegram.utils.request import Request
@@ -10,6 +14,7 @@ from apps.base.utils import live_settings
 from apps.telegram.models import TelegramMessage
 from apps.telegram.renderers.keyboard import TelegramKeyboardRenderer
 from apps.telegram.renderers.message import TelegramMessageRenderer
+from common import metrics
 from common.api_helpers.utils import create_engine_url
 
 logger = logging.getLogger(__name__)
@@ -18,6 +23,9 @@ logger = logging.getLogger(__name__)
 class TelegramClient:
     ALLOWED_UPDATES = ("message", "callback_query")
     PARSE_MODE = ParseMode.HTML
+    SENDING_SLOT_CACHE_KEY_PREFIX = "telegram_sending_slot"
+    # how far ahead a sending slot can be reserved
+    MAX_SENDING_SLOT_DELAY = 60  # seconds
 
     def __init__(self, token: Optional[str] = None):
         self.token = token or live_settings.TELEGRAM_TOKEN
@@ -45,6 +53,71 @@ class TelegramClient:
 
         self.api_client.set_webhook(webhook_url, allowed_updates=self.ALLOWED_UPDATES)
 
+    @classmethod
+    def reserve_sending_slot(cls, chat_id: Union[int, str]) -> float:
+        """
+        Paces messages, so all workers together send no more than TELEGRAM_MESSAGES_PER_SECOND messages per second
+        and messages to the same chat are at least chat interval apart.
+        Group and channel chat ids are negative, they have stricter limits than private chats.
+        :return: delay in seconds before the reserved slot
+        """
+        chat_interval = (
+            settings.TELEGRAM_GROUP_CHAT_MESSAGE_INTERVAL
+            if str(chat_id).startswith("-")
+            else settings.TELEGRAM_PRIVATE_CHAT_MESSAGE_INTERVAL
+        )
+        now = time.time()
+        for delay in range(cls.MAX_SENDING_SLOT_DELAY):
+            # the first slot is right away, the next ones are at the start of the following seconds
+            send_at = now if delay == 0 else int(now) + delay
+            chat_slot_cache_keys = cls._reserve_chat_slot(chat_id, send_at, chat_interval)
+            if chat_slot_cache_keys is None:
+                continue
+            if cls._reserve_slot(
+                f"{cls.SENDING_SLOT_CACHE_KEY_PREFIX}_{int(send_at)}", settings.TELEGRAM_MESSAGES_PER_SECOND
+            ):
+                return send_at - now
+            # overall limit is reached in this second, give the chat slot back
+            cache.delete_many(chat_slot_cache_keys)
+        logger.warning(
+            f"telegram_client: no free sending slot for chat {chat_id} in the next {cls.MAX_SENDING_SLOT_DELAY} seconds"
+        )
+        return cls.MAX_SENDING_SLOT_DELAY
+
+    @classmethod
+    def _reserve_chat_slot(cls, chat_id: Union[int, str], send_at: float, chat_interval: int) -> Optional[list]:
+        """
+        Reserves every second the chat is busy for after a message sent at send_at.
+        Seconds are reserved with cache.add, so of two concurrent reservations less than chat interval apart
+        only one succeeds.
+        :return: reserved cache keys or None if the chat is busy
+        """
+        reserved_cache_keys = []
+        for second in range(int(send_at), math.ceil(send_at + chat_interval)):
+            cache_key = f"{cls.SENDING_SLOT_CACHE_KEY_PREFIX}_{chat_id}_{second}"
+            if not cache.add(cache_key, True, timeout=cls.MAX_SENDING_SLOT_DELAY * 2):
+                cache.delete_many(reserved_cache_keys)
+                return None
+            reserved_cache_keys.append(cache_key)
+        return reserved_cache_keys
+
+    @classmethod
+    def _reserve_slot(cls, cache_key: str, capacity: int) -> bool:
+        cache.add(cache_key, 0, timeout=cls.MAX_SENDING_SLOT_DELAY * 2)
+        try:
+            reserved = cache.incr(cache_key)
+        except ValueError:
+            # slot key was evicted, consider it free
+            return True
+        if reserved > capacity:
+            # don't count the failed reservation
+            try:
+                cache.decr(cache_key)
+            except ValueError:
+                pass
+            return False
+        return True
+
     def send_message(
         self,
         chat_id: Union[int, str],
@@ -71,14 +144,15 @@ class TelegramClient:
         reply_to_message_id: Optional[int] = None,
     ) -> Message:
         try:
-            message = self.api_client.send_message(
-                chat_id=chat_id,
-                text=text,
-                reply_markup=keyboard,
-                reply_to_message_id=reply_to_message_id,
-                parse_mode=self.PARSE_MODE,
-                disable_web_page_preview=False,
-            )
+            with metrics.observe_messenger_request("telegram", "send_message"):
+                message = self.api_client.send_message(
+                    chat_id=chat_id,
+                    text=text,
+                    reply_markup=keyboard,
+                    reply_to_message_id=reply_to_message_id,
+                    parse_mode=self.PARSE_MODE,
+                    disable_web_page_preview=False,
+                )
         except BadRequest as e:
             logger.warning("Telegram BadRequest: {}".format(e.message))
             raise
@@ -100,14 +174,15 @@ class TelegramClient:
         text: str,
         keyboard: Optional[InlineKeyboardMarkup] = None,
     ) -> Message:
-        message = self.api_client.edit_message_text(
-            chat_id=chat_id,
-            message_id=message_id,
-            text=text,
-            reply_markup=keyboard,
-            parse_mode=self.PARSE_MODE,
-            disable_web_page_preview=False,
-        )
+        with metrics.observe_messenger_request("telegram", "edit_message_text"):
+            message = self.api_client.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                reply_markup=keyboard,
+                parse_mode=self.PARSE_MODE,
+                disable_web_page_preview=False,
+            )
         return message
 
     @staticmethod
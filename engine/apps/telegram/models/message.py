@@ -38,7 +38,8 @@ class TelegramMessage(models.Model):
         related_name="telegram_messages",
     )
 
-    # field for task debouncing for apps.telegram.tasks.edit_message
+    # edit_task_id is deprecated, edits are coalesced in the cache by apps.telegram.tasks.schedule_edit_message.
+    # The column is kept for workers of the previous release during rolling deploys and will be dropped later.
     edit_task_id = models.CharField(max_length=100, null=True, default=None)
 
     @property
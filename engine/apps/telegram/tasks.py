@@ -1,9 +1,9 @@
 import logging
 
-from celery import uuid as celery_uuid
 from celery.utils.log import get_task_logger
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from telegram import error
 
 from apps.alerts.models import Alert, AlertGroup
@@ -23,6 +23,10 @@ from common.utils import OkToRetry
 logger = get_task_logger(__name__)
 logger.setLevel(logging.DEBUG)
 
+EDIT_MESSAGE_PENDING_CACHE_KEY_PREFIX = "telegram_edit_message_pending"
+# pending edit expires if its task is lost, so the message can be edited again
+EDIT_MESSAGE_PENDING_TIMEOUT = TelegramClient.MAX_SENDING_SLOT_DELAY + 60 * 5
+
 
 @shared_dedicated_queue_retry_task(
     autoretry_for=(Exception,), retry_backoff=True, max_retries=1 if settings.DEBUG else None
@@ -37,6 +41,25 @@ def register_telegram_webhook(token=None):
         logger.warning(f"Tried to register Telegram webhook using token: {telegram_client.token}, got error: {e}")
 
 
+def get_edit_message_pending_cache_key(message_pk):
+    return f"{EDIT_MESSAGE_PENDING_CACHE_KEY_PREFIX}_{message_pk}"
+
+
+def schedule_edit_message(message, countdown=0):
+    """
+    Schedules edit of the message to its latest state.
+    Edits requested while an edit is already pending are coalesced into it, since the message is rendered
+    when the edit is executed. Edits are paced to Telegram rate limits, so when the chat is idle the edit is sent
+    right away and during bursts of updates it's delayed to the next free sending slot.
+    """
+    if not cache.add(get_edit_message_pending_cache_key(message.pk), True, timeout=EDIT_MESSAGE_PENDING_TIMEOUT):
+        logger.debug(f"Edit of telegram message {message.pk} is already pending")
+        return
+
+    delay = TelegramClient.reserve_sending_slot(message.chat_id)
+    edit_message.apply_async((message.pk,), countdown=max(delay, countdown))
+
+
 @shared_dedicated_queue_retry_task(
     bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=1 if settings.DEBUG else None
 )
@@ -44,22 +67,12 @@ def register_telegram_webhook(token=None):
 @ignore_message_to_edit_deleted
 @ignore_bot_deleted
 def edit_message(self, message_pk):
+    # release the pending edit before rendering, so updates made during the edit schedule a new one
+    cache.delete(get_edit_message_pending_cache_key(message_pk))
+
     message = TelegramMessage.objects.get(pk=message_pk)
     telegram_client = TelegramClient()
 
-    # if edit_task_id was not set at the time task was invoked, assign it and rerun the task
-    if message.edit_task_id is None:
-        task_id = celery_uuid()
-        message.edit_task_id = task_id
-        message.save(update_fields=["edit_task_id"])
-
-        edit_message.apply_async((message_pk,), task_id=task_id)
-        return
-
-    if message.edit_task_id != edit_message.request.id:
-        logger.debug("Dropping the task since another task was scheduled already.")
-        return
-
     try:
         telegram_client.edit_message(message=message)
     except error.BadRequest as e:
@@ -67,16 +80,7 @@ def edit_message(self, message_pk):
             pass
     except (error.RetryAfter, error.TimedOut) as e:
         countdown = getattr(e, "retry_after", 3)
-
-        task_id = celery_uuid()
-        message.edit_task_id = task_id
-        message.save(update_fields=["edit_task_id"])
-
-        edit_message.apply_async((message_pk,), countdown=countdown, task_id=task_id)
-        return
-
-    message.edit_task_id = None
-    message.save(update_fields=["edit_task_id"])
+        schedule_edit_message(message, countdown=countdown)
 
 
 @shared_dedicated_queue_retry_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=None)
@@ -202,4 +206,4 @@ def on_create_alert_telegram_representative_async(self, alert_pk):
         )
     )
     for message in messages_to_edit:
-        edit_message.delay(message_pk=message.pk)
+        schedule_edit_message(message)
@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from telegram import error
+
+from apps.telegram.client import TelegramClient
+from apps.telegram.models import TelegramMessage
+from apps.telegram.tasks import edit_message, schedule_edit_message
+
+
+@pytest.fixture()
+def telegram_message(
+    make_organization_with_slack_team_identity, make_alert_receive_channel, make_alert_group, make_telegram_message
+):
+    organization, _ = make_organization_with_slack_team_identity()
+    alert_receive_channel = make_alert_receive_channel(organization)
+    alert_group = make_alert_group(alert_receive_channel)
+    return make_telegram_message(alert_group, TelegramMessage.ALERT_GROUP_MESSAGE, chat_id="-100123")
+
+
+@pytest.mark.django_db
+def test_schedule_edit_message_coalesces_pending_edits(telegram_message):
+    cache.clear()
+
+    with patch.object(edit_message, "apply_async") as mock_apply_async:
+        schedule_edit_message(telegram_message)
+        schedule_edit_message(telegram_message)
+
+    mock_apply_async.assert_called_once_with((telegram_message.pk,), countdown=0)
+
+    with patch.object(TelegramClient, "__init__", return_value=None), patch.object(
+        TelegramClient, "edit_message"
+    ) as mock_edit_message:
+        edit_message(telegram_message.pk)
+    mock_edit_message.assert_called_once()
+
+    # edit is not pending anymore, so the next update schedules a new one, paced to the chat rate limit
+    with patch.object(edit_message, "apply_async") as mock_apply_async:
+        schedule_edit_message(telegram_message)
+    mock_apply_async.assert_called_once()
+    assert mock_apply_async.call_args.kwargs["countdown"] > 0
+
+
+@pytest.mark.django_db
+def test_edit_message_rescheduled_on_retry_after(telegram_message):
+    cache.clear()
+
+    with patch.object(TelegramClient, "__init__", return_value=None), patch.object(
+        TelegramClient, "edit_message", side_effect=error.RetryAfter(10)
+    ), patch.object(edit_message, "apply_async") as mock_apply_async:
+        edit_message(telegram_message.pk)
+
+    mock_apply_async.assert_called_once_with((telegram_message.pk,), countdown=10)
+
+
+@pytest.mark.parametrize(
+    "chat_ids,messages_per_second,expected_delays",
+    [
+        # group chats are limited to one message per interval
+        (["-1", "-1", "-1"], 30, [0, 3, 6]),
+        (["1", "1", "1"], 30, [0, 1, 2]),
+        # overall limit is shared by all chats
+        (["1", "2", "3", "-4"], 2, [0, 0, 1, 1]),
+    ],
+)
+def test_reserve_sending_slot(settings, chat_ids, messages_per_second, expected_delays):
+    cache.clear()
+    settings.TELEGRAM_MESSAGES_PER_SECOND = messages_per_second
+    settings.TELEGRAM_PRIVATE_CHAT_MESSAGE_INTERVAL = 1
+    settings.TELEGRAM_GROUP_CHAT_MESSAGE_INTERVAL = 3
+
+    with patch("apps.telegram.client.time.time", return_value=300):
+        delays = [TelegramClient.reserve_sending_slot(chat_id) for chat_id in chat_ids]
+
+    assert delays == expected_delays
+
+
+def test_reserve_sending_slot_keeps_chat_interval(settings):
+    cache.clear()
+    settings.TELEGRAM_MESSAGES_PER_SECOND = 30
+    settings.TELEGRAM_GROUP_CHAT_MESSAGE_INTERVAL = 3
+
+    # message sent at the end of a second keeps the chat busy for 3 seconds after it
+    with patch("apps.telegram.client.time.time", return_value=300.9):
+        assert TelegramClient.reserve_sending_slot("-1") == 0
+    with patch("apps.telegram.client.time.time", return_value=301.0):
+        assert TelegramClient.reserve_sending_slot("-1") == 3
+
+
+def test_reserve_sending_slot_gives_chat_slot_back(settings):
+    cache.clear()
+    settings.TELEGRAM_MESSAGES_PER_SECOND = 1
+    settings.TELEGRAM_GROUP_CHAT_MESSAGE_INTERVAL = 3
+
+    with patch("apps.telegram.client.time.time", return_value=300):
+        assert TelegramClient.reserve_sending_slot("-1") == 0
+        # overall limit is reached in the first second, so the chat is reserved from the next one
+        assert TelegramClient.reserve_sending_slot("-2") == 1
+        # the chat slot reserved in the first second was given back
+        assert TelegramClient._reserve_chat_slot("-2", 300, 1) is not None
@@ -41,6 +41,9 @@ class TwilioMessageStatuses(object):
         "read": READ,
     }
 
+    # statuses reported to users in notification log
+    DELIVERY_LOG_STATUSES = (DELIVERED, UNDELIVERED, FAILED)
+
 
 class TwilioCallStatuses(object):
     """
@@ -78,6 +81,9 @@ class TwilioCallStatuses(object):
         "canceled": CANCELED,
     }
 
+    # statuses reported to users in notification log
+    DELIVERY_LOG_STATUSES = (COMPLETED, BUSY, FAILED, NO_ANSWER)
+
 
 class TwilioLogRecordType(object):
     VERIFICATION_START = 10
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.15 on 2026-10-19 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('twilioapp', '0002_auto_20220604_1008'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='phonecall',
+            name='status_log_pending',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddField(
+            model_name='smsmessage',
+            name='status_log_pending',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
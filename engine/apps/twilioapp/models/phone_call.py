@@ -12,6 +12,7 @@ from apps.alerts.incident_appearance.renderers.phone_call_renderer import AlertG
 from apps.alerts.signals import user_notification_action_triggered_signal
 from apps.base.utils import live_settings
 from apps.twilioapp.constants import TwilioCallStatuses
+from apps.twilioapp.tasks import schedule_status_callbacks_processing
 from apps.twilioapp.twilio_client import twilio_client
 from common.api_helpers.utils import create_engine_url
 from common.utils import clean_markup, escape_for_twilio_phone_call
@@ -21,8 +22,8 @@ logger = logging.getLogger(__name__)
 
 class PhoneCallManager(models.Manager):
     def update_status(self, call_sid, call_status):
-        """The function checks existence of PhoneCall instance
-        according to call_sid and updates status on message_status
+        """The function updates status of PhoneCall instance according to call_sid.
+        Delivery log records are created in batches by process_status_callbacks task.
 
         Args:
             call_sid (str): sid of Twilio call
@@ -31,53 +32,75 @@ class PhoneCallManager(models.Manager):
         Returns:
 
         """
-        UserNotificationPolicyLogRecord = apps.get_model("base", "UserNotificationPolicyLogRecord")
-
         if call_sid and call_status:
-            phone_call_qs = self.filter(sid=call_sid)
-
             status = TwilioCallStatuses.DETERMINANT.get(call_status)
 
-            if phone_call_qs.exists() and status:
-                phone_call_qs.update(status=status)
-                phone_call = phone_call_qs.first()
-                if phone_call.grafana_cloud_notification:
-                    # If call was made via grafana twilio it is don't needed to create logs on it's delivery status.
-                    return
-                log_record = None
-                if status == TwilioCallStatuses.COMPLETED:
-                    log_record = UserNotificationPolicyLogRecord(
-                        author=phone_call.receiver,
-                        type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_SUCCESS,
-                        notification_policy=phone_call.notification_policy,
-                        alert_group=phone_call.represents_alert_group,
-                        notification_step=phone_call.notification_policy.step
-                        if phone_call.notification_policy
-                        else None,
-                        notification_channel=phone_call.notification_policy.notify_by
-                        if phone_call.notification_policy
-                        else None,
-                    )
-                elif status in [TwilioCallStatuses.FAILED, TwilioCallStatuses.BUSY, TwilioCallStatuses.NO_ANSWER]:
-                    log_record = UserNotificationPolicyLogRecord(
-                        author=phone_call.receiver,
-                        type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FAILED,
-                        notification_policy=phone_call.notification_policy,
-                        alert_group=phone_call.represents_alert_group,
-                        notification_error_code=PhoneCall.get_error_code_by_twilio_status(status),
-                        notification_step=phone_call.notification_policy.step
-                        if phone_call.notification_policy
-                        else None,
-                        notification_channel=phone_call.notification_policy.notify_by
-                        if phone_call.notification_policy
-                        else None,
-                    )
-
-                if log_record is not None:
-                    log_record.save()
-                    user_notification_action_triggered_signal.send(
-                        sender=PhoneCall.objects.update_status, log_record=log_record
-                    )
+            if status:
+                update_kwargs = {"status": status}
+                if status in TwilioCallStatuses.DELIVERY_LOG_STATUSES:
+                    update_kwargs["status_log_pending"] = True
+                updated = self.filter(sid=call_sid).update(**update_kwargs)
+
+                if updated and status in TwilioCallStatuses.DELIVERY_LOG_STATUSES:
+                    schedule_status_callbacks_processing()
+
+    def process_status_callbacks(self, batch_size):
+        """
+        Creates delivery log records for phone calls with pending status updates.
+        Returns True if there are more phone calls to process.
+        """
+        UserNotificationPolicyLogRecord = apps.get_model("base", "UserNotificationPolicyLogRecord")
+
+        phone_calls = list(
+            self.filter(status_log_pending=True)
+            .select_related("receiver", "notification_policy", "represents_alert_group")
+            .order_by("pk")[:batch_size]
+        )
+
+        pks_by_status = {}
+        for phone_call in phone_calls:
+            pks_by_status.setdefault(phone_call.status, []).append(phone_call.pk)
+            if phone_call.grafana_cloud_notification:
+                # If call was made via grafana twilio it is don't needed to create logs on it's delivery status.
+                continue
+
+            status = phone_call.status
+            log_record = None
+            if status == TwilioCallStatuses.COMPLETED:
+                log_record = UserNotificationPolicyLogRecord(
+                    author=phone_call.receiver,
+                    type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_SUCCESS,
+                    notification_policy=phone_call.notification_policy,
+                    alert_group=phone_call.represents_alert_group,
+                    notification_step=phone_call.notification_policy.step if phone_call.notification_policy else None,
+                    notification_channel=phone_call.notification_policy.notify_by
+                    if phone_call.notification_policy
+                    else None,
+                )
+            elif status in [TwilioCallStatuses.FAILED, TwilioCallStatuses.BUSY, TwilioCallStatuses.NO_ANSWER]:
+                log_record = UserNotificationPolicyLogRecord(
+                    author=phone_call.receiver,
+                    type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FAILED,
+                    notification_policy=phone_call.notification_policy,
+                    alert_group=phone_call.represents_alert_group,
+                    notification_error_code=PhoneCall.get_error_code_by_twilio_status(status),
+                    notification_step=phone_call.notification_policy.step if phone_call.notification_policy else None,
+                    notification_channel=phone_call.notification_policy.notify_by
+                    if phone_call.notification_policy
+                    else None,
+                )
+
+            if log_record is not None:
+                log_record.save()
+                user_notification_action_triggered_signal.send(
+                    sender=PhoneCall.objects.update_status, log_record=log_record
+                )
+
+        # status could be changed by another callback while the batch was processed, keep such calls pending
+        for status, pks in pks_by_status.items():
+            self.filter(pk__in=pks, status=status).update(status_log_pending=False)
+
+        return len(phone_calls) == batch_size
 
     def get_and_process_digit(self, call_sid, digit):
         """The function get Phone Call instance according to call_sid
@@ -124,6 +147,8 @@ class PhoneCall(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     grafana_cloud_notification = models.BooleanField(default=False)
+    # set by status callback, delivery log record for the status is not created yet
+    status_log_pending = models.BooleanField(default=False, db_index=True)
 
     class PhoneCallsLimitExceeded(Exception):
         """Phone calls limit exceeded"""
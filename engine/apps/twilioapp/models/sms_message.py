@@ -11,6 +11,7 @@ from apps.alerts.incident_appearance.renderers.sms_renderer import AlertGroupSms
 from apps.alerts.signals import user_notification_action_triggered_signal
 from apps.base.utils import live_settings
 from apps.twilioapp.constants import TwilioMessageStatuses
+from apps.twilioapp.tasks import schedule_status_callbacks_processing
 from apps.twilioapp.twilio_client import twilio_client
 from common.api_helpers.utils import create_engine_url
 from common.utils import clean_markup
@@ -20,9 +21,8 @@ logger = logging.getLogger(__name__)
 
 class SMSMessageManager(models.Manager):
     def update_status(self, message_sid, message_status):
-        """The function checks existence of SMSMessage
-        instance according to message_sid and updates status on
-        message_status
+        """The function updates status of SMSMessage instance according to message_sid.
+        Delivery log records are created in batches by process_status_callbacks task.
 
         Args:
             message_sid (str): sid of Twilio message
@@ -31,54 +31,74 @@ class SMSMessageManager(models.Manager):
         Returns:
 
         """
-        UserNotificationPolicyLogRecord = apps.get_model("base", "UserNotificationPolicyLogRecord")
-
         if message_sid and message_status:
-            sms_message_qs = self.filter(sid=message_sid)
-
             status = TwilioMessageStatuses.DETERMINANT.get(message_status)
 
-            if sms_message_qs.exists() and status:
-                sms_message_qs.update(status=status)
-
-                sms_message = sms_message_qs.first()
-                if sms_message.grafana_cloud_notification:
-                    # If sms was sent via grafana cloud notifications  don't create logs on its delivery status.
-                    return
-                log_record = None
-
-                if status == TwilioMessageStatuses.DELIVERED:
-                    log_record = UserNotificationPolicyLogRecord(
-                        author=sms_message.receiver,
-                        type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_SUCCESS,
-                        notification_policy=sms_message.notification_policy,
-                        alert_group=sms_message.represents_alert_group,
-                        notification_step=sms_message.notification_policy.step
-                        if sms_message.notification_policy
-                        else None,
-                        notification_channel=sms_message.notification_policy.notify_by
-                        if sms_message.notification_policy
-                        else None,
-                    )
-                elif status in [TwilioMessageStatuses.UNDELIVERED, TwilioMessageStatuses.FAILED]:
-                    log_record = UserNotificationPolicyLogRecord(
-                        author=sms_message.receiver,
-                        type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FAILED,
-                        notification_policy=sms_message.notification_policy,
-                        alert_group=sms_message.represents_alert_group,
-                        notification_error_code=sms_message.get_error_code_by_twilio_status(status),
-                        notification_step=sms_message.notification_policy.step
-                        if sms_message.notification_policy
-                        else None,
-                        notification_channel=sms_message.notification_policy.notify_by
-                        if sms_message.notification_policy
-                        else None,
-                    )
-                if log_record is not None:
-                    log_record.save()
-                    user_notification_action_triggered_signal.send(
-                        sender=SMSMessage.objects.update_status, log_record=log_record
-                    )
+            if status:
+                update_kwargs = {"status": status}
+                if status in TwilioMessageStatuses.DELIVERY_LOG_STATUSES:
+                    update_kwargs["status_log_pending"] = True
+                updated = self.filter(sid=message_sid).update(**update_kwargs)
+
+                if updated and status in TwilioMessageStatuses.DELIVERY_LOG_STATUSES:
+                    schedule_status_callbacks_processing()
+
+    def process_status_callbacks(self, batch_size):
+        """
+        Creates delivery log records for messages with pending status updates.
+        Returns True if there are more messages to process.
+        """
+        UserNotificationPolicyLogRecord = apps.get_model("base", "UserNotificationPolicyLogRecord")
+
+        sms_messages = list(
+            self.filter(status_log_pending=True)
+            .select_related("receiver", "notification_policy", "represents_alert_group")
+            .order_by("pk")[:batch_size]
+        )
+
+        pks_by_status = {}
+        for sms_message in sms_messages:
+            pks_by_status.setdefault(sms_message.status, []).append(sms_message.pk)
+            if sms_message.grafana_cloud_notification:
+                # If sms was sent via grafana cloud notifications  don't create logs on its delivery status.
+                continue
+
+            status = sms_message.status
+            log_record = None
+            if status == TwilioMessageStatuses.DELIVERED:
+                log_record = UserNotificationPolicyLogRecord(
+                    author=sms_message.receiver,
+                    type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_SUCCESS,
+                    notification_policy=sms_message.notification_policy,
+                    alert_group=sms_message.represents_alert_group,
+                    notification_step=sms_message.notification_policy.step if sms_message.notification_policy else None,
+                    notification_channel=sms_message.notification_policy.notify_by
+                    if sms_message.notification_policy
+                    else None,
+                )
+            elif status in [TwilioMessageStatuses.UNDELIVERED, TwilioMessageStatuses.FAILED]:
+                log_record = UserNotificationPolicyLogRecord(
+                    author=sms_message.receiver,
+                    type=UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FAILED,
+                    notification_policy=sms_message.notification_policy,
+                    alert_group=sms_message.represents_alert_group,
+                    notification_error_code=sms_message.get_error_code_by_twilio_status(status),
+                    notification_step=sms_message.notification_policy.step if sms_message.notification_policy else None,
+                    notification_channel=sms_message.notification_policy.notify_by
+                    if sms_message.notification_policy
+                    else None,
+                )
+            if log_record is not None:
+                log_record.save()
+                user_notification_action_triggered_signal.send(
+                    sender=SMSMessage.objects.update_status, log_record=log_record
+                )
+
+        # status could be changed by another callback while the batch was processed, keep such messages pending
+        for status, pks in pks_by_status.items():
+            self.filter(pk__in=pks, status=status).update(status_log_pending=False)
+
+        return len(sms_messages) == batch_size
 
 
 class SMSMessage(models.Model):
@@ -99,6 +119,8 @@ class SMSMessage(models.Model):
         choices=TwilioMessageStatuses.CHOICES,
     )
     grafana_cloud_notification = models.BooleanField(default=False)
+    # set by status callback, delivery log record for the status is not created yet
+    status_log_pending = models.BooleanField(default=False, db_index=True)
 
     # https://www.twilio.com/docs/sms/api/message-resource#message-properties
     sid = models.CharField(
@@ -0,0 +1,45 @@
+from celery.utils.log import get_task_logger
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from common.custom_celery_tasks import shared_dedicated_queue_retry_task
+
+logger = get_task_logger(__name__)
+
+# status callbacks received within this delay are processed in one batch
+STATUS_CALLBACKS_BATCH_DELAY = 5  # seconds
+STATUS_CALLBACKS_BATCH_SIZE = 500
+STATUS_CALLBACKS_SCHEDULED_CACHE_KEY = "twilio_status_callbacks_processing_scheduled"
+STATUS_CALLBACKS_LOCK_CACHE_KEY = "twilio_status_callbacks_processing_lock"
+STATUS_CALLBACKS_LOCK_TIMEOUT = 60 * 5
+
+
+def schedule_status_callbacks_processing():
+    if cache.add(STATUS_CALLBACKS_SCHEDULED_CACHE_KEY, True, timeout=STATUS_CALLBACKS_BATCH_DELAY):
+        process_status_callbacks.apply_async(countdown=STATUS_CALLBACKS_BATCH_DELAY)
+
+
+@shared_dedicated_queue_retry_task(
+    autoretry_for=(Exception,), retry_backoff=True, max_retries=1 if settings.DEBUG else None
+)
+def process_status_callbacks():
+    """
+    Creates delivery log records for Twilio status callbacks received since the previous run
+    """
+    PhoneCall = apps.get_model("twilioapp", "PhoneCall")
+    SMSMessage = apps.get_model("twilioapp", "SMSMessage")
+
+    if not cache.add(STATUS_CALLBACKS_LOCK_CACHE_KEY, True, timeout=STATUS_CALLBACKS_LOCK_TIMEOUT):
+        logger.info("process_status_callbacks: another batch is being processed, retry later")
+        process_status_callbacks.apply_async(countdown=STATUS_CALLBACKS_BATCH_DELAY)
+        return
+
+    try:
+        has_more_phone_calls = PhoneCall.objects.process_status_callbacks(batch_size=STATUS_CALLBACKS_BATCH_SIZE)
+        has_more_sms_messages = SMSMessage.objects.process_status_callbacks(batch_size=STATUS_CALLBACKS_BATCH_SIZE)
+    finally:
+        cache.delete(STATUS_CALLBACKS_LOCK_CACHE_KEY)
+
+    if has_more_phone_calls or has_more_sms_messages:
+        process_status_callbacks.apply_async()
@@ -0,0 +1,11 @@
+import pytest
+
+from apps.twilioapp.twilio_client import twilio_client
+
+
+@pytest.fixture(autouse=True)
+def reset_twilio_api_client():
+    # twilio_client reuses API client between calls, don't let mocked clients leak between tests
+    twilio_client._api_client = None
+    yield
+    twilio_client._api_client = None
@@ -9,9 +9,10 @@ from django.utils.datastructures import MultiValueDict
 from django.utils.http import urlencode
 from rest_framework.test import APIClient
 
-from apps.base.models import UserNotificationPolicy
+from apps.base.models import UserNotificationPolicy, UserNotificationPolicyLogRecord
 from apps.twilioapp.constants import TwilioCallStatuses
 from apps.twilioapp.models import PhoneCall
+from apps.twilioapp.twilio_client import twilio_client
 from apps.twilioapp.utils import get_gather_message
 
 
@@ -331,3 +332,44 @@ def test_make_phone_call_gathering_digit(
 
     gather_message = urllib.parse.quote(get_gather_message())
     assert gather_message in mock_twilio_client.return_value.calls.create.call_args.kwargs["url"]
+
+
+@mock.patch("apps.twilioapp.models.phone_call.schedule_status_callbacks_processing")
+@pytest.mark.django_db
+def test_process_status_callbacks(mock_schedule_status_callbacks_processing, phone_call_setup):
+    phone_call, alert_group = phone_call_setup
+
+    PhoneCall.objects.update_status(call_sid=phone_call.sid, call_status="no-answer")
+    mock_schedule_status_callbacks_processing.assert_called_once_with()
+
+    phone_call.refresh_from_db()
+    assert phone_call.status_log_pending is True
+    assert not alert_group.personal_log_records.exists()
+
+    has_more = PhoneCall.objects.process_status_callbacks(batch_size=1)
+
+    assert has_more is True
+    phone_call.refresh_from_db()
+    assert phone_call.status_log_pending is False
+    log_record = alert_group.personal_log_records.get()
+    assert log_record.type == UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_FAILED
+    assert log_record.notification_error_code == UserNotificationPolicyLogRecord.ERROR_NOTIFICATION_PHONE_CALL_NO_ANSWER
+
+    assert PhoneCall.objects.process_status_callbacks(batch_size=1) is False
+
+
+@mock.patch("apps.twilioapp.twilio_client.Client")
+@pytest.mark.django_db
+def test_twilio_api_client_is_reused(mock_twilio_client):
+    assert twilio_client.twilio_api_client is twilio_client.twilio_api_client
+    assert mock_twilio_client.call_count == 1
+
+
+@pytest.mark.django_db
+def test_reserve_call_sending_slot(settings):
+    settings.TWILIO_CALLS_PER_SECOND = 2
+
+    with mock.patch("apps.twilioapp.twilio_client.time.time", return_value=1000.5):
+        delays = [twilio_client.reserve_call_sending_slot() for _ in range(5)]
+
+    assert delays == [0, 0, 1, 1, 2]
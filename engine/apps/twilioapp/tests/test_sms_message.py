@@ -7,7 +7,7 @@ from django.utils.datastructures import MultiValueDict
 from django.utils.http import urlencode
 from rest_framework.test import APIClient
 
-from apps.base.models import UserNotificationPolicy
+from apps.base.models import UserNotificationPolicy, UserNotificationPolicyLogRecord
 from apps.twilioapp.constants import TwilioMessageStatuses
 from apps.twilioapp.models import SMSMessage
 
@@ -140,3 +140,28 @@ def test_update_status(mock_has_permission, mock_slack_api_call, sms_message_set
 
         sms_message.refresh_from_db()
         assert sms_message.status == TwilioMessageStatuses.DETERMINANT[status]
+
+
+@mock.patch("apps.twilioapp.models.sms_message.schedule_status_callbacks_processing")
+@pytest.mark.django_db
+def test_process_status_callbacks(mock_schedule_status_callbacks_processing, sms_message_setup):
+    sms_message, alert_group = sms_message_setup
+
+    SMSMessage.objects.update_status(message_sid=sms_message.sid, message_status="sent")
+    mock_schedule_status_callbacks_processing.assert_not_called()
+    SMSMessage.objects.update_status(message_sid=sms_message.sid, message_status="delivered")
+    mock_schedule_status_callbacks_processing.assert_called_once_with()
+
+    sms_message.refresh_from_db()
+    assert sms_message.status == TwilioMessageStatuses.DELIVERED
+    assert sms_message.status_log_pending is True
+    assert not alert_group.personal_log_records.exists()
+
+    has_more = SMSMessage.objects.process_status_callbacks(batch_size=10)
+
+    assert has_more is False
+    sms_message.refresh_from_db()
+    assert sms_message.status_log_pending is False
+    log_record = alert_group.personal_log_records.get()
+    assert log_record.type == UserNotificationPolicyLogRecord.TYPE_PERSONAL_NOTIFICATION_SUCCESS
+    assert log_record.author == sms_message.receiver
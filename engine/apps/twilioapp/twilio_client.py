@@ -1,28 +1,75 @@
 import logging
+import time
 import urllib.parse
 
 from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 from twilio.base.exceptions import TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 
 from apps.base.utils import live_settings
 from apps.twilioapp.constants import TEST_CALL_TEXT, TwilioLogRecordStatus, TwilioLogRecordType
 from apps.twilioapp.utils import get_calling_code, get_gather_message, get_gather_url, parse_phone_number
+from common import metrics
 from common.api_helpers.utils import create_engine_url
 
 logger = logging.getLogger(__name__)
 
 
 class TwilioClient:
+    API_TIMEOUT = 10  # seconds
+    SENDING_SLOT_CACHE_KEY_PREFIX = "twilio_sending_slot"
+    # how far ahead a sending slot can be reserved
+    MAX_SENDING_SLOT_DELAY = 60  # seconds
+
+    def __init__(self):
+        self._api_client = None
+        self._api_client_credentials = None
+
     @property
     def twilio_api_client(self):
-        return Client(live_settings.TWILIO_ACCOUNT_SID, live_settings.TWILIO_AUTH_TOKEN)
+        # Reuse the client and its HTTP session to keep connections to Twilio API alive between requests.
+        # Client is recreated when credentials are changed in live settings.
+        credentials = (live_settings.TWILIO_ACCOUNT_SID, live_settings.TWILIO_AUTH_TOKEN)
+        if self._api_client is None or self._api_client_credentials != credentials:
+            self._api_client = Client(*credentials, http_client=TwilioHttpClient(timeout=self.API_TIMEOUT))
+            self._api_client_credentials = credentials
+        return self._api_client
+
+    def reserve_sms_sending_slot(self):
+        return self._reserve_sending_slot("sms", settings.TWILIO_SMS_PER_SECOND)
+
+    def reserve_call_sending_slot(self):
+        return self._reserve_sending_slot("call", settings.TWILIO_CALLS_PER_SECOND)
+
+    def _reserve_sending_slot(self, kind, rate_per_second):
+        """
+        Paces requests from Twilio number, so all workers together send no more than rate_per_second requests
+        of the given kind per second.
+        :return: delay in seconds before the reserved slot
+        """
+        now = int(time.time())
+        for delay in range(self.MAX_SENDING_SLOT_DELAY):
+            cache_key = f"{self.SENDING_SLOT_CACHE_KEY_PREFIX}_{kind}_{self.twilio_number}_{now + delay}"
+            cache.add(cache_key, 0, timeout=self.MAX_SENDING_SLOT_DELAY * 2)
+            try:
+                reserved = cache.incr(cache_key)
+            except ValueError:
+                # slot key was evicted, consider it free
+                return delay
+            if reserved <= rate_per_second:
+                return delay
+        logger.warning(f"twilio_client: no free {kind} sending slot for the next {self.MAX_SENDING_SLOT_DELAY} seconds")
+        return self.MAX_SENDING_SLOT_DELAY
 
     @property
     def twilio_number(self):
         return live_settings.TWILIO_NUMBER
 
+    @metrics.observe_messenger_request("twilio", "send_message")
     def send_message(self, body, to):
         status_callback = create_engine_url(reverse("twilioapp:sms_status_events"))
         try:
@@ -126,6 +173,7 @@ class TwilioClient:
         )
         self.make_call(message=message, to=to)
 
+    @metrics.observe_messenger_request("twilio", "make_call")
     def make_call(self, message, to, grafana_cloud=False):
         try:
             start_message = message.replace('"', "")
@@ -181,8 +181,10 @@ class Organization(MaintainableObject):
     """
 
     def start_disable_maintenance_task(self, countdown):
-        maintenance_uuid = disable_maintenance.apply_async(
-            args=(),
+        ScheduledTask = apps.get_model("base", "ScheduledTask")
+
+        maintenance_uuid = ScheduledTask.schedule(
+            disable_maintenance,
             kwargs={
                 "organization_id": self.pk,
             },
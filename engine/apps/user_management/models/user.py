@@ -93,6 +93,9 @@ class UserManager(models.Manager):
         organization.users.bulk_update(
             users_to_update, ["email", "name", "username", "role", "avatar_url"], batch_size=5000
         )
+        if users_to_update:
+            # bulk_update doesn't send post_save, so drop schedules iCal like listen_for_user_model_save does
+            drop_cached_ical_for_custom_events_for_organization.apply_async((organization.pk,))
 
 
 class UserQuerySet(models.QuerySet):
@@ -103,8 +106,13 @@ class UserQuerySet(models.QuerySet):
         return super().filter(*args, **kwargs)
 
     def delete(self):
+        organization_ids = set(self.values_list("organization_id", flat=True))
         # is_active = None is used to be able to have multiple deleted users with the same user_id
-        return super().update(is_active=None)
+        deleted_count = super().update(is_active=None)
+        # deleted users are removed from schedules iCal
+        for organization_id in organization_ids:
+            drop_cached_ical_for_custom_events_for_organization.apply_async((organization_id,))
+        return deleted_count
 
     def hard_delete(self):
         return super().delete()
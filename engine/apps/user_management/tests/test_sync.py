@@ -25,10 +25,17 @@ def test_sync_users_for_organization(make_organization, make_user_for_organizati
         for user_id in (2, 3)
     )
 
-    User.objects.sync_for_organization(organization, api_users=api_users)
+    with patch(
+        "apps.user_management.models.user.drop_cached_ical_for_custom_events_for_organization.apply_async"
+    ) as mock_drop_cached_ical:
+        User.objects.sync_for_organization(organization, api_users=api_users)
 
     assert organization.users.count() == 2
 
+    # schedules iCal is dropped for deleted and updated users
+    assert mock_drop_cached_ical.call_count == 2
+    mock_drop_cached_ical.assert_called_with((organization.pk,))
+
     # check that excess users are deleted
     assert not organization.users.filter(pk=users[0].pk).exists()
 
@@ -8,6 +8,7 @@ from jinja2.exceptions import TemplateRuntimeError
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound, Throttled
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 
 from apps.alerts.incident_appearance.templaters import (
@@ -23,6 +24,7 @@ from apps.api.serializers.team import TeamSerializer
 from apps.base.messaging import get_messaging_backends
 from apps.user_management.models import Team
 from common.api_helpers.exceptions import BadRequest
+from common.database import is_sticky_to_primary, use_read_replica
 from common.jinja_templater import apply_jinja_template
 
 
@@ -141,6 +143,34 @@ class RateLimitHeadersMixin:
         return super().handle_exception(exc)
 
 
+class ReadReplicaMixin:
+    """
+    Routes reads of safe requests to the read replica, see common.database.
+    Replica is used after authentication, so users who made changes recently are kept on the primary.
+    Content of streaming responses (e.g. exports) is read from the replica too, when it's consumed.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_sticky_to_primary(request.user):
+            self._read_replica = use_read_replica()
+            self._read_replica.__enter__()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        read_replica = getattr(self, "_read_replica", None)
+        if read_replica is not None:
+            self._read_replica = None
+            read_replica.__exit__(None, None, None)
+            if response.streaming:
+                response.streaming_content = self._stream_with_read_replica(response.streaming_content)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    @staticmethod
+    def _stream_with_read_replica(streaming_content):
+        with use_read_replica():
+            yield from streaming_content
+
+
 class OrderedModelSerializerMixin:
     def _change_position(self, order, instance):
         if order is not None:
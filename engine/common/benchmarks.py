@@ -0,0 +1,539 @@
+"""
+Benchmarks of hot paths of alert ingestion, escalation, schedules and rendering.
+Benchmarks are run on fixtures seeded in the local database inside a transaction, which is rolled back when they
+finish, with Celery tasks executed eagerly, so nothing is sent to the broker. Tasks deferred with
+transaction.on_commit are never executed, since the transaction is not committed.
+Cache writes are made to an isolated in-memory cache, which is dropped as well.
+Every benchmark reports wall time, number of database queries and peak memory allocated by a single run.
+"""
+import copy
+import timeit
+import tracemalloc
+from calendar import monthrange
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from icalendar import Event
+from recurring_ical_events import UnfoldableCalendar
+
+from apps.alerts.incident_appearance.templaters.web_templater import format_web_message
+from apps.alerts.tasks import escalate_alert_group
+from apps.schedules.ical_events.adapter.amixr_recurring_ical_events_adapter import AmixrUnfoldableCalendar
+from apps.schedules.ical_utils import create_base_icalendar, list_users_to_notify_from_ical_for_period
+from apps.schedules.models import CustomOnCallShift
+from common.constants.role import Role
+from common.jinja_templater import apply_jinja_template
+from common.utils import escape_html
+from config_integrations import alertmanager, grafana
+from engine.celery import app
+
+BENCHMARKS = {}
+
+# number of users notified by every "Notify multiple Users" escalation step
+ESCALATION_NOTIFY_USERS_COUNT = 5
+
+
+def benchmark(name):
+    """Registers benchmark setup, which takes seeded fixtures and returns a function to measure."""
+
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def make_large_payload(template_module, size):
+    """
+    Inflates integration test payload with labels and annotations containing links,
+    which is typical for Alertmanager and Grafana alerts with many series.
+    """
+    payload = copy.deepcopy(template_module.tests["payload"])
+    payload.setdefault("labels", {}).update({f"label_{i}": f"value-{i}.example.com" for i in range(size)})
+    payload.setdefault("annotations", {}).update(
+        {
+            f"runbook_{i}": f"See https://grafana.com/docs/runbooks/{i}?panel=1&from=now-1h for details"
+            for i in range(size)
+        }
+    )
+    payload["message"] = "\n".join(
+        f"Metric *cpu_usage* on host-{i}.example.com is above threshold, http://localhost:3000/d/{i}"
+        for i in range(size)
+    )
+    return payload
+
+
+def make_schedule_icalendar(usernames, now):
+    """
+    Daily rotation of users, where every user is on-call for a day once in len(usernames) days.
+    Rotation started len(usernames) weeks ago and every user has an edited occurrence, like swapped shifts.
+    """
+    calendar = create_base_icalendar("Benchmark")
+    users_count = len(usernames)
+    rotation_start = (now - timezone.timedelta(weeks=users_count)).replace(hour=0, minute=0, second=0, microsecond=0)
+    for idx, username in enumerate(usernames):
+        start = rotation_start + timezone.timedelta(days=idx)
+        uid = f"benchmark-{idx}"
+
+        event = Event()
+        event.add("uid", uid)
+        event.add("summary", username)
+        event.add("dtstart", start)
+        event.add("dtend", start + timezone.timedelta(days=1))
+        event.add("rrule", {"freq": "daily", "interval": users_count})
+        event.add("sequence", 0)
+        calendar.add_component(event)
+
+        edited_start = start + timezone.timedelta(days=users_count)
+        edited_event = Event()
+        edited_event.add("uid", uid)
+        edited_event.add("summary", usernames[(idx + 1) % users_count])
+        edited_event.add("dtstart", edited_start)
+        edited_event.add("dtend", edited_start + timezone.timedelta(days=1))
+        edited_event.add("recurrence-id", edited_start)
+        edited_event.add("sequence", 1)
+        calendar.add_component(edited_event)
+    return calendar
+
+
+class BenchmarkFixtures:
+    """
+    Organization with size users, size integrations, size routes for the benchmarked integration,
+    escalation chain of size steps and iCal schedule rotating all users.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.now = timezone.now()
+        self.payload = make_large_payload(grafana, size)
+
+        self.organization = self._seed_organization()
+        self.users = self._seed_users()
+        self.schedule, self.calendar = self._seed_schedule()
+        self.escalation_chain = self._seed_escalation_chain()
+        self.alert_receive_channel, self.channel_filter = self._seed_integrations()
+
+    def _seed_organization(self):
+        Organization = apps.get_model("user_management", "Organization")
+
+        ids = Organization.objects.aggregate(max_org_id=Max("org_id"), max_stack_id=Max("stack_id"))
+        return Organization.objects.create(
+            org_id=(ids["max_org_id"] or 0) + 1, stack_id=(ids["max_stack_id"] or 0) + 1, org_title="Benchmark"
+        )
+
+    def _seed_users(self):
+        User = apps.get_model("user_management", "User")
+
+        User.objects.bulk_create(
+            [
+                User(
+                    organization=self.organization,
+                    user_id=idx,
+                    username=f"benchmark-user-{idx}",
+                    email=f"benchmark-user-{idx}@example.com",
+                    role=Role.ADMIN,
+                )
+                for idx in range(self.size)
+            ]
+        )
+        return list(self.organization.users.order_by("user_id"))
+
+    def _seed_schedule(self):
+        OnCallScheduleICal = apps.get_model("schedules", "OnCallScheduleICal")
+
+        calendar = make_schedule_icalendar([user.username for user in self.users], self.now)
+        schedule = OnCallScheduleICal.objects.create(
+            organization=self.organization, name="Benchmark", cached_ical_file_primary=calendar.to_ical().decode()
+        )
+        return schedule, calendar
+
+    def _seed_escalation_chain(self):
+        EscalationChain = apps.get_model("alerts", "EscalationChain")
+        EscalationPolicy = apps.get_model("alerts", "EscalationPolicy")
+
+        escalation_chain = EscalationChain.objects.create(organization=self.organization, name="Benchmark")
+        steps = (
+            EscalationPolicy.STEP_NOTIFY_MULTIPLE_USERS,
+            EscalationPolicy.STEP_WAIT,
+            EscalationPolicy.STEP_NOTIFY_SCHEDULE,
+            EscalationPolicy.STEP_WAIT,
+        )
+        for idx in range(self.size):
+            step = steps[idx % len(steps)]
+            escalation_policy = EscalationPolicy.objects.create(
+                escalation_chain=escalation_chain,
+                step=step,
+                wait_delay=EscalationPolicy.ONE_MINUTE if step == EscalationPolicy.STEP_WAIT else None,
+                notify_schedule=self.schedule if step == EscalationPolicy.STEP_NOTIFY_SCHEDULE else None,
+            )
+            if step == EscalationPolicy.STEP_NOTIFY_MULTIPLE_USERS:
+                escalation_policy.notify_to_users_queue.set(self.users[:ESCALATION_NOTIFY_USERS_COUNT])
+        return escalation_chain
+
+    def _seed_integrations(self):
+        AlertReceiveChannel = apps.get_model("alerts", "AlertReceiveChannel")
+        ChannelFilter = apps.get_model("alerts", "ChannelFilter")
+
+        alert_receive_channels = [
+            AlertReceiveChannel.create(
+                organization=self.organization,
+                integration=AlertReceiveChannel.INTEGRATION_GRAFANA,
+                author=self.users[0],
+            )
+            for _ in range(self.size)
+        ]
+        alert_receive_channel = alert_receive_channels[0]
+        # select_filter checks the payload against every route, only the last one matches it
+        for idx in range(self.size - 1):
+            ChannelFilter.objects.create(
+                alert_receive_channel=alert_receive_channel, filtering_term=f"host-{idx}\\.benchmark\\.example\\.com"
+            )
+        channel_filter = ChannelFilter.objects.create(
+            alert_receive_channel=alert_receive_channel,
+            filtering_term=self.payload["labels"]["alertname"],
+            escalation_chain=self.escalation_chain,
+        )
+        return alert_receive_channel, channel_filter
+
+
+@benchmark("alert_create")
+def setup_alert_create(fixtures):
+    """Alerts after the first one are attached to the same alert group, as most alerts are."""
+    Alert = apps.get_model("alerts", "Alert")
+
+    def run():
+        Alert.create(
+            title=fixtures.payload["labels"]["alertname"],
+            message=fixtures.payload["message"],
+            image_url=None,
+            link_to_upstream_details=fixtures.payload["generatorURL"],
+            alert_receive_channel=fixtures.alert_receive_channel,
+            integration_unique_data={},
+            raw_request_data=fixtures.payload,
+        )
+
+    return run
+
+
+@benchmark("channel_filter_select_filter")
+def setup_channel_filter_select_filter(fixtures):
+    ChannelFilter = apps.get_model("alerts", "ChannelFilter")
+
+    def run():
+        ChannelFilter.select_filter(
+            fixtures.alert_receive_channel,
+            fixtures.payload,
+            fixtures.payload["labels"]["alertname"],
+            fixtures.payload["message"],
+        )
+
+    return run
+
+
+@benchmark("apply_jinja_template")
+def setup_apply_jinja_template(fixtures):
+    def run():
+        apply_jinja_template(grafana.web_message, fixtures.payload)
+
+    return run
+
+
+@benchmark("unfoldable_calendar_between")
+def setup_unfoldable_calendar_between(fixtures):
+    start = fixtures.now - timezone.timedelta(days=1)
+    end = fixtures.now + timezone.timedelta(days=30)
+
+    def run():
+        AmixrUnfoldableCalendar(fixtures.calendar).between(start, end)
+
+    return run
+
+
+@benchmark("list_users_to_notify_from_ical_for_period")
+def setup_list_users_to_notify_from_ical_for_period(fixtures):
+    end = fixtures.now + timezone.timedelta(days=1)
+
+    def run():
+        # schedule is fetched on every run, so iCal files cached on the instance are parsed every time
+        schedule = type(fixtures.schedule).objects.get(pk=fixtures.schedule.pk)
+        list(list_users_to_notify_from_ical_for_period(schedule, fixtures.now, end))
+
+    return run
+
+
+@benchmark("escalate_alert_group")
+def setup_escalate_alert_group(fixtures):
+    """
+    Every run executes the whole escalation chain, one escalate_alert_group task per step.
+    Wait steps don't wait, since next tasks are executed right away instead of being scheduled.
+    """
+    AlertGroup = apps.get_model("alerts", "AlertGroup")
+
+    alert_group = AlertGroup.all_objects.create(
+        channel=fixtures.alert_receive_channel, channel_filter=fixtures.channel_filter
+    )
+    raw_escalation_snapshot = alert_group.build_raw_escalation_snapshot()
+    max_tasks = fixtures.escalation_chain.escalation_policies.count() + 1
+
+    def run():
+        AlertGroup.all_objects.filter(pk=alert_group.pk).update(
+            active_escalation_id="benchmark",
+            is_escalation_finished=False,
+            raw_escalation_snapshot=raw_escalation_snapshot,
+        )
+        for _ in range(max_tasks):
+            active_escalation_id, is_escalation_finished = AlertGroup.all_objects.values_list(
+                "active_escalation_id", "is_escalation_finished"
+            ).get(pk=alert_group.pk)
+            if is_escalation_finished:
+                break
+            escalate_alert_group.apply((alert_group.pk,), task_id=active_escalation_id, throw=True)
+
+    return run
+
+
+@benchmark("format_web_message_alertmanager")
+def setup_format_web_message_alertmanager(fixtures):
+    return make_format_web_message_run(alertmanager, fixtures.size)
+
+
+@benchmark("format_web_message_grafana")
+def setup_format_web_message_grafana(fixtures):
+    return make_format_web_message_run(grafana, fixtures.size)
+
+
+def make_format_web_message_run(template_module, size):
+    message, _ = apply_jinja_template(template_module.web_message, make_large_payload(template_module, size))
+    message = escape_html(message)
+
+    def run():
+        format_web_message(message)
+
+    return run
+
+
+def make_rolling_users_shift(fixtures, frequency, name):
+    """
+    Rolling users shift of all users, which started size rotations ago, so every run counts rotation dates
+    from the shift start.
+    """
+    # frequency: event duration, approximate rotation period
+    durations = {
+        CustomOnCallShift.FREQUENCY_HOURLY: (timezone.timedelta(hours=1), timezone.timedelta(hours=1)),
+        CustomOnCallShift.FREQUENCY_DAILY: (timezone.timedelta(hours=8), timezone.timedelta(days=1)),
+        CustomOnCallShift.FREQUENCY_WEEKLY: (timezone.timedelta(days=1), timezone.timedelta(weeks=1)),
+        CustomOnCallShift.FREQUENCY_MONTHLY: (timezone.timedelta(days=1), timezone.timedelta(days=30)),
+    }
+    duration, rotation_period = durations[frequency]
+    now = fixtures.now.replace(minute=0, second=0, microsecond=0)
+    return CustomOnCallShift.objects.create(
+        organization=fixtures.organization,
+        name=name,
+        type=CustomOnCallShift.TYPE_ROLLING_USERS_EVENT,
+        frequency=frequency,
+        start=now - rotation_period * fixtures.size,
+        rotation_start=now,
+        duration=duration,
+        week_start=CustomOnCallShift.MONDAY,
+        rolling_users=[{str(user.pk): user.public_primary_key} for user in fixtures.users],
+    )
+
+
+def register_shift_benchmarks():
+    """Registers iCal generation benchmarks of rolling users shifts for every rotation frequency."""
+    for frequency, frequency_name in CustomOnCallShift.PUBLIC_FREQUENCY_CHOICES_MAP.items():
+        name = f"shift_convert_to_ical_{frequency_name}"
+
+        def setup(fixtures, frequency=frequency, name=name):
+            shift = make_rolling_users_shift(fixtures, frequency, name)
+            return shift.convert_to_ical
+
+        def setup_baseline(fixtures, frequency=frequency, name=name):
+            shift = make_rolling_users_shift(fixtures, frequency, f"{name}_baseline")
+            return lambda: BaselineShiftConverter(shift).convert_to_ical()
+
+        benchmark(name)(setup)
+        benchmark(f"{name}_baseline")(setup_baseline)
+
+
+class BaselineShiftConverter:
+    """
+    Former iCal generation of rolling users shifts, kept to compare the current one with. Every event is serialized
+    to iCal and parsed back to count the next rotation date from its repetitions.
+    """
+
+    def __init__(self, shift):
+        self.shift = shift
+
+    def convert_to_ical(self, time_zone="UTC"):
+        shift = self.shift
+        result = ""
+        time_zone = shift.time_zone if shift.time_zone is not None else time_zone
+        event_ical = self.generate_ical(shift.start, user_counter=0)
+        rotations_created = 0
+        all_rotation_checked = False
+
+        users_queue = shift.get_rolling_users()
+        if not users_queue:
+            return result
+        if shift.frequency is None:
+            users_queue = users_queue[:1]
+
+        if shift.start == shift.rotation_start or shift.frequency is None:
+            start = shift.start
+        else:
+            start = self.get_rotation_date(event_ical)
+
+        while not all_rotation_checked:
+            for counter, users in enumerate(users_queue, start=1):
+                if not start:
+                    all_rotation_checked = True
+                    break
+                elif start >= shift.rotation_start:
+                    for user_counter, user in enumerate(users, start=1):
+                        event_ical = self.generate_ical(start, user_counter, user, counter, time_zone)
+                        result += event_ical
+                    rotations_created += 1
+                else:
+                    event_ical = self.generate_ical(start, user_counter=0)
+
+                if rotations_created == len(users_queue):
+                    all_rotation_checked = True
+                    break
+                start = self.get_rotation_date(event_ical, get_next_date=True)
+        return result
+
+    def generate_ical(self, start, user_counter, user=None, counter=1, time_zone="UTC"):
+        return self.shift.generate_ical_event(start, user_counter, user, counter, time_zone).to_ical().decode("utf-8")
+
+    def get_rotation_date(self, event_ical, get_next_date=False):
+        shift = self.shift
+
+        current_event = Event.from_ical(event_ical)
+        interval = shift.interval or 1
+        current_event["rrule"]["INTERVAL"] = interval
+        current_event_start = current_event["DTSTART"].dt
+        next_event_start = current_event_start
+        if get_next_date:
+            if shift.frequency == CustomOnCallShift.FREQUENCY_HOURLY:
+                next_event_start = current_event_start + timezone.timedelta(hours=1)
+            elif shift.frequency == CustomOnCallShift.FREQUENCY_DAILY:
+                next_event_start = current_event_start + timezone.timedelta(days=1)
+            elif shift.frequency == CustomOnCallShift.FREQUENCY_WEEKLY:
+                days_for_next_event = 7 - current_event_start.weekday() + shift.week_start
+                if days_for_next_event > 7:
+                    days_for_next_event = days_for_next_event % 7
+                next_event_start = current_event_start + timezone.timedelta(
+                    days=days_for_next_event + 7 * (interval - 1)
+                )
+            elif shift.frequency == CustomOnCallShift.FREQUENCY_MONTHLY:
+                days_for_next_event = (
+                    monthrange(current_event_start.year, current_event_start.month)[1] - current_event_start.day + 1
+                )
+                for i in range(1, interval):
+                    days_for_next_event += monthrange(current_event_start.year, current_event_start.month + i)[1]
+                next_event_start = current_event_start + timezone.timedelta(days=days_for_next_event)
+
+        next_event_dt = None
+        repetitions = UnfoldableCalendar(current_event).RepeatedEvent(
+            current_event, next_event_start.replace(microsecond=0)
+        )
+        for event in repetitions:
+            if event.start >= next_event_start:
+                next_event_dt = event.start
+                break
+
+        if shift.until and next_event_dt and next_event_dt > shift.until:
+            return
+        return next_event_dt
+
+
+register_shift_benchmarks()
+
+
+@contextmanager
+def isolated_cache():
+    """Makes cache writes of benchmarks (e.g. alert grouping and notification policies) go to a throwaway cache."""
+    with override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "benchmarks"}}
+    ):
+        yield
+
+
+@contextmanager
+def eager_celery():
+    task_always_eager = app.conf.task_always_eager
+    app.conf.task_always_eager = True
+    try:
+        yield
+    finally:
+        app.conf.task_always_eager = task_always_eager
+
+
+def measure(func, number, repeat):
+    """
+    Measures func after a warm-up run, so lazily loaded modules and cold caches don't affect the results.
+    Queries and memory are measured by separate runs, not to slow down timed ones.
+    """
+    func()
+    timings = [timing / number * 1000 for timing in timeit.repeat(func, number=number, repeat=repeat)]
+
+    with CaptureQueriesContext(connection) as context:
+        func()
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "best_ms": round(min(timings), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "queries": len(context.captured_queries),
+        "peak_memory_kib": round(peak_memory / 1024, 1),
+    }
+
+
+def run_benchmarks(names=None, size=50, number=5, repeat=3):
+    """Returns JSON serializable report with results of benchmarks by their names, all benchmarks by default."""
+    names = names or list(BENCHMARKS)
+    results = {}
+    with isolated_cache(), eager_celery(), transaction.atomic():
+        fixtures = BenchmarkFixtures(size)
+        for name in names:
+            results[name] = measure(BENCHMARKS[name](fixtures), number, repeat)
+        transaction.set_rollback(True)
+    return {"size": size, "number": number, "repeat": repeat, "benchmarks": results}
+
+
+def compare_reports(report, baseline):
+    """
+    Returns changes of benchmark results relative to the baseline report, for benchmarks present in both.
+    Time is compared by the best run, since it's the least affected by other load on the machine.
+    Percent changes are None when the baseline value is zero.
+    """
+    changes = {}
+    for name, result in report["benchmarks"].items():
+        baseline_result = baseline["benchmarks"].get(name)
+        if baseline_result is None:
+            continue
+        changes[name] = {
+            "time_change_percent": get_change_percent(result["best_ms"], baseline_result["best_ms"]),
+            "queries_change": result["queries"] - baseline_result["queries"],
+            "peak_memory_change_percent": get_change_percent(
+                result["peak_memory_kib"], baseline_result["peak_memory_kib"]
+            ),
+        }
+    return changes
+
+
+def get_change_percent(value, baseline_value):
+    if not baseline_value:
+        return None
+    return round((value / baseline_value - 1) * 100, 1)
@@ -0,0 +1,18 @@
+from django.conf import settings
+
+from common.query_profiling import QueryProfiler, get_enforced_query_budget, log_query_profile
+
+# Profilers of running tasks by task id, queries of eager tasks are counted for their callers too
+_task_profilers = {}
+
+
+def start_task_query_profiling(task_id, task):
+    if settings.QUERY_PROFILING_ENABLED:
+        _task_profilers[task_id] = QueryProfiler(max_queries=get_enforced_query_budget(task.name)).start()
+
+
+def finish_task_query_profiling(task_id, task):
+    """Records database queries of tasks when QUERY_PROFILING_ENABLED is set, budgets are looked up by task name."""
+    profiler = _task_profilers.pop(task_id, None)
+    if profiler is not None:
+        log_query_profile("task", task.name, profiler.stop())
@@ -0,0 +1,148 @@
+"""
+Routing of read queries to a read replica.
+Reads go to the replica only inside use_read_replica, which is opted into by read-heavy views (ReadReplicaMixin)
+and tasks. Everything else, including all writes, goes to the primary. Replica reads fall back to the primary when:
+- the replica is not configured (no READ_REPLICA_DATABASE_ALIAS in DATABASES),
+- the replica lags behind the primary more than READ_REPLICA_MAX_LAG seconds or is not available,
+- the user made changes recently (see mark_sticky_to_primary), so they read their own writes,
+- something was written or a transaction was started on the primary within the same use_read_replica block.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+READ_REPLICA_LAG_CACHE_KEY = "read_replica_lag"
+# how often replica lag is checked
+READ_REPLICA_LAG_CHECK_INTERVAL = 5  # seconds
+READ_REPLICA_STICKY_CACHE_KEY_PREFIX = "read_replica_sticky"
+
+
+@dataclass
+class ReadReplicaState:
+    alias: Optional[str]
+    primary_used_for_write: bool = False
+
+
+_read_replica_state = ContextVar("read_replica_state", default=None)
+
+
+def is_read_replica_configured():
+    return settings.READ_REPLICA_DATABASE_ALIAS in settings.DATABASES
+
+
+def get_replica_lag():
+    """Returns replica lag in seconds, None if the replica is not available or replication is stopped."""
+    connection = connections[settings.READ_REPLICA_DATABASE_ALIAS]
+    if connection.vendor == "mysql":
+        query = "SHOW SLAVE STATUS"
+    elif connection.vendor == "postgresql":
+        query = (
+            "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+            "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END AS lag"
+        )
+    else:
+        # other databases (e.g. SQLite) don't replicate, so the replica is never behind
+        return 0
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query)
+            row = cursor.fetchone()
+            columns = [column[0] for column in cursor.description] if cursor.description else []
+    except DatabaseError as e:
+        logger.warning(f"get_replica_lag: replica is not available: {e}")
+        return None
+
+    if row is None:
+        # MySQL server is not a replica, e.g. the same server is used for local development
+        return 0
+    status = dict(zip(columns, row))
+    return status["Seconds_Behind_Master"] if connection.vendor == "mysql" else status["lag"]
+
+
+def is_replica_lagging():
+    # lag is cached as a tuple, since None means the replica is not available
+    cached_lag = cache.get(READ_REPLICA_LAG_CACHE_KEY)
+    if cached_lag is None:
+        cached_lag = (get_replica_lag(),)
+        cache.set(READ_REPLICA_LAG_CACHE_KEY, cached_lag, timeout=READ_REPLICA_LAG_CHECK_INTERVAL)
+
+    (lag,) = cached_lag
+    return lag is None or lag > settings.READ_REPLICA_MAX_LAG
+
+
+@contextmanager
+def use_read_replica():
+    """
+    Routes reads to the replica within the block, if the replica is configured and up to date.
+    Can be used as a decorator of views and tasks.
+    """
+    alias = None
+    if is_read_replica_configured() and not is_replica_lagging():
+        alias = settings.READ_REPLICA_DATABASE_ALIAS
+
+    token = _read_replica_state.set(ReadReplicaState(alias=alias))
+    try:
+        yield
+    finally:
+        _read_replica_state.reset(token)
+
+
+def get_sticky_cache_key(user_pk):
+    return f"{READ_REPLICA_STICKY_CACHE_KEY_PREFIX}_{user_pk}"
+
+
+def mark_sticky_to_primary(user):
+    """Makes reads of the user go to the primary for a while, so they see their own changes."""
+    cache.set(get_sticky_cache_key(user.pk), True, timeout=settings.READ_REPLICA_STICKINESS_TIMEOUT)
+
+
+def is_sticky_to_primary(user):
+    return user is not None and user.is_authenticated and cache.get(get_sticky_cache_key(user.pk)) is not None
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not is_read_replica_configured():
+            return None
+
+        state = _read_replica_state.get()
+        if (
+            state is None
+            or state.alias is None
+            or state.primary_used_for_write
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        if not is_read_replica_configured():
+            return None
+
+        state = _read_replica_state.get()
+        if state is not None:
+            # following reads could depend on the write, so they go to the primary too
+            state.primary_used_for_write = True
+        # explicit alias, so instances read from the replica are saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica has the same data as the primary
+        databases = {DEFAULT_DB_ALIAS, settings.READ_REPLICA_DATABASE_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == settings.READ_REPLICA_DATABASE_ALIAS:
+            return False
+        return None
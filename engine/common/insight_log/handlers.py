@@ -0,0 +1,66 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler which formats and writes records in a background thread.
+    Insight log messages are built lazily (see ResourceInsightLogLine), so diffing of resource states happens
+    in this thread too and doesn't slow down requests and tasks.
+    """
+
+    # records are dropped if the writer thread can't keep up, to never block the caller
+    MAX_QUEUE_SIZE = 10000
+    FLUSH_TIMEOUT = 5  # seconds
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._pid = None
+        self._queue = None
+        self._writer_thread = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.flush_queue)
+
+    def _ensure_writer_thread(self):
+        # writer thread doesn't survive fork, so it's started lazily in every process
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
+            self._writer_thread = threading.Thread(target=self._write_records, name="insight-log-writer", daemon=True)
+            self._writer_thread.start()
+            self._pid = os.getpid()
+
+    def _write_records(self):
+        record_queue = self._queue
+        while True:
+            record = record_queue.get()
+            try:
+                super().emit(record)
+            finally:
+                record_queue.task_done()
+
+    def emit(self, record):
+        self._ensure_writer_thread()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            logger.warning("insight_log.background_handler_queue_is_full")
+
+    def flush_queue(self):
+        """Waits until queued records are written"""
+        if self._pid != os.getpid():
+            return
+        # Queue.join has no timeout, so wait for the queue to be drained by polling it
+        deadline = time.monotonic() + self.FLUSH_TIMEOUT
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.flush()
@@ -1,15 +1,35 @@
 from django.apps import apps
+from django.core.cache import cache
+
+INSIGHT_LOGS_DYNAMIC_SETTING_NAME = "org_id_to_enable_insight_logs"
+INSIGHT_LOGS_ENABLED_CACHE_KEY = "org_ids_to_enable_insight_logs"
+INSIGHT_LOGS_ENABLED_CACHE_LIFETIME = 60 * 10
+
+
+def get_org_ids_to_enable_insight_logs():
+    """
+    Returns set of organization ids with enabled insight logs, it contains "all" if insight logs are enabled for
+    all organizations. The set is cached and invalidated when DynamicSetting is saved.
+    """
+    org_ids = cache.get(INSIGHT_LOGS_ENABLED_CACHE_KEY)
+    if org_ids is None:
+        DynamicSetting = apps.get_model("base", "DynamicSetting")
+        org_id_to_enable_insight_logs, _ = DynamicSetting.objects.get_or_create(
+            name=INSIGHT_LOGS_DYNAMIC_SETTING_NAME,
+            defaults={"json_value": []},
+        )
+        org_ids = frozenset(org_id_to_enable_insight_logs.json_value or [])
+        cache.set(INSIGHT_LOGS_ENABLED_CACHE_KEY, org_ids, INSIGHT_LOGS_ENABLED_CACHE_LIFETIME)
+    return org_ids
+
+
+def invalidate_insight_logs_enabled_cache():
+    cache.delete(INSIGHT_LOGS_ENABLED_CACHE_KEY)
 
 
 def is_insight_logs_enabled(organization):
     """
     is_insight_logs_enabled checks if inside logs enabled for given organization.
     """
-    DynamicSetting = apps.get_model("base", "DynamicSetting")
-    org_id_to_enable_insight_logs, _ = DynamicSetting.objects.get_or_create(
-        name="org_id_to_enable_insight_logs",
-        defaults={"json_value": []},
-    )
-    log_all = "all" in org_id_to_enable_insight_logs.json_value
-    insight_logs_enabled = organization.id in org_id_to_enable_insight_logs.json_value
-    return log_all or insight_logs_enabled
+    org_ids = get_org_ids_to_enable_insight_logs()
+    return "all" in org_ids or organization.id in org_ids
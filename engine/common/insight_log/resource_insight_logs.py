@@ -56,6 +56,32 @@ class InsightLoggable(ABC):
         pass
 
 
+class ResourceInsightLogLine:
+    """
+    Resource insight log line, which is built when the log record is formatted.
+    Diffing and serializing of resource states is done by the log handler (in background for insight_logger),
+    not by the code which changes the resource.
+    """
+
+    def __init__(self, log_line_prefix, prev_state=None, new_state=None):
+        self.log_line_prefix = log_line_prefix
+        self.prev_state = prev_state
+        self.new_state = new_state
+
+    def __str__(self):
+        log_line = self.log_line_prefix
+        try:
+            if self.prev_state and self.new_state:
+                prev_state, new_state = state_diff_finder(self.prev_state, self.new_state)
+                prev_state = escape_json_str_for_insight_log(json.dumps(format_state_for_insight_log(prev_state)))
+                new_state = escape_json_str_for_insight_log(json.dumps(format_state_for_insight_log(new_state)))
+                log_line += f' prev_state="{prev_state}"'
+                log_line += f' new_state="{new_state}"'
+        except Exception as e:
+            logger.warning(f"insight_log.failed_to_write_entity_insight_log_state exception={e}")
+        return log_line
+
+
 def write_resource_insight_log(instance: InsightLoggable, author, event: EntityEvent, prev_state=None, new_state=None):
     try:
         organization = author.organization
@@ -74,13 +100,7 @@ def write_resource_insight_log(instance: InsightLoggable, author, event: EntityE
             log_line = f"tenant_id={tenant_id} author_id={author_id} author={author} action_type=resource action={event.value} resource_type={entity_type} resource_id={entity_id} resource_name={entity_name}"  # noqa
             for k, v in metadata.items():
                 log_line += f" {k}={json.dumps(v)}"
-            if prev_state and new_state:
-                prev_state, new_state = state_diff_finder(prev_state, new_state)
-                prev_state = escape_json_str_for_insight_log(json.dumps(format_state_for_insight_log(prev_state)))
-                new_state = escape_json_str_for_insight_log(json.dumps(format_state_for_insight_log(new_state)))
-                log_line += f' prev_state="{prev_state}"'
-                log_line += f' new_state="{new_state}"'
-            insight_logger.info(log_line)
+            insight_logger.info(ResourceInsightLogLine(log_line, prev_state=prev_state, new_state=new_state))
     except Exception as e:
         logger.warning(f"insight_log.failed_to_write_entity_insight_log exception={e}")
 
@@ -0,0 +1,184 @@
+"""
+Prometheus metrics of the alert pipeline.
+Web and Celery worker processes collect metrics on their own. When PROMETHEUS_MULTIPROC_DIR environment variable
+is set (required for uwsgi and prefork Celery workers), processes write metrics to files in that directory and
+they are aggregated on scrape.
+"""
+import os
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from celery.utils.iso8601 import parse_iso8601
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+from common import tracing
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+integration_request_duration = Histogram(
+    "oncall_integration_request_duration_seconds",
+    "Time of handling requests to integrations.",
+    ["integration", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+alert_pipeline_stage_duration = Histogram(
+    "oncall_alert_pipeline_stage_duration_seconds",
+    "Time spent in a stage of the alert pipeline, which is not a task on its own.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+alert_pipeline_stage_failures = Counter(
+    "oncall_alert_pipeline_stage_failures_total",
+    "Number of failed stages of the alert pipeline, which are not tasks on their own.",
+    ["stage"],
+)
+alert_pipeline_latency = Histogram(
+    "oncall_alert_pipeline_latency_seconds",
+    "Time from receiving an alert by integration to the start of a task handling it.",
+    ["task"],
+    buckets=LATENCY_BUCKETS,
+)
+celery_task_duration = Histogram(
+    "oncall_celery_task_duration_seconds",
+    "Time of executing Celery tasks.",
+    ["task"],
+    buckets=LATENCY_BUCKETS,
+)
+celery_task_queue_lag = Histogram(
+    "oncall_celery_task_queue_lag_seconds",
+    "Time from publishing a Celery task (or its eta) to the start of its execution.",
+    ["task"],
+    buckets=LATENCY_BUCKETS,
+)
+celery_task_failures = Counter(
+    "oncall_celery_task_failures_total",
+    "Number of Celery tasks failed without retry.",
+    ["task"],
+)
+messenger_request_duration = Histogram(
+    "oncall_messenger_request_duration_seconds",
+    "Time of requests to messengers APIs (Slack, Telegram, Twilio).",
+    ["backend", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+MESSENGER_REQUEST_OK = "ok"
+MESSENGER_REQUEST_ERROR = "error"
+
+
+@contextmanager
+def observe_stage(stage):
+    """Measures time and failures of a stage of the alert pipeline, can be used as a decorator."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        alert_pipeline_stage_failures.labels(stage).inc()
+        raise
+    finally:
+        alert_pipeline_stage_duration.labels(stage).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def observe_messenger_request(backend, method):
+    """
+    Measures time of a request to messenger API. Requests raising exceptions are labeled as errors,
+    status of requests failed without exceptions can be set on the yielded object.
+    """
+    start = time.perf_counter()
+    request = SimpleNamespace(status=MESSENGER_REQUEST_OK)
+    try:
+        yield request
+    except Exception:
+        request.status = MESSENGER_REQUEST_ERROR
+        raise
+    finally:
+        messenger_request_duration.labels(backend, method, request.status).observe(time.perf_counter() - start)
+
+
+# Celery task instrumentation, connected to Celery signals in engine.celery.
+# Tasks are executed one by one in a worker process, eager tasks are nested, so state is kept per task id.
+_running_tasks = {}
+
+
+def _to_timestamp(value):
+    if isinstance(value, str):
+        value = parse_iso8601(value)
+    return value.timestamp()
+
+
+def on_task_publish(headers):
+    tracing.inject_trace_headers(headers)
+
+
+def on_task_start(task_id, task):
+    request = task.request
+    if request.is_eager:
+        # eager tasks are executed in the context of the caller, so they continue its trace
+        trace = tracing.get_current_trace()
+    else:
+        trace = tracing.extract_trace(request)
+        published_at = request.get(tracing.PUBLISHED_AT_HEADER)
+        if published_at is not None:
+            # tasks with eta are not expected to start before it
+            expected_start = max(published_at, _to_timestamp(request.eta)) if request.eta else published_at
+            celery_task_queue_lag.labels(task.name).observe(max(time.time() - expected_start, 0))
+
+    if trace is not None:
+        alert_pipeline_latency.labels(task.name).observe(trace.elapsed)
+
+    _running_tasks[task_id] = (
+        time.perf_counter(),
+        tracing.set_current_trace(trace),
+        tracing.set_log_request_id(trace.trace_id if trace is not None else None),
+    )
+
+
+def on_task_finish(task_id, task):
+    try:
+        start, trace_token, previous_request_id = _running_tasks.pop(task_id)
+    except KeyError:
+        return
+    celery_task_duration.labels(task.name).observe(time.perf_counter() - start)
+    tracing.reset_current_trace(trace_token)
+    tracing.set_log_request_id(previous_request_id)
+
+
+def on_task_failure(task):
+    celery_task_failures.labels(task.name).inc()
+
+
+def is_multiprocess_mode():
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ or "prometheus_multiproc_dir" in os.environ
+
+
+def get_registry():
+    if is_multiprocess_mode():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics():
+    """Returns content type and metrics of all processes in Prometheus text format."""
+    return CONTENT_TYPE_LATEST, generate_latest(get_registry())
+
+
+def start_metrics_server(port):
+    start_http_server(port, registry=get_registry())
+
+
+def mark_process_dead(pid):
+    if is_multiprocess_mode():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,128 @@
+"""
+Profiling of database queries of requests and Celery tasks.
+Profiler records number of queries, their time and fingerprints of queries executed more than once,
+which usually point to N+1 patterns. Profiling of requests and tasks is enabled by QUERY_PROFILING_ENABLED,
+profiles exceeding query budgets from QUERY_BUDGETS (or QUERY_BUDGET_DEFAULT) are logged as warnings.
+With QUERY_BUDGETS_ENFORCED the query exceeding the budget raises QueryBudgetExceeded, failing the request or task.
+"""
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# number of the most duplicated queries included in reports
+DUPLICATED_QUERIES_REPORT_SIZE = 5
+
+IN_CLAUSE_RE = re.compile(r"\bIN \((?:%s, )*%s\)", re.IGNORECASE)
+STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def get_query_fingerprint(sql):
+    """Returns query with parameters and literals replaced, so queries differing only by them are the same."""
+    sql = IN_CLAUSE_RE.sub("IN (...)", sql)
+    sql = STRING_LITERAL_RE.sub("?", sql)
+    sql = NUMBER_LITERAL_RE.sub("?", sql)
+    return WHITESPACE_RE.sub(" ", sql).strip()
+
+
+class QueryProfile:
+    def __init__(self):
+        self.queries_count = 0
+        self.queries_duration = 0.0
+        self.fingerprints = Counter()
+
+    @property
+    def duplicated_queries(self):
+        """Fingerprints of queries executed more than once with number of executions, the most frequent first."""
+        return [(fingerprint, count) for fingerprint, count in self.fingerprints.most_common() if count > 1]
+
+    def record(self, sql, duration):
+        self.queries_count += 1
+        self.queries_duration += duration
+        self.fingerprints[get_query_fingerprint(sql)] += 1
+
+    def report(self):
+        duplicated_queries = self.duplicated_queries
+        lines = [f"{self.queries_count} queries in {self.queries_duration * 1000:.1f} ms"]
+        if duplicated_queries:
+            lines.append(f"{len(duplicated_queries)} duplicated queries, the most frequent:")
+            lines.extend(
+                f"  {count}x {fingerprint}"
+                for fingerprint, count in duplicated_queries[:DUPLICATED_QUERIES_REPORT_SIZE]
+            )
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryProfiler:
+    """
+    Records queries executed on all database connections of the current thread.
+    Can be started and stopped separately, so it can be used by middlewares and signal handlers.
+    Queries over max_queries raise QueryBudgetExceeded.
+    """
+
+    def __init__(self, max_queries=None):
+        self.profile = QueryProfile()
+        self.max_queries = max_queries
+        self._connections = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.max_queries is not None and self.profile.queries_count >= self.max_queries:
+            raise QueryBudgetExceeded(f"Query budget of {self.max_queries} exceeded: {self.profile.report()}")
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.profile.record(sql, time.perf_counter() - start)
+
+    def start(self):
+        for connection in connections.all():
+            connection.execute_wrappers.append(self)
+            self._connections.append(connection)
+        return self
+
+    def stop(self):
+        for connection in self._connections:
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+        self._connections = []
+        return self.profile
+
+    def __enter__(self):
+        self.start()
+        return self.profile
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def get_query_budget(name):
+    return settings.QUERY_BUDGETS.get(name, settings.QUERY_BUDGET_DEFAULT)
+
+
+def get_enforced_query_budget(name):
+    """Returns query budget to pass to QueryProfiler as max_queries, None if budgets are not enforced."""
+    return get_query_budget(name) if settings.QUERY_BUDGETS_ENFORCED else None
+
+
+def log_query_profile(kind, name, profile):
+    """Logs query profile of a request or a task, as a warning if it's over the query budget."""
+    budget = get_query_budget(name)
+    over_budget = budget is not None and profile.queries_count > budget
+    logger.log(
+        logging.WARNING if over_budget else logging.INFO,
+        f"query_profile {kind}={name} queries={profile.queries_count} budget={budget} "
+        f"db_time={profile.queries_duration:.3f} duplicated={len(profile.duplicated_queries)} "
+        f"over_budget={int(over_budget)}" + (f"\n{profile.report()}" if over_budget else ""),
+    )
+    return over_budget
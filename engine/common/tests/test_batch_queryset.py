@@ -0,0 +1,69 @@
+import pytest
+
+from apps.base.models import FailedToInvokeCeleryTask
+from common.utils import batch_queryset, delete_queryset_in_batches, iterate_queryset
+
+
+def _make_tasks(count):
+    return [FailedToInvokeCeleryTask.objects.create(name=f"task_{i}", parameters={}) for i in range(count)]
+
+
+@pytest.mark.django_db
+def test_batch_queryset():
+    tasks = _make_tasks(7)
+
+    batches = [list(batch) for batch in batch_queryset(FailedToInvokeCeleryTask.objects.order_by("-pk"), 3)]
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [task.pk for batch in batches for task in batch] == sorted(task.pk for task in tasks)
+
+
+@pytest.mark.django_db
+def test_batch_queryset_values_list():
+    tasks = _make_tasks(4)
+
+    batches = [
+        list(batch) for batch in batch_queryset(FailedToInvokeCeleryTask.objects.values_list("pk", flat=True), 2)
+    ]
+
+    assert batches == [[tasks[0].pk, tasks[1].pk], [tasks[2].pk, tasks[3].pk]]
+
+
+@pytest.mark.django_db
+def test_batch_queryset_empty():
+    assert list(batch_queryset(FailedToInvokeCeleryTask.objects.all())) == []
+
+
+@pytest.mark.django_db
+def test_batch_queryset_rows_deleted_during_iteration():
+    tasks = _make_tasks(6)
+
+    pks = []
+    for batch in batch_queryset(FailedToInvokeCeleryTask.objects.values_list("pk", flat=True), 2):
+        batch_pks = list(batch)
+        # deleting already processed rows doesn't shift next batches
+        FailedToInvokeCeleryTask.objects.filter(pk__in=batch_pks).delete()
+        pks.extend(batch_pks)
+
+    assert pks == [task.pk for task in tasks]
+
+
+@pytest.mark.django_db
+def test_iterate_queryset():
+    tasks = _make_tasks(5)
+
+    pks = list(iterate_queryset(FailedToInvokeCeleryTask.objects.values_list("pk", flat=True), 2))
+
+    assert pks == [task.pk for task in tasks]
+
+
+@pytest.mark.django_db
+def test_delete_queryset_in_batches(django_assert_num_queries):
+    tasks = _make_tasks(6)
+
+    # every batch is a pk query and a delete, the last batch is shorter than batch size
+    with django_assert_num_queries(6):
+        deleted_count = delete_queryset_in_batches(FailedToInvokeCeleryTask.objects.filter(pk__gt=tasks[0].pk), 2)
+
+    assert deleted_count == 5
+    assert list(FailedToInvokeCeleryTask.objects.all()) == [tasks[0]]
@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from common.benchmarks import BENCHMARKS, compare_reports, run_benchmarks
+
+
+@pytest.mark.django_db
+def test_run_benchmarks():
+    report = run_benchmarks(size=4, number=1, repeat=1)
+
+    assert set(report["benchmarks"]) == set(BENCHMARKS)
+    for result in report["benchmarks"].values():
+        assert result["best_ms"] > 0
+        assert result["mean_ms"] >= result["best_ms"]
+        assert result["peak_memory_kib"] > 0
+    assert report["benchmarks"]["alert_create"]["queries"] > 0
+    assert report["benchmarks"]["apply_jinja_template"]["queries"] == 0
+
+
+@pytest.mark.django_db
+def test_run_benchmarks_isolates_cache():
+    cache.set("benchmark_test", "value")
+
+    def setup(fixtures):
+        return lambda: cache.set("benchmark_test", "changed")
+
+    with patch.dict(BENCHMARKS, {"cache_write": setup}):
+        run_benchmarks(["cache_write"], size=1, number=1, repeat=1)
+
+    assert cache.get("benchmark_test") == "value"
+
+
+@pytest.mark.django_db
+def test_shift_benchmark_matches_baseline():
+    def setup(fixtures):
+        current = BENCHMARKS["shift_convert_to_ical_weekly"](fixtures)
+        baseline = BENCHMARKS["shift_convert_to_ical_weekly_baseline"](fixtures)
+        results.extend(strip_dtstamp(run()) for run in (current, baseline))
+        return lambda: None
+
+    def strip_dtstamp(ical):
+        return [line for line in ical.splitlines() if not line.startswith(("DTSTAMP", "UID"))]
+
+    results = []
+    with patch.dict(BENCHMARKS, {"shift_check": setup}):
+        run_benchmarks(["shift_check"], size=4, number=1, repeat=1)
+
+    current, baseline = results
+    assert current and current == baseline
+
+
+def test_compare_reports():
+    baseline = {
+        "benchmarks": {
+            "alert_create": {"best_ms": 10.0, "queries": 20, "peak_memory_kib": 100.0},
+            "removed": {"best_ms": 1.0, "queries": 1, "peak_memory_kib": 1.0},
+        }
+    }
+    report = {
+        "benchmarks": {
+            "alert_create": {"best_ms": 12.0, "queries": 18, "peak_memory_kib": 50.0},
+            "added": {"best_ms": 1.0, "queries": 1, "peak_memory_kib": 1.0},
+        }
+    }
+
+    assert compare_reports(report, baseline) == {
+        "alert_create": {"time_change_percent": 20.0, "queries_change": -2, "peak_memory_change_percent": -50.0}
+    }
+
+
+def test_compare_reports_zero_baseline():
+    baseline = {"benchmarks": {"noop": {"best_ms": 0.0, "queries": 0, "peak_memory_kib": 0.0}}}
+    report = {"benchmarks": {"noop": {"best_ms": 0.1, "queries": 0, "peak_memory_kib": 0.1}}}
+
+    assert compare_reports(report, baseline) == {
+        "noop": {"time_change_percent": None, "queries_change": 0, "peak_memory_change_percent": None}
+    }
@@ -0,0 +1,135 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.user_management.models import User
+from common.database import (
+    READ_REPLICA_LAG_CACHE_KEY,
+    get_replica_lag,
+    is_sticky_to_primary,
+    mark_sticky_to_primary,
+    use_read_replica,
+)
+from engine.middlewares import ReadReplicaStickinessMiddleware
+
+
+@pytest.fixture()
+def read_replica(settings, tmp_path):
+    """Configures a second SQLite database as the read replica."""
+    replica = {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path / "replica.sqlite3")}
+    settings.DATABASES = {**settings.DATABASES, settings.READ_REPLICA_DATABASE_ALIAS: replica}
+    connections.databases[settings.READ_REPLICA_DATABASE_ALIAS] = replica
+    cache.delete(READ_REPLICA_LAG_CACHE_KEY)
+
+    yield settings.READ_REPLICA_DATABASE_ALIAS
+
+    connections[settings.READ_REPLICA_DATABASE_ALIAS].close()
+    del connections[settings.READ_REPLICA_DATABASE_ALIAS]
+    del connections.databases[settings.READ_REPLICA_DATABASE_ALIAS]
+    cache.delete(READ_REPLICA_LAG_CACHE_KEY)
+
+
+def test_reads_use_primary_without_replica():
+    with use_read_replica():
+        assert User.objects.all().db == "default"
+
+
+def test_reads_routed_to_replica(read_replica):
+    assert User.objects.all().db == "default"
+
+    with use_read_replica():
+        assert User.objects.all().db == read_replica
+        assert get_replica_lag() == 0
+
+    assert User.objects.all().db == "default"
+
+
+def test_reads_use_primary_after_write(read_replica):
+    with use_read_replica():
+        assert router.db_for_write(User) == "default"
+        assert User.objects.all().db == "default"
+
+    # the next block starts on the replica again
+    with use_read_replica():
+        assert User.objects.all().db == read_replica
+
+
+@pytest.mark.parametrize("lag,expected_db", [(1, "replica"), (100, "default"), (None, "default")])
+def test_reads_fall_back_to_primary_when_replica_lags(read_replica, settings, lag, expected_db):
+    settings.READ_REPLICA_MAX_LAG = 10
+
+    with patch("common.database.get_replica_lag", return_value=lag) as mock_get_replica_lag:
+        for _ in range(2):
+            with use_read_replica():
+                assert User.objects.all().db == expected_db
+
+    # lag is cached between checks
+    mock_get_replica_lag.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_reads_use_primary_in_transaction(read_replica):
+    # tests are run in a transaction on the primary
+    with use_read_replica():
+        assert User.objects.all().db == "default"
+
+
+@pytest.mark.django_db
+def test_stickiness_middleware(read_replica, make_organization_and_user):
+    _, user = make_organization_and_user()
+    middleware = ReadReplicaStickinessMiddleware(lambda request: HttpResponse())
+
+    request = RequestFactory().get("/")
+    request.user = user
+    middleware(request)
+    assert not is_sticky_to_primary(user)
+
+    request = RequestFactory().post("/")
+    request.user = user
+    middleware(request)
+    assert is_sticky_to_primary(user)
+
+
+@pytest.mark.django_db
+def test_read_replica_mixin(make_organization_and_user, make_public_api_token):
+    organization, user = make_organization_and_user()
+    _, token = make_public_api_token(user, organization)
+    client = APIClient()
+    url = reverse("api-public:users-list")
+
+    with patch("common.api_helpers.mixins.use_read_replica", wraps=use_read_replica) as mock_use_read_replica:
+        response = client.get(url, format="json", HTTP_AUTHORIZATION=token)
+    assert response.status_code == status.HTTP_200_OK
+    mock_use_read_replica.assert_called_once()
+
+    # users read their own writes from the primary
+    mark_sticky_to_primary(user)
+    with patch("common.api_helpers.mixins.use_read_replica", wraps=use_read_replica) as mock_use_read_replica:
+        response = client.get(url, format="json", HTTP_AUTHORIZATION=token)
+    assert response.status_code == status.HTTP_200_OK
+    mock_use_read_replica.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_read_replica_mixin_streaming_response(
+    read_replica, make_organization_and_user_with_plugin_token, make_user_auth_headers
+):
+    _, user, token = make_organization_and_user_with_plugin_token()
+    client = APIClient()
+    url = reverse("api-internal:alertgroup-export", kwargs={"export_type": "alert_groups"})
+
+    with patch("common.api_helpers.mixins.use_read_replica", wraps=use_read_replica) as mock_use_read_replica:
+        response = client.get(url, **make_user_auth_headers(user, token))
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_use_read_replica.call_count == 1
+
+        # rows are read from the replica when the content is consumed, after the view returned
+        b"".join(response.streaming_content)
+        assert mock_use_read_replica.call_count == 2
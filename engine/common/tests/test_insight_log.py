@@ -0,0 +1,58 @@
+import io
+import logging
+
+import pytest
+
+from apps.base.models import DynamicSetting
+from common.insight_log.handlers import BackgroundStreamHandler
+from common.insight_log.insight_logs_enabled_check import is_insight_logs_enabled
+from common.insight_log.resource_insight_logs import ResourceInsightLogLine
+
+
+@pytest.mark.django_db
+def test_is_insight_logs_enabled(make_organization, django_assert_num_queries):
+    organization = make_organization()
+    another_organization = make_organization()
+
+    assert is_insight_logs_enabled(organization) is False
+    # enabled organizations are cached
+    with django_assert_num_queries(0):
+        assert is_insight_logs_enabled(another_organization) is False
+
+    setting = DynamicSetting.objects.get(name="org_id_to_enable_insight_logs")
+    setting.json_value = [organization.id]
+    setting.save()
+    assert is_insight_logs_enabled(organization) is True
+    assert is_insight_logs_enabled(another_organization) is False
+
+    setting.json_value = ["all"]
+    setting.save()
+    assert is_insight_logs_enabled(another_organization) is True
+
+
+def test_resource_insight_log_line():
+    log_line = ResourceInsightLogLine(
+        "tenant_id=1",
+        prev_state={"name": "old", "verified_phone_number": "+1", "team": "General"},
+        new_state={"name": "new", "verified_phone_number": "+2", "team": "General"},
+    )
+    assert str(log_line) == (
+        'tenant_id=1 prev_state="{\\"name\\": \\"old\\", \\"verified_phone_number\\": \\"*****\\"}"'
+        ' new_state="{\\"name\\": \\"new\\", \\"verified_phone_number\\": \\"*****\\"}"'
+    )
+    assert str(ResourceInsightLogLine("tenant_id=1")) == "tenant_id=1"
+
+
+def test_background_stream_handler():
+    stream = io.StringIO()
+    handler = BackgroundStreamHandler(stream)
+    test_logger = logging.getLogger("test_background_stream_handler")
+    test_logger.addHandler(handler)
+    test_logger.propagate = False
+    try:
+        test_logger.warning(ResourceInsightLogLine("tenant_id=1"))
+        handler.flush_queue()
+    finally:
+        test_logger.removeHandler(handler)
+
+    assert stream.getvalue() == "tenant_id=1\n"
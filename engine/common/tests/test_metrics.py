@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+from celery.app.task import Context
+from django.test import Client
+from prometheus_client import REGISTRY
+
+from common import metrics, tracing
+
+
+def test_trace_is_carried_in_task_headers():
+    headers = {}
+    token = tracing.start_trace("trace-id")
+    try:
+        tracing.inject_trace_headers(headers)
+        trace = tracing.get_current_trace()
+    finally:
+        tracing.reset_current_trace(token)
+
+    assert tracing.get_current_trace() is None
+    assert headers[tracing.PUBLISHED_AT_HEADER] >= trace.started_at
+    assert tracing.extract_trace(Context(headers)) == trace
+
+
+def test_start_trace_without_request_id():
+    token = tracing.start_trace("none")
+    try:
+        trace_id = tracing.get_current_trace().trace_id
+    finally:
+        tracing.reset_current_trace(token)
+
+    assert trace_id != "none"
+
+
+def test_task_continues_trace_from_headers():
+    token = tracing.start_trace("trace-id")
+    try:
+        headers = {"id": "task-id"}
+        tracing.inject_trace_headers(headers)
+    finally:
+        tracing.reset_current_trace(token)
+
+    task = SimpleNamespace(name="test_task_continues_trace", request=Context(headers))
+    metrics.on_task_start("task-id", task)
+    try:
+        trace_id = tracing.get_current_trace().trace_id
+    finally:
+        metrics.on_task_finish("task-id", task)
+
+    assert trace_id == "trace-id"
+    assert tracing.get_current_trace() is None
+    for metric in ("oncall_celery_task_duration_seconds", "oncall_celery_task_queue_lag_seconds"):
+        assert REGISTRY.get_sample_value(f"{metric}_count", {"task": task.name}) == 1
+    assert REGISTRY.get_sample_value("oncall_alert_pipeline_latency_seconds_count", {"task": task.name}) == 1
+
+
+def test_observe_messenger_request_status():
+    labels = {"backend": "test", "method": "test_observe_messenger_request_status"}
+
+    with metrics.observe_messenger_request(labels["backend"], labels["method"]):
+        pass
+    with metrics.observe_messenger_request(labels["backend"], labels["method"]) as request:
+        request.status = "rate_limited"
+    with pytest.raises(ValueError):
+        with metrics.observe_messenger_request(labels["backend"], labels["method"]):
+            raise ValueError
+
+    for status in (metrics.MESSENGER_REQUEST_OK, "rate_limited", metrics.MESSENGER_REQUEST_ERROR):
+        assert (
+            REGISTRY.get_sample_value("oncall_messenger_request_duration_seconds_count", {**labels, "status": status})
+            == 1
+        )
+
+
+@pytest.mark.parametrize(
+    "secret,authorization,expected_status",
+    [
+        (None, "Bearer ", 404),
+        ("secret", None, 401),
+        ("secret", "Bearer wrong", 401),
+        ("secret", "Bearer secret", 200),
+    ],
+)
+def test_metrics_view(settings, secret, authorization, expected_status):
+    settings.PROMETHEUS_EXPORTER_SECRET = secret
+    headers = {"HTTP_AUTHORIZATION": authorization} if authorization is not None else {}
+
+    response = Client().get("/metrics/", **headers)
+
+    assert response.status_code == expected_status
+    if expected_status == 200:
+        assert b"oncall_integration_request_duration_seconds" in response.content
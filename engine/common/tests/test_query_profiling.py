@@ -0,0 +1,161 @@
+import logging
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.alerts.models import AlertReceiveChannel
+from apps.user_management.models import Organization
+from common.custom_celery_tasks.query_profiling import finish_task_query_profiling, start_task_query_profiling
+from common.query_profiling import QueryBudgetExceeded, QueryProfiler, get_query_fingerprint
+from engine.middlewares import QueryProfilingMiddleware
+
+
+def get_integration_url(alert_receive_channel):
+    return reverse(
+        "integrations:universal",
+        kwargs={
+            "integration_type": alert_receive_channel.integration,
+            "alert_channel_key": alert_receive_channel.token,
+        },
+    )
+
+
+def test_get_query_fingerprint():
+    assert get_query_fingerprint(
+        'SELECT "id" FROM "t"\n  WHERE "id" IN (%s, %s, %s) AND "name" = \'it\'\'s\' LIMIT 21'
+    ) == get_query_fingerprint('SELECT "id" FROM "t" WHERE "id" IN (%s) AND "name" = \'other\' LIMIT 1')
+
+
+@pytest.mark.django_db
+def test_query_profiler_duplicated_queries(make_organization):
+    organizations = [make_organization() for _ in range(3)]
+
+    with QueryProfiler() as profile:
+        for organization in organizations:
+            Organization.objects.get(pk=organization.pk)
+        list(Organization.objects.all())
+
+    assert profile.queries_count == 4
+    assert profile.queries_duration > 0
+    assert [count for _, count in profile.duplicated_queries] == [3]
+    assert "3x SELECT" in profile.report()
+
+
+@pytest.mark.django_db
+def test_query_profiler_max_queries(make_organization):
+    organization = make_organization()
+
+    with pytest.raises(QueryBudgetExceeded, match="Query budget of 1 exceeded"):
+        with QueryProfiler(max_queries=1):
+            Organization.objects.get(pk=organization.pk)
+            Organization.objects.get(pk=organization.pk)
+
+
+@patch("apps.integrations.views.create_alert.apply_async")
+@pytest.mark.django_db
+def test_query_profiling_middleware(_, settings, caplog, make_organization, make_alert_receive_channel):
+    settings.QUERY_PROFILING_ENABLED = True
+    settings.QUERY_BUDGETS = {"integrations:universal": 0}
+    alert_receive_channel = make_alert_receive_channel(
+        make_organization(), integration=AlertReceiveChannel.INTEGRATION_WEBHOOK
+    )
+
+    with caplog.at_level(logging.INFO, logger="common.query_profiling"):
+        response = APIClient().post(get_integration_url(alert_receive_channel), {"message": "test"}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert int(response["X-Queries-Count"]) > 0
+    [record] = [record for record in caplog.records if record.name == "common.query_profiling"]
+    assert record.levelno == logging.WARNING
+    assert "view=integrations:universal" in record.getMessage()
+    assert "budget=0" in record.getMessage()
+    assert "over_budget=1" in record.getMessage()
+
+
+@patch("apps.integrations.views.create_alert.apply_async")
+@pytest.mark.django_db
+def test_query_profiling_middleware_enforced(_, settings, make_organization, make_alert_receive_channel):
+    settings.QUERY_PROFILING_ENABLED = True
+    settings.QUERY_BUDGETS = {"integrations:universal": 0}
+    settings.QUERY_BUDGETS_ENFORCED = True
+    alert_receive_channel = make_alert_receive_channel(
+        make_organization(), integration=AlertReceiveChannel.INTEGRATION_WEBHOOK
+    )
+
+    with pytest.raises(QueryBudgetExceeded):
+        APIClient().post(get_integration_url(alert_receive_channel), {"message": "test"}, format="json")
+
+
+@pytest.mark.django_db
+def test_query_profiling_middleware_streaming_response(settings, caplog, make_organization):
+    settings.QUERY_PROFILING_ENABLED = True
+    organization = make_organization()
+
+    def streaming_content():
+        yield str(Organization.objects.get(pk=organization.pk).pk)
+
+    middleware = QueryProfilingMiddleware(lambda request: StreamingHttpResponse(streaming_content()))
+    with caplog.at_level(logging.INFO, logger="common.query_profiling"):
+        response = middleware(RequestFactory().get("/export/"))
+        assert not caplog.records
+        # queries are recorded when the content is consumed
+        assert b"".join(response.streaming_content) == str(organization.pk).encode()
+
+    assert "X-Queries-Count" not in response
+    [record] = caplog.records
+    assert "view=/export/ queries=1" in record.getMessage()
+
+
+@patch("apps.integrations.views.create_alert.apply_async")
+@pytest.mark.django_db
+def test_query_profiling_middleware_disabled(_, settings, make_organization, make_alert_receive_channel):
+    settings.QUERY_PROFILING_ENABLED = False
+    alert_receive_channel = make_alert_receive_channel(
+        make_organization(), integration=AlertReceiveChannel.INTEGRATION_WEBHOOK
+    )
+
+    response = APIClient().post(get_integration_url(alert_receive_channel), {"message": "test"}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Queries-Count" not in response
+
+
+@pytest.mark.django_db
+def test_task_query_profiling(settings, caplog, make_organization):
+    settings.QUERY_PROFILING_ENABLED = True
+    settings.QUERY_BUDGET_DEFAULT = 5
+    organization = make_organization()
+    task = SimpleNamespace(name="test_task")
+
+    with caplog.at_level(logging.INFO, logger="common.query_profiling"):
+        start_task_query_profiling("task-id", task)
+        Organization.objects.get(pk=organization.pk)
+        finish_task_query_profiling("task-id", task)
+        # not started tasks are ignored
+        finish_task_query_profiling("other-task-id", task)
+
+    [record] = caplog.records
+    assert record.levelno == logging.INFO
+    assert "task=test_task queries=1 budget=5" in record.getMessage()
+
+
+@pytest.mark.django_db
+def test_task_query_profiling_enforced(settings, make_organization):
+    settings.QUERY_PROFILING_ENABLED = True
+    settings.QUERY_BUDGETS = {"test_task": 0}
+    settings.QUERY_BUDGETS_ENFORCED = True
+    organization = make_organization()
+    task = SimpleNamespace(name="test_task")
+
+    start_task_query_profiling("task-id", task)
+    try:
+        with pytest.raises(QueryBudgetExceeded):
+            Organization.objects.get(pk=organization.pk)
+    finally:
+        finish_task_query_profiling("task-id", task)
@@ -23,3 +23,18 @@ def test_urlize_will_not_wrap_link_inside_a():
     original = '<a href="https://amixr.io/">https://amixr.io/</a>'
     expected = original
     assert urlize_with_respect_to_a(original) == expected
+
+
+def test_urlize_will_wrap_links_in_nested_tags_only_outside_a():
+    original = '<p>see https://amixr.io/ or <a href="https://grafana.com/">grafana <b>https://grafana.com/</b></a></p>'
+    expected = (
+        '<p>see <a href="https://amixr.io/">https://amixr.io/</a> or '
+        '<a href="https://grafana.com/">grafana <b>https://grafana.com/</b></a></p>'
+    )
+    assert urlize_with_respect_to_a(original) == expected
+
+
+def test_urlize_will_keep_escaped_text_escaped():
+    original = "&lt;script&gt;alert(1)&lt;/script&gt; https://amixr.io/"
+    expected = '&lt;script&gt;alert(1)&lt;/script&gt; <a href="https://amixr.io/">https://amixr.io/</a>'
+    assert urlize_with_respect_to_a(original) == expected
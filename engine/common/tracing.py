@@ -0,0 +1,77 @@
+"""
+Trace context of an alert, started when the alert is received by an integration and carried through Celery tasks
+in message headers, so every hop of the pipeline can be attributed to the alert and its latency can be measured.
+Trace id is the request id of the integration request, so logs of tasks are labeled with it like logs of the request.
+"""
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from log_request_id import DEFAULT_NO_REQUEST_ID, local
+
+TRACE_ID_HEADER = "oncall_trace_id"
+TRACE_STARTED_AT_HEADER = "oncall_trace_started_at"
+PUBLISHED_AT_HEADER = "oncall_published_at"
+
+
+@dataclass(frozen=True)
+class TraceContext:
+    trace_id: str
+    # unix timestamp, so it's comparable between processes
+    started_at: float
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started_at
+
+
+_current_trace = ContextVar("current_trace", default=None)
+
+
+def get_current_trace():
+    return _current_trace.get()
+
+
+def start_trace(trace_id=None):
+    """Starts trace of a new alert, returns token to restore the previous trace with."""
+    if trace_id is None or trace_id == DEFAULT_NO_REQUEST_ID:
+        trace_id = uuid.uuid4().hex
+    return set_current_trace(TraceContext(trace_id=trace_id, started_at=time.time()))
+
+
+def set_current_trace(trace):
+    return _current_trace.set(trace)
+
+
+def reset_current_trace(token):
+    _current_trace.reset(token)
+
+
+def inject_trace_headers(headers):
+    """Adds current trace and publishing time to headers of a published task message."""
+    headers[PUBLISHED_AT_HEADER] = time.time()
+    trace = get_current_trace()
+    if trace is not None:
+        headers[TRACE_ID_HEADER] = trace.trace_id
+        headers[TRACE_STARTED_AT_HEADER] = trace.started_at
+
+
+def extract_trace(task_request):
+    """Returns trace context sent with the task message, if any."""
+    trace_id = task_request.get(TRACE_ID_HEADER)
+    started_at = task_request.get(TRACE_STARTED_AT_HEADER)
+    if trace_id is None or started_at is None:
+        return None
+    return TraceContext(trace_id=trace_id, started_at=started_at)
+
+
+def set_log_request_id(request_id):
+    """Labels logs with request_id like RequestIDMiddleware does for requests, returns the previous label."""
+    previous_request_id = getattr(local, "request_id", None)
+    if request_id is None:
+        if hasattr(local, "request_id"):
+            del local.request_id
+    else:
+        local.request_id = request_id
+    return previous_request_id
@@ -11,6 +11,7 @@ import markdown2
 from bs4 import BeautifulSoup
 from celery.utils.log import get_task_logger
 from celery.utils.time import get_exponential_backoff_interval
+from django.db.models import QuerySet
 from django.utils.html import urlize
 
 logger = get_task_logger(__name__)
@@ -114,10 +115,66 @@ def getenv_integer(variable_name: str, default: int) -> int:
 
 
 def batch_queryset(qs, batch_size=1000):
-    qs_count = qs.count()
-    for start in range(0, qs_count, batch_size):
-        end = min(start + batch_size, qs_count)
-        yield qs[start:end]
+    """
+    Splits queryset into batches using keyset pagination on primary key (pk > last_pk) instead of OFFSET,
+    so every batch is an index range scan and rows inserted or deleted during iteration are not skipped or repeated.
+    Yields lazy querysets of the same kind as qs (models, values or values_list).
+    """
+    qs = qs.order_by("pk")
+    pks_qs = qs.values_list("pk", flat=True)
+    last_pk = None
+    while True:
+        batch_pks_qs = pks_qs if last_pk is None else pks_qs.filter(pk__gt=last_pk)
+        batch_pks = list(batch_pks_qs[:batch_size])
+        if not batch_pks:
+            return
+
+        batch_qs = qs.filter(pk__lte=batch_pks[-1])
+        if last_pk is not None:
+            batch_qs = batch_qs.filter(pk__gt=last_pk)
+        yield batch_qs
+
+        if len(batch_pks) < batch_size:
+            return
+        last_pk = batch_pks[-1]
+
+
+def iterate_queryset(qs, batch_size=1000):
+    """
+    Iterates over queryset in keyset batches (see batch_queryset), streaming every batch with a server-side cursor
+    where the database supports it. Use values_list to avoid instantiating models when only a few columns are needed.
+    """
+    for batch_qs in batch_queryset(qs, batch_size):
+        yield from batch_qs.iterator(chunk_size=batch_size)
+
+
+def delete_queryset_in_batches(qs, batch_size=1000):
+    """
+    Deletes queryset rows in batches of primary keys ordered by pk, so the number of rows the cascade collector loads
+    into memory and the time every DELETE holds its locks are bounded by batch_size.
+    Rows are deleted with plain DELETE queries if the model has no cascades and signals, custom (soft) delete methods
+    of the queryset are bypassed. Batches are committed separately when called outside of a transaction,
+    so an interrupted delete continues from where it stopped when called again.
+    Returns the number of deleted rows of the queryset model.
+    """
+    model = qs.model
+    pks_qs = qs.order_by("pk").values_list("pk", flat=True)
+    deleted_count = 0
+    last_pk = None
+    while True:
+        batch_pks_qs = pks_qs if last_pk is None else pks_qs.filter(pk__gt=last_pk)
+        batch_pks = list(batch_pks_qs[:batch_size])
+        if not batch_pks:
+            return deleted_count
+
+        # only pk is loaded, fields of related objects needed by the collector are fetched by Django itself
+        QuerySet(model, using=qs.db).filter(pk__in=batch_pks).only("pk").delete()
+        deleted_count += len(batch_pks)
+        logger.debug(f"Deleted {deleted_count} {model._meta.label} rows, last pk {batch_pks[-1]}")
+
+        if len(batch_pks) < batch_size:
+            return deleted_count
+        last_pk = batch_pks[-1]
 
 
 def is_regex_valid(regex) -> bool:
@@ -200,23 +257,346 @@ def escape_html(text):
     return html.escape(text)
 
 
+HTML_TAG_RE = re.compile(r"(<[^<>]*>)")
+HTML_A_TAG_RE = re.compile(r"<(/?)a(?:\s|>)", re.IGNORECASE)
+
+
 def urlize_with_respect_to_a(html):
     """
-    Wrap links into <a> tag if not already
+    Wrap links into <a> tag if not already.
+    Markup is split into tags and text in a single pass, text outside of <a> tags is urlized in place.
     """
-    soup = BeautifulSoup(html, features="html.parser")
-    textNodes = soup.find_all(text=True)
-    for textNode in textNodes:
-        if textNode.parent and getattr(textNode.parent, "name") == "a":
-            continue
-        urlizedText = urlize(textNode)
-        textNode.replaceWith(BeautifulSoup(urlizedText, features="html.parser"))
+    parts = HTML_TAG_RE.split(html)
+    a_depth = 0
+    # even parts are text, odd parts are tags
+    for idx, part in enumerate(parts):
+        if idx % 2:
+            a_tag_match = HTML_A_TAG_RE.match(part)
+            if a_tag_match is not None:
+                a_depth = max(a_depth - 1, 0) if a_tag_match.group(1) else a_depth + 1
+        # urlize can only find links in words containing one of these chars
+        elif a_depth == 0 and ("." in part or "@" in part or ":" in part):
+            parts[idx] = urlize(part)
+    return "".join(parts)
+
+
+URL_TLDS = (
+    "com",
+    "net",
+    "org",
+    "edu",
+    "gov",
+    "mil",
+    "aero",
+    "asia",
+    "biz",
+    "cat",
+    "coop",
+    "info",
+    "int",
+    "jobs",
+    "mobi",
+    "museum",
+    "name",
+    "post",
+    "pro",
+    "tel",
+    "travel",
+    "xxx",
+    "ac",
+    "ad",
+    "ae",
+    "af",
+    "ag",
+    "ai",
+    "al",
+    "am",
+    "an",
+    "ao",
+    "aq",
+    "ar",
+    "as",
+    "at",
+    "au",
+    "aw",
+    "ax",
+    "az",
+    "ba",
+    "bb",
+    "bd",
+    "be",
+    "bf",
+    "bg",
+    "bh",
+    "bi",
+    "bj",
+    "bm",
+    "bn",
+    "bo",
+    "br",
+    "bs",
+    "bt",
+    "bv",
+    "bw",
+    "by",
+    "bz",
+    "ca",
+    "cc",
+    "cd",
+    "cf",
+    "cg",
+    "ch",
+    "ci",
+    "ck",
+    "cl",
+    "cm",
+    "cn",
+    "co",
+    "cr",
+    "cs",
+    "cu",
+    "cv",
+    "cx",
+    "cy",
+    "cz",
+    "dd",
+    "de",
+    "dj",
+    "dk",
+    "dm",
+    "do",
+    "dz",
+    "ec",
+    "ee",
+    "eg",
+    "eh",
+    "er",
+    "es",
+    "et",
+    "eu",
+    "fi",
+    "fj",
+    "fk",
+    "fm",
+    "fo",
+    "fr",
+    "ga",
+    "gb",
+    "gd",
+    "ge",
+    "gf",
+    "gg",
+    "gh",
+    "gi",
+    "gl",
+    "gm",
+    "gn",
+    "gp",
+    "gq",
+    "gr",
+    "gs",
+    "gt",
+    "gu",
+    "gw",
+    "gy",
+    "hk",
+    "hm",
+    "hn",
+    "hr",
+    "ht",
+    "hu",
+    "id",
+    "ie",
+    "il",
+    "im",
+    "in",
+    "io",
+    "iq",
+    "ir",
+    "is",
+    "it",
+    "je",
+    "jm",
+    "jo",
+    "jp",
+    "ke",
+    "kg",
+    "kh",
+    "ki",
+    "km",
+    "kn",
+    "kp",
+    "kr",
+    "kw",
+    "ky",
+    "kz",
+    "la",
+    "lb",
+    "lc",
+    "li",
+    "lk",
+    "lr",
+    "ls",
+    "lt",
+    "lu",
+    "lv",
+    "ly",
+    "ma",
+    "mc",
+    "md",
+    "me",
+    "mg",
+    "mh",
+    "mk",
+    "ml",
+    "mm",
+    "mn",
+    "mo",
+    "mp",
+    "mq",
+    "mr",
+    "ms",
+    "mt",
+    "mu",
+    "mv",
+    "mw",
+    "mx",
+    "my",
+    "mz",
+    "na",
+    "nc",
+    "ne",
+    "nf",
+    "ng",
+    "ni",
+    "nl",
+    "no",
+    "np",
+    "nr",
+    "nu",
+    "nz",
+    "om",
+    "pa",
+    "pe",
+    "pf",
+    "pg",
+    "ph",
+    "pk",
+    "pl",
+    "pm",
+    "pn",
+    "pr",
+    "ps",
+    "pt",
+    "pw",
+    "py",
+    "qa",
+    "re",
+    "ro",
+    "rs",
+    "ru",
+    "rw",
+    "sa",
+    "sb",
+    "sc",
+    "sd",
+    "se",
+    "sg",
+    "sh",
+    "si",
+    "sj",
+    "ja",
+    "sk",
+    "sl",
+    "sm",
+    "sn",
+    "so",
+    "sr",
+    "ss",
+    "st",
+    "su",
+    "sv",
+    "sx",
+    "sy",
+    "sz",
+    "tc",
+    "td",
+    "tf",
+    "tg",
+    "th",
+    "tj",
+    "tk",
+    "tl",
+    "tm",
+    "tn",
+    "to",
+    "tp",
+    "tr",
+    "tt",
+    "tv",
+    "tw",
+    "tz",
+    "ua",
+    "ug",
+    "uk",
+    "us",
+    "uy",
+    "uz",
+    "va",
+    "vc",
+    "ve",
+    "vg",
+    "vi",
+    "vn",
+    "vu",
+    "wf",
+    "ws",
+    "ye",
+    "yt",
+    "yu",
+    "za",
+    "zm",
+    "zw",
+)
 
-    return str(soup)
 
+def _build_alternation_pattern(words):
+    """
+    Builds a regex alternation for the words in a form of a prefix trie (e.g. "c(?:a|om|o)"), so the regex engine
+    discards non-matching branches after the first differing char instead of trying every word one by one.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _node_pattern(node):
+        alternatives = []
+        is_terminal = False
+        for char in sorted(node):
+            if char == "":
+                is_terminal = True
+            else:
+                alternatives.append(re.escape(char) + _node_pattern(node[char]))
+        if not alternatives:
+            return ""
+        pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        if is_terminal:
+            # longer words go first, the terminal match is optional
+            pattern = "(?:" + pattern + ")?" if len(alternatives) == 1 else pattern[:-1] + "|)"
+        return pattern
+
+    return "(?:" + _node_pattern(trie) + ")"
+
+
+URL_TLDS_PATTERN = _build_alternation_pattern(URL_TLDS)
 
 url_re = re.compile(
-    r"""(?i)\b((?:https?:(?:/{1,3}|[a-z0-9%])|[a-z0-9.\-]+[.](?:com|net|org|edu|gov|mil|aero|asia|biz|cat|coop|info|int|jobs|mobi|museum|name|post|pro|tel|travel|xxx|ac|ad|ae|af|ag|ai|al|am|an|ao|aq|ar|as|at|au|aw|ax|az|ba|bb|bd|be|bf|bg|bh|bi|bj|bm|bn|bo|br|bs|bt|bv|bw|by|bz|ca|cc|cd|cf|cg|ch|ci|ck|cl|cm|cn|co|cr|cs|cu|cv|cx|cy|cz|dd|de|dj|dk|dm|do|dz|ec|ee|eg|eh|er|es|et|eu|fi|fj|fk|fm|fo|fr|ga|gb|gd|ge|gf|gg|gh|gi|gl|gm|gn|gp|gq|gr|gs|gt|gu|gw|gy|hk|hm|hn|hr|ht|hu|id|ie|il|im|in|io|iq|ir|is|it|je|jm|jo|jp|ke|kg|kh|ki|km|kn|kp|kr|kw|ky|kz|la|lb|lc|li|lk|lr|ls|lt|lu|lv|ly|ma|mc|md|me|mg|mh|mk|ml|mm|mn|mo|mp|mq|mr|ms|mt|mu|mv|mw|mx|my|mz|na|nc|ne|nf|ng|ni|nl|no|np|nr|nu|nz|om|pa|pe|pf|pg|ph|pk|pl|pm|pn|pr|ps|pt|pw|py|qa|re|ro|rs|ru|rw|sa|sb|sc|sd|se|sg|sh|si|sj|Ja|sk|sl|sm|sn|so|sr|ss|st|su|sv|sx|sy|sz|tc|td|tf|tg|th|tj|tk|tl|tm|tn|to|tp|tr|tt|tv|tw|tz|ua|ug|uk|us|uy|uz|va|vc|ve|vg|vi|vn|vu|wf|ws|ye|yt|yu|za|zm|zw)/)(?:[^\s()<>{}\[\]]+|\([^\s()]*?\([^\s()]+\)[^\s()]*?\)|\([^\s]+?\))+(?:\([^\s()]*?\([^\s()]+\)[^\s()]*?\)|\([^\s]+?\)|[^\s`!()\[\]{};:'".,<>?«»“”‘’])|(?:(?<!@)[a-z0-9]+(?:[.\-][a-z0-9]+)*[.](?:com|net|org|edu|gov|mil|aero|asia|biz|cat|coop|info|int|jobs|mobi|museum|name|post|pro|tel|travel|xxx|ac|ad|ae|af|ag|ai|al|am|an|ao|aq|ar|as|at|au|aw|ax|az|ba|bb|bd|be|bf|bg|bh|bi|bj|bm|bn|bo|br|bs|bt|bv|bw|by|bz|ca|cc|cd|cf|cg|ch|ci|ck|cl|cm|cn|co|cr|cs|cu|cv|cx|cy|cz|dd|de|dj|dk|dm|do|dz|ec|ee|eg|eh|er|es|et|eu|fi|fj|fk|fm|fo|fr|ga|gb|gd|ge|gf|gg|gh|gi|gl|gm|gn|gp|gq|gr|gs|gt|gu|gw|gy|hk|hm|hn|hr|ht|hu|id|ie|il|im|in|io|iq|ir|is|it|je|jm|jo|jp|ke|kg|kh|ki|km|kn|kp|kr|kw|ky|kz|la|lb|lc|li|lk|lr|ls|lt|lu|lv|ly|ma|mc|md|me|mg|mh|mk|ml|mm|mn|mo|mp|mq|mr|ms|mt|mu|mv|mw|mx|my|mz|na|nc|ne|nf|ng|ni|nl|no|np|nr|nu|nz|om|pa|pe|pf|pg|ph|pk|pl|pm|pn|pr|ps|pt|pw|py|qa|re|ro|rs|ru|rw|sa|sb|sc|sd|se|sg|sh|si|sj|Ja|sk|sl|sm|sn|so|sr|ss|st|su|sv|sx|sy|sz|tc|td|tf|tg|th|tj|tk|tl|tm|tn|to|tp|tr|tt|tv|tw|tz|ua|ug|uk|us|uy|uz|va|vc|ve|vg|vi|vn|vu|wf|ws|ye|yt|yu|za|zm|zw)\b/?(?!@)))""",  # noqa: E501
+    r"""(?i)\b((?:https?:(?:/{{1,3}}|[a-z0-9%])|[a-z0-9.\-]+[.]{tlds}/)(?:[^\s()<>{{}}\[\]]+|\([^\s()]*?\([^\s()]+\)[^\s()]*?\)|\([^\s]+?\))+(?:\([^\s()]*?\([^\s()]+\)[^\s()]*?\)|\([^\s]+?\)|[^\s`!()\[\]{{}};:'".,<>?«»“”‘’])|(?:(?<!@)[a-z0-9]+(?:[.\-][a-z0-9]+)*[.]{tlds}\b/?(?!@)))""".format(  # noqa: E501
+        tlds=URL_TLDS_PATTERN
+    ),
     re.IGNORECASE,
 )
 
@@ -4,6 +4,7 @@ import uuid
 from importlib import import_module, reload
 
 import pytest
+from django.core.cache import cache
 from django.db.models.signals import post_save
 from django.urls import clear_url_caches
 from pytest_factoryboy import register
@@ -51,6 +52,7 @@ from apps.schedules.tests.factories import (
     OnCallScheduleFactory,
     OnCallScheduleICalFactory,
 )
+from apps.slack import slack_formatter
 from apps.slack.slack_client import SlackClientWithErrorHandling
 from apps.slack.tests.factories import (
     SlackActionRecordFactory,
@@ -111,6 +113,14 @@ register(IntegrationHeartBeatFactory)
 register(LiveSettingFactory)
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # primary keys can be reused between tests, so cached objects must not leak from one test to another
+    yield
+    cache.clear()
+    slack_formatter._workspace_names.clear()
+
+
 @pytest.fixture(autouse=True)
 def mock_slack_api_call(monkeypatch):
     def mock_api_call(*args, **kwargs):
@@ -6,11 +6,18 @@ from celery.app.log import TaskFormatter
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings.prod")
 
+from django.conf import settings  # noqa: E402
 from django.db import connection  # noqa: E402
 
 connection.cursor()
 from celery import Celery  # noqa: E402
 
+from common import metrics  # noqa: E402
+from common.custom_celery_tasks.query_profiling import (  # noqa: E402
+    finish_task_query_profiling,
+    start_task_query_profiling,
+)
+
 app = Celery("proj")
 
 # Using a string here means the worker doesn't have to serialize
@@ -41,3 +48,36 @@ def on_after_setup_logger(logger, **kwargs):
                 "%(asctime)s source=engine:celery task_id=%(task_id)s task_name=%(task_name)s name=%(name)s level=%(levelname)s %(message)s"
             )
         )
+
+
+@celery.signals.before_task_publish.connect
+def on_before_task_publish(headers, **kwargs):
+    metrics.on_task_publish(headers)
+
+
+@celery.signals.task_prerun.connect
+def on_task_prerun(task_id, task, **kwargs):
+    metrics.on_task_start(task_id, task)
+    start_task_query_profiling(task_id, task)
+
+
+@celery.signals.task_postrun.connect
+def on_task_postrun(task_id, task, **kwargs):
+    finish_task_query_profiling(task_id, task)
+    metrics.on_task_finish(task_id, task)
+
+
+@celery.signals.task_failure.connect
+def on_task_failure(sender, **kwargs):
+    metrics.on_task_failure(sender)
+
+
+@celery.signals.worker_init.connect
+def on_worker_init(**kwargs):
+    if settings.PROMETHEUS_CELERY_WORKER_PORT:
+        metrics.start_metrics_server(settings.PROMETHEUS_CELERY_WORKER_PORT)
+
+
+@celery.signals.worker_process_shutdown.connect
+def on_worker_process_shutdown(pid, **kwargs):
+    metrics.mark_process_dead(pid)
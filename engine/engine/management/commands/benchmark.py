@@ -0,0 +1,79 @@
+import json
+
+from django.core.management import BaseCommand, CommandError
+
+from common.benchmarks import BENCHMARKS, compare_reports, run_benchmarks
+
+
+def format_change_percent(change_percent):
+    return "n/a" if change_percent is None else f"{change_percent:+.1f}%"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures time, queries and memory of alert ingestion, escalation, schedule and rendering hot paths "
+        "on fixtures seeded in the local database and rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help=f"Benchmarks to run, all by default: {', '.join(BENCHMARKS)}.")
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=50,
+            help="Number of users, integrations, routes, escalation steps, shift rotations and extra payload labels.",
+        )
+        parser.add_argument("--number", type=int, default=5, help="Number of runs in every measurement.")
+        parser.add_argument("--repeat", type=int, default=3, help="Number of measurements.")
+        parser.add_argument("--output", help="Path to save JSON report to.")
+        parser.add_argument("--baseline", help="Path to JSON report to compare results with.")
+        parser.add_argument(
+            "--max-time-regression",
+            type=float,
+            default=None,
+            help="Fail if time of any benchmark grows by more percent than given relative to the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        unknown_names = set(options["names"]) - set(BENCHMARKS)
+        if unknown_names:
+            raise CommandError(f"Unknown benchmarks: {', '.join(sorted(unknown_names))}")
+
+        report = run_benchmarks(options["names"], options["size"], options["number"], options["repeat"])
+
+        for name, result in report["benchmarks"].items():
+            self.stdout.write(
+                f"{name}: best of {options['repeat']}: {result['best_ms']:.2f} ms, "
+                f"{result['queries']} queries, peak memory {result['peak_memory_kib']:.1f} KiB"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+
+        if not options["baseline"]:
+            return
+
+        with open(options["baseline"]) as f:
+            changes = compare_reports(report, json.load(f))
+
+        regressions = []
+        for name, change in changes.items():
+            self.stdout.write(
+                f"{name}: time {format_change_percent(change['time_change_percent'])}, "
+                f"queries {change['queries_change']:+d}, "
+                f"peak memory {format_change_percent(change['peak_memory_change_percent'])} relative to the baseline"
+            )
+            max_time_regression = options["max_time_regression"]
+            time_change_percent = change["time_change_percent"]
+            if (
+                max_time_regression is not None
+                and time_change_percent is not None
+                and time_change_percent > max_time_regression
+            ):
+                regressions.append(name)
+
+        if regressions:
+            raise CommandError(
+                f"Time regressed by more than {options['max_time_regression']}%: {', '.join(regressions)}"
+            )
@@ -1,5 +1,6 @@
 import datetime
 import logging
+import time
 
 from django.apps import apps
 from django.conf import settings
@@ -7,6 +8,11 @@ from django.core.exceptions import PermissionDenied, RequestDataTooBig
 from django.db import OperationalError
 from django.http import HttpResponse
 from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+
+from common import metrics, tracing
+from common.database import is_read_replica_configured, mark_sticky_to_primary
+from common.query_profiling import QueryProfiler, get_enforced_query_budget, log_query_profile
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +51,91 @@ class RequestTimeLoggingMiddleware(MiddlewareMixin):
         return response
 
 
+class IntegrationMetricsMiddleware(MiddlewareMixin):
+    """
+    Measures time of handling requests to integrations and starts trace of alerts received by them,
+    which is carried to tasks created while handling the request.
+    """
+
+    def process_request(self, request):
+        if request.path.startswith("/integrations/v1"):
+            request._metrics_start = time.perf_counter()
+            request._trace_token = tracing.start_trace(getattr(request, "id", None))
+
+    def process_response(self, request, response):
+        if hasattr(request, "_metrics_start"):
+            metrics.integration_request_duration.labels(
+                self.get_integration_label(request, response), response.status_code
+            ).observe(time.perf_counter() - request._metrics_start)
+            tracing.reset_current_trace(request._trace_token)
+        return response
+
+    @staticmethod
+    def get_integration_label(request, response):
+        resolver_match = request.resolver_match
+        if resolver_match is None:
+            return "unknown"
+        # integration type in universal integrations url is arbitrary, it's only used once validated by the view
+        if resolver_match.url_name == "universal" and request.method == "POST" and response.status_code < 400:
+            return resolver_match.kwargs["integration_type"]
+        return resolver_match.url_name
+
+
+class QueryProfilingMiddleware(MiddlewareMixin):
+    """
+    Records database queries of requests when QUERY_PROFILING_ENABLED is set, see common.query_profiling.
+    Budgets are looked up by url name of the view, e.g. "api-internal:alertgroup-list".
+    Queries of streaming responses are recorded until their content is consumed, so they don't get query headers.
+    """
+
+    def process_request(self, request):
+        if settings.QUERY_PROFILING_ENABLED:
+            request._query_profiler = QueryProfiler().start()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, "_query_profiler"):
+            request._query_profiler.max_queries = get_enforced_query_budget(request.resolver_match.view_name)
+
+    def process_response(self, request, response):
+        if not hasattr(request, "_query_profiler"):
+            return response
+
+        resolver_match = request.resolver_match
+        view_name = resolver_match.view_name if resolver_match is not None else request.path
+        if response.streaming:
+            response.streaming_content = self._profile_streaming_content(
+                request._query_profiler, view_name, response.streaming_content
+            )
+            return response
+
+        profile = request._query_profiler.stop()
+        log_query_profile("view", view_name, profile)
+        response["X-Queries-Count"] = profile.queries_count
+        response["X-Queries-Duration"] = f"{profile.queries_duration:.3f}"
+        return response
+
+    @staticmethod
+    def _profile_streaming_content(query_profiler, view_name, streaming_content):
+        try:
+            yield from streaming_content
+        finally:
+            log_query_profile("view", view_name, query_profiler.stop())
+
+
+class ReadReplicaStickinessMiddleware(MiddlewareMixin):
+    """
+    Keeps reads of users on the primary for a while after they make changes, so they read their own writes.
+    DRF authenticates users in views and sets them on the request, so it's checked after the response.
+    """
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and is_read_replica_configured():
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                mark_sticky_to_primary(user)
+        return response
+
+
 class RequestBodyReadingMiddleware(MiddlewareMixin):
     def process_request(self, request):
         # Reading request body, as required by uwsgi
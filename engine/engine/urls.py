@@ -18,13 +18,14 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from .views import HealthCheckView, ReadinessCheckView, StartupProbeView
+from .views import HealthCheckView, MetricsView, ReadinessCheckView, StartupProbeView
 
 urlpatterns = [
     path("", HealthCheckView.as_view()),
     path("health/", HealthCheckView.as_view()),
     path("ready/", ReadinessCheckView.as_view()),
     path("startupprobe/", StartupProbeView.as_view()),
+    path("metrics/", MetricsView.as_view()),
     # path('slow/', SlowView.as_view()),
     # path('exception/', ExceptionView.as_view()),
     path(settings.ONCALL_DJANGO_ADMIN_PATH, admin.site.urls),
@@ -1,10 +1,13 @@
 import time
 
+from django.conf import settings
 from django.core.cache import cache
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
 from django.views.generic import View
 
 from apps.integrations.mixins import AlertChannelDefiningMixin
+from common import metrics
 from common.custom_celery_tasks import shared_dedicated_queue_retry_task
 
 
@@ -59,6 +62,26 @@ class StartupProbeView(View):
         return HttpResponse("Ok")
 
 
+class MetricsView(View):
+    """
+    Prometheus scrape endpoint, requires PROMETHEUS_EXPORTER_SECRET as a bearer token.
+    Celery workers expose their metrics on PROMETHEUS_CELERY_WORKER_PORT.
+    """
+
+    dangerously_bypass_middlewares = True
+
+    def get(self, request):
+        if not settings.PROMETHEUS_EXPORTER_SECRET:
+            raise Http404
+        if not constant_time_compare(
+            request.headers.get("Authorization", ""), f"Bearer {settings.PROMETHEUS_EXPORTER_SECRET}"
+        ):
+            return HttpResponse(status=401)
+
+        content_type, content = metrics.render_metrics()
+        return HttpResponse(content, content_type=content_type)
+
+
 class SlowView(View):
     def get(self, request):
         time.sleep(1.5)
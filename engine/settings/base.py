@@ -59,9 +59,17 @@ TWILIO_ACCOUNT_SID = os.environ.get("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.environ.get("TWILIO_AUTH_TOKEN")
 TWILIO_NUMBER = os.environ.get("TWILIO_NUMBER")
 TWILIO_VERIFY_SERVICE_SID = os.environ.get("TWILIO_VERIFY_SERVICE_SID")
+# Twilio API rate per sender number, notifications over the rate are delayed
+TWILIO_SMS_PER_SECOND = getenv_integer("TWILIO_SMS_PER_SECOND", 1)
+TWILIO_CALLS_PER_SECOND = getenv_integer("TWILIO_CALLS_PER_SECOND", 1)
 
 TELEGRAM_WEBHOOK_HOST = os.environ.get("TELEGRAM_WEBHOOK_HOST", BASE_URL)
 TELEGRAM_TOKEN = os.environ.get("TELEGRAM_TOKEN")
+# Telegram Bot API limits: overall messages per second and minimal interval between messages to the same chat,
+# edits over the limits are delayed and coalesced
+TELEGRAM_MESSAGES_PER_SECOND = getenv_integer("TELEGRAM_MESSAGES_PER_SECOND", 30)
+TELEGRAM_PRIVATE_CHAT_MESSAGE_INTERVAL = getenv_integer("TELEGRAM_PRIVATE_CHAT_MESSAGE_INTERVAL", 1)
+TELEGRAM_GROUP_CHAT_MESSAGE_INTERVAL = getenv_integer("TELEGRAM_GROUP_CHAT_MESSAGE_INTERVAL", 3)
 
 os.environ.setdefault("MYSQL_PASSWORD", "empty")
 os.environ.setdefault("RABBIT_URI", "empty")
@@ -99,6 +107,17 @@ DB_BACKEND_DEFAULT_VALUES = {
     },
 }
 
+# Read-heavy views and tasks read from the replica when DATABASES has READ_REPLICA_DATABASE_ALIAS, see common.database
+DATABASE_ROUTERS = ["common.database.ReadReplicaRouter"]
+READ_REPLICA_DATABASE_ALIAS = "replica"
+# Reads fall back to the primary when the replica lags more than this number of seconds
+READ_REPLICA_MAX_LAG = getenv_integer("READ_REPLICA_MAX_LAG", 10)
+# Reads of a user stay on the primary for this number of seconds after the user's changes
+READ_REPLICA_STICKINESS_TIMEOUT = getenv_integer("READ_REPLICA_STICKINESS_TIMEOUT", 30)
+
+# Partial indexes (e.g. on AlertGroup) are only created on databases which support them, MySQL just skips them
+SILENCED_SYSTEM_CHECKS = ["models.W037"]
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -150,6 +169,9 @@ REST_FRAMEWORK = {
 MIDDLEWARE = [
     "log_request_id.middleware.RequestIDMiddleware",
     "engine.middlewares.RequestTimeLoggingMiddleware",
+    "engine.middlewares.IntegrationMetricsMiddleware",
+    "engine.middlewares.QueryProfilingMiddleware",
+    "engine.middlewares.ReadReplicaStickinessMiddleware",
     "engine.middlewares.BanAlertConsumptionBasedOnSettingsMiddleware",
     "engine.middlewares.RequestBodyReadingMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -184,7 +206,7 @@ LOGGING = {
             "formatter": "standard",
         },
         "insight_logger": {
-            "class": "logging.StreamHandler",
+            "class": "common.insight_log.handlers.BackgroundStreamHandler",
             "formatter": "insight_logger",
         },
     },
@@ -279,9 +301,9 @@ CELERY_WORKER_SEND_TASK_EVENTS = True
 CELERY_TASK_SEND_SENT_EVENT = True
 
 CELERY_BEAT_SCHEDULE = {
-    "restore_heartbeat_tasks": {
-        "task": "apps.heartbeat.tasks.restore_heartbeat_tasks",
-        "schedule": 10 * 60,
+    "check_heartbeats_expiration": {
+        "task": "apps.heartbeat.tasks.check_heartbeats_expiration",
+        "schedule": 60,
         "args": (),
     },
     "check_escalations": {
@@ -334,11 +356,27 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(minute="*/30"),
         "args": (),
     },
+    "start_purge_resolved_alert_groups": {
+        "task": "apps.alerts.tasks.purge_alert_groups.start_purge_resolved_alert_groups",
+        "schedule": crontab(minute=30, hour=3),
+        "args": (),
+    },
+    "compact_alert_payloads": {
+        "task": "apps.alerts.tasks.compact_alert_payloads.compact_alert_payloads",
+        "schedule": crontab(minute=30, hour=4),
+        "args": (),
+    },
     "process_failed_to_invoke_celery_tasks": {
         "task": "apps.base.tasks.process_failed_to_invoke_celery_tasks",
         "schedule": 60 * 10,
         "args": (),
     },
+    "dispatch_scheduled_tasks": {
+        "task": "apps.base.tasks.dispatch_scheduled_tasks",
+        # must match apps.base.models.scheduled_task.SCHEDULED_TASKS_DISPATCH_INTERVAL
+        "schedule": 60,
+        "args": (),
+    },
 }
 
 INTERNAL_IPS = ["127.0.0.1"]
@@ -453,6 +491,30 @@ GRAFANA_INCIDENT_STATIC_API_KEY = os.environ.get("GRAFANA_INCIDENT_STATIC_API_KE
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = getenv_integer("DATA_UPLOAD_MAX_MEMORY_SIZE", 1_048_576)  # 1mb by default
 
+# Resolved alert groups older than this number of days are hard deleted daily, 0 disables the purge
+ALERT_GROUP_RETENTION_DAYS = getenv_integer("ALERT_GROUP_RETENTION_DAYS", 0)
+
+# Payloads of alerts older than this number of days are compressed (except for the first and the last alerts
+# of every alert group), 0 disables the compaction
+ALERT_PAYLOAD_COMPACTION_DAYS = getenv_integer("ALERT_PAYLOAD_COMPACTION_DAYS", 0)
+
+# Bearer token required to scrape Prometheus metrics from /metrics/, metrics are not exposed if it's not set
+PROMETHEUS_EXPORTER_SECRET = os.environ.get("PROMETHEUS_EXPORTER_SECRET", None)
+# Port of Prometheus metrics endpoint started by Celery workers, 0 disables the endpoint
+PROMETHEUS_CELERY_WORKER_PORT = getenv_integer("PROMETHEUS_CELERY_WORKER_PORT", 0)
+
+# Log number of database queries, their time and duplicates for every request and Celery task
+QUERY_PROFILING_ENABLED = getenv_boolean("QUERY_PROFILING_ENABLED", default=False)
+# Maximum number of queries by url name of a view or by task name, profiles exceeding it are logged as warnings.
+# Set as comma separated pairs, e.g. "integrations:universal=20,apps.alerts.tasks.notify_user.notify_user_task=30"
+QUERY_BUDGETS = {
+    name.strip(): int(budget)
+    for name, budget in (item.rsplit("=", 1) for item in os.environ.get("QUERY_BUDGETS", "").split(",") if item.strip())
+}
+QUERY_BUDGET_DEFAULT = getenv_integer("QUERY_BUDGET_DEFAULT", None)
+# Fail requests and tasks exceeding their query budgets instead of only logging them
+QUERY_BUDGETS_ENFORCED = getenv_boolean("QUERY_BUDGETS_ENFORCED", default=False)
+
 # Log inbound/outbound calls as slow=1 if they exceed threshold
 SLOW_THRESHOLD_SECONDS = 2.0
 
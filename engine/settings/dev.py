@@ -21,6 +21,16 @@ DATABASES = {
     },
 }
 
+# Set DB_REPLICA_HOST to route reads of read-heavy views and tasks to a replica, e.g. a second local database
+if os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "HOST": os.environ["DB_REPLICA_HOST"],
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
 SECRET_KEY = os.environ.get("SECRET_KEY", "osMsNM0PqlRHBlUvqmeJ7+ldU3IUETCrY9TrmiViaSmInBHolr1WUlS0OFS4AHrnnkp1vp9S9z1")
 
 MIRAGE_SECRET_KEY = os.environ.get(
@@ -22,6 +22,13 @@ DATABASES = {
     },
 }
 
+if os.environ.get("MYSQL_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["MYSQL_REPLICA_HOST"],
+        "PORT": os.environ.get("MYSQL_REPLICA_PORT", DATABASES["default"]["PORT"]),
+    }
+
 RABBITMQ_USERNAME = os.environ.get("RABBITMQ_USERNAME")
 RABBITMQ_PASSWORD = os.environ.get("RABBITMQ_PASSWORD")
 RABBITMQ_HOST = os.environ.get("RABBITMQ_HOST")
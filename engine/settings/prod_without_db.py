@@ -7,7 +7,7 @@ try:
     def on_uwsgi_worker_exit():
         multiprocess.mark_process_dead(os.getpid())
 
-        uwsgi.atexit = on_uwsgi_worker_exit
+    uwsgi.atexit = on_uwsgi_worker_exit
 
 except ModuleNotFoundError:
     # Only works under uwsgi web server environment
@@ -88,10 +88,10 @@ CELERY_TASK_ROUTES = {
     },  # todo: remove
     "apps.alerts.tasks.send_alert_group_signal.send_alert_group_signal": {"queue": "default"},
     "apps.alerts.tasks.wipe.wipe": {"queue": "default"},
+    "apps.heartbeat.tasks.check_heartbeats_expiration": {"queue": "default"},
     "apps.heartbeat.tasks.heartbeat_checkup": {"queue": "default"},
     "apps.heartbeat.tasks.integration_heartbeat_checkup": {"queue": "default"},
     "apps.heartbeat.tasks.process_heartbeat_task": {"queue": "default"},
-    "apps.heartbeat.tasks.restore_heartbeat_tasks": {"queue": "default"},
     "apps.schedules.tasks.refresh_ical_files.refresh_ical_file": {"queue": "default"},
     "apps.schedules.tasks.refresh_ical_files.start_refresh_ical_files": {"queue": "default"},
     "apps.schedules.tasks.notify_about_gaps_in_schedule.check_empty_shifts_in_schedule": {"queue": "default"},
@@ -134,6 +134,7 @@ CELERY_TASK_ROUTES = {
     "apps.alerts.tasks.send_update_postmortem_signal.send_update_postmortem_signal": {"queue": "critical"},
     "apps.alerts.tasks.send_update_resolution_note_signal.send_update_resolution_note_signal": {"queue": "critical"},
     "apps.alerts.tasks.unsilence.unsilence_task": {"queue": "critical"},
+    "apps.base.tasks.dispatch_scheduled_tasks": {"queue": "critical"},
     "apps.base.tasks.process_failed_to_invoke_celery_tasks": {"queue": "critical"},
     "apps.base.tasks.process_failed_to_invoke_celery_tasks_batch": {"queue": "critical"},
     "apps.integrations.tasks.create_alert": {"queue": "critical"},
@@ -141,8 +142,13 @@ CELERY_TASK_ROUTES = {
     "apps.integrations.tasks.start_notify_about_integration_ratelimit": {"queue": "critical"},
     "apps.schedules.tasks.drop_cached_ical.drop_cached_ical_for_custom_events_for_organization": {"queue": "critical"},
     "apps.schedules.tasks.drop_cached_ical.drop_cached_ical_task": {"queue": "critical"},
+    "apps.sendgridapp.tasks.process_email_status_events": {"queue": "critical"},
+    "apps.twilioapp.tasks.process_status_callbacks": {"queue": "critical"},
     # LONG
     "apps.alerts.tasks.check_escalation_finished.check_escalation_finished_task": {"queue": "long"},
+    "apps.alerts.tasks.compact_alert_payloads.compact_alert_payloads": {"queue": "long"},
+    "apps.alerts.tasks.purge_alert_groups.purge_resolved_alert_groups": {"queue": "long"},
+    "apps.alerts.tasks.purge_alert_groups.start_purge_resolved_alert_groups": {"queue": "long"},
     "apps.grafana_plugin.tasks.sync.start_sync_organizations": {"queue": "long"},
     "apps.grafana_plugin.tasks.sync.sync_organization_async": {"queue": "long"},
     # SLACK
@@ -1,10 +1,25 @@
+from typing import Any, Callable, NamedTuple
+
 from pdpyras import APISession
 
 from migrator import oncall_api_client
-from migrator.config import MODE, MODE_PLAN, PAGERDUTY_API_TOKEN
+from migrator.checkpoint import (
+    ESCALATION_POLICIES,
+    INTEGRATIONS,
+    NOTIFICATION_RULES,
+    SCHEDULES,
+    Checkpoint,
+)
+from migrator.config import (
+    MIGRATION_CHECKPOINT_FILE,
+    MODE,
+    MODE_PLAN,
+    PAGERDUTY_API_TOKEN,
+)
 from migrator.report import (
     TAB,
     escalation_policy_report,
+    format_error,
     format_escalation_policy,
     format_integration,
     format_schedule,
@@ -30,6 +45,7 @@ from migrator.resources.users import (
     match_users_and_schedules_for_escalation_policy,
     match_users_for_schedule,
 )
+from migrator.utils import run_concurrently
 
 
 def main() -> None:
@@ -96,32 +112,133 @@ def main() -> None:
 
         return
 
-    print("▶ Migrating user notification rules...")
-    for user in users:
-        if user["oncall_user"]:
-            migrate_notification_rules(user)
-            print(TAB + format_user(user))
-
-    print("▶ Migrating schedules...")
-    for schedule in schedules:
-        if not schedule["unmatched_users"]:
-            migrate_schedule(schedule)
-            print(TAB + format_schedule(schedule))
+    checkpoint = Checkpoint(MIGRATION_CHECKPOINT_FILE)
+    if checkpoint:
+        print(
+            "▶ Resuming migration, {} resources are already migrated...".format(
+                len(checkpoint)
+            )
+        )
+        restore_migrated_resources(checkpoint, schedules, escalation_policies)
+
+    # Escalation policies reference schedules and integrations reference escalation policies,
+    # so they are migrated after resources they depend on. Resources of one stage are migrated concurrently.
+    print("▶ Migrating user notification rules and schedules...")
+    migrate_resources(
+        checkpoint,
+        [
+            Migration(
+                NOTIFICATION_RULES,
+                user,
+                migrate_notification_rules,
+                format_user,
+            )
+            for user in users
+            if user["oncall_user"]
+        ]
+        + [
+            Migration(
+                SCHEDULES,
+                schedule,
+                migrate_schedule,
+                format_schedule,
+            )
+            for schedule in schedules
+            if not schedule["unmatched_users"]
+        ],
+    )
 
     print("▶ Migrating escalation policies...")
-    for policy in escalation_policies:
-        if not policy["unmatched_users"] and not policy["flawed_schedules"]:
-            migrate_escalation_policy(policy, users, schedules)
-            print(TAB + format_escalation_policy(policy))
+    migrate_resources(
+        checkpoint,
+        [
+            Migration(
+                ESCALATION_POLICIES,
+                policy,
+                lambda policy: migrate_escalation_policy(policy, users, schedules),
+                format_escalation_policy,
+            )
+            for policy in escalation_policies
+            if not policy["unmatched_users"] and not policy["flawed_schedules"]
+        ],
+    )
 
     print("▶ Migrating integrations...")
-    for integration in integrations:
-        if (
-            integration["oncall_type"]
+    migrate_resources(
+        checkpoint,
+        [
+            Migration(
+                INTEGRATIONS,
+                integration,
+                lambda integration: migrate_integration(
+                    integration, escalation_policies
+                ),
+                format_integration,
+            )
+            for integration in integrations
+            if integration["oncall_type"]
             and not integration["is_escalation_policy_flawed"]
-        ):
-            migrate_integration(integration, escalation_policies)
-            print(TAB + format_integration(integration))
+        ],
+    )
+
+    # Migration is complete, so the next run starts from scratch
+    checkpoint.clear()
+
+
+class Migration(NamedTuple):
+    resource_type: str
+    resource: dict
+    # returns Grafana OnCall resource to record in the checkpoint (if other resources depend on it)
+    migrate: Callable[[dict], Any]
+    format: Callable[[dict], str]
+
+
+def restore_migrated_resources(
+    checkpoint: Checkpoint, schedules: list[dict], escalation_policies: list[dict]
+) -> None:
+    """
+    Restore Grafana OnCall resources created by the interrupted migration,
+    so resources depending on them can be migrated.
+    """
+    for schedule in schedules:
+        if checkpoint.is_migrated(SCHEDULES, schedule["id"]):
+            schedule["oncall_schedule"] = checkpoint.get(SCHEDULES, schedule["id"])
+
+    for policy in escalation_policies:
+        if checkpoint.is_migrated(ESCALATION_POLICIES, policy["id"]):
+            policy["oncall_escalation_chain"] = checkpoint.get(
+                ESCALATION_POLICIES, policy["id"]
+            )
+
+
+def migrate_resources(checkpoint: Checkpoint, migrations: list[Migration]) -> None:
+    def migrate(migration: Migration) -> None:
+        oncall_resource = migration.migrate(migration.resource)
+        checkpoint.mark_migrated(
+            migration.resource_type, migration.resource["id"], oncall_resource
+        )
+
+    migrations_to_run = []
+    for migration in migrations:
+        if checkpoint.is_migrated(migration.resource_type, migration.resource["id"]):
+            print(TAB + migration.format(migration.resource) + " (already migrated)")
+        else:
+            migrations_to_run.append(migration)
+
+    failed = False
+    for migration, error in run_concurrently(migrate, migrations_to_run):
+        if error:
+            failed = True
+            print(TAB + format_error(migration.format(migration.resource), error))
+        else:
+            print(TAB + migration.format(migration.resource))
+
+    # Resources of the next stages could depend on failed ones, so migration is stopped here
+    if failed:
+        raise SystemExit(
+            "Migration failed for some resources. Run the migration again to resume it, "
+            "already migrated resources will be skipped."
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+import json
+import os
+import threading
+from typing import Any, Optional
+
+NOTIFICATION_RULES = "notification_rules"
+SCHEDULES = "schedules"
+ESCALATION_POLICIES = "escalation_policies"
+INTEGRATIONS = "integrations"
+
+
+class Checkpoint:
+    """
+    Record of migrated resources, saved to a file after every migrated resource,
+    so an interrupted migration can be resumed without migrating the same resources again.
+    Resources are recorded by resource type and PagerDuty ID, along with Grafana OnCall resources
+    other resources depend on (e.g. escalation chains are needed to migrate integrations).
+    """
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.migrated: dict[str, dict[str, Any]] = {}
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.migrated = json.load(f)
+
+    def __len__(self) -> int:
+        return sum(len(resources) for resources in self.migrated.values())
+
+    def is_migrated(self, resource_type: str, resource_id: str) -> bool:
+        return resource_id in self.migrated.get(resource_type, {})
+
+    def get(self, resource_type: str, resource_id: str) -> Any:
+        return self.migrated[resource_type][resource_id]
+
+    def mark_migrated(
+        self, resource_type: str, resource_id: str, oncall_resource: Any = None
+    ) -> None:
+        with self.lock:
+            self.migrated.setdefault(resource_type, {})[resource_id] = oncall_resource
+            self._save()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.migrated = {}
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+
+        # Write to a temporary file first, so the checkpoint is never left half-written
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.migrated, f)
+        os.replace(tmp_path, self.path)
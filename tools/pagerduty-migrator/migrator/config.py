@@ -10,6 +10,15 @@ PAGERDUTY_API_TOKEN = os.environ["PAGERDUTY_API_TOKEN"]
 ONCALL_API_TOKEN = os.environ["ONCALL_API_TOKEN"]
 ONCALL_API_URL = urljoin(os.environ["ONCALL_API_URL"], "api/v1/")
 
+# Grafana OnCall public API allows 300 requests per minute per token
+ONCALL_API_REQUESTS_PER_SECOND = float(
+    os.getenv("ONCALL_API_REQUESTS_PER_SECOND", default="5")
+)
+MIGRATION_WORKERS = int(os.getenv("MIGRATION_WORKERS", default="8"))
+MIGRATION_CHECKPOINT_FILE = os.getenv(
+    "MIGRATION_CHECKPOINT_FILE", default="migration_checkpoint.json"
+)
+
 ONCALL_DELAY_OPTIONS = [1, 5, 15, 30, 60]
 ONCALL_DEFAULT_CONTACT_METHOD = "notify_by_" + os.getenv(
     "ONCALL_DEFAULT_CONTACT_METHOD", default="sms"
@@ -1,38 +1,77 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
-from urllib.parse import urljoin
+from urllib.parse import parse_qs, urlencode, urljoin, urlparse
 
 import requests
-from requests import HTTPError
+from requests.adapters import HTTPAdapter
 
-from migrator.config import ONCALL_API_TOKEN, ONCALL_API_URL
+from migrator.config import (
+    MIGRATION_WORKERS,
+    ONCALL_API_REQUESTS_PER_SECOND,
+    ONCALL_API_TOKEN,
+    ONCALL_API_URL,
+)
+from migrator.utils import TokenBucket
+
+# Session is shared by all threads, so connections are kept alive and reused between requests
+session = requests.Session()
+session.headers["Authorization"] = ONCALL_API_TOKEN
+adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MIGRATION_WORKERS)
+session.mount("http://", adapter)
+session.mount("https://", adapter)
+
+rate_limiter = TokenBucket(ONCALL_API_REQUESTS_PER_SECOND)
 
 
 def api_call(method: str, path: str, **kwargs) -> requests.Response:
     url = urljoin(ONCALL_API_URL, path)
 
-    response = requests.request(
-        method, url, headers={"Authorization": ONCALL_API_TOKEN}, **kwargs
-    )
+    while True:
+        rate_limiter.acquire()
+        response = session.request(method, url, **kwargs)
+
+        if response.status_code != 429:
+            break
 
-    try:
-        response.raise_for_status()
-    except HTTPError as e:
-        if e.response.status_code == 429:
-            cooldown_seconds = int(e.response.headers["Retry-After"])
-            sleep(cooldown_seconds)
-            return api_call(method, path, **kwargs)
-        else:
-            raise
+        cooldown_seconds = int(response.headers.get("Retry-After", 1))
+        sleep(cooldown_seconds)
 
+    response.raise_for_status()
     return response
 
 
+def get_page_url(url: str, page: int) -> str:
+    parsed_url = urlparse(url)
+    query = parse_qs(parsed_url.query)
+    query["page"] = [str(page)]
+    return parsed_url._replace(query=urlencode(query, doseq=True)).geturl()
+
+
 def list_all(path: str) -> list[dict]:
     response = api_call("get", path)
 
     data = response.json()
     results = data["results"]
 
+    if not data["next"]:
+        return results
+
+    # When total number of results and page size are known, fetch the rest of the pages concurrently
+    if data.get("count") is not None and results:
+        page_count = math.ceil(data["count"] / len(results))
+        page_urls = [
+            get_page_url(data["next"], page) for page in range(2, page_count + 1)
+        ]
+
+        with ThreadPoolExecutor(max_workers=MIGRATION_WORKERS) as executor:
+            for page_results in executor.map(
+                lambda url: api_call("get", url).json()["results"], page_urls
+            ):
+                results += page_results
+
+        return results
+
     while data["next"]:
         response = api_call("get", data["next"])
 
@@ -66,6 +66,12 @@ def format_integration(integration: dict) -> str:
     return result
 
 
+def format_error(formatted_resource: str, error: Exception) -> str:
+    return "{} {} — migration failed: {}".format(
+        ERROR_SIGN, formatted_resource.removeprefix(SUCCESS_SIGN + " "), error
+    )
+
+
 def user_report(users: list[dict]) -> str:
     result = "User notification rules report:"
 
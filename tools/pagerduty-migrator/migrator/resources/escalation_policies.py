@@ -24,7 +24,7 @@ def match_escalation_policy_for_integration(
 
 def migrate_escalation_policy(
     escalation_policy: dict, users: list[dict], schedules: list[dict]
-) -> None:
+) -> dict:
     name = escalation_policy["name"]
     rules = escalation_policy["escalation_rules"]
     num_loops = escalation_policy["num_loops"]
@@ -49,6 +49,8 @@ def migrate_escalation_policy(
     for policy in oncall_escalation_policies:
         oncall_api_client.create("escalation_policies", policy)
 
+    return oncall_escalation_chain
+
 
 def transform_rules(
     rules: list[dict],
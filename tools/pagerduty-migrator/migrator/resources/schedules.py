@@ -10,7 +10,7 @@ def match_schedule(schedule: dict, oncall_schedules: list[dict]) -> None:
     schedule["oncall_schedule"] = oncall_schedule
 
 
-def migrate_schedule(schedule: dict) -> None:
+def migrate_schedule(schedule: dict) -> dict:
     if schedule["oncall_schedule"]:
         oncall_api_client.delete(
             "schedules/{}".format(schedule["oncall_schedule"]["id"])
@@ -25,3 +25,4 @@ def migrate_schedule(schedule: dict) -> None:
     oncall_schedule = oncall_api_client.create("schedules", payload)
 
     schedule["oncall_schedule"] = oncall_schedule
+    return oncall_schedule
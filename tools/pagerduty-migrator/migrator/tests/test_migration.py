@@ -0,0 +1,132 @@
+from unittest import mock
+
+import pytest
+
+from migrator import oncall_api_client
+from migrator.checkpoint import ESCALATION_POLICIES, SCHEDULES, Checkpoint
+from migrator.utils import TokenBucket, run_concurrently
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    with mock.patch("migrator.utils.time.sleep") as mock_sleep:
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+        # bucket is empty, so the next call waits for a token to be refilled
+        bucket.tokens = 0.5
+        with mock.patch(
+            "migrator.utils.time.monotonic", return_value=bucket.updated_at
+        ):
+            mock_sleep.side_effect = lambda seconds: setattr(bucket, "tokens", 1)
+            bucket.acquire()
+
+    mock_sleep.assert_called_once_with(pytest.approx(0.05))
+
+
+def test_run_concurrently():
+    def migrate(item):
+        if item == 2:
+            raise ValueError("failed")
+
+    results = dict(run_concurrently(migrate, [1, 2, 3]))
+
+    assert results[1] is None
+    assert results[3] is None
+    assert isinstance(results[2], ValueError)
+
+
+def make_response(status_code, data=None, headers=None):
+    response = mock.Mock(status_code=status_code, headers=headers or {})
+    response.json.return_value = data
+    return response
+
+
+def test_api_call_retries_rate_limited_requests():
+    responses = [make_response(429, headers={"Retry-After": "2"}), make_response(200)]
+
+    with mock.patch.object(
+        oncall_api_client.session, "request", side_effect=responses
+    ) as mock_request, mock.patch("migrator.oncall_api_client.sleep") as mock_sleep:
+        oncall_api_client.api_call("get", "users")
+
+    assert mock_request.call_count == 2
+    mock_sleep.assert_called_once_with(2)
+
+
+def test_list_all_fetches_pages_concurrently():
+    pages = {
+        "https://oncall.example.com/api/v1/users": {
+            "count": 5,
+            "next": "https://oncall.example.com/api/v1/users?page=2",
+            "results": [{"id": 1}, {"id": 2}],
+        },
+        "https://oncall.example.com/api/v1/users?page=2": {
+            "count": 5,
+            "next": "https://oncall.example.com/api/v1/users?page=3",
+            "results": [{"id": 3}, {"id": 4}],
+        },
+        "https://oncall.example.com/api/v1/users?page=3": {
+            "count": 5,
+            "next": None,
+            "results": [{"id": 5}],
+        },
+    }
+
+    with mock.patch.object(
+        oncall_api_client.session,
+        "request",
+        side_effect=lambda method, url, **kwargs: make_response(200, pages[url]),
+    ), mock.patch(
+        "migrator.oncall_api_client.ONCALL_API_URL",
+        "https://oncall.example.com/api/v1/",
+    ):
+        results = oncall_api_client.list_all("users")
+
+    assert [result["id"] for result in results] == [1, 2, 3, 4, 5]
+
+
+def test_list_all_empty_first_page():
+    pages = {
+        "https://oncall.example.com/api/v1/users": {
+            "count": 1,
+            "next": "https://oncall.example.com/api/v1/users?page=2",
+            "results": [],
+        },
+        "https://oncall.example.com/api/v1/users?page=2": {
+            "count": 1,
+            "next": None,
+            "results": [{"id": 1}],
+        },
+    }
+
+    with mock.patch.object(
+        oncall_api_client.session,
+        "request",
+        side_effect=lambda method, url, **kwargs: make_response(200, pages[url]),
+    ), mock.patch(
+        "migrator.oncall_api_client.ONCALL_API_URL",
+        "https://oncall.example.com/api/v1/",
+    ):
+        results = oncall_api_client.list_all("users")
+
+    # page size is unknown, so pages are fetched one by one
+    assert [result["id"] for result in results] == [1]
+
+
+def test_checkpoint_resumes_migration(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+
+    checkpoint = Checkpoint(path)
+    checkpoint.mark_migrated(SCHEDULES, "SCHEDULE1", {"id": "ONCALL_SCHEDULE1"})
+
+    checkpoint = Checkpoint(path)
+    assert len(checkpoint) == 1
+    assert checkpoint.is_migrated(SCHEDULES, "SCHEDULE1")
+    assert not checkpoint.is_migrated(ESCALATION_POLICIES, "SCHEDULE1")
+    assert checkpoint.get(SCHEDULES, "SCHEDULE1") == {"id": "ONCALL_SCHEDULE1"}
+
+    checkpoint.clear()
+    assert not Checkpoint(path)
@@ -1,6 +1,9 @@
-from typing import Callable, Optional, TypeVar
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, Optional, TypeVar
 
-from migrator.config import ONCALL_DELAY_OPTIONS
+from migrator.config import MIGRATION_WORKERS, ONCALL_DELAY_OPTIONS
 
 T = TypeVar("T")
 
@@ -63,3 +66,47 @@ def find_closest_value(lst: list[int], value: int) -> int:
 
 def transform_wait_delay(delay: int) -> int:
     return find_closest_value(ONCALL_DELAY_OPTIONS, delay) * 60
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Allows bursts of up to "capacity" calls, refilled with "rate" tokens per second.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait_seconds = (1 - self.tokens) / self.rate
+
+            time.sleep(wait_seconds)
+
+
+def run_concurrently(
+    func: Callable[[T], None], items: list[T], workers: int = MIGRATION_WORKERS
+) -> Iterator[tuple[T, Optional[Exception]]]:
+    """
+    Call func for every item in a thread pool and yield items with exceptions raised (if any) as they complete.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(func, item): item for item in items}
+
+        for future in as_completed(futures):
+            yield futures[future], future.exception()